@@ -13,6 +13,12 @@ per-object lazy reads fails loudly instead of silently going slow.
 
 from __future__ import annotations
 
+import functools
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+
 from pyVmomi import vim
 
 
@@ -160,3 +166,101 @@ class FakeSI:
 def make_si(fixtures: dict, page_size: int = 1000) -> FakeSI:
     """Build a fake ServiceInstance from ``{vim_type: [(obj, props), ...]}``."""
     return FakeSI(fixtures, page_size)
+
+
+class DoubleStub:
+    """SOAP stub that backs real morefs with Python doubles.
+
+    :meth:`ref` wraps a double in a real managed object (so it type-checks
+    in an ``ObjectSpec``); methods invoked on the moref and its lazy property
+    reads go to the double. :meth:`task` wraps a scripted task whose ``info``
+    can only be read through a collector — a lazy ``task.info`` read fails
+    the test. ``RetrieveContent`` yields a session collector whose private
+    collectors (one per wait in ``ops.tasks``) report the filtered paths off
+    each double: all of them in the first ``WaitForUpdatesEx``, then only the
+    values that changed. A task left ``running`` stays so until the wait
+    budget runs out.
+    """
+
+    def __init__(self) -> None:
+        self.doubles: dict[str, object] = {}
+        self._tasks: set[str] = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def ref(self, vim_type, double, prefix: str = "obj"):
+        with self._lock:
+            moid = f"{prefix}-{next(self._ids)}"
+        self.doubles[moid] = double
+        return vim_type(moid, self)
+
+    def task(self, result=None, state="success", error=None, progress=100) -> vim.Task:
+        info = SimpleNamespace(state=state, result=result, error=error, progress=progress)
+        task = self.ref(vim.Task, SimpleNamespace(info=info), "task")
+        self._tasks.add(task._moId)
+        return task
+
+    def InvokeMethod(self, mo, info, args):  # noqa: N802 - pyVmomi contract
+        if info.name == "RetrieveContent":
+            return SimpleNamespace(propertyCollector=SimpleNamespace(
+                CreatePropertyCollector=lambda: _DoubleCollector(self.doubles),
+            ))
+        return getattr(self.doubles[mo._moId], info.name)(*args)
+
+    def InvokeAccessor(self, mo, info):  # noqa: N802 - pyVmomi contract
+        assert mo._moId not in self._tasks, (
+            f"lazy '{info.name}' read on {mo} — tasks must be awaited through a collector"
+        )
+        return getattr(self.doubles[mo._moId], info.name)
+
+
+class _DoubleCollector:
+    def __init__(self, doubles: dict[str, object]) -> None:
+        self._doubles = doubles
+        self._objs: list = []
+        self._paths: list[str] = []
+        self._seen: dict[str, dict] = {}
+
+    def CreateFilter(self, spec, partialUpdates):  # noqa: N802, N803 - pyVmomi API
+        self._objs = [o.obj for o in spec.objectSet]
+        self._paths = list(spec.propSet[0].pathSet)
+
+    def _read(self, obj) -> dict:
+        double = self._doubles[obj._moId]
+        return {p: functools.reduce(getattr, p.split("."), double) for p in self._paths}
+
+    def WaitForUpdatesEx(self, version, options):  # noqa: N802
+        changes = []
+        for obj in self._objs:
+            now = self._read(obj)
+            before = self._seen.get(obj._moId)
+            if now != before:
+                self._seen[obj._moId] = now
+                changes.append(SimpleNamespace(
+                    kind="modify" if before else "enter", obj=obj, changeSet=[
+                        SimpleNamespace(name=k, op="assign", val=v) for k, v in now.items()
+                    ],
+                ))
+        if not changes:
+            time.sleep(min(options.maxWaitSeconds, 0.01))
+            return None
+        return SimpleNamespace(
+            version=str(int(version or 0) + 1),
+            filterSet=[SimpleNamespace(objectSet=changes)],
+        )
+
+    def Destroy(self):  # noqa: N802
+        pass
+
+
+_DOUBLES = DoubleStub()
+
+
+def fake_task(result=None, state="success", error=None, progress=100) -> vim.Task:
+    """A ``vim.Task`` that reports ``state`` (with ``result`` / ``error``) when awaited."""
+    return _DOUBLES.task(result, state, error, progress)
+
+
+def fake_ref(vim_type, double):
+    """A real ``vim_type`` moref whose methods and properties are ``double``'s."""
+    return _DOUBLES.ref(vim_type, double)
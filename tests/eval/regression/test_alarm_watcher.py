@@ -0,0 +1,267 @@
+"""Regression — alarm watch mode streams changes instead of re-polling.
+
+``scan_alarms`` re-reads ``triggeredAlarmState`` for the root folder and every
+datacenter / cluster / host on each cycle. ``AlarmWatcher`` registers one
+PropertyCollector filter and blocks in ``WaitForUpdatesEx``, publishing the
+target's alarm set only when it changes.
+
+Locked here:
+1. one private PropertyCollector, one filter on ``triggeredAlarmState``,
+   full-value (non-partial) updates; collector and view destroyed on stop;
+2. ``on_change`` fires on the initial state and on real changes only — not on
+   a ``maxWaitSeconds`` timeout or an update that leaves the set unchanged;
+3. a failed watch is retried with a fresh connection and reports unhealthy
+   meanwhile;
+4. the scheduler skips the alarm poll for a healthy watched target (and so
+   never resolves its alarms from a poll), and watcher changes flow through
+   the dedup pipeline;
+5. each scan cycle re-submits the watcher's current alarms, so an alarm that
+   stays active still renotifies;
+6. alarm and entity names are read once per new moref, in one collector
+   call per update that brings new ones — never lazily per alarm state.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pyVmomi import vim, vmodl
+
+from tests.eval.regression._pc_fakes import FakeViewManager, _Batch, _CountingStub, _ObjContent
+from vmware_aiops.scanner.alarm_watcher import AlarmWatcher
+
+_stub = _CountingStub()  # no InvokeAccessor: a lazy name read fails the test
+_NAMES: dict = {}
+
+
+def _ref(kind, name: str):
+    ref = kind(f"{kind.__name__.lower()}-{name.replace(' ', '-')}", _stub)
+    _NAMES[ref] = name
+    return ref
+
+
+def _state(alarm: str, entity: str, status: str = "red"):
+    return SimpleNamespace(
+        overallStatus=status,
+        alarm=_ref(vim.alarm.Alarm, alarm),
+        entity=_ref(vim.HostSystem, entity),
+        time="2026-10-01 00:00:00",
+        acknowledged=False,
+    )
+
+
+def _update(version: str, *changes):
+    """changes: (kind, obj, states-or-None)."""
+    return SimpleNamespace(
+        version=version,
+        filterSet=[SimpleNamespace(objectSet=[
+            SimpleNamespace(
+                kind=kind,
+                obj=obj,
+                changeSet=[] if states is None else [
+                    SimpleNamespace(name="triggeredAlarmState", op="assign", val=states)
+                ],
+            )
+            for kind, obj, states in changes
+        ])],
+    )
+
+
+class _WatchPC:
+    """Private collector: replays scripted update sets, then parks until cancelled."""
+
+    def __init__(self, updates: list) -> None:
+        self._updates = list(updates)
+        self._cancel = threading.Event()
+        self.filters: list[tuple] = []
+        self.versions: list[str] = []
+        self.destroyed = 0
+
+    def CreateFilter(self, spec, partialUpdates):  # noqa: N802, N803 - pyVmomi API
+        self.filters.append((spec, partialUpdates))
+
+    def WaitForUpdatesEx(self, version, options):  # noqa: N802
+        self.versions.append(version)
+        if self._updates:
+            return self._updates.pop(0)
+        self._cancel.wait(5)
+        raise vmodl.fault.RequestCanceled()
+
+    def CancelWaitForUpdates(self):  # noqa: N802
+        self._cancel.set()
+
+    def Destroy(self):  # noqa: N802
+        self.destroyed += 1
+
+
+class _SharedPC:
+    """The session's collector: hands out the private one, answers name reads."""
+
+    def __init__(self, watch_pc: _WatchPC) -> None:
+        self.watch_pc = watch_pc
+        self.reads: list[set[str]] = []
+
+    def CreatePropertyCollector(self):  # noqa: N802
+        return self.watch_pc
+
+    def RetrievePropertiesEx(self, specs, options):  # noqa: N802
+        [spec] = specs
+        refs = [o.obj for o in spec.objectSet]
+        self.reads.append({_NAMES[r] for r in refs})
+        return _Batch([
+            _ObjContent(r, {"info.name" if isinstance(r, vim.alarm.Alarm) else "name": _NAMES[r]})
+            for r in refs
+        ])
+
+
+def _si(watch_pc: _WatchPC):
+    content = SimpleNamespace(
+        propertyCollector=_SharedPC(watch_pc),
+        viewManager=FakeViewManager(),
+        rootFolder=vim.Folder("group-d1", _CountingStub()),
+    )
+    return SimpleNamespace(RetrieveContent=lambda: content, content=content)
+
+
+def _wait_for(predicate, timeout=5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+ROOT, HOST = object(), object()
+
+
+def test_publishes_initial_state_and_real_changes_only():
+    a, b = _state("Host CPU usage", "esxi-1"), _state("Datastore usage", "ds-1", "yellow")
+    pc = _WatchPC([
+        _update("1", ("enter", ROOT, [a]), ("enter", HOST, [a])),  # aggregated + own
+        None,                                                     # maxWaitSeconds timeout
+        _update("2", ("modify", HOST, [a, b])),
+        _update("3", ("modify", ROOT, [a, b])),                   # same set: no publish
+        _update("4", ("modify", HOST, []), ("modify", ROOT, [b])),
+    ])
+    si = _si(pc)
+    published: list[list[str]] = []
+    watcher = AlarmWatcher(
+        "vc1", connect=lambda: si,
+        on_change=lambda t, issues: published.append(sorted(i["alarm_name"] for i in issues)),
+    )
+    watcher.start()
+    assert _wait_for(lambda: len(published) == 3)
+    assert watcher.healthy
+    watcher.stop()
+
+    assert published == [
+        ["Host CPU usage"],
+        ["Datastore usage", "Host CPU usage"],
+        ["Datastore usage"],
+    ]
+    assert pc.versions[:6] == ["", "1", "1", "2", "3", "4"]
+    # names of new morefs only, one read per update that brings any
+    assert si.content.propertyCollector.reads == [
+        {"Host CPU usage", "esxi-1"}, {"Datastore usage", "ds-1"},
+    ]
+    [(spec, partial)] = pc.filters
+    assert partial is False
+    assert spec.propSet[0].pathSet == ["triggeredAlarmState"]
+    assert pc.destroyed == 1
+    assert si.content.viewManager.views[0].calls == 1
+    assert not watcher.healthy
+
+
+def test_failure_reconnects_and_reports_unhealthy():
+    attempts: list[int] = []
+    good = _si(_WatchPC([_update("1", ("enter", HOST, [_state("X", "esxi-1")]))]))
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("vCenter down")
+        return good
+
+    published: list[list[dict]] = []
+    watcher = AlarmWatcher(
+        "vc1", connect=connect, on_change=lambda t, i: published.append(i),
+        retry_seconds=0.01,
+    )
+    assert not watcher.healthy
+    watcher.start()
+    assert _wait_for(lambda: published)
+    watcher.stop()
+    assert len(attempts) == 2
+
+
+def test_scheduler_skips_poll_for_healthy_watch(tmp_path, monkeypatch):
+    from vmware_aiops.config import AppConfig, NotifyConfig
+    from vmware_aiops.notify.issue_state import IssueStateStore
+    from vmware_aiops.scanner import scheduler
+    from vmware_aiops.scanner.pacing import ScanPacer
+
+    config = AppConfig(notify=NotifyConfig(log_file=str(tmp_path / "scan.log")))
+    conn_mgr = MagicMock()
+    polled = MagicMock(return_value=[])
+    monkeypatch.setattr(scheduler, "scan_alarms", polled)
+    monkeypatch.setattr(scheduler, "scan_logs", lambda si, cfg: [])
+    monkeypatch.setattr(scheduler, "scan_host_logs", lambda si, **kw: [])
+    store = IssueStateStore(str(tmp_path / "state.json"))
+
+    alarm = {
+        "severity": "critical", "source": "alarm", "message": "[HostSystem:esxi-1] X",
+        "time": "", "entity": "esxi-1", "entity_type": "HostSystem", "alarm_name": "X",
+    }
+    scheduler._on_alarm_change(config, "vc1", [dict(alarm)], store, None)
+
+    watcher = SimpleNamespace(healthy=True, current_issues=lambda: [dict(alarm)])
+    pacer = ScanPacer(300, min_seconds=300, max_seconds=300)
+    scheduler._run_target_scan(config, conn_mgr, "vc1", pacer, store, None, {"vc1": watcher})
+    polled.assert_not_called()
+    assert len(store) == 1  # not resolved by a poll that never looked
+
+    # Watch down: the poll covers alarms again and can resolve them.
+    watcher.healthy = False
+    scheduler._run_target_scan(config, conn_mgr, "vc1", pacer, store, None, {"vc1": watcher})
+    polled.assert_called_once()
+    logged = [json.loads(line) for line in (tmp_path / "scan.log").read_text().splitlines()]
+    assert [e["transition"] for e in logged] == ["new", "resolved"]
+
+
+def test_unchanged_watched_alarm_renotifies(tmp_path, monkeypatch):
+    from vmware_aiops.config import AppConfig, NotifyConfig
+    from vmware_aiops.notify import issue_state
+    from vmware_aiops.scanner import scheduler
+    from vmware_aiops.scanner.pacing import ScanPacer
+
+    clock = [1_000_000.0]
+    monkeypatch.setattr(issue_state, "time", SimpleNamespace(time=lambda: clock[0]))
+    config = AppConfig(notify=NotifyConfig(log_file=str(tmp_path / "scan.log")))
+    conn_mgr = MagicMock()
+    monkeypatch.setattr(scheduler, "scan_alarms", MagicMock(side_effect=AssertionError))
+    monkeypatch.setattr(scheduler, "scan_logs", lambda si, cfg: [])
+    monkeypatch.setattr(scheduler, "scan_host_logs", lambda si, **kw: [])
+    store = issue_state.IssueStateStore(str(tmp_path / "state.json"), renotify_minutes=60)
+
+    # The watcher published the alarm once and has seen no change since.
+    pc = _WatchPC([_update("1", ("enter", HOST, [_state("X", "esxi-1")]))])
+    watcher = AlarmWatcher(
+        "vc1", connect=lambda: _si(pc),
+        on_change=lambda t, issues: scheduler._on_alarm_change(config, t, issues, store, None),
+    )
+    watcher.start()
+    assert _wait_for(lambda: watcher.healthy and len(store) == 1)
+
+    pacer = ScanPacer(300, min_seconds=300, max_seconds=300)
+    for minutes in (30, 61):  # two cycles, alarm unchanged
+        clock[0] += minutes * 60
+        scheduler._run_target_scan(config, conn_mgr, "vc1", pacer, store, None, {"vc1": watcher})
+    watcher.stop()
+
+    logged = [json.loads(line) for line in (tmp_path / "scan.log").read_text().splitlines()]
+    assert [e["transition"] for e in logged] == ["new", "renotify"]
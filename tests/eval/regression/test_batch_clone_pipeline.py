@@ -0,0 +1,140 @@
+"""Regression — pipelined batch clone (``ops.clone_pipeline``).
+
+Before: ``batch_clone`` ran one name at a time, and each of its clone,
+reconfigure, snapshot and power-on steps looked the VM up again by scanning
+every VM's name, then waited for its task before the next step — 100 clones
+took 100 times one clone, plus 400 inventory scans.
+
+Locked here:
+1. the source is resolved once (a name scan plus one read of its folder,
+   host and datastores), however many clones follow; every later step runs
+   on the moref the clone task returned;
+2. clones are in flight together, capped per host and per datastore, each
+   moving to its next step as soon as the last one finishes;
+3. one failed clone does not stop the rest — a failed task or any other
+   error, such as a dropped connection — results keep ``vm_names`` order
+   and shape (``messages``), and each reaches ``on_result`` as it finishes.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops.vm_deploy import batch_clone
+
+FOLDER = vim.Folder("group-v3", _CountingStub())
+
+
+def _task(result=None, error=None):
+    return fake_task(result, "error" if error else "success", error)
+
+
+class _Clone:
+    def __init__(self, name):
+        self.name = name
+        self.steps = []
+
+    def CreateSnapshot_Task(self, name, description, memory, quiesce):  # noqa: N802 - pyVmomi API
+        self.steps.append(("snapshot", name, memory))
+        return _task()
+
+    def PowerOn(self):  # noqa: N802
+        self.steps.append(("on",))
+        return _task()
+
+
+class _SourceStub:
+    """SOAP stub of the source VM: answers ``Clone`` and tracks overlap."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+        self.clones = {}
+        self.specs = []
+
+    def InvokeMethod(self, mo, info, args):  # noqa: N802 - pyVmomi contract
+        assert info.name == "Clone", info.name
+        folder, name, spec = args
+        assert folder is FOLDER
+        self.specs.append(spec)
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        if name == "lab-03":
+            return _task(error=SimpleNamespace(msg="Insufficient disk space"))
+        self.clones[name] = _Clone(name)
+        return _task(result=self.clones[name])
+
+
+def _si(source=None):
+    source = source or _SourceStub()
+    si = make_si({vim.VirtualMachine: [(vim.VirtualMachine("vm-10", source), {
+        "name": "gold", "parent": FOLDER, "runtime.host": "esx1",
+        "datastore": ["ds1"], "config.template": False,
+    })]})
+    return si, source
+
+
+def test_source_resolved_once_and_steps_run_on_the_clone():
+    si, source = _si()
+    names = [f"lab-{i:02d}" for i in range(1, 13)]
+    streamed = []
+    rows = batch_clone(
+        si, "gold", names, cpu=4, memory_mb=8192, snapshot_name="baseline",
+        power_on=True, on_result=streamed.append,
+    )
+    assert si.pc.call_count == 2  # name scan + source placement, not per clone
+    assert [r["name"] for r in rows] == names
+    assert sorted(r["name"] for r in streamed) == names
+
+    ok = rows[0]
+    assert ok["status"] == "ok"
+    assert ok["messages"] == [
+        "VM 'lab-01' cloned from 'gold' (CPU: 4, Memory: 8192MB).",
+        "Snapshot 'baseline' created.", "Powered on.",
+    ]
+    # the snapshot must see the clone powered off, so power-on follows it
+    assert source.clones["lab-01"].steps == [("snapshot", "baseline", False), ("on",)]
+    failed = rows[2]
+    assert failed["status"] == "error" and "Insufficient disk space" in failed["messages"][-1]
+    assert sum(r["status"] == "ok" for r in rows) == 11
+
+
+def test_clones_overlap_within_host_and_datastore_caps():
+    si, source = _si()
+    names = [f"lab-{i:02d}" for i in range(10, 26)]
+    batch_clone(si, "gold", names, concurrency=16)
+    assert source.peak == 4  # every clone lands on ds1: the per-datastore cap
+
+    si, source = _si()
+    batch_clone(si, "gold", names, concurrency=16, per_host=2, per_datastore=8)
+    assert source.peak == 2
+
+
+def test_unknown_source_is_one_error_row():
+    si, _ = _si()
+    assert batch_clone(si, "nope", ["a", "b"]) == [{
+        "name": "nope", "status": "error", "messages": ["Source VM 'nope' not found."],
+    }]
+
+
+def test_unexpected_error_is_that_clones_row():
+    class _Dropping(_SourceStub):
+        def InvokeMethod(self, mo, info, args):  # noqa: N802 - pyVmomi contract
+            if args[1] == "lab-02":
+                raise ConnectionResetError("Connection reset by peer")
+            return super().InvokeMethod(mo, info, args)
+
+    si, source = _si(_Dropping())
+    rows = batch_clone(si, "gold", ["lab-01", "lab-02", "lab-04"])
+    assert [r["status"] for r in rows] == ["ok", "error", "ok"]
+    assert rows[1]["messages"] == ["Connection reset by peer"]
+    assert set(source.clones) == {"lab-01", "lab-04"}
@@ -0,0 +1,131 @@
+"""Regression — ``batch_deploy`` runs its VMs in parallel.
+
+Before: ``batch_deploy`` walked ``vms:`` one VM at a time, each through
+deploy → ISO attach → snapshot → power on, so one slow OVA upload held up
+every VM behind it.
+
+Locked here:
+1. each VM's steps run in order, and a failed step ends that VM's chain
+   only — including a source or template that vanished after the spec was
+   written (the step raises; it does not return a failure message as "ok");
+2. VMs run in parallel under the spec's ``concurrency:`` block — ``max``
+   overall and ``per_datastore`` per datastore — and ``concurrency: 1``
+   is the old one-at-a-time behaviour;
+3. results keep ``vms`` order and shape, and each reaches ``on_result`` as
+   soon as its VM finishes.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import make_si
+from vmware_aiops.ops import vm_deploy
+
+
+class _Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.steps: dict = {}
+        self.active: dict = {}
+        self.peak: dict = {}
+
+    def step(self, name, what, key=None):
+        with self.lock:
+            self.steps.setdefault(name, []).append(what)
+            for k in ("all", key):
+                self.active[k] = self.active.get(k, 0) + 1
+                self.peak[k] = max(self.peak.get(k, 0), self.active[k])
+        time.sleep(0.02)
+        with self.lock:
+            for k in ("all", key):
+                self.active[k] -= 1
+        if name == "vm-03" and what == "iso":
+            raise RuntimeError("CD-ROM locked")
+        return f"{what} {name}"
+
+
+@pytest.fixture()
+def rec(monkeypatch):
+    r = _Recorder()
+
+    def create_vm(si, vm_name, datastore_name=None, **kwargs):
+        return r.step(vm_name, "create", datastore_name)
+
+    monkeypatch.setattr(vm_deploy, "create_vm", create_vm)
+    monkeypatch.setattr(vm_deploy, "attach_iso", lambda si, name, iso: r.step(name, "iso"))
+    monkeypatch.setattr(
+        vm_deploy, "create_snapshot", lambda si, name, snap, **kw: r.step(name, "snapshot"),
+    )
+    monkeypatch.setattr(vm_deploy, "power_on_vm", lambda si, name: r.step(name, "on"))
+    return r
+
+
+def _spec(tmp_path, concurrency, n=8):
+    path = tmp_path / "deploy.yaml"
+    vms = "".join(
+        f"  - {{name: vm-{i:02d}, datastore: ds{i % 2}, iso: '[ds] a.iso'}}\n"
+        for i in range(1, n + 1)
+    )
+    path.write_text(
+        f"concurrency: {concurrency}\n"
+        "defaults: {snapshot: base, power_on: true}\n"
+        f"vms:\n{vms}",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_parallel_chains_in_order(rec, tmp_path):
+    streamed = []
+    results = vm_deploy.batch_deploy(
+        object(), _spec(tmp_path, "{max: 8, per_datastore: 2}"),
+        on_result=streamed.append, preflight=False,
+    )
+    assert [r["name"] for r in results] == [f"vm-{i:02d}" for i in range(1, 9)]
+    assert sorted(r["name"] for r in streamed) == [r["name"] for r in results]
+    assert results[0] == {
+        "name": "vm-01", "status": "ok",
+        "messages": ["create vm-01", "iso vm-01", "snapshot vm-01", "on vm-01"],
+    }
+    assert rec.steps["vm-01"] == ["create", "iso", "snapshot", "on"]
+    # a failed ISO attach stops vm-03's chain, not the others
+    assert results[2]["status"] == "error"
+    assert results[2]["messages"] == ["create vm-03", "CD-ROM locked"]
+    assert rec.steps["vm-03"] == ["create", "iso"]
+    assert sum(r["status"] == "ok" for r in results) == 7
+
+    assert rec.peak["all"] > 2  # VMs overlap
+    assert rec.peak["ds0"] <= 2 and rec.peak["ds1"] <= 2
+
+
+@pytest.mark.parametrize(
+    "source", ["template: gold", "linked_clone: {source: gold, snapshot: base}"],
+)
+def test_vanished_source_ends_the_chain(rec, tmp_path, source):
+    path = tmp_path / "deploy.yaml"
+    path.write_text(
+        f"{source}\ndefaults: {{snapshot: base, power_on: true}}\n"
+        "vms: [{name: web-01, iso: '[ds] a.iso'}]\n",
+        encoding="utf-8",
+    )
+    si = make_si({vim.VirtualMachine: []})
+    [result] = vm_deploy.batch_deploy(si, str(path), preflight=False)
+    assert result["status"] == "error"
+    [message] = result["messages"]
+    assert "VM 'gold' not found" in message
+    assert rec.steps == {}  # no ISO, snapshot or power-on on a VM that never existed
+
+
+def test_concurrency_one_is_sequential(rec, tmp_path):
+    vm_deploy.batch_deploy(object(), _spec(tmp_path, 1, n=4), preflight=False)
+    assert rec.peak["all"] == 1
+
+
+def test_bad_concurrency_block(tmp_path):
+    with pytest.raises(ValueError, match="per_host"):
+        vm_deploy.batch_deploy(object(), _spec(tmp_path, "{per_host: 0}"))
@@ -0,0 +1,130 @@
+"""Regression — batch linked clone fast path (``vm_deploy.batch_linked_clone``).
+
+Before: ``batch_linked_clone`` called ``linked_clone`` once per name, and each
+call scanned every VM's name for the source, read its snapshot tree again and
+(with a target host) scanned every host — then waited for the clone before
+the next name. A 500-desktop refresh was dominated by those lookups.
+
+Locked here:
+1. source, snapshot, folder, candidate hosts and resource pool cost four
+   PropertyCollector calls whatever the batch size; clones join the
+   source's own resource pool, the cluster root only when it has none;
+2. clones are spread round-robin over the source cluster's hosts that are
+   connected, out of maintenance and mount the source's datastores, each
+   spec carrying the snapshot moref and ``createNewChildDiskBacking``;
+3. clones are submitted in parallel, at most ``per_host`` per host;
+4. a missing snapshot or unusable host is one error row before any task.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops.vm_deploy import batch_linked_clone
+
+_stub = _CountingStub()
+FOLDER = vim.Folder("group-v3", _stub)
+POOL = vim.ResourcePool("resgroup-8", _stub)
+CLUSTER = vim.ClusterComputeResource("domain-c7", _stub)
+SNAP = vim.vm.Snapshot("snapshot-41", _stub)
+HOSTS = {n: vim.HostSystem(f"host-{n}", _stub) for n in range(1, 7)}
+
+
+class _SourceStub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active: dict = {}
+        self.peak: dict = {}
+        self.specs: dict = {}
+
+    def InvokeMethod(self, mo, info, args):  # noqa: N802 - pyVmomi contract
+        folder, name, spec = args
+        assert info.name == "Clone" and folder is FOLDER
+        host = spec.location.host
+        with self.lock:
+            self.specs[name] = spec
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(0.02)
+        with self.lock:
+            self.active[host] -= 1
+        return fake_task(object())
+
+
+def _host(name, parent=CLUSTER, maint=False, ds=("ds-gold",)):
+    return {
+        "name": name, "parent": parent, "runtime.connectionState": "connected",
+        "runtime.inMaintenanceMode": maint, "datastore": list(ds),
+    }
+
+
+def _si(pool=None):
+    source = _SourceStub()
+    tree = [SimpleNamespace(
+        name="base", description="", createTime="2026-10-01", state="poweredOff",
+        snapshot=SNAP, childSnapshotList=[],
+    )]
+    si = make_si({
+        vim.VirtualMachine: [(vim.VirtualMachine("vm-10", source), {
+            "name": "gold", "parent": FOLDER, "runtime.host": HOSTS[1],
+            "datastore": ["ds-gold"], "config.template": False,
+            "snapshot.rootSnapshotList": tree, "resourcePool": pool,
+        })],
+        vim.HostSystem: [
+            (HOSTS[1], _host("esx1")), (HOSTS[2], _host("esx2")), (HOSTS[3], _host("esx3")),
+            (HOSTS[4], _host("esx4", maint=True)),
+            (HOSTS[5], _host("esx5", ds=("ds-other",))),
+            (HOSTS[6], _host("esx6", parent=vim.ClusterComputeResource("domain-c9", _stub))),
+        ],
+        vim.ComputeResource: [(CLUSTER, {"resourcePool": POOL})],
+    })
+    return si, source
+
+
+def test_resolved_once_and_round_robin_over_usable_hosts():
+    si, source = _si()
+    names = [f"desk-{i:03d}" for i in range(1, 10)]
+    rows = batch_linked_clone(si, "gold", "base", names, cpu=2, concurrency=9)
+    assert si.pc.call_count == 4  # VM names, source, hosts, pool
+    assert [r["status"] for r in rows] == ["ok"] * 9
+
+    hosts = [source.specs[n].location.host for n in names]
+    assert hosts == [HOSTS[1], HOSTS[2], HOSTS[3]] * 3
+    spec = source.specs["desk-001"]
+    assert spec.snapshot is SNAP and spec.location.pool is POOL
+    assert spec.location.diskMoveType == "createNewChildDiskBacking"
+    assert rows[1]["messages"] == [
+        "VM 'desk-002' linked-cloned from 'gold' @ snapshot 'base' on 'esx2' (CPU: 2)."
+    ]
+    assert max(source.peak.values()) > 1  # submitted in parallel
+
+
+def test_clones_join_the_sources_pool():
+    child = vim.ResourcePool("resgroup-21", _stub)
+    si, source = _si(pool=child)
+    batch_linked_clone(si, "gold", "base", ["desk-1", "desk-2"])
+    assert {s.location.pool for s in source.specs.values()} == {child}
+    assert si.pc.call_count == 3  # no cluster root pool read
+
+
+def test_per_host_cap_and_host_choice():
+    si, source = _si()
+    names = [f"desk-{i:03d}" for i in range(12)]
+    batch_linked_clone(si, "gold", "base", names, hosts=["esx3"], concurrency=12, per_host=2)
+    assert set(source.peak) == {HOSTS[3]}
+    assert source.peak[HOSTS[3]] == 2
+
+
+def test_bad_snapshot_or_host_is_one_error_row():
+    si, source = _si()
+    [row] = batch_linked_clone(si, "gold", "nope", ["a", "b"])
+    assert row["messages"] == ["Snapshot 'nope' not found. Available: base"]
+
+    [row] = batch_linked_clone(si, "gold", "base", ["a"], hosts=["esx4", "esx2"])
+    assert row["status"] == "error" and "esx4" in row["messages"][0]
+    assert source.specs == {}
@@ -0,0 +1,149 @@
+"""Regression — fleet clean slate (``bulk_snapshot.clean_slate_vms``).
+
+Before: resetting a lab meant one ``vm clean-slate`` per VM, each doing a
+name lookup, a power-off wait and a revert wait before the next VM started.
+
+Locked here:
+1. targets, power state, snapshot trees, host and datastores come from the
+   selection pass; a VM without the snapshot is reported and NOT powered off;
+2. running VMs are powered off before the revert, stopped ones are not, and
+   ``power_on`` starts VMs the revert left off;
+3. at most ``per_host`` VMs per host and ``per_datastore`` per datastore are
+   reset at once, while other hosts proceed in parallel;
+4. each row reaches ``on_result`` as its VM finishes; ``vm clean-slate
+   --match`` double-confirms and audits one batch entry.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import fake_task
+from vmware_aiops.ops import bulk_snapshot, fleet
+
+
+class _Tracker:
+    lock = threading.Lock()
+    active: dict = {}
+    peak: dict = {}
+
+    @classmethod
+    def busy(cls, keys):
+        with cls.lock:
+            for k in keys:
+                cls.active[k] = cls.active.get(k, 0) + 1
+                cls.peak[k] = max(cls.peak.get(k, 0), cls.active[k])
+            cls.peak["*"] = max(cls.peak.get("*", 0), len([v for v in cls.active.values() if v]))
+        time.sleep(0.03)
+        with cls.lock:
+            for k in keys:
+                cls.active[k] -= 1
+
+
+class _VM:
+    def __init__(self, name, host, datastores):
+        self.name, self.host, self.datastores = name, host, datastores
+        self.calls = []
+
+    def PowerOff(self):  # noqa: N802 - pyVmomi API
+        self.calls.append("off")
+        return fake_task()
+
+    def PowerOn(self):  # noqa: N802
+        self.calls.append("on")
+        return fake_task()
+
+
+class _Snap:
+    def __init__(self, vm):
+        self.vm = vm
+
+    def RevertToSnapshot_Task(self):  # noqa: N802
+        self.vm.calls.append("revert")
+        _Tracker.busy([self.vm.host, *self.vm.datastores])
+        return fake_task()
+
+
+@pytest.fixture()
+def lab(monkeypatch):
+    layout = {f"lab-{i:02d}": ("esx1", ["ds1"]) for i in range(4)}
+    layout.update({f"lab-{i:02d}": ("esx2", ["ds2"]) for i in range(4, 8)})
+    vms = {name: _VM(name, host, ds) for name, (host, ds) in layout.items()}
+
+    def tree(vm):
+        return [SimpleNamespace(
+            name="baseline", description="", createTime="2026-10-01", state="poweredOff",
+            snapshot=_Snap(vm), childSnapshotList=[],
+        )]
+
+    def fake_collect(si, obj_type, paths, root=None):
+        if obj_type == [vim.Datacenter]:
+            return [("dc1", {"name": "dc1"})]
+        assert {"snapshot.rootSnapshotList", "datastore", "runtime.host"} <= set(paths)
+        return [
+            (vm, {
+                "name": name, "config.template": False, "runtime.host": vm.host,
+                "runtime.powerState": "poweredOff" if name == "lab-01" else "poweredOn",
+                "datastore": vm.datastores,
+                "snapshot.rootSnapshotList": None if name == "lab-07" else tree(vm),
+            })
+            for name, vm in vms.items()
+        ]
+
+    monkeypatch.setattr(fleet, "_collect", fake_collect)
+    _Tracker.active, _Tracker.peak = {}, {}
+    return vms
+
+
+def test_power_off_revert_power_on_and_missing_snapshot(lab):
+    streamed = []
+    rows = bulk_snapshot.clean_slate_vms(
+        object(), vm_names=["lab-00", "lab-01", "lab-07"], power_on=True,
+        on_result=streamed.append,
+    )
+    assert [(r["name"], r["status"]) for r in rows] == [
+        ("lab-00", "ok"), ("lab-01", "ok"), ("lab-07", "error"),
+    ]
+    assert lab["lab-00"].calls == ["off", "revert", "on"]
+    assert lab["lab-01"].calls == ["revert", "on"]
+    assert lab["lab-07"].calls == []  # no snapshot: left running
+    assert rows[0]["message"] == "Powered off, reverted to 'baseline', powered on."
+    assert rows[2]["message"] == "Snapshot 'baseline' not found. Available: none"
+    assert sorted(r["name"] for r in streamed) == ["lab-00", "lab-01", "lab-07"]
+
+
+def test_caps_per_host_and_datastore(lab):
+    rows = bulk_snapshot.clean_slate_vms(
+        object(), pattern="lab-*", concurrency=8, per_host=3, per_datastore=2,
+    )
+    assert sum(r["status"] == "ok" for r in rows) == 7
+    assert _Tracker.peak["esx1"] == 2 and _Tracker.peak["ds1"] == 2  # datastore is tighter
+    assert _Tracker.peak["esx2"] <= 2
+    assert _Tracker.peak["*"] >= 4  # both hosts busy together
+
+    with pytest.raises(ValueError, match="per_host"):
+        bulk_snapshot.clean_slate_vms(object(), pattern="*", per_host=0)
+
+
+def test_cli_bulk_clean_slate(lab, monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import vm as vm_module
+
+    audits = []
+    monkeypatch.setattr(vm_module, "_get_connection", lambda target, config=None: (object(), None))
+    monkeypatch.setattr(vm_module, "_audit", SimpleNamespace(log=lambda **kw: audits.append(kw)))
+
+    result = CliRunner().invoke(
+        app, ["vm", "clean-slate", "--match", "lab-0[67]"], input="y\ny\n",
+    )
+    assert result.exit_code == 0, result.output
+    assert "lab-06: Powered off, reverted to 'baseline'." in result.output  # streamed
+    assert lab["lab-06"].calls == ["off", "revert"]
+    [audit] = audits
+    assert (audit["operation"], audit["result"]) == ("batch_clean_slate", "1/2 OK")
@@ -0,0 +1,247 @@
+"""Regression — bulk power operations (``ops.bulk_power`` over ``ops.fleet``).
+
+Before: powering on 200 VMs was 200 sequential ``power_on_vm`` calls, each a
+full-inventory name lookup, a ``PowerOn`` task and a polled wait; reset and
+suspend had no CLI command at all.
+
+Locked here:
+1. VMs are selected by exact names and/or a glob in one property pass per
+   datacenter; templates never match, missing / ambiguous names are
+   per-VM errors, not exceptions;
+2. power-on is ONE ``PowerOnMultiVM_Task`` per datacenter (DRS override set),
+   with per-VM results taken from its attempted / notAttempted lists and a
+   per-VM ``PowerOn`` fallback where the call is unsupported;
+3. forced off / reset / suspend run concurrently, never above the cap, and
+   VMs already in the wanted state are ``skipped``; any error on one VM —
+   not only a vSphere fault — is that VM's row, never the batch's;
+4. graceful off requests every shutdown, then waits for all VMs together and
+   (opt-in) escalates the ones still running or without Tools to PowerOff;
+5. ``vm reset --match`` double-confirms, prints per-VM results and audits.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim, vmodl
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import fake_ref, fake_task
+from vmware_aiops.ops import bulk_power, fleet
+
+ON, OFF = "poweredOn", "poweredOff"
+
+
+class _VM:
+    """VM double behind a real moref, so shutdowns are awaited through a collector."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, name, state=OFF, tools=True, stops=True):
+        self.name = name
+        self.calls = []
+        self.runtime = SimpleNamespace(powerState=state)
+        self.tools = tools
+        self.stops = stops
+
+    def _task(self, op):
+        self.calls.append(op)
+        with _VM.lock:
+            _VM.active += 1
+            _VM.peak = max(_VM.peak, _VM.active)
+        time.sleep(0.05)
+        with _VM.lock:
+            _VM.active -= 1
+        return fake_task()
+
+    def PowerOn(self, host=None):  # noqa: N802 - pyVmomi API
+        self.calls.append("PowerOn")
+        return fake_task()
+
+    def PowerOff(self):  # noqa: N802
+        return self._task("PowerOff")
+
+    def ShutdownGuest(self):  # noqa: N802
+        self.calls.append("ShutdownGuest")
+        if not self.tools:
+            raise vim.fault.ToolsUnavailable()
+        if self.stops:
+            self.runtime.powerState = OFF
+
+    def Reset(self):  # noqa: N802
+        return self._task("Reset")
+
+    def Suspend(self):  # noqa: N802
+        return self._task("Suspend")
+
+
+class _DC:
+    def __init__(self, name, unsupported=False, declined=()):
+        self.name = name
+        self.unsupported = unsupported
+        self.declined = set(declined)
+        self.multi = []
+
+    def PowerOnMultiVM_Task(self, vm, option):  # noqa: N802
+        if self.unsupported:
+            raise vmodl.fault.NotSupported()
+        self.multi.append(([v.name for v in vm], option))
+        return fake_task(SimpleNamespace(
+            attempted=[
+                SimpleNamespace(vm=v, task=fake_task()) for v in vm if v.name not in self.declined
+            ],
+            notAttempted=[
+                SimpleNamespace(vm=v, fault=SimpleNamespace(msg="Insufficient resources"))
+                for v in vm if v.name in self.declined
+            ],
+        ))
+
+
+@pytest.fixture()
+def inventory(monkeypatch):
+    dc1 = _DC("dc1", declined={"web-03"})
+    dc2 = _DC("dc2", unsupported=True)
+    rows = {
+        dc1: [("web-01", OFF, False), ("web-02", ON, False), ("web-03", OFF, False),
+              ("web-tmpl", OFF, True), ("db-01", ON, False), ("dup", OFF, False)],
+        dc2: [("web-04", OFF, False), ("dup", OFF, False), ("db-02", ON, False),
+              ("db-03", ON, False)],
+    }
+    vms = {}
+    collected = []
+
+    def fake_collect(si, obj_type, paths, root=None):
+        collected.append((obj_type[0], root))
+        if obj_type == [vim.Datacenter]:
+            return [(dc, {"name": dc.name}) for dc in rows]
+        out = []
+        for name, state, template in rows[root]:
+            vm = vms.setdefault((root.name, name), _VM(name, state))
+            out.append((fake_ref(vim.VirtualMachine, vm), {
+                "name": name, "runtime.powerState": state, "config.template": template,
+            }))
+        return out
+
+    monkeypatch.setattr(fleet, "_collect", fake_collect)
+    _VM.active = _VM.peak = 0
+    return SimpleNamespace(dc1=dc1, dc2=dc2, vms=vms, collected=collected)
+
+
+def test_selection_by_names_and_pattern(inventory):
+    targets, errors = fleet.select_vms(
+        object(), ["db-01", "web-01", "nope", "web-tmpl", "dup"], pattern="web-*",
+    )
+    assert [t.name for t in targets] == ["db-01", "web-01", "web-02", "web-03", "web-04"]
+    assert {e["name"]: e["message"].split()[0] for e in errors} == {
+        "nope": "VM", "web-tmpl": "Is", "dup": "2",
+    }
+    # One VM pass per datacenter, no per-name lookups.
+    assert [t for t, _ in inventory.collected].count(vim.VirtualMachine) == 2
+    with pytest.raises(ValueError, match="pattern"):
+        fleet.select_vms(object())
+
+
+def test_power_on_uses_one_multi_vm_task_per_datacenter(inventory):
+    rows = bulk_power.power_vms(object(), "on", pattern="web-*")
+    by_name = {r["name"]: r for r in rows}
+
+    [(names, option)] = inventory.dc1.multi
+    assert names == ["web-01", "web-03"]
+    assert (option[0].key, option[0].value) == ("OverrideAutomationLevel", True)
+    assert by_name["web-01"]["status"] == "ok"
+    assert by_name["web-02"]["status"] == "skipped"
+    assert (by_name["web-03"]["status"], by_name["web-03"]["message"]) == (
+        "error", "Insufficient resources",
+    )
+    # dc2 has no multi-VM power-on: per-VM PowerOn fallback.
+    assert by_name["web-04"]["status"] == "ok"
+    assert inventory.vms[("dc2", "web-04")].calls == ["PowerOn"]
+    assert inventory.vms[("dc1", "web-01")].calls == []
+
+
+def test_fan_out_respects_concurrency_cap(inventory):
+    rows = bulk_power.power_vms(
+        object(), "off", vm_names=["web-01", "web-02", "db-01", "web-04"],
+        force=True, concurrency=2,
+    )
+    assert [r["status"] for r in rows] == ["skipped", "ok", "ok", "skipped"]
+
+    _VM.peak = 0
+    rows = bulk_power.power_vms(object(), "reset", pattern="*", concurrency=2)
+    statuses = {r["name"]: r["status"] for r in rows}
+    assert [n for n, s in statuses.items() if s == "ok"] == ["db-01", "db-02", "db-03", "web-02"]
+    assert statuses["web-01"] == "skipped"  # powered off: nothing to reset
+    assert _VM.peak == 2
+
+    with pytest.raises(ValueError, match="concurrency"):
+        bulk_power.power_vms(object(), "suspend", pattern="*", concurrency=0)
+    with pytest.raises(ValueError, match="Unknown power action"):
+        bulk_power.power_vms(object(), "reboot", pattern="*")
+
+
+def test_non_vsphere_error_is_one_vms_row(inventory, monkeypatch):
+    reset = _VM.Reset
+
+    def flaky(self):
+        if self.name == "db-02":
+            raise ConnectionResetError("connection reset by peer")
+        return reset(self)
+
+    monkeypatch.setattr(_VM, "Reset", flaky)
+    rows = bulk_power.power_vms(object(), "reset", pattern="db-*")
+    assert {r["name"]: (r["status"], r["message"]) for r in rows} == {
+        "db-01": ("ok", "Reset."), "db-02": ("error", "connection reset by peer"),
+        "db-03": ("ok", "Reset."),
+    }
+
+
+def test_graceful_off_waits_together_and_escalates(inventory):
+    vms = inventory.vms
+    for name in ("web-02", "db-01", "db-02", "db-03"):
+        dc = "dc1" if name in ("web-02", "db-01") else "dc2"
+        vms[(dc, name)] = _VM(name, ON)
+    vms[("dc2", "db-02")].stops = False
+    vms[("dc2", "db-03")].tools = False
+
+    rows = bulk_power.power_vms(object(), "off", pattern="db-*", shutdown_timeout=0)
+    assert {r["name"]: r["status"] for r in rows} == {
+        "db-01": "ok", "db-02": "running", "db-03": "error",
+    }
+    assert "force" in rows[2]["message"]
+    assert vms[("dc2", "db-02")].calls == ["ShutdownGuest"]  # no escalation asked
+
+    rows = bulk_power.power_vms(
+        object(), "off", vm_names=["web-02", "db-02", "db-03"], shutdown_timeout=0, escalate=True,
+    )
+    assert [(r["name"], r["status"]) for r in rows] == [
+        ("web-02", "ok"), ("db-02", "ok"), ("db-03", "ok"),
+    ]
+    assert rows[0]["message"] == "Gracefully shut down."
+    assert "within 0s" in rows[1]["message"]
+    assert "Tools not running" in rows[2]["message"]
+    assert vms[("dc2", "db-02")].calls[-1] == "PowerOff"
+    assert vms[("dc1", "web-02")].calls == ["ShutdownGuest"]
+
+
+def test_cli_bulk_reset(inventory, monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import vm as vm_module
+
+    audits = []
+    monkeypatch.setattr(vm_module, "_get_connection", lambda target, config=None: (object(), None))
+    monkeypatch.setattr(vm_module, "_audit", SimpleNamespace(log=lambda **kw: audits.append(kw)))
+
+    result = CliRunner().invoke(app, ["vm", "reset", "--match", "db-*"], input="y\ny\n")
+    assert result.exit_code == 0, result.output
+    assert "db-03" in result.output
+    assert inventory.vms[("dc1", "db-01")].calls == ["Reset"]
+    [audit] = audits
+    assert (audit["operation"], audit["result"]) == ("batch_power_reset", "3/3 OK")
+
+    result = CliRunner().invoke(app, ["vm", "reset"])
+    assert result.exit_code == 2
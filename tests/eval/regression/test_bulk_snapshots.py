@@ -0,0 +1,189 @@
+"""Regression — snapshot tree index and bulk snapshot operations.
+
+Before: ``revert_to_snapshot`` / ``delete_snapshot`` (and ``linked_clone``,
+``clean_slate``) found a snapshot by calling ``list_snapshots``, which walked
+``vm.snapshot`` lazily — a round-trip per tree level — and a pre-change
+snapshot of 300 VMs was 300 sequential ``vm snapshot-create`` runs.
+
+Locked here:
+1. a VM's whole snapshot tree is ONE ``RetrievePropertiesEx`` read
+   (``snapshot.rootSnapshotList``), indexed depth-first with levels; nested
+   snapshots are found by name and a miss lists what is available;
+2. ``clean_slate`` reads power state and tree together and does not power a
+   VM off when the snapshot it would revert to does not exist;
+3. bulk create / revert / delete take each VM's tree from the selection pass,
+   skip existing snapshots on create, report missing ones per VM, and never
+   run more than ``per_datastore`` tasks on one datastore while other
+   datastores proceed in parallel;
+4. ``vm snapshot-delete --match`` double-confirms, prints per-VM results and
+   audits one batch entry.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops import bulk_snapshot, fleet, vm_lifecycle
+
+
+class _Snap:
+    """``vim.vm.Snapshot`` double recording the calls made on it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def RevertToSnapshot_Task(self):  # noqa: N802 - pyVmomi API
+        self.calls.append("revert")
+        return fake_task()
+
+    def RemoveSnapshot_Task(self, removeChildren):  # noqa: N802, N803
+        self.calls.append(("remove", removeChildren))
+        return fake_task()
+
+
+def _node(name, *children):
+    return SimpleNamespace(
+        name=name, description=f"{name} desc", createTime="2026-10-01", state="poweredOff",
+        snapshot=_Snap(), childSnapshotList=list(children),
+    )
+
+
+def _si(tree, power="poweredOff"):
+    stub = _CountingStub()
+    vm = vim.VirtualMachine("vm-1", stub)
+    si = make_si({vim.VirtualMachine: [(vm, {
+        "name": "web-01", "runtime.powerState": power, "snapshot.rootSnapshotList": tree,
+    })]})
+    return stub, si
+
+
+def test_tree_is_one_read_and_indexed_depth_first():
+    tree = [_node("base", _node("patch-1", _node("patch-2")), _node("alt")), _node("other")]
+    stub, si = _si(tree)
+
+    snaps = vm_lifecycle.list_snapshots(si, "web-01")
+    assert [(s["name"], s["level"]) for s in snaps] == [
+        ("base", 0), ("patch-1", 1), ("patch-2", 2), ("alt", 1), ("other", 0),
+    ]
+    assert si.pc.call_count == 2  # name lookup + the whole tree
+
+    out = vm_lifecycle.revert_to_snapshot(si, "web-01", "patch-2")
+    assert "reverted" in out
+    assert tree[0].childSnapshotList[0].childSnapshotList[0].snapshot.calls == ["revert"]
+
+    out = vm_lifecycle.delete_snapshot(si, "web-01", "gone")
+    assert out == "Snapshot 'gone' not found. Available: base, patch-1, patch-2, alt, other"
+    assert stub.calls == 0
+
+
+def test_clean_slate_checks_snapshot_before_power_off():
+    stub, si = _si([_node("base")], power="poweredOn")
+    out = vm_lifecycle.clean_slate(si, "web-01", "baseline")
+    assert out == "Clean Slate: Snapshot 'baseline' not found. Available: base"
+    assert si.pc.call_count == 2
+    assert stub.calls == 0  # no PowerOff issued
+
+
+class _VM:
+    lock = threading.Lock()
+    active: dict = {}
+    peak: dict = {}
+
+    def __init__(self, name, datastores):
+        self.name = name
+        self.datastores = datastores
+        self.created = []
+
+    def CreateSnapshot_Task(self, name, description, memory, quiesce):  # noqa: N802
+        self.created.append((name, memory, quiesce))
+        with _VM.lock:
+            for ds in self.datastores:
+                _VM.active[ds] = _VM.active.get(ds, 0) + 1
+                _VM.peak[ds] = max(_VM.peak.get(ds, 0), _VM.active[ds])
+            _VM.peak["*"] = max(_VM.peak.get("*", 0), sum(_VM.active.values()))
+        time.sleep(0.05)
+        with _VM.lock:
+            for ds in self.datastores:
+                _VM.active[ds] -= 1
+        return fake_task()
+
+
+@pytest.fixture()
+def fleet_vms(monkeypatch):
+    layout = {f"app-{i:02d}": ["ds1"] for i in range(6)}
+    layout.update({"db-01": ["ds2"], "db-02": ["ds2", "ds1"], "db-03": ["ds2"]})
+    vms = {name: _VM(name, ds) for name, ds in layout.items()}
+    trees = {"app-00": [_node("pre-patch")], "db-01": [_node("base", _node("pre-patch"))]}
+
+    def fake_collect(si, obj_type, paths, root=None):
+        if obj_type == [vim.Datacenter]:
+            return [("dc1", {"name": "dc1"})]
+        assert {"snapshot.rootSnapshotList", "datastore"} <= set(paths)
+        return [
+            (vm, {"name": name, "runtime.powerState": "poweredOn", "config.template": False,
+                  "datastore": vm.datastores, "snapshot.rootSnapshotList": trees.get(name)})
+            for name, vm in vms.items()
+        ]
+
+    monkeypatch.setattr(fleet, "_collect", fake_collect)
+    _VM.active, _VM.peak = {}, {}
+    return SimpleNamespace(vms=vms, trees=trees)
+
+
+def test_bulk_create_caps_tasks_per_datastore(fleet_vms):
+    rows = bulk_snapshot.snapshot_vms(
+        object(), "create", "pre-patch", vm_names=["nope"], pattern="*", per_datastore=2,
+    )
+    status = {r["name"]: r["status"] for r in rows}
+    assert (status.pop("app-00"), status.pop("db-01")) == ("skipped", "skipped")  # nested too
+    assert status.pop("nope") == "error"
+    assert set(status.values()) == {"ok"}
+    assert fleet_vms.vms["app-01"].created == [("pre-patch", False, False)]
+    assert _VM.peak["ds1"] == 2
+    assert _VM.peak["ds2"] <= 2
+    assert _VM.peak["*"] >= 3  # ds2 work ran alongside ds1's two slots
+
+    with pytest.raises(ValueError, match="per_datastore"):
+        bulk_snapshot.snapshot_vms(object(), "create", "x", pattern="*", per_datastore=0)
+    with pytest.raises(ValueError, match="Unknown snapshot action"):
+        bulk_snapshot.snapshot_vms(object(), "rename", "x", pattern="*")
+
+
+def test_bulk_revert_and_delete_use_indexed_trees(fleet_vms):
+    rows = bulk_snapshot.snapshot_vms(object(), "revert", "pre-patch", vm_names=["db-01", "app-01"])
+    assert [(r["name"], r["status"]) for r in rows] == [("db-01", "ok"), ("app-01", "error")]
+    assert rows[1]["message"] == "Snapshot 'pre-patch' not found. Available: none"
+    nested = fleet_vms.trees["db-01"][0].childSnapshotList[0].snapshot
+    assert nested.calls == ["revert"]
+
+    rows = bulk_snapshot.snapshot_vms(
+        object(), "delete", "pre-patch", vm_names=["db-01"], remove_children=True,
+    )
+    assert rows[0]["status"] == "ok"
+    assert nested.calls[-1] == ("remove", True)
+
+
+def test_cli_bulk_snapshot_delete(fleet_vms, monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import vm as vm_module
+
+    audits = []
+    monkeypatch.setattr(vm_module, "_get_connection", lambda target, config=None: (object(), None))
+    monkeypatch.setattr(vm_module, "_audit", SimpleNamespace(log=lambda **kw: audits.append(kw)))
+
+    result = CliRunner().invoke(
+        app, ["vm", "snapshot-delete", "--match", "*-0[01]", "--name", "pre-patch"],
+        input="y\ny\n",
+    )
+    assert result.exit_code == 0, result.output
+    assert "app-01" in result.output
+    assert fleet_vms.trees["app-00"][0].snapshot.calls == [("remove", False)]
+    [audit] = audits
+    assert (audit["operation"], audit["result"]) == ("batch_snapshot_delete", "2/3 OK")
@@ -0,0 +1,138 @@
+"""Regression — CPU/memory and power-on folded into the clone task.
+
+Before: every deploy path cloned with ``powerOn=False`` and no ``config``,
+then ran ``ReconfigVM_Task`` for CPU/memory and ``PowerOn`` as separate
+tasks — each after another name lookup — so one provisioned VM was up to
+four tasks to submit and wait on.
+
+Locked here:
+1. ``batch_clone``, ``linked_clone``, ``deploy_from_template`` and
+   ``batch_deploy``'s full-clone mode send CPU/memory as ``CloneSpec.config``
+   and power-on as ``CloneSpec.powerOn``: one task per VM;
+2. with a baseline snapshot the clone stays off, the snapshot is taken on the
+   clone task's result and power-on follows it (the snapshot must capture a
+   powered-off VM);
+3. nothing after the clone looks the new VM up by name.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import fake_task
+from vmware_aiops.ops import clone_pipeline, vm_deploy, vm_lifecycle
+
+
+class _VM:
+    """Clone source (or the clone it returns); records every task."""
+
+    def __init__(self, name, template=False):
+        self.name = name
+        self.parent = "folder"
+        self.config = SimpleNamespace(template=template)
+        self.calls: list = []
+        self.clone = None
+
+    def Clone(self, folder, name, spec):  # noqa: N802 - pyVmomi API
+        self.calls.append(("clone", spec))
+        self.clone = _VM(name)
+        return fake_task(self.clone)
+
+    def ReconfigVM_Task(self, spec):  # noqa: N802
+        self.calls.append(("reconfig",))
+        return fake_task()
+
+    def CreateSnapshot_Task(self, name, description, memory, quiesce):  # noqa: N802
+        self.calls.append(("snapshot", name))
+        return fake_task()
+
+    def PowerOn(self):  # noqa: N802
+        self.calls.append(("on",))
+        return fake_task()
+
+
+@pytest.fixture()
+def no_lookups(monkeypatch):
+    """Only the source may be looked up by name."""
+    sources = {"gold": _VM("gold"), "tpl": _VM("tpl", template=True)}
+
+    def find(si, name):
+        return sources[name]
+
+    monkeypatch.setattr(vm_deploy, "_require_vm", find)
+    monkeypatch.setattr(vm_lifecycle, "_require_vm", find)
+    monkeypatch.setattr(
+        vm_lifecycle, "snapshot_index",
+        lambda si, vm: SimpleNamespace(find=lambda n: SimpleNamespace(snapshot=None)),
+    )
+    return sources
+
+
+def _spec(vm):
+    [(step, spec)] = [c for c in vm.calls if c[0] == "clone"]
+    return spec
+
+
+def test_clone_spec_carries_config_and_power_on():
+    spec = clone_pipeline.clone_spec(vim.vm.RelocateSpec(), cpu=4, power_on=True)
+    assert (spec.config.numCPUs, spec.config.memoryMB, spec.powerOn) == (4, None, True)
+    assert clone_pipeline.describe_spec(spec) == " (CPU: 4, powered on)"
+    assert clone_pipeline.clone_spec(vim.vm.RelocateSpec()).config is None
+
+
+def test_linked_clone_is_onefake_task(no_lookups):
+    msg = vm_deploy.linked_clone(
+        object(), "gold", "desk-01", "base", cpu=2, memory_mb=4096, power_on=True,
+    )
+    gold = no_lookups["gold"]
+    spec = _spec(gold)
+    assert (spec.config.numCPUs, spec.config.memoryMB, spec.powerOn) == (2, 4096, True)
+    assert gold.clone.calls == []  # no reconfigure, no separate power-on
+    assert msg.endswith("(CPU: 2, Memory: 4096MB, powered on).")
+
+
+def test_template_snapshot_comes_before_power_on(no_lookups):
+    msg = vm_deploy.deploy_from_template(
+        object(), "tpl", "web-01", memory_mb=8192, power_on=True, snapshot_name="baseline",
+    )
+    tpl = no_lookups["tpl"]
+    assert _spec(tpl).powerOn is False
+    assert _spec(tpl).config.memoryMB == 8192
+    assert tpl.clone.calls == [("snapshot", "baseline"), ("on",)]
+    assert msg.split(" | ")[1:] == [
+        "Snapshot 'baseline' created for VM 'web-01'.", "VM 'web-01' powered on successfully.",
+    ]
+
+
+def test_batch_deploy_full_clone_is_onefake_task(no_lookups, tmp_path):
+    spec_path = tmp_path / "deploy.yaml"
+    spec_path.write_text(
+        "source: gold\n"
+        "defaults: {cpu: 4, memory_mb: 8192, power_on: true}\n"
+        "vms: [{name: app-01}]\n",
+        encoding="utf-8",
+    )
+    [result] = vm_deploy.batch_deploy(object(), str(spec_path), preflight=False)
+    gold = no_lookups["gold"]
+    spec = _spec(gold)
+    assert (spec.config.numCPUs, spec.config.memoryMB, spec.powerOn) == (4, 8192, True)
+    assert gold.clone.calls == []
+    assert result["status"] == "ok"
+    assert result["messages"] == [
+        "VM 'gold' cloned as 'app-01' (inherited from source); "
+        "CPU: 4, Memory: 8192MB, powered on."
+    ]
+
+
+def test_batch_clone_is_one_task_per_vm():
+    gold = _VM("gold")
+    source = clone_pipeline.CloneSource("gold", gold, "folder", None, ())
+    [row] = clone_pipeline.run_clones(
+        source, clone_pipeline.clone_jobs(["app-02"]), cpu=2, power_on=True,
+    )
+    assert _spec(gold).powerOn is True and _spec(gold).config.numCPUs == 2
+    assert gold.clone.calls == []
+    assert row["messages"] == ["VM 'app-02' cloned from 'gold' (CPU: 2, powered on)."]
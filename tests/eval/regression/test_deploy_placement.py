@@ -0,0 +1,193 @@
+"""Regression — capacity-aware placement for ``batch_deploy`` (``ops.placement``).
+
+Before: ``batch_deploy`` put every VM wherever its source or template lived,
+or on the spec's one ``datastore``, with no look at free memory or space — a
+large batch overfilled one host and one datastore.
+
+Locked here:
+1. one capacity snapshot costs three PropertyCollector calls and leaves out
+   hosts in maintenance and inaccessible datastores;
+2. ``spread`` alternates between equally free hosts and takes the freest
+   datastore; ``pack`` fills one host before the next; each placement is
+   charged against the snapshot, keeping the headroom free;
+3. a linked clone only goes to hosts that mount its source's datastores;
+4. ``batch_deploy`` with a ``placement:`` block pins clones to the planned
+   host and datastore and records it in each result; without the preflight,
+   a VM that fits nowhere is an error row that does not stop the rest;
+5. placed linked clones go straight to the planned host's moref, in the
+   source's resource pool, from the source and snapshot read once per batch.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops import placement, vm_deploy
+
+_stub = _CountingStub()
+CLUSTER = vim.ClusterComputeResource("domain-c7", _stub)
+DS = {n: vim.Datastore(f"datastore-{n}", _stub) for n in (1, 2, 3)}
+HOSTS = {n: vim.HostSystem(f"host-{n}", _stub) for n in (1, 2, 3)}
+_GB = 1024**3
+
+
+def _host(name, ds, maint=False):
+    return {
+        "name": name, "parent": CLUSTER, "runtime.connectionState": "connected",
+        "runtime.inMaintenanceMode": maint, "summary.hardware.cpuMhz": 2000,
+        "summary.hardware.numCpuCores": 16, "summary.hardware.memorySize": 64 * _GB,
+        "summary.quickStats.overallCpuUsage": 4000,
+        "summary.quickStats.overallMemoryUsage": 10000, "datastore": list(ds),
+    }
+
+
+def _ds(name, free_gb, accessible=True):
+    return {
+        "name": name, "summary.capacity": 1000 * _GB, "summary.freeSpace": free_gb * _GB,
+        "summary.accessible": accessible, "summary.maintenanceMode": "normal",
+    }
+
+
+def _si(extra=None):
+    return make_si({
+        vim.ComputeResource: [(CLUSTER, {"name": "prod"})],
+        vim.Datastore: [
+            (DS[1], _ds("ds1", 500)), (DS[2], _ds("ds2", 200)),
+            (DS[3], _ds("ds3", 900, accessible=False)),
+        ],
+        vim.HostSystem: [
+            (HOSTS[1], _host("esx1", [DS[1], DS[2], DS[3]])),
+            (HOSTS[2], _host("esx2", [DS[2]])),
+            (HOSTS[3], _host("esx3", [DS[1]], maint=True)),
+        ],
+        **(extra or {}),
+    })
+
+
+def _demands(n, memory_mb=12288, disk_gb=40):
+    return [placement.Demand(f"vm-{i}", memory_mb, disk_gb) for i in range(1, n + 1)]
+
+
+def test_snapshot_is_three_calls_and_skips_unusable():
+    si = _si()
+    snap = placement.take_snapshot(si)
+    assert si.pc.call_count == 3
+    assert [h.name for h in snap.hosts] == ["esx1", "esx2"]
+    assert {d.name for d in snap.datastores.values()} == {"ds1", "ds2"}
+    esx1 = snap.hosts[0]
+    assert esx1.cluster == "prod" and esx1.datastores == {DS[1], DS[2]}
+    assert esx1.memory_mb == pytest.approx(65536 * 0.9 - 10000)
+
+
+def test_spread_and_pack():
+    placed, errors = placement.plan_placement(placement.take_snapshot(_si()), _demands(4))
+    assert errors == []
+    assert [(p.host, p.datastore) for p in placed.values()] == [
+        ("esx1", "ds1"), ("esx2", "ds2"), ("esx1", "ds1"), ("esx2", "ds2"),
+    ]
+
+    snap = placement.take_snapshot(_si())
+    placed, errors = placement.plan_placement(snap, _demands(4, disk_gb=20), strategy="pack")
+    assert [placed[f"vm-{i}"].host for i in range(1, 5)] == ["esx1"] * 3 + ["esx2"]
+    assert {p.datastore for p in placed.values()} == {"ds2"}  # the fullest that fits
+    assert snap.hosts[0].memory_mb < 12288  # full, headroom kept
+    ds2 = next(d for d in snap.datastores.values() if d.name == "ds2")
+    assert ds2.free_gb == pytest.approx(200 - 100 - 20 * 4)
+    [error] = placement.plan_placement(snap, _demands(1, memory_mb=4096, disk_gb=500))[1]
+    assert "no datastore mounted by a host with room has 500 GB" in error["messages"][0]
+
+    with pytest.raises(ValueError, match="nope"):
+        placement.plan_placement(snap, _demands(1), hosts=["nope"])
+
+
+def test_linked_clone_needs_the_source_mounts():
+    snap = placement.take_snapshot(_si())
+    demands = [
+        placement.Demand(f"desk-{i}", 4096, mounts=(DS[1],), place_datastore=False)
+        for i in range(3)
+    ]
+    placed, _ = placement.plan_placement(snap, demands)
+    assert {p.host for p in placed.values()} == {"esx1"}
+    assert {p.datastore for p in placed.values()} == {None}
+
+
+def test_batch_deploy_places_clones_and_reports_unplaced(monkeypatch, tmp_path):
+    gold = vim.VirtualMachine("vm-10", _stub)
+    si = _si({vim.VirtualMachine: [(gold, {
+        "name": "gold", "parent": vim.Folder("group-v3", _stub), "runtime.host": HOSTS[1],
+        "datastore": [DS[1]], "summary.storage.committed": 30 * _GB,
+    })]})
+    clones = {}
+
+    def clone_vm(si, source, name, **kwargs):
+        clones[name] = kwargs
+        return f"VM '{source}' cloned as '{name}'."
+
+    monkeypatch.setattr(vm_deploy, "clone_vm", clone_vm)
+    spec_path = tmp_path / "deploy.yaml"
+    spec_path.write_text(
+        "source: gold\n"
+        "placement: {strategy: spread}\n"
+        "defaults: {memory_mb: 12288}\n"
+        "vms: [{name: app-01}, {name: huge, memory_mb: 131072}, {name: app-02}]\n",
+        encoding="utf-8",
+    )
+    results = vm_deploy.batch_deploy(si, str(spec_path), preflight=False)
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[0]["placement"] == {"host": "esx1", "cluster": "prod", "datastore": "ds1"}
+    assert results[2]["placement"]["host"] == "esx2"
+    assert "no host has 131072 MB memory free" in results[1]["messages"][0]
+    assert clones["app-02"]["target_host"] == "esx2"
+    assert clones["app-02"]["target_datastore"] == "ds2"
+    assert "huge" not in clones
+
+
+class _SourceStub:
+    def __init__(self):
+        self.specs = {}
+
+    def InvokeMethod(self, mo, info, args):  # noqa: N802 - pyVmomi contract
+        folder, name, spec = args
+        assert info.name == "Clone"
+        self.specs[name] = spec
+        return fake_task(object())
+
+
+@pytest.mark.parametrize("n", [2, 8])
+def test_batch_deploy_places_linked_clones_on_host_morefs(tmp_path, n):
+    source = _SourceStub()
+    pool = vim.ResourcePool("resgroup-21", _stub)
+    snap = vim.vm.Snapshot("snapshot-41", _stub)
+    tree = [SimpleNamespace(
+        name="base", description="", createTime="2026-10-01", state="poweredOff",
+        snapshot=snap, childSnapshotList=[],
+    )]
+    si = _si({vim.VirtualMachine: [(vim.VirtualMachine("vm-10", source), {
+        "name": "gold", "parent": vim.Folder("group-v3", _stub), "runtime.host": HOSTS[1],
+        "datastore": [DS[2]], "snapshot.rootSnapshotList": tree, "resourcePool": pool,
+    })]})
+    spec_path = tmp_path / "deploy.yaml"
+    vms = "".join(f"  - {{name: desk-{i}}}\n" for i in range(n))
+    spec_path.write_text(
+        "linked_clone: {source: gold, snapshot: base}\n"
+        f"placement: {{strategy: spread}}\ndefaults: {{memory_mb: 4096}}\nvms:\n{vms}",
+        encoding="utf-8",
+    )
+    results = vm_deploy.batch_deploy(si, str(spec_path), preflight=False)
+    assert [r["status"] for r in results] == ["ok"] * n
+    # VM names, the source, the capacity snapshot (3) — no per-VM lookups
+    assert si.pc.call_count == 5
+    by_ref = {HOSTS[1]: "esx1", HOSTS[2]: "esx2"}
+    for r in results:
+        location = source.specs[r["name"]].location
+        assert by_ref[location.host] == r["placement"]["host"]
+        assert location.pool is pool
+        assert source.specs[r["name"]].snapshot is snap
+    assert results[0]["messages"] == [
+        f"VM 'desk-0' linked-cloned from 'gold' @ snapshot 'base' "
+        f"on '{results[0]['placement']['host']}' (CPU: 2, Memory: 4096MB)."
+    ]
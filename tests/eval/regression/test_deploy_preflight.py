@@ -0,0 +1,151 @@
+"""Regression — ``batch_deploy`` checks the whole spec before the first task.
+
+Before: a missing template, datastore, network or ISO — or a VM name already
+taken — surfaced only when ``batch_deploy`` reached the VM that used it, so a
+bad entry near the end of a large spec left the VMs before it built.
+
+Locked here:
+1. every problem in the spec is reported in one result — per VM where it
+   belongs to one VM, as its own row where it belongs to the batch (source,
+   aggregate capacity) — and nothing is deployed; clean VMs are ``skipped``;
+2. ISOs are checked with one datastore search per folder;
+3. the check costs the same PropertyCollector calls for 3 VMs or 60;
+4. a template that is not a template, a linked clone's missing snapshot and
+   a stopped instant-clone parent are each a source row.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops import deploy_preflight, vm_deploy
+
+_stub = _CountingStub()
+CLUSTER = vim.ClusterComputeResource("domain-c7", _stub)
+DS = {n: vim.Datastore(f"datastore-{n}", _stub) for n in (1, 2, 3)}
+HOSTS = {n: vim.HostSystem(f"host-{n}", _stub) for n in (1, 2)}
+_GB = 1024**3
+
+
+class _Browser:
+    """``HostDatastoreBrowser`` double: a folder listing per datastore path."""
+
+    def __init__(self, listing):
+        self.listing = listing
+        self.searches = []
+
+    def SearchDatastore_Task(self, datastorePath, searchSpec):  # noqa: N802, N803
+        self.searches.append((datastorePath, list(searchSpec.matchPattern)))
+        files = [
+            SimpleNamespace(path=f) for f in self.listing.get(datastorePath, [])
+            if f in searchSpec.matchPattern
+        ]
+        return fake_task(SimpleNamespace(file=files))
+
+
+def _ds(name, free_gb, browser=None, accessible=True):
+    return {
+        "name": name, "summary.capacity": 1000 * _GB, "summary.freeSpace": free_gb * _GB,
+        "summary.accessible": accessible, "summary.maintenanceMode": "normal",
+        "browser": browser,
+    }
+
+
+def _host(name):
+    return {
+        "name": name, "parent": CLUSTER, "runtime.connectionState": "connected",
+        "runtime.inMaintenanceMode": False, "summary.hardware.cpuMhz": 2000,
+        "summary.hardware.numCpuCores": 16, "summary.hardware.memorySize": 64 * _GB,
+        "summary.quickStats.overallCpuUsage": 4000,
+        "summary.quickStats.overallMemoryUsage": 10000, "datastore": [DS[1], DS[2]],
+    }
+
+
+def _si(vms=(), browser=None):
+    return make_si({
+        vim.VirtualMachine: list(vms),
+        vim.ComputeResource: [(CLUSTER, {"name": "prod"})],
+        vim.Datastore: [
+            (DS[1], _ds("ds1", 500, browser)), (DS[2], _ds("ds2", 200)),
+            (DS[3], _ds("ds3", 900, accessible=False)),
+        ],
+        vim.HostSystem: [(HOSTS[1], _host("esx1")), (HOSTS[2], _host("esx2"))],
+        vim.Network: [(vim.Network("network-1", _stub), {"name": "VM Network"})],
+    })
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "deploy.yaml"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_every_problem_at_once_and_nothing_deployed(monkeypatch, tmp_path):
+    browser = _Browser({"[ds1] iso": ["ubuntu.iso"]})
+    taken = vim.VirtualMachine("vm-9", _stub)
+    si = _si([(taken, {"name": "web-01"})], browser)
+    monkeypatch.setattr(vm_deploy, "create_vm", pytest.fail)
+    spec = _write(tmp_path, (
+        "defaults: {datastore: ds1, memory_mb: 20480}\n"
+        "vms:\n"
+        "  - {name: web-01}\n"
+        "  - {name: web-02, datastore: nope}\n"
+        "  - {name: web-03, datastore: ds3}\n"
+        "  - {name: web-04, network: Prod-VLAN}\n"
+        "  - {name: web-05, iso: '[ds1] iso/rhel.iso'}\n"
+        "  - {name: web-06, iso: '[ds1] iso/ubuntu.iso'}\n"
+    ))
+    streamed = []
+    results = vm_deploy.batch_deploy(si, spec, on_result=streamed.append)
+    assert streamed == results
+    assert results[0]["name"] == "hosts"
+    assert "needs 122880 MB of memory" in results[0]["messages"][0]
+    by_name = {r["name"]: r for r in results[1:]}
+    assert list(by_name) == [f"web-0{i}" for i in range(1, 7)]
+    assert by_name["web-01"]["messages"] == ["A VM or template named 'web-01' already exists."]
+    assert by_name["web-02"]["messages"] == ["Datastore 'nope' not found."]
+    assert "inaccessible or in maintenance mode" in by_name["web-03"]["messages"][0]
+    assert by_name["web-04"]["messages"] == ["Network 'Prod-VLAN' not found."]
+    assert by_name["web-05"]["messages"] == ["ISO '[ds1] iso/rhel.iso' not found."]
+    assert by_name["web-06"] == {
+        "name": "web-06", "status": "skipped",
+        "messages": ["Not deployed: preflight found 6 problem(s); nothing was started."],
+    }
+    assert browser.searches == [("[ds1] iso", ["rhel.iso", "ubuntu.iso"])]
+
+
+@pytest.mark.parametrize("n", [3, 60])
+def test_reads_do_not_grow_with_the_batch(tmp_path, n):
+    gold = vim.VirtualMachine("vm-10", _stub)
+    si = _si([(gold, {
+        "name": "gold", "config.template": True, "datastore": [DS[1]],
+        "summary.storage.committed": 2 * _GB,
+    })])
+    vms = "".join(f"  - {{name: app-{i:02d}, memory_mb: 1024}}\n" for i in range(n))
+    check = deploy_preflight.check_spec(
+        si, vm_deploy.load_deploy_spec(_write(tmp_path, f"template: gold\nvms:\n{vms}")),
+    )
+    assert check.ok, check.rows([])
+    # VM names, the source, the capacity snapshot (3); no network read for clones
+    assert si.pc.call_count == 5
+
+
+@pytest.mark.parametrize("source,props,message", [
+    ("template: gold", {"config.template": False}, "'gold' is not a template"),
+    ("linked_clone: {source: gold, snapshot: base}", {}, "base"),
+    (
+        "instant_clone: {source: gold}", {"runtime.powerState": "poweredOff"},
+        "needs a running parent; 'gold' is poweredOff",
+    ),
+])
+def test_source_unfit_for_its_channel(tmp_path, source, props, message):
+    gold = vim.VirtualMachine("vm-10", _stub)
+    si = _si([(gold, {"name": "gold", "datastore": [DS[1]], **props})])
+    spec = vm_deploy.load_deploy_spec(_write(tmp_path, f"{source}\nvms: [{{name: app-01}}]\n"))
+    rows = deploy_preflight.check_spec(si, spec).rows(["app-01"])
+    assert rows[0]["name"] == "gold" and message in rows[0]["messages"][0]
+    assert rows[1]["status"] == "skipped"
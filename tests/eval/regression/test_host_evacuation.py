@@ -0,0 +1,152 @@
+"""Regression — parallel host evacuation (``ops.host_evacuate``).
+
+Before: draining a host meant one ``migrate_vm`` per VM, each resolving the
+VM and target host by name and reading ``vm.runtime.host``, ``vm.datastore``
+and the datastore's mounts lazily, then waiting up to 10 minutes before the
+next VM.
+
+Locked here:
+1. the plan is TWO paged collections (all hosts, the source host's VMs),
+   with no lazy read on any host or VM moref;
+2. destinations are cluster hosts that are connected, out of maintenance and
+   mount all of the VM's datastores and networks; largest VMs go first to
+   the host with the most free memory, keeping headroom; VMs nothing can
+   take are reported with the reason;
+3. the per-host vMotion limit follows NIC speed (4 on 1GbE, 8 on 10GbE+) and
+   is never exceeded on the source or any destination;
+4. ``cluster evacuate-host --dry-run`` prints the plan and moves nothing.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops.cluster_mgmt import ClusterError
+from vmware_aiops.ops.host_evacuate import apply_evacuation, evacuate_host, plan_evacuation
+
+GB_MB = 1024
+
+
+class _VM:
+    lock = threading.Lock()
+    active: dict = {}
+    peak: dict = {}
+
+    def __init__(self, name):
+        self.name = name
+        self.moved_to = None
+
+    def Relocate(self, spec):  # noqa: N802 - pyVmomi API
+        self.moved_to = spec.host
+        with _VM.lock:
+            for k in ("*", spec.host):
+                _VM.active[k] = _VM.active.get(k, 0) + 1
+                _VM.peak[k] = max(_VM.peak.get(k, 0), _VM.active[k])
+        time.sleep(0.02)
+        with _VM.lock:
+            for k in ("*", spec.host):
+                _VM.active[k] -= 1
+        return fake_task()
+
+
+def _nic(speed):
+    return SimpleNamespace(linkSpeed=SimpleNamespace(speedMb=speed))
+
+
+@pytest.fixture()
+def cluster():
+    stub = _CountingStub()
+    h = {n: vim.HostSystem(f"host-{n}", stub) for n in range(1, 6)}
+    shared, local, net = "ds-shared", "ds-local", "pg-prod"
+
+    def host(name, mem_gb, used_gb, speed, parent="cl1", maint=False, ds=(shared,)):
+        return {
+            "name": name, "parent": parent, "runtime.connectionState": "connected",
+            "runtime.inMaintenanceMode": maint,
+            "summary.hardware.cpuMhz": 2000, "summary.hardware.numCpuCores": 32,
+            "summary.hardware.memorySize": mem_gb * 1024**3,
+            "summary.quickStats.overallCpuUsage": 1000,
+            "summary.quickStats.overallMemoryUsage": used_gb * GB_MB,
+            "datastore": list(ds), "network": [net],
+            "config.network.pnic": [_nic(1000), _nic(speed)],
+        }
+
+    hosts = [
+        (h[1], host("esx1", 256, 200, 10000, ds=(shared, local))),
+        (h[2], host("esx2", 256, 40, 1000)),
+        (h[3], host("esx3", 128, 20, 25000)),
+        (h[4], host("esx4", 512, 0, 10000, maint=True)),
+        (h[5], host("esx5", 512, 0, 10000, parent="cl2")),
+    ]
+
+    def vm(name, mem_gb, power="poweredOn", ds=shared):
+        return (_VM(name), {
+            "name": name, "config.template": False, "runtime.powerState": power,
+            "summary.config.memorySizeMB": mem_gb * GB_MB,
+            "summary.quickStats.overallCpuUsage": 500, "datastore": [ds], "network": [net],
+        })
+
+    vms = [vm(f"app-{i:02d}", 4) for i in range(12)]
+    vms += [vm("big", 80), vm("huge", 400), vm("pinned", 2, ds=local), vm("off", 64, "poweredOff")]
+    _VM.active, _VM.peak = {}, {}
+    si = make_si({vim.HostSystem: hosts, vim.VirtualMachine: vms})
+    return SimpleNamespace(si=si, stub=stub, hosts=h, vms={p["name"]: v for v, p in vms})
+
+
+def test_plan_is_two_reads_and_places_by_capacity_and_access(cluster):
+    plan = plan_evacuation(cluster.si, "esx1")
+    assert cluster.si.pc.call_count == 2
+    assert cluster.stub.calls == 0
+
+    to = {m.name: m.destination_name for m in plan.moves}
+    assert to["big"] == "esx2"  # most free memory: 256*0.9-40 vs 128*0.9-20
+    assert set(to.values()) == {"esx2", "esx3"}  # never maintenance / other cluster
+    assert to["off"] in {"esx2", "esx3"}
+    unplaced = {r["name"]: r["message"] for r in plan.unplaced}
+    assert "mounts all of its datastores" in unplaced["pinned"]
+    assert "409600 MB memory" in unplaced["huge"]
+    assert plan.limits == {"esx1": 8, "esx2": 4, "esx3": 8}
+
+    plan = plan_evacuation(cluster.si, "esx1", destinations=["esx3"], include_powered_off=False)
+    assert {m.destination_name for m in plan.moves} == {"esx3"}
+    assert {r["name"]: r["status"] for r in plan.unplaced}["off"] == "skipped"
+    with pytest.raises(ClusterError, match="esx5"):
+        plan_evacuation(cluster.si, "esx1", destinations=["esx5"])
+    with pytest.raises(ClusterError, match="not found"):
+        plan_evacuation(cluster.si, "esx9")
+
+
+def test_parallel_moves_respect_vmotion_limits_and_stream(cluster):
+    streamed = []
+    rows = evacuate_host(cluster.si, "esx1", concurrency=16, on_result=streamed.append)
+    status = {r["name"]: r["status"] for r in rows}
+    assert (status.pop("pinned"), status.pop("huge")) == ("error", "error")
+    assert set(status.values()) == {"ok"}
+    assert len(streamed) == len(rows)
+    assert cluster.vms["big"].moved_to == cluster.hosts[2]
+    assert 4 < _VM.peak["*"] <= 8  # the source host's 10GbE limit, beyond esx2's 4
+    assert _VM.peak[cluster.hosts[2]] <= 4  # esx2 is on 1GbE
+
+    _VM.active, _VM.peak = {}, {}
+    apply_evacuation(plan_evacuation(cluster.si, "esx1"), concurrency=16, per_host=2)
+    assert _VM.peak["*"] == 2
+
+
+def test_cli_dry_run_prints_plan_and_moves_nothing(cluster, monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import cluster as cluster_module
+
+    monkeypatch.setattr(
+        cluster_module, "_get_connection", lambda target, config=None: (cluster.si, None)
+    )
+    result = CliRunner().invoke(app, ["cluster", "evacuate-host", "esx1", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "big" in result.output and "esx2=4" in result.output
+    assert all(v.moved_to is None for v in cluster.vms.values())
@@ -0,0 +1,134 @@
+"""Regression — Instant Clone provisioning channel (``InstantClone_Task``).
+
+Before: the only fast channel was a linked clone, which still boots every
+clone from disk — a warm pool of CI runners paid a full guest boot per VM
+and a separate power-on task after the clone.
+
+Locked here:
+1. the parent is resolved once however many clones follow, and clones are
+   submitted in parallel on the parent's host, at most ``per_host`` at once;
+2. each spec carries the shared ``extraConfig`` with ``{name}`` replaced and
+   the clone's own overrides on top;
+3. a parent that is not running is an error row per name before any task;
+4. ``batch_deploy``'s ``instant_clone`` channel takes no power-on step and
+   reads the parent once per batch, not once per VM.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, fake_task, make_si
+from vmware_aiops.ops import vm_deploy
+
+_stub = _CountingStub()
+FOLDER = vim.Folder("group-v3", _stub)
+HOST = vim.HostSystem("host-1", _stub)
+
+
+class _ParentStub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+        self.specs: dict = {}
+
+    def InvokeMethod(self, mo, info, args):  # noqa: N802 - pyVmomi contract
+        assert info.name == "InstantClone", info.name
+        [spec] = args
+        with self.lock:
+            self.specs[spec.name] = spec
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return fake_task(object())
+
+
+def _si(power="poweredOn"):
+    parent = _ParentStub()
+    si = make_si({vim.VirtualMachine: [(vim.VirtualMachine("vm-10", parent), {
+        "name": "runner", "parent": FOLDER, "runtime.host": HOST,
+        "runtime.powerState": power, "datastore": ["ds1"], "config.template": False,
+    })]})
+    return si, parent
+
+
+def _config(spec):
+    return {o.key: o.value for o in spec.config or ()}
+
+
+def test_parent_resolved_once_and_identity_per_clone():
+    si, parent = _si()
+    names = [f"ci-{i:02d}" for i in range(1, 13)]
+    streamed = []
+    rows = vm_deploy.batch_instant_clone(
+        si, "runner", names,
+        extra_config={"guestinfo.hostname": "{name}", "guestinfo.role": "ci"},
+        overrides={"ci-02": {"guestinfo.role": "canary"}},
+        concurrency=12, per_host=3, on_result=streamed.append,
+    )
+    assert si.pc.call_count == 2  # name scan + parent placement, not per clone
+    assert [r["name"] for r in rows] == names
+    assert len(streamed) == 12
+    assert rows[0]["messages"] == [
+        "VM 'ci-01' instant-cloned from 'runner' (2 extraConfig keys), running."
+    ]
+    assert _config(parent.specs["ci-01"]) == {
+        "guestinfo.hostname": "ci-01", "guestinfo.role": "ci",
+    }
+    assert _config(parent.specs["ci-02"])["guestinfo.role"] == "canary"
+    assert parent.peak == 3  # parallel, capped on the parent's host
+
+
+def test_parent_must_be_running():
+    si, parent = _si(power="poweredOff")
+    rows = vm_deploy.batch_instant_clone(si, "runner", ["a", "b"])
+    assert [r["status"] for r in rows] == ["error", "error"]
+    assert "needs a running parent" in rows[0]["messages"][0]
+    assert parent.specs == {}
+    assert vm_deploy.batch_instant_clone(si, "nope", ["a"]) == [{
+        "name": "nope", "status": "error", "messages": ["Parent VM 'nope' not found."],
+    }]
+
+
+def test_batch_deploy_channel_merges_per_vm_extra_config(tmp_path):
+    si, parent = _si()
+    spec_path = tmp_path / "deploy.yaml"
+    spec_path.write_text(
+        "instant_clone:\n"
+        "  source: runner\n"
+        "  extra_config: {guestinfo.hostname: '{name}'}\n"
+        "defaults: {power_on: true}\n"
+        "vms:\n"
+        "  - name: ci-07\n"
+        "    extra_config: {guestinfo.ip: 10.0.0.7}\n",
+        encoding="utf-8",
+    )
+    [result] = vm_deploy.batch_deploy(si, str(spec_path))
+    assert result["status"] == "ok"
+    assert result["messages"] == [
+        "VM 'ci-07' instant-cloned from 'runner' (2 extraConfig keys), running."
+    ]
+    assert _config(parent.specs["ci-07"]) == {
+        "guestinfo.hostname": "ci-07", "guestinfo.ip": "10.0.0.7",
+    }
+
+
+def test_batch_deploy_reads_the_parent_once(tmp_path):
+    spec_path = tmp_path / "deploy.yaml"
+    vms = "".join(f"  - {{name: ci-{i:02d}}}\n" for i in range(1, 9))
+    spec_path.write_text(f"instant_clone: {{source: runner}}\nvms:\n{vms}", encoding="utf-8")
+
+    si, parent = _si()
+    rows = vm_deploy.batch_deploy(si, str(spec_path))
+    assert [r["status"] for r in rows] == ["ok"] * 8
+    assert si.pc.call_count == 5  # preflight: VM names, parent, capacity snapshot (3)
+    assert len(parent.specs) == 8
+
+    si, parent = _si()
+    vm_deploy.batch_deploy(si, str(spec_path), preflight=False)
+    assert si.pc.call_count == 2  # name scan + parent placement, not per VM
+    assert len(parent.specs) == 8
@@ -0,0 +1,184 @@
+"""Regression — scan issues are deduplicated across cycles by fingerprint.
+
+Before: every ``_run_scan`` logged and webhooked every still-active alarm and
+every event still inside the lookback window, so one long-lived alarm paged
+Slack every 15 minutes and ``scan.log`` grew by the whole active set per cycle.
+
+Locked here:
+1. a repeat of the same issue is suppressed; only new / escalated / renotify /
+   resolved transitions are emitted;
+2. only stateful sources (alarm, connection) resolve, and only for a
+   (target, source) scope that was scanned successfully this cycle;
+3. fingerprints ignore volatile fragments (counters, timestamps, hex ids) and
+   keep identical entity names on different targets apart;
+4. the store persists, evicts least-recently-seen entries past ``max_entries``
+   and expires entries unseen for ``expire_hours``;
+5. the scheduler wires it so a second identical cycle sends no webhook.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from vmware_aiops.notify.issue_state import (
+    IssueStateStore,
+    issue_fingerprint,
+    normalize_message,
+)
+
+
+def _alarm(entity="esxi-1", severity="warning", target="vc1", name="Host CPU usage"):
+    return {
+        "severity": severity,
+        "source": "alarm",
+        "message": f"[HostSystem:{entity}] {name}",
+        "time": "2026-10-01 00:00:00",
+        "entity": entity,
+        "alarm_name": name,
+        "target": target,
+    }
+
+
+def _event(msg="Host esxi-1 lost connection at 10:01:02 (opID 4411)", target="vc1"):
+    return {
+        "severity": "critical",
+        "source": "event",
+        "event_type": "HostConnectionLostEvent",
+        "message": msg,
+        "time": "",
+        "entity": "esxi-1",
+        "target": target,
+    }
+
+
+def _store(tmp_path, **kw) -> IssueStateStore:
+    return IssueStateStore(str(tmp_path / "state.json"), **kw)
+
+
+ALARM_SCOPE = {("vc1", "alarm")}
+
+
+def test_repeat_is_suppressed_until_renotify(tmp_path):
+    store = _store(tmp_path, renotify_minutes=60)
+    first = store.process([_alarm()], ALARM_SCOPE, now=0)
+    assert [i["transition"] for i in first] == ["new"]
+    assert store.process([_alarm()], ALARM_SCOPE, now=900) == []
+    again = store.process([_alarm()], ALARM_SCOPE, now=3600)
+    assert [i["transition"] for i in again] == ["renotify"]
+    assert again[0]["occurrences"] == 3
+
+
+def test_renotify_zero_never_resends(tmp_path):
+    store = _store(tmp_path, renotify_minutes=0)
+    store.process([_alarm()], ALARM_SCOPE, now=0)
+    assert store.process([_alarm()], ALARM_SCOPE, now=10**6) == []
+
+
+def test_escalation_is_emitted(tmp_path):
+    store = _store(tmp_path)
+    store.process([_alarm(severity="warning")], ALARM_SCOPE, now=0)
+    out = store.process([_alarm(severity="critical")], ALARM_SCOPE, now=60)
+    assert [(i["transition"], i["severity"]) for i in out] == [("escalated", "critical")]
+    # De-escalation is not news.
+    assert store.process([_alarm(severity="warning")], ALARM_SCOPE, now=120) == []
+
+
+def test_alarm_resolves_only_within_scanned_scope(tmp_path):
+    store = _store(tmp_path)
+    store.process([_alarm()], ALARM_SCOPE, now=0)
+    # Alarm scan failed for vc1 this cycle: absence proves nothing.
+    assert store.process([], {("vc1", "connection")}, now=60) == []
+    out = store.process([], ALARM_SCOPE, now=120)
+    assert [i["transition"] for i in out] == ["resolved"]
+    # Resolved once, not every cycle after.
+    assert store.process([], ALARM_SCOPE, now=180) == []
+    # Coming back is new again.
+    assert [i["transition"] for i in store.process([_alarm()], ALARM_SCOPE, now=240)] == ["new"]
+
+
+def test_events_age_out_silently(tmp_path):
+    store = _store(tmp_path)
+    store.process([_event()], {("vc1", "event")}, now=0)
+    assert store.process([], {("vc1", "event"), ("vc1", "alarm")}, now=60) == []
+
+
+def test_fingerprint_ignores_volatile_fragments():
+    a = _event("Host esxi-1 lost connection at 10:01:02 (opID 4411) 0xdeadbeef")
+    b = _event("Host esxi-1 lost connection at 11:22:33 (opID 9) 0x1")
+    assert issue_fingerprint(a) == issue_fingerprint(b)
+    assert normalize_message("Disk  42 at 2026-10-01T10:00:00Z") == "disk # at #"
+
+
+def test_fingerprint_separates_targets():
+    assert issue_fingerprint(_alarm(target="vc1")) != issue_fingerprint(_alarm(target="vc2"))
+
+
+def test_duplicates_within_one_cycle_collapse(tmp_path):
+    store = _store(tmp_path)
+    out = store.process([_alarm(), _alarm()], ALARM_SCOPE, now=0)
+    assert len(out) == 1
+
+
+def test_state_persists_across_instances(tmp_path):
+    store = _store(tmp_path)
+    store.process([_alarm()], ALARM_SCOPE, now=0)
+    store.save()
+    reloaded = _store(tmp_path)
+    assert len(reloaded) == 1
+    assert reloaded.process([_alarm()], ALARM_SCOPE, now=60) == []
+
+
+def test_corrupt_state_file_starts_fresh(tmp_path):
+    (tmp_path / "state.json").write_text("{not json", encoding="utf-8")
+    store = _store(tmp_path)
+    assert len(store) == 0
+
+
+def test_lru_eviction_and_expiry(tmp_path):
+    store = _store(tmp_path, max_entries=2, expire_hours=1)
+    store.process([_alarm(entity="a")], ALARM_SCOPE, now=0)
+    store.process([_alarm(entity="a"), _alarm(entity="b")], ALARM_SCOPE, now=10)
+    store.process([_alarm(entity="b"), _alarm(entity="c")], ALARM_SCOPE, now=20)
+    # "a" was least recently seen when "c" arrived.
+    assert len(store) == 2
+    out = store.process([_alarm(entity="a")], set(), now=30)
+    assert [i["transition"] for i in out] == ["new"]
+    # Nothing seen for over an hour expires.
+    store.process([], set(), now=30 + 3601)
+    assert len(store) == 0
+
+
+def test_scheduler_second_identical_cycle_sends_nothing(tmp_path, monkeypatch):
+    from vmware_aiops.config import AppConfig, NotifyConfig
+    from vmware_aiops.scanner import scheduler
+    from vmware_aiops.scanner.pacing import ScanPacer
+
+    config = AppConfig(notify=NotifyConfig(
+        log_file=str(tmp_path / "scan.log"), webhook_url="https://hooks.example/x",
+    ))
+    conn_mgr = MagicMock()
+    pacer = ScanPacer(900, min_seconds=900, max_seconds=900)
+
+    def _untargeted_alarm(si):
+        issue = _alarm()
+        del issue["target"]  # scanners don't know the target; the scheduler tags it
+        return [issue]
+
+    monkeypatch.setattr(scheduler, "scan_alarms", _untargeted_alarm)
+    monkeypatch.setattr(scheduler, "scan_logs", lambda si, cfg: [])
+    monkeypatch.setattr(scheduler, "scan_host_logs", lambda si, **kw: [])
+    sent: list[list[dict]] = []
+    monkeypatch.setattr(
+        scheduler.WebhookNotifier, "send", lambda self, issues: sent.append(issues)
+    )
+
+    store = _store(tmp_path)
+    scheduler._run_target_scan(config, conn_mgr, "vc1", pacer, store)
+    scheduler._run_target_scan(config, conn_mgr, "vc1", pacer, store)
+    assert len(sent) == 1
+    assert sent[0][0]["transition"] == "new"
+
+    monkeypatch.setattr(scheduler, "scan_alarms", lambda si: [])
+    scheduler._run_target_scan(config, conn_mgr, "vc1", pacer, store)
+    assert [i["transition"] for i in sent[1]] == ["resolved"]
+    assert (tmp_path / "state.json").exists()
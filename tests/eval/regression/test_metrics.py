@@ -0,0 +1,165 @@
+"""Regression — opt-in self-telemetry (``vmware_aiops.metrics``).
+
+Before: there was no way to see how many PropertyCollector pages a scan
+fetched, how long task waits took, or how often MCP tools failed, short of
+reading debug logs.
+
+Locked here:
+1. disabled by default: ``inc`` / ``observe`` / ``timer`` record nothing;
+2. the exposition is valid Prometheus text — prefixed names, HELP/TYPE
+   headers, escaped labels, cumulative histogram buckets with ``+Inf``;
+3. ``_collect`` counts batches, pages and objects per managed-object type;
+4. ``tool_errors`` counts MCP calls by outcome, including sanitised errors;
+5. the loopback ``/metrics`` endpoint and the atomic textfile serve the same
+   exposition, and ``vmware-aiops metrics`` prints the textfiles.
+"""
+
+from __future__ import annotations
+
+import urllib.error
+import urllib.request
+
+import pytest
+from pyVmomi import vim
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import NoLazyMO, make_si
+from vmware_aiops import metrics
+from vmware_aiops.metrics import REGISTRY, Registry
+
+
+@pytest.fixture()
+def enabled(monkeypatch):
+    monkeypatch.setattr(REGISTRY, "enabled", True)
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+
+def test_disabled_registry_records_nothing():
+    reg = Registry()
+    reg.enabled = False
+    reg.inc("x_total")
+    reg.observe("x_seconds", 1.0)
+    with reg.timer("y_seconds") as labels:
+        labels["outcome"] = "ok"
+    assert reg.render() == ""
+
+
+def test_render_counters_and_histograms():
+    reg = Registry()
+    reg.enabled = True
+    reg.inc("task_polls_total", 3)
+    reg.inc("webhook_requests_total", mode="inline", result='5"00')
+    reg.observe("task_wait_seconds", 0.2, outcome="success")
+    reg.observe("task_wait_seconds", 7.0, outcome="success")
+    reg.observe("task_wait_seconds", 9999.0, outcome="success")
+    text = reg.render()
+    lines = text.splitlines()
+
+    assert "# HELP vmware_aiops_task_polls_total Task status round-trips " \
+        "(WaitForUpdatesEx calls or TaskInfo polls)." in lines
+    assert "# TYPE vmware_aiops_task_polls_total counter" in lines
+    assert "vmware_aiops_task_polls_total 3" in lines
+    assert 'vmware_aiops_webhook_requests_total{mode="inline",result="5\\"00"} 1' in lines
+    assert "# TYPE vmware_aiops_task_wait_seconds histogram" in lines
+    assert 'vmware_aiops_task_wait_seconds_bucket{outcome="success",le="0.1"} 0' in lines
+    assert 'vmware_aiops_task_wait_seconds_bucket{outcome="success",le="0.25"} 1' in lines
+    assert 'vmware_aiops_task_wait_seconds_bucket{outcome="success",le="10"} 2' in lines
+    assert 'vmware_aiops_task_wait_seconds_bucket{outcome="success",le="600"} 2' in lines
+    assert 'vmware_aiops_task_wait_seconds_bucket{outcome="success",le="+Inf"} 3' in lines
+    assert 'vmware_aiops_task_wait_seconds_count{outcome="success"} 3' in lines
+    assert text.endswith("\n")
+
+
+def test_timer_takes_labels_set_inside_block():
+    reg = Registry()
+    reg.enabled = True
+    with reg.timer("scan_target_seconds", target="vc1") as labels:
+        labels["outcome"] = "error"
+    assert reg.histogram_count("scan_target_seconds", target="vc1", outcome="error") == 1
+
+
+def test_collect_counts_batches_pages_and_objects(enabled):
+    from vmware_aiops.ops.inventory import _collect
+
+    rows = [(NoLazyMO(f"vm-{i}"), {"name": f"vm-{i}"}) for i in range(5)]
+    si = make_si({vim.VirtualMachine: rows}, page_size=2)
+    assert len(_collect(si, [vim.VirtualMachine], ["name"])) == 5
+
+    assert enabled.counter_value("pc_collect_total", type="vim.VirtualMachine") == 1
+    assert enabled.counter_value("pc_pages_total", type="vim.VirtualMachine") == 3
+    assert enabled.counter_value("pc_objects_total", type="vim.VirtualMachine") == 5
+    assert enabled.histogram_count("pc_collect_seconds", type="vim.VirtualMachine") == 1
+
+
+def test_tool_errors_counts_outcomes(enabled, monkeypatch):
+    from vmware_aiops.mcp_server import _shared
+
+    monkeypatch.setattr(_shared._METRICS_FILE, "maybe_write", lambda: None)
+
+    @_shared.tool_errors("str")
+    def probe(fail: bool) -> str:
+        if fail:
+            raise RuntimeError("boom")
+        return "ok"
+
+    probe(False)
+    probe(False)
+    probe(True)
+    assert enabled.counter_value("mcp_tool_calls_total", tool="probe", outcome="ok") == 2
+    assert enabled.counter_value("mcp_tool_calls_total", tool="probe", outcome="error") == 1
+    assert enabled.histogram_count("mcp_tool_seconds", tool="probe") == 3
+
+
+def test_http_endpoint_and_textfile(enabled, tmp_path):
+    enabled.inc("scan_issues_total", 2, target="vc1", severity="critical")
+    expected = enabled.render()
+
+    server = enabled.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain")
+            assert resp.read().decode() == expected
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    out = tmp_path / "sub" / "metrics.prom"
+    enabled.write_textfile(out)
+    assert out.read_text() == expected
+    assert not list(out.parent.glob("*.tmp"))
+
+
+def test_throttled_textfile(enabled, tmp_path):
+    out = tmp_path / "metrics-mcp.prom"
+    writer = metrics.ThrottledTextfile(out, min_interval=3600)
+    enabled.inc("task_polls_total")
+    writer.maybe_write()
+    first = out.read_text()
+    enabled.inc("task_polls_total")
+    writer.maybe_write()
+    assert out.read_text() == first
+
+
+def test_cli_prints_textfiles(tmp_path):
+    from vmware_aiops.cli import app
+
+    config = tmp_path / "config.yaml"
+    textfile = tmp_path / "metrics.prom"
+    config.write_text(f"metrics:\n  textfile: {textfile}\n", encoding="utf-8")
+
+    result = CliRunner().invoke(app, ["metrics", "--config", str(config)])
+    assert result.exit_code == 1
+    assert "No metrics recorded yet" in result.output
+
+    textfile.write_text("vmware_aiops_task_polls_total 4\n", encoding="utf-8")
+    (tmp_path / "metrics-mcp.prom").write_text("vmware_aiops_mcp_x 1\n", encoding="utf-8")
+    result = CliRunner().invoke(app, ["metrics", "--config", str(config)])
+    assert result.exit_code == 0
+    assert "# source: daemon" in result.output
+    assert "vmware_aiops_task_polls_total 4" in result.output
+    assert "vmware_aiops_mcp_x 1" in result.output
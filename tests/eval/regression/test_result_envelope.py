@@ -24,8 +24,8 @@ from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
-from pyVmomi import vim
 
+from tests.eval.regression._pc_fakes import fake_task
 from vmware_aiops.ops import alarm_mgmt, datastore_browser, planner, ttl
 
 ENVELOPE_KEYS = {"items", "returned", "limit", "total", "truncated", "hint"}
@@ -62,11 +62,7 @@ def _stub_browse(monkeypatch, file_names: list[str]) -> None:
     folder = SimpleNamespace(folderPath="[ds1] ", file=files)
 
     def fake_search(datastorePath, searchSpec):  # noqa: N803 — pyVmomi API names
-        return SimpleNamespace(
-            info=SimpleNamespace(
-                state=vim.TaskInfo.State.success, result=[folder], error=None
-            )
-        )
+        return fake_task([folder])
 
     monkeypatch.setattr(
         datastore_browser,
@@ -243,6 +239,7 @@ def test_missing_plan_dir_is_an_explicit_zero(monkeypatch, tmp_path) -> None:
 BATCH_WRITE_TOOLS = (
     "batch_clone_vms",
     "batch_deploy_from_spec",
+    "batch_instant_clone_vms",
     "batch_linked_clone_vms",
 )
 
@@ -0,0 +1,195 @@
+"""Regression — indexed scan history (``notify.history.ScanHistory``).
+
+Before: the only record of past scans was ``scan.log`` JSONL, so "every
+critical issue on host X last week" meant reading every line of every
+rotated segment.
+
+Locked here:
+1. ``ScanLogger`` records each batch into SQLite alongside the JSONL line,
+   and a history failure never loses the JSONL write;
+2. queries filter by time range / severity / entity / source / target /
+   transition, newest first, with the real match count;
+3. entity/severity range queries are served by an index, not a table scan;
+4. rows past retention are compacted at most once a day;
+5. ``vmware-aiops scan history`` and the ``scan_history`` MCP tool read it.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import pytest
+from typer.testing import CliRunner
+
+from vmware_aiops.notify.history import ScanHistory
+from vmware_aiops.notify.logger import ScanLogger
+
+DAY = 86400
+NOW = 1_790_000_000.0
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+def _entry(age_s: float, severity="critical", entity="esxi-1", source="alarm", **extra):
+    return {
+        "timestamp": _iso(NOW - age_s),
+        "severity": severity,
+        "source": source,
+        "entity": entity,
+        "target": "vc1",
+        "message": f"{severity} on {entity}",
+        **extra,
+    }
+
+
+@pytest.fixture()
+def history(tmp_path):
+    store = ScanHistory(str(tmp_path / "history.db"), retention_days=30)
+    store.record(
+        [
+            _entry(10 * DAY),
+            _entry(3 * DAY, transition="new"),
+            _entry(2 * DAY, severity="warning"),
+            _entry(1 * DAY, entity="esxi-2"),
+            _entry(3600, source="event", transition="resolved"),
+        ],
+        now=NOW,
+    )
+    return store
+
+
+def test_logger_records_batches(tmp_path):
+    store = ScanHistory(str(tmp_path / "history.db"))
+    log = ScanLogger(str(tmp_path / "scan.log"), history=store)
+    log.log_issues([
+        {"severity": "critical", "source": "alarm", "message": "a", "entity": "esxi-1"},
+        {"severity": "info", "source": "event", "message": "b", "entity": "vm-1"},
+    ])
+    rows, total = store.query()
+    assert total == 2
+    assert {r["message"] for r in rows} == {"a", "b"}
+    jsonl = (tmp_path / "scan.log").read_text().splitlines()
+    assert len(jsonl) == 2
+    assert rows[0]["timestamp"] in jsonl[0]
+
+
+def test_history_failure_keeps_jsonl(tmp_path):
+    class Broken:
+        def record(self, entries):
+            raise sqlite3.OperationalError("database is locked")
+
+    log = ScanLogger(str(tmp_path / "scan.log"), history=Broken())
+    log.log_issue({"severity": "warning", "source": "alarm", "message": "m"})
+    assert len((tmp_path / "scan.log").read_text().splitlines()) == 1
+
+
+def test_query_filters_and_order(history):
+    rows, total = history.query(
+        since=NOW - 7 * DAY, severity="critical", entity="esxi-1", source="alarm"
+    )
+    assert total == 1
+    assert rows[0]["transition"] == "new"
+
+    rows, total = history.query(since=NOW - 7 * DAY, until=NOW - DAY / 2)
+    assert total == 3
+    assert [r["severity"] for r in rows] == ["critical", "warning", "critical"]
+    assert [r["entity"] for r in rows] == ["esxi-2", "esxi-1", "esxi-1"]
+
+    rows, total = history.query(limit=2)
+    assert (len(rows), total) == (2, 5)
+    assert rows[0]["source"] == "event"
+
+    assert history.query(transition="resolved")[1] == 1
+    assert history.query(target="vc2")[1] == 0
+
+
+def test_query_validation(tmp_path, history):
+    with pytest.raises(ValueError, match="severity"):
+        history.query(severity="fatal")
+    with pytest.raises(ValueError, match="filter"):
+        history.query(host="esxi-1")
+    with pytest.raises(FileNotFoundError, match="daemon"):
+        ScanHistory(str(tmp_path / "none.db")).query()
+
+
+def test_range_queries_use_indexes(history):
+    conn = sqlite3.connect(history.path)
+    for column in ("entity", "severity", "source", "target"):
+        plan = " ".join(
+            str(row[-1]) for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT entry FROM issues "
+                f"WHERE ts >= ? AND {column} = ? ORDER BY ts DESC", (0, "x"),
+            )
+        )
+        assert f"ix_issues_{column}_ts" in plan, plan
+    conn.close()
+
+
+def test_retention_compacts_once_a_day(history):
+    # First record stamped last_compact; within a day nothing is deleted.
+    history.record([_entry(0)], now=NOW + 3600)
+    assert history.query()[1] == 6
+    # A day later the 10-day-old row is still inside 30-day retention...
+    history.record([_entry(0)], now=NOW + DAY)
+    assert history.query()[1] == 7
+    # ...until it ages past it.
+    history.record([_entry(0)], now=NOW + 25 * DAY)
+    rows, total = history.query()
+    assert total == 7
+    assert min(r["timestamp"] for r in rows) == _iso(NOW - 3 * DAY)
+
+
+def test_cli_scan_history(tmp_path, monkeypatch):
+    from vmware_aiops.cli import app
+
+    db = tmp_path / "history.db"
+    config = tmp_path / "config.yaml"
+    config.write_text(f"notify:\n  history_file: {db}\n", encoding="utf-8")
+    now = time.time()
+    ScanHistory(str(db)).record([
+        {"timestamp": _iso(now - 600), "severity": "critical", "source": "alarm",
+         "target": "vc1", "entity": "esxi-1", "message": "cpu-high"},
+        {"timestamp": _iso(now - 9 * DAY), "severity": "critical", "source": "alarm",
+         "target": "vc1", "entity": "esxi-1", "message": "old-alarm"},
+    ])
+    runner = CliRunner()
+
+    result = runner.invoke(
+        app, ["scan", "history", "--since", "7d", "--entity", "esxi-1", "--config", str(config)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "cpu-high" in result.output
+    assert "old-alarm" not in result.output
+
+    result = runner.invoke(app, ["scan", "history", "--since", "2026-01-01", "-c", str(config)])
+    assert "old-alarm" in result.output
+
+    result = runner.invoke(app, ["scan", "history", "--since", "yesterday", "-c", str(config)])
+    assert result.exit_code == 2
+    assert "relative age" in result.output
+
+
+def test_mcp_tool_returns_envelope(tmp_path, monkeypatch):
+    from vmware_aiops.mcp_server.tools.scan import scan_history
+
+    db = tmp_path / "history.db"
+    config = tmp_path / "config.yaml"
+    config.write_text(f"notify:\n  history_file: {db}\n", encoding="utf-8")
+    monkeypatch.setenv("VMWARE_AIOPS_CONFIG", str(config))
+
+    missing = scan_history()
+    assert "No scan history" in missing["error"]
+
+    now = time.time()
+    ScanHistory(str(db)).record([
+        {"timestamp": _iso(now - 60 * i), "severity": "warning", "source": "event",
+         "target": "vc1", "entity": "vm-1", "message": f"m{i}"}
+        for i in range(5)
+    ])
+    page = scan_history(since_hours=1, severity="warning", limit=2)
+    assert [i["message"] for i in page["items"]] == ["m0", "m1"]
+    assert (page["total"], page["truncated"]) == (5, True)
@@ -0,0 +1,90 @@
+"""Regression — ScanLogger writes one batch per cycle and rotates scan.log.
+
+Before: ``log_issue`` opened, appended to and closed ``scan.log`` once per
+issue (2,000 issues = 2,000 open/write/close sequences), echoed every issue to
+the console, and the file grew forever.
+
+Locked here:
+1. ``log_issues`` opens the file once per batch and preserves JSONL shape;
+2. size- and age-based rotation, gzip of rotated segments, retention;
+3. console echo is capped per batch with a single summary line.
+"""
+
+from __future__ import annotations
+
+import builtins
+import gzip
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+
+from vmware_aiops.notify.logger import ScanLogger
+
+
+def _issues(n: int) -> list[dict]:
+    return [
+        {"severity": "warning", "source": "event", "message": f"issue {i}", "entity": "e"}
+        for i in range(n)
+    ]
+
+
+def test_batch_opens_file_once(tmp_path, monkeypatch):
+    path = tmp_path / "scan.log"
+    opened: list[str] = []
+    real_open = builtins.open
+
+    def counting_open(file, mode="r", *a, **kw):
+        if str(file) == str(path) and "a" in mode:
+            opened.append(mode)
+        return real_open(file, mode, *a, **kw)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    ScanLogger(str(path), console_limit=0).log_issues(_issues(2000))
+    assert opened == ["a"]
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2000
+    first = json.loads(lines[0])
+    assert first["message"] == "issue 0" and "timestamp" in first
+
+
+def test_empty_batch_touches_nothing(tmp_path):
+    ScanLogger(str(tmp_path / "scan.log")).log_issues([])
+    assert not (tmp_path / "scan.log").exists()
+
+
+def test_size_rotation_compresses_and_keeps_backups(tmp_path):
+    path = tmp_path / "scan.log"
+    scan_logger = ScanLogger(str(path), max_bytes=1, backups=2, console_limit=0)
+    for cycle in range(5):
+        scan_logger.log_issues([{"severity": "info", "message": f"cycle {cycle}"}])
+
+    segments = scan_logger.rotated_segments()
+    assert len(segments) == 2
+    assert all(p.suffix == ".gz" for p in segments)
+    # Newest segments survive; the active file holds the latest cycle.
+    kept = [json.loads(gzip.decompress(p.read_bytes()))["message"] for p in segments]
+    assert kept == ["cycle 2", "cycle 3"]
+    assert json.loads(path.read_text(encoding="utf-8"))["message"] == "cycle 4"
+
+
+def test_time_rotation_uses_first_entry_age(tmp_path):
+    path = tmp_path / "scan.log"
+    old = (datetime.now(tz=timezone.utc) - timedelta(hours=25)).isoformat()
+    path.write_text(json.dumps({"timestamp": old, "message": "old"}) + "\n", encoding="utf-8")
+
+    scan_logger = ScanLogger(str(path), max_bytes=0, rotate_hours=24, compress=False)
+    scan_logger.log_issues([{"severity": "info", "message": "fresh"}])
+    segments = scan_logger.rotated_segments()
+    assert len(segments) == 1 and segments[0].suffix != ".gz"
+    assert "old" in segments[0].read_text(encoding="utf-8")
+    # A fresh file does not rotate again.
+    scan_logger.log_issues([{"severity": "info", "message": "again"}])
+    assert len(scan_logger.rotated_segments()) == 1
+
+
+def test_console_echo_is_capped(tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger="vmware-aiops.scan")
+    ScanLogger(str(tmp_path / "scan.log"), console_limit=3).log_issues(_issues(10))
+    messages = [r.getMessage() for r in caplog.records]
+    assert len(messages) == 4
+    assert "7 more issue(s)" in messages[-1]
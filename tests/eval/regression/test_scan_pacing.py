@@ -0,0 +1,145 @@
+"""Regression — per-target, jittered, adaptive scan jobs.
+
+Before: one ``IntervalTrigger`` job scanned every target together, so every
+vCenter was hit at the same instant on a fixed interval regardless of how long
+the cycle took or what it found.
+
+Locked here:
+1. one job per target, with its own interval (target override honoured),
+   start offset within ``jitter_seconds``, ``max_instances=1``, coalescing
+   and a misfire grace of half the interval;
+2. the pacer stretches on overrun / slow vCenter, shrinks while issues are
+   active, relaxes back toward the base, and stays within bounds;
+3. a cycle that changes the interval reschedules only its own job, and
+   moves its misfire grace to half the new interval;
+4. no interval (stretched or not) plus jitter may reach the event lookback —
+   such a config is rejected at load and by the pacer, and the defaults fit.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from vmware_aiops.config import (
+    AppConfig,
+    ConfigError,
+    ScannerConfig,
+    TargetConfig,
+    load_config,
+)
+from vmware_aiops.scanner import scheduler
+from vmware_aiops.scanner.pacing import ScanPacer
+
+
+def _config(**scanner) -> AppConfig:
+    return AppConfig(
+        targets=(
+            TargetConfig(name="vc-a", host="a", config_username="u"),
+            TargetConfig(name="vc-b", host="b", config_username="u", scan_interval_minutes=30),
+        ),
+        scanner=ScannerConfig(**scanner),
+    )
+
+
+def test_one_job_per_target_with_own_settings():
+    sched = BackgroundScheduler()
+    before = datetime.now().astimezone()
+    pacers = scheduler._add_scan_jobs(
+        sched, _config(interval_minutes=10, jitter_seconds=120), MagicMock(), None, None, {}
+    )
+    jobs = {j.id: j for j in sched.get_jobs()}
+    assert set(jobs) == {"vmware_scan:vc-a", "vmware_scan:vc-b"}
+    assert jobs["vmware_scan:vc-a"].trigger.interval == timedelta(minutes=10)
+    assert jobs["vmware_scan:vc-b"].trigger.interval == timedelta(minutes=30)
+    for job in jobs.values():
+        assert job.max_instances == 1
+        assert job.coalesce is True
+        assert job.trigger.jitter == 120
+        first = job.next_run_time
+        assert before <= first <= before + timedelta(seconds=121)
+    assert jobs["vmware_scan:vc-b"].misfire_grace_time == 15 * 60
+    assert pacers["vc-b"].base == 30 * 60
+
+
+def test_pacer_rules():
+    pacer = ScanPacer(base_seconds=600, min_seconds=120, max_seconds=1800)
+    assert pacer.observe(duration=10, latency=0.1, active_issues=0) == 600
+    # Overrun: at least double.
+    assert pacer.observe(duration=400, latency=0.1, active_issues=0) == 1200
+    # Slow vCenter stretches further, clamped at max.
+    assert pacer.observe(duration=10, latency=5.0, active_issues=0) == 1800
+    # Healthy again: halfway back toward base each cycle.
+    assert pacer.observe(duration=10, latency=0.1, active_issues=0) == 1200
+    assert pacer.observe(duration=10, latency=0.1, active_issues=0) == 900
+    # Active issues: half the base.
+    assert pacer.observe(duration=10, latency=0.1, active_issues=3) == 300
+    assert pacer.observe(duration=10, latency=0.1, active_issues=0) == 600
+
+
+def test_pacer_bounds():
+    pacer = ScanPacer(base_seconds=600, min_seconds=500, max_seconds=700)
+    assert pacer.observe(duration=10, latency=0.1, active_issues=1) == 500
+    assert pacer.observe(duration=9999, latency=0.1, active_issues=0) == 700
+
+
+def test_cycle_reschedules_own_job_only_on_change(tmp_path, monkeypatch):
+    from vmware_aiops.config import NotifyConfig
+
+    config = AppConfig(
+        scanner=ScannerConfig(jitter_seconds=30),
+        notify=NotifyConfig(log_file=str(tmp_path / "scan.log")),
+    )
+    monkeypatch.setattr(scheduler, "scan_alarms", lambda si: [])
+    monkeypatch.setattr(scheduler, "scan_logs", lambda si, cfg: [])
+    monkeypatch.setattr(scheduler, "scan_host_logs", lambda si, **kw: [])
+    sched = MagicMock()
+    pacer = ScanPacer(600, 120, 1800)
+
+    scheduler._run_target_scan(config, MagicMock(), "vc-a", pacer, scheduler=sched)
+    sched.reschedule_job.assert_not_called()
+
+    monkeypatch.setattr(
+        scheduler, "scan_alarms",
+        lambda si: [{"severity": "critical", "source": "alarm", "message": "m", "entity": "e"}],
+    )
+    scheduler._run_target_scan(config, MagicMock(), "vc-a", pacer, scheduler=sched)
+    job_id = sched.reschedule_job.call_args.args[0]
+    trigger = sched.reschedule_job.call_args.kwargs["trigger"]
+    assert job_id == "vmware_scan:vc-a"
+    sched.modify_job.assert_called_once_with(job_id, misfire_grace_time=150)
+    assert trigger.interval == timedelta(seconds=300)
+    assert trigger.jitter == 30
+
+
+
+@pytest.mark.parametrize("scanner_yaml,ok", [
+    ("{}", True),  # the defaults fit
+    ("{max_interval_minutes: 60}", False),  # 60 min + 60 s jitter > 1 h
+    ("{max_interval_minutes: 60, lookback_hours: 2}", True),
+    ("{adaptive: false, max_interval_minutes: 60}", True),
+    ("{adaptive: false, interval_minutes: 59, jitter_seconds: 120}", False),
+])
+def test_intervals_stay_inside_the_event_lookback(tmp_path, scanner_yaml, ok):
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        f"targets: [{{name: vc-a, host: a}}]\nscanner: {scanner_yaml}\n", encoding="utf-8",
+    )
+    if ok:  # the loader and the pacer agree on what fits
+        config = load_config(path)
+        scheduler._add_scan_jobs(BackgroundScheduler(), config, MagicMock(), None, None, {})
+        return
+    with pytest.raises(ConfigError, match="raise lookback_hours"):
+        load_config(path)
+
+
+def test_pacer_rejects_a_limit_at_or_below_its_max():
+    with pytest.raises(ValueError, match="event lookback"):
+        ScanPacer(900, 300, 3600, limit_seconds=3540)
+    with pytest.raises(ValueError, match="event lookback"):
+        ScanPacer(3600, 3600, 3600, limit_seconds=3600)
+    pacer = ScanPacer(900, 300, 2700, limit_seconds=3540)
+    assert pacer.observe(duration=9999, latency=0.1, active_issues=0) == 2700
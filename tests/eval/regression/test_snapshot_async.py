@@ -27,6 +27,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tests.eval.regression._pc_fakes import fake_task
 from vmware_aiops.ops import vm_lifecycle
 from vmware_aiops.ops.vm_lifecycle import (
     TaskStillRunning,
@@ -36,10 +37,14 @@ from vmware_aiops.ops.vm_lifecycle import (
 )
 
 
-def _fake_target(task) -> dict:
+def _fake_index(task) -> vm_lifecycle.SnapshotIndex:
     ref = MagicMock()
     ref.RemoveSnapshot_Task.return_value = task
-    return {"name": "baseline", "snapshot_ref": ref}
+    tree = [SimpleNamespace(
+        name="baseline", description="", createTime=None, state="poweredOff",
+        snapshot=ref, childSnapshotList=[],
+    )]
+    return vm_lifecycle.SnapshotIndex(tree)
 
 
 # ── Fix 1: generous default timeout, not the 300s metadata default ──
@@ -58,9 +63,10 @@ def test_delete_snapshot_default_timeout_is_generous() -> None:
 
 def test_delete_snapshot_no_wait_returns_task_id_without_waiting() -> None:
     task = SimpleNamespace(_moId="task-9001", info=SimpleNamespace(state="running"))
-    target = _fake_target(task)
+    index = _fake_index(task)
 
-    with patch.object(vm_lifecycle, "list_snapshots", return_value=[target]), \
+    with patch.object(vm_lifecycle, "_require_vm"), \
+            patch.object(vm_lifecycle, "snapshot_index", return_value=index), \
             patch.object(vm_lifecycle, "_wait_for_task") as waited:
         out = delete_snapshot(MagicMock(), "vm1", "baseline", wait=False)
 
@@ -73,13 +79,10 @@ def test_delete_snapshot_no_wait_returns_task_id_without_waiting() -> None:
 
 
 def test_wait_for_task_raises_task_still_running_with_id() -> None:
-    task = SimpleNamespace(
-        _moId="task-7777",
-        info=SimpleNamespace(state=vm_lifecycle.vim.TaskInfo.State.running),
-    )
+    task = fake_task(state="running", progress=10)
     with pytest.raises(TaskStillRunning) as ei:
         _wait_for_task(task, timeout=0)
-    assert ei.value.task_id == "task-7777"
+    assert ei.value.task_id == task._moId
     assert "task-status" in str(ei.value)
 
 
@@ -88,9 +91,10 @@ def test_wait_for_task_raises_task_still_running_with_id() -> None:
 
 def test_delete_snapshot_wait_timeout_returns_not_failed_string() -> None:
     task = SimpleNamespace(_moId="task-5555", info=SimpleNamespace(state="running"))
-    target = _fake_target(task)
+    index = _fake_index(task)
 
-    with patch.object(vm_lifecycle, "list_snapshots", return_value=[target]), \
+    with patch.object(vm_lifecycle, "_require_vm"), \
+            patch.object(vm_lifecycle, "snapshot_index", return_value=index), \
             patch.object(
                 vm_lifecycle, "_wait_for_task",
                 side_effect=TaskStillRunning("task-5555", 1800),
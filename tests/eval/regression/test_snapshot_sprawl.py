@@ -0,0 +1,175 @@
+"""Regression — fleet snapshot sprawl report (``ops.snapshot_sprawl``).
+
+Before: only ``get_vm_info`` reported snapshots (a count, one VM at a time);
+finding the VMs whose old snapshots fill a datastore meant walking every VM.
+
+Locked here:
+1. every VM's snapshot tree and ``layoutEx`` come from ONE paged collection,
+   with no lazy read on any VM or snapshot moref;
+2. delta size counts the running chain's snapshot deltas (not the base disk,
+   nor a linked clone's own base delta), deltas of other snapshot branches,
+   and the snapshot state / memory files — per datastore from file names;
+3. age, depth, filtering, sorting and limit are in-memory over the one pass;
+   datastores are ranked by delta with their worst VMs;
+4. snapshots past the age threshold are grouped by name for bulk cleanup;
+   templates are listed apart (bulk delete rejects them), and the CLI caps
+   the names it prints per group.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import _CountingStub, make_si
+from vmware_aiops.ops.snapshot_sprawl import snapshot_sprawl
+
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+GB = 1024**3
+
+
+def _snap(stub, moid, name, days, *children):
+    return SimpleNamespace(
+        name=name, description="", createTime=NOW - timedelta(days=days), state="poweredOff",
+        snapshot=vim.vm.Snapshot(moid, stub), childSnapshotList=list(children),
+    )
+
+
+def _file(key, path, gb, kind="diskExtent"):
+    return SimpleNamespace(key=key, name=path, size=gb * GB, type=kind)
+
+
+def _chain(*keys):
+    return [SimpleNamespace(fileKey=[k]) for k in keys]
+
+
+def _fixtures():
+    stub = _CountingStub()
+    patch = _snap(stub, "snapshot-2", "patch", 10)
+    tree_a = [_snap(stub, "snapshot-1", "base", 40, patch, _snap(stub, "snapshot-3", "alt", 5))]
+    tree_b = [_snap(stub, "snapshot-9", "base", 100)]
+    vm_a = {
+        "name": "vm-a",
+        "snapshot.rootSnapshotList": tree_a,
+        "snapshot.currentSnapshot": patch.snapshot,
+        "layoutEx.file": [
+            _file(1, "[ds1] vm-a/vm-a.vmdk", 50), _file(2, "[ds1] vm-a/vm-a-000001.vmdk", 4),
+            _file(3, "[ds2] vm-a/vm-a-000002.vmdk", 2), _file(6, "[ds2] vm-a/vm-a-000003.vmdk", 3),
+            _file(4, "[ds1] vm-a/vm-a-Snapshot2.vmsn", 1, "snapshotData"),
+            _file(5, "[ds1] vm-a/vm-a-Snapshot2.vmem", 8, "snapshotMemory"),
+        ],
+        "layoutEx.disk": [SimpleNamespace(chain=_chain(1, 2, 3))],
+        "layoutEx.snapshot": [
+            SimpleNamespace(disk=[SimpleNamespace(chain=_chain(1))]),
+            SimpleNamespace(disk=[SimpleNamespace(chain=_chain(1, 2))]),
+            SimpleNamespace(disk=[SimpleNamespace(chain=_chain(1, 6))]),
+        ],
+    }
+    vm_b = {  # linked clone: parent base + own delta + one snapshot delta
+        "name": "vm-b",
+        "snapshot.rootSnapshotList": tree_b,
+        "snapshot.currentSnapshot": tree_b[0].snapshot,
+        "layoutEx.file": [
+            _file(1, "[ds1] gold/gold.vmdk", 30), _file(2, "[ds1] vm-b/vm-b.vmdk", 5),
+            _file(3, "[ds3] vm-b/vm-b-000001.vmdk", 6),
+        ],
+        "layoutEx.disk": [SimpleNamespace(chain=_chain(1, 2, 3))],
+    }
+    return stub, {vim.VirtualMachine: [
+        (vim.VirtualMachine("vm-1", stub), vm_a),
+        (vim.VirtualMachine("vm-2", stub), vm_b),
+        (vim.VirtualMachine("vm-3", stub), {"name": "vm-c"}),
+    ]}
+
+
+def test_one_pass_sizes_ages_and_ranking():
+    stub, fixtures = _fixtures()
+    si = make_si(fixtures, page_size=1)
+    report = snapshot_sprawl(si, now=NOW)
+
+    assert si.pc.call_count == 1
+    assert stub.calls == 0
+    a, b = report["vms"]
+    assert (a["name"], a["delta_gb"], a["datastores"]) == ("vm-a", 18.0, {"ds1": 13.0, "ds2": 5.0})
+    assert (a["count"], a["depth"], a["oldest"], a["age_days"], a["newest_age_days"]) == (
+        3, 2, "base", 40.0, 5.0,
+    )
+    assert (b["name"], b["delta_gb"], b["datastores"]) == ("vm-b", 6.0, {"ds3": 6.0})
+    assert report["total"] == 2 and report["delta_gb"] == 24.0
+    assert [(d["datastore"], d["delta_gb"]) for d in report["datastores"]] == [
+        ("ds1", 13.0), ("ds3", 6.0), ("ds2", 5.0),
+    ]
+    assert report["datastores"][0]["worst"] == [{"name": "vm-a", "delta_gb": 13.0}]
+
+
+def test_filters_sorting_and_cleanup_groups():
+    _, fixtures = _fixtures()
+    si = make_si(fixtures)
+
+    report = snapshot_sprawl(si, older_than_days=8, sort_by="age_days", limit=1, now=NOW)
+    assert [r["name"] for r in report["vms"]] == ["vm-b"]
+    assert report["total"] == 2
+    assert report["cleanup"] == [
+        {"snapshot": "base", "vms": ["vm-b", "vm-a"], "count": 2, "templates": []},
+        {"snapshot": "patch", "vms": ["vm-a"], "count": 1, "templates": []},
+    ]
+    assert [r["name"] for r in snapshot_sprawl(si, datastore="ds3", now=NOW)["vms"]] == ["vm-b"]
+    assert snapshot_sprawl(si, min_delta_gb=10, pattern="vm-*", now=NOW)["total"] == 1
+    with pytest.raises(ValueError, match="sort key"):
+        snapshot_sprawl(si, sort_by="size")
+
+
+def test_cli_report(monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import vm as vm_module
+
+    _, fixtures = _fixtures()
+    monkeypatch.setattr(
+        vm_module, "_get_connection", lambda target, config=None: (make_si(fixtures), None)
+    )
+    result = CliRunner().invoke(app, ["vm", "snapshot-sprawl", "--older-than", "8"])
+    assert result.exit_code == 0, result.output
+    assert "ds1" in result.output
+    assert "snapshot-delete" in result.output
+
+
+def _with_copies(fixtures, stub, n, template=False):
+    """``n`` more VMs (or templates) with one 30-day-old ``base`` snapshot."""
+    for i in range(n):
+        fixtures[vim.VirtualMachine].append((vim.VirtualMachine(f"vm-{100 + i}", stub), {
+            "name": f"{'tmpl' if template else 'app'}-{i:02d}", "config.template": template,
+            "snapshot.rootSnapshotList": [_snap(stub, f"snapshot-{100 + i}", "base", 30)],
+        }))
+    return fixtures
+
+
+def test_templates_are_not_bulk_delete_targets():
+    stub, fixtures = _fixtures()
+    report = snapshot_sprawl(make_si(_with_copies(fixtures, stub, 2, template=True)), now=NOW)
+    base = next(g for g in report["cleanup"] if g["snapshot"] == "base")
+    assert base == {
+        "snapshot": "base", "vms": ["vm-a", "vm-b"], "count": 2,
+        "templates": ["tmpl-00", "tmpl-01"],
+    }
+
+
+def test_cli_caps_names_per_group(monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import vm as vm_module
+
+    stub, fixtures = _fixtures()
+    _with_copies(_with_copies(fixtures, stub, 40), stub, 7, template=True)
+    monkeypatch.setattr(
+        vm_module, "_get_connection", lambda target, config=None: (make_si(fixtures), None)
+    )
+    result = CliRunner().invoke(app, ["vm", "snapshot-sprawl", "--older-than", "8"])
+    assert result.exit_code == 0, result.output
+    output = " ".join(result.output.split())
+    assert "'base' on 42 VMs" in output and "+37 more" in output
+    assert "app-39" not in output
+    assert "vmware-aiops vm snapshot-delete vm-a --name 'patch'" in output
+    assert "template(s) tmpl-00" in output and "+2 more" in output
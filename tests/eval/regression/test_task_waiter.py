@@ -0,0 +1,212 @@
+"""Regression — tasks are awaited with PropertyCollector updates, not polling.
+
+Before: ``_wait_for_task`` read ``task.info.state`` every 2 seconds and then
+``task.info`` again — several lazy round-trips per poll per task, and up to
+2 s of added latency for every finished task.
+
+Locked here:
+1. one private collector and ONE filter (``info.state`` / ``progress`` /
+   ``error`` / ``result``) covers any number of tasks; the collector is
+   destroyed afterwards;
+2. tasks are yielded in completion order, each as soon as its update
+   arrives, with result / fault taken from the update (no ``task.info`` read);
+3. a task already finished is reported even with ``timeout=0``; one still
+   running past the budget is reported ``running`` → ``TaskStillRunning``;
+4. ``_wait_for_task`` keeps the fault chain in ``TaskFailedError``;
+5. a graceful shutdown is awaited the same way — one filter on
+   ``runtime.powerState`` for any number of VMs — instead of a 2 s poll;
+6. an object that leaves the filter ends its wait at once: a task as an
+   ``error`` carrying ``ManagedObjectNotFound``, a VM as not reached.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from pyVmomi import vim, vmodl
+
+from tests.eval.regression._pc_fakes import _CountingStub
+from vmware_aiops.ops import tasks as task_waiter
+from vmware_aiops.ops.vm_lifecycle import TaskFailedError, TaskStillRunning, _wait_for_task
+
+
+def _change(task, **props):
+    return SimpleNamespace(
+        kind="modify",
+        obj=task,
+        changeSet=[
+            SimpleNamespace(name=f"info.{k}", op="assign", val=v) for k, v in props.items()
+        ],
+    )
+
+
+def _update(version, *changes):
+    return SimpleNamespace(version=version, filterSet=[SimpleNamespace(objectSet=list(changes))])
+
+
+class _TaskPC:
+    def __init__(self, updates):
+        self._updates = list(updates)
+        self.filters = []
+        self.waits = []
+        self.destroyed = 0
+
+    def CreateFilter(self, spec, partialUpdates):  # noqa: N802, N803 - pyVmomi API
+        self.filters.append((spec, partialUpdates))
+
+    def WaitForUpdatesEx(self, version, options):  # noqa: N802
+        self.waits.append((version, options.maxWaitSeconds))
+        return self._updates.pop(0) if self._updates else None
+
+    def Destroy(self):  # noqa: N802
+        self.destroyed += 1
+
+
+@pytest.fixture()
+def session(monkeypatch):
+    """A stub whose service collector hands out one scripted private collector."""
+    stub = _CountingStub()
+    holder = {}
+
+    def install(updates):
+        pc = _TaskPC(updates)
+        holder["pc"] = pc
+        task_waiter._COLLECTORS[stub] = SimpleNamespace(CreatePropertyCollector=lambda: pc)
+        return pc
+
+    yield stub, install
+    task_waiter._COLLECTORS.pop(stub, None)
+
+
+def test_one_filter_for_many_tasks_in_completion_order(session):
+    stub, install = session
+    t1, t2, t3 = (vim.Task(f"task-{i}", stub) for i in (1, 2, 3))
+    pc = install([
+        _update("1", *(_change(t, state="running", progress=0) for t in (t1, t2, t3))),
+        _update("2", _change(t2, state="success", result="vm-42")),
+        None,  # maxWaitSeconds elapsed
+        _update("3", _change(t1, state="error", error=SimpleNamespace(msg="disk full")),
+                _change(t3, progress=80)),
+        _update("4", _change(t3, state="success")),
+    ])
+
+    waiter = task_waiter.wait_for_tasks([t1, t2, t3], timeout=600)
+    first = next(waiter)
+    assert (first.task_id, first.state, first.result) == ("task-2", "success", "vm-42")
+    assert len(pc.waits) == 2  # yielded before the rest were awaited
+    rest = list(waiter)
+
+    assert [(o.task_id, o.state) for o in rest] == [("task-1", "error"), ("task-3", "success")]
+    assert rest[0].error.msg == "disk full"
+    assert rest[1].progress == 80
+    [(spec, partial)] = pc.filters
+    assert partial is False
+    assert [o.obj for o in spec.objectSet] == [t1, t2, t3]
+    assert spec.propSet[0].pathSet == ["info.state", "info.progress", "info.error", "info.result"]
+    assert [v for v, _ in pc.waits] == ["", "1", "2", "2", "3"]
+    assert all(0 < w <= 60 for _, w in pc.waits)
+    assert pc.destroyed == 1
+    assert stub.calls == 0  # no lazy task.info reads
+
+
+def test_finished_task_reported_with_zero_timeout(session):
+    stub, install = session
+    task = vim.Task("task-9", stub)
+    install([_update("1", _change(task, state="success", result=None))])
+    assert _wait_for_task(task, timeout=0) is None
+
+
+def test_budget_exceeded_is_still_running(session):
+    stub, install = session
+    task = vim.Task("task-7", stub)
+    pc = install([_update("1", _change(task, state="running", progress=35))])
+
+    with pytest.raises(TaskStillRunning) as caught:
+        _wait_for_task(task, timeout=0)
+    assert caught.value.task_id == "task-7"
+    assert pc.destroyed == 1
+
+    install([_update("1", _change(task, state="queued"))])
+    [outcome] = task_waiter.wait_for_tasks([task], timeout=0)
+    assert outcome.state == "running"
+
+
+def test_failed_task_keeps_fault_chain(session):
+    stub, install = session
+    task = vim.Task("task-3", stub)
+    fault = SimpleNamespace(
+        msg="A specified parameter was not correct",
+        faultCause=SimpleNamespace(msg="spec.location.host"),
+        faultMessage=[],
+    )
+    install([_update("1", _change(task, state="error", error=fault))])
+    with pytest.raises(TaskFailedError, match="caused_by=spec.location.host"):
+        _wait_for_task(task)
+
+
+def test_power_state_wait_is_one_filter(session):
+    from vmware_aiops.ops.vm_lifecycle import _await_powered_off
+
+    stub, install = session
+    vm1, vm2 = (vim.VirtualMachine(f"vm-{i}", stub) for i in (1, 2))
+
+    def power(vm, state):
+        return SimpleNamespace(
+            kind="modify", obj=vm,
+            changeSet=[SimpleNamespace(name="runtime.powerState", op="assign", val=state)],
+        )
+
+    pc = install([
+        _update("1", power(vm1, "poweredOn"), power(vm2, "poweredOn")),
+        _update("2", power(vm2, "poweredOff")),
+        _update("3", power(vm1, "poweredOff")),
+    ])
+    got = list(task_waiter.wait_for_values(
+        [vm1, vm2], "runtime.powerState", ("poweredOff",), timeout=600,
+    ))
+    assert [(vm._moId, str(v), reached) for vm, v, reached in got] == [
+        ("vm-2", "poweredOff", True), ("vm-1", "poweredOff", True),
+    ]
+    [(spec, _)] = pc.filters
+    assert spec.propSet[0].pathSet == ["runtime.powerState"]
+    assert spec.propSet[0].type is vim.VirtualMachine
+    assert pc.destroyed == 1
+
+    install([_update("1", power(vm1, "poweredOn"))])
+    assert _await_powered_off(vm1, timeout=0) is False
+    install([_update("1", power(vm1, "poweredOff"))])
+    assert _await_powered_off(vm1, timeout=0) is True
+    assert stub.calls == 0
+
+
+def test_object_that_leaves_ends_its_wait(session):
+    stub, install = session
+    t1, t2 = (vim.Task(f"task-{i}", stub) for i in (1, 2))
+    pc = install([
+        _update("1", *(_change(t, state="running") for t in (t1, t2))),
+        _update("2", SimpleNamespace(kind="leave", obj=t1, changeSet=[])),
+        _update("3", _change(t2, state="success")),
+    ])
+    gone, done = task_waiter.wait_for_tasks([t1, t2], timeout=600)
+    assert (gone.task_id, gone.state) == ("task-1", "error")
+    assert isinstance(gone.error, vmodl.fault.ManagedObjectNotFound)
+    assert "Recent Tasks" in gone.error.msg
+    assert (done.task_id, done.state) == ("task-2", "success")
+    assert len(pc.waits) == 3  # the vanished task did not hold the wait open
+
+    vm = vim.VirtualMachine("vm-1", stub)
+    install([
+        _update("1", SimpleNamespace(kind="enter", obj=vm, changeSet=[
+            SimpleNamespace(name="runtime.powerState", op="assign", val="poweredOn"),
+        ])),
+        _update("2", SimpleNamespace(kind="leave", obj=vm, changeSet=[])),
+    ])
+    [(_, value, reached)] = task_waiter.wait_for_values(
+        [vm], "runtime.powerState", ("poweredOff",), timeout=600,
+    )
+    assert (value, reached) == ("poweredOn", False)
+    install([_update("1", SimpleNamespace(kind="leave", obj=t1, changeSet=[]))])
+    with pytest.raises(TaskFailedError, match="disappeared"):
+        _wait_for_task(t1)
+    assert stub.calls == 0
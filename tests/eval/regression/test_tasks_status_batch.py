@@ -0,0 +1,92 @@
+"""Regression — batch task polling (``vm_lifecycle.get_tasks_status``).
+
+Before: ``get_task_status`` built one ``vim.Task`` and read ``task.info``
+lazily, so polling the 50 "running" rows of a ``wait=False`` bulk run was 50
+round-trips per poll.
+
+Locked here:
+1. every task's ``info`` is read in ONE ``RetrievePropertiesEx``, with no
+   lazy read on any task moref;
+2. vCenter rejects the whole call when one id was garbage-collected; that id
+   is reported ``gone`` and the rest are re-read without it;
+3. ids are de-duplicated and rows come back in request order, shaped like the
+   single-id status (``task_error`` for a failed task, never ``error``);
+4. ``vm task-status`` with several ids prints one table.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from pyVmomi import vmodl
+from typer.testing import CliRunner
+
+from tests.eval.regression._pc_fakes import _Batch, _CountingStub, _ObjContent, make_si
+from vmware_aiops.ops.vm_lifecycle import get_tasks_status
+
+
+class _TaskCollector:
+    """PropertyCollector that fails the whole call on a gc'd task, like vCenter."""
+
+    def __init__(self, infos: dict, gone: set) -> None:
+        self.infos, self.gone = infos, gone
+        self.call_count = 0
+
+    def RetrievePropertiesEx(self, specs, options):  # noqa: N802 - pyVmomi API
+        self.call_count += 1
+        objs = [o.obj for o in specs[0].objectSet]
+        for obj in objs:
+            if obj._moId in self.gone:
+                raise vmodl.fault.ManagedObjectNotFound(obj=obj)
+        return _Batch([_ObjContent(o, {"info": self.infos[o._moId]}) for o in objs])
+
+
+def _info(state, progress=None, error=None):
+    return SimpleNamespace(
+        state=state, progress=progress, error=error,
+        descriptionId="VirtualMachine.removeSnapshot", entityName="web-01",
+    )
+
+
+def _si(gone=()):
+    infos = {
+        "task-1": _info("running", 40),
+        "task-2": _info("success", 100),
+        "task-3": _info("error", error=SimpleNamespace(msg="Disk locked")),
+    }
+    si = make_si({})
+    si._stub = stub = _CountingStub()
+    si.pc = si._content.propertyCollector = _TaskCollector(infos, set(gone))
+    return si, stub
+
+
+def test_all_ids_in_one_call_in_request_order():
+    si, stub = _si()
+    rows = get_tasks_status(si, ["task-3", "task-1", "task-3", "task-2"])
+    assert si.pc.call_count == 1
+    assert stub.calls == 0
+    assert [(r["task_id"], r["state"]) for r in rows] == [
+        ("task-3", "error"), ("task-1", "running"), ("task-2", "success"),
+    ]
+    assert rows[0]["task_error"] == "Disk locked" and "error" not in rows[0]
+    assert rows[1]["progress_pct"] == 40
+
+
+def test_gone_ids_are_dropped_and_the_rest_reread():
+    si, _ = _si(gone={"task-8", "task-9"})
+    rows = get_tasks_status(si, ["task-1", "task-8", "task-9", "task-2"])
+    assert [r["state"] for r in rows] == ["running", "gone", "gone", "success"]
+    assert "garbage-collected" in rows[1]["note"]
+    assert si.pc.call_count == 3  # one retry per gone id
+
+
+def test_cli_many_ids_print_one_table(monkeypatch):
+    from vmware_aiops.cli import app
+    from vmware_aiops.cli import vm as vm_module
+
+    si, _ = _si(gone={"task-9"})
+    monkeypatch.setattr(vm_module, "_get_connection", lambda target, config=None: (si, None))
+    result = CliRunner().invoke(app, ["vm", "task-status", "task-1", "task-3", "task-9"])
+    assert result.exit_code == 0, result.output
+    assert "Task Status" in result.output
+    assert "Disk locked" in result.output and "gone" in result.output
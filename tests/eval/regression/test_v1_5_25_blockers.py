@@ -139,26 +139,18 @@ def test_mcp_config_install_imports_json() -> None:
 def test_wait_for_task_preserves_fault_cause() -> None:
     """Without faultCause / faultMessage, users get a useless 'Task failed'
     message and can't diagnose host/datastore/permission issues."""
+    from tests.eval.regression._pc_fakes import fake_task
     from vmware_aiops.ops.vm_lifecycle import TaskFailedError, _wait_for_task
 
-    task = MagicMock()
-    task.info.state = "error"
-
     err = MagicMock()
     err.msg = "A specified parameter was not correct"
     cause = MagicMock()
     cause.msg = "spec.location.host"
     err.faultCause = cause
     err.faultMessage = []
-    task.info.error = err
-
-    # Force loop exit immediately
-    with patch("vmware_aiops.ops.vm_lifecycle.vim") as mock_vim:
-        mock_vim.TaskInfo.State.running = "running"
-        mock_vim.TaskInfo.State.queued = "queued"
-        mock_vim.TaskInfo.State.success = "success"
-        with pytest.raises(TaskFailedError) as exc:
-            _wait_for_task(task)
+
+    with pytest.raises(TaskFailedError) as exc:
+        _wait_for_task(fake_task(state="error", error=err))
 
     msg = str(exc.value)
     assert "caused_by" in msg or "spec.location.host" in msg, \
@@ -117,6 +117,16 @@ PROPERTY_CHAINS = [
     ("VirtualMachine", "guest.toolsRunningStatus"),
     ("VirtualMachine", "guest.guestFullName"),
     ("VirtualMachine", "config.template"),
+    # get_vm_info / get_vms_info batched detail
+    ("VirtualMachine", "runtime.host"),
+    ("VirtualMachine", "config.hardware.numCPU"),
+    ("VirtualMachine", "config.hardware.memoryMB"),
+    ("VirtualMachine", "config.guestFullName"),
+    ("VirtualMachine", "config.guestId"),
+    ("VirtualMachine", "config.instanceUuid"),
+    ("VirtualMachine", "guest.hostName"),
+    ("VirtualMachine", "guest.toolsVersion"),
+    ("VirtualMachine", "snapshot.rootSnapshotList"),
     ("VirtualMachine", "config.uuid"),
     ("VirtualMachine", "config.hardware.device"),
     ("VirtualMachine", "config.annotation"),
@@ -125,9 +135,22 @@ PROPERTY_CHAINS = [
     ("VirtualMachine", "snapshot.rootSnapshotList.childSnapshotList"),
     ("VirtualMachine", "snapshot.currentSnapshot"),
     ("VirtualMachine", "datastore.name"),
+    # snapshot_sprawl fleet pass
+    ("VirtualMachine", "snapshot.rootSnapshotList.createTime"),
+    ("VirtualMachine", "snapshot.rootSnapshotList.description"),
+    ("VirtualMachine", "snapshot.rootSnapshotList.state"),
+    ("VirtualMachine", "layoutEx.file.key"),
+    ("VirtualMachine", "layoutEx.file.name"),
+    ("VirtualMachine", "layoutEx.file.type"),
+    ("VirtualMachine", "layoutEx.file.size"),
+    ("VirtualMachine", "layoutEx.disk.chain.fileKey"),
+    ("VirtualMachine", "layoutEx.snapshot.disk.chain.fileKey"),
+    ("VirtualMachine", "config.template"),
     ("VirtualMachine", "network"),
     ("VirtualMachine", "resourcePool"),
     ("VirtualMachine", "parent"),
+    ("VirtualMachine", "parentVApp"),
+    ("ManagedEntity", "parent"),
     ("VirtualMachine", "triggeredAlarmState.overallStatus"),
     ("VirtualMachine", "triggeredAlarmState.acknowledged"),
     ("VirtualMachine", "triggeredAlarmState.time"),
@@ -162,6 +185,8 @@ PROPERTY_CHAINS = [
     ("HostSystem", "summary.hardware.memorySize"),
     ("HostSystem", "hardware.memorySize"),
     ("HostSystem", "datastore.name"),
+    ("HostSystem", "network"),
+    ("HostSystem", "config.network.pnic.linkSpeed.speedMb"),
     # ClusterComputeResource
     ("ClusterComputeResource", "name"),
     ("ClusterComputeResource", "host.name"),
@@ -169,6 +194,8 @@ PROPERTY_CHAINS = [
     ("ClusterComputeResource", "resourcePool"),
     ("ClusterComputeResource", "configurationEx"),
     ("ClusterComputeResource", "summary.numHosts"),
+    # linked_clone_jobs reads the pool of a cluster or standalone host
+    ("ComputeResource", "resourcePool"),
     # Datacenter / Folder
     ("Datacenter", "name"),
     ("Datacenter", "hostFolder"),
@@ -184,15 +211,27 @@ PROPERTY_CHAINS = [
     ("Datastore", "summary.capacity"),
     ("Datastore", "summary.freeSpace"),
     ("Datastore", "summary.accessible"),
+    ("Datastore", "summary.maintenanceMode"),
     ("Datastore", "browser"),
     # Tasks
     ("Task", "info.state"),
+    ("Task", "info.progress"),
+    ("Task", "info.error"),
+    ("Task", "info.result"),
+    # Bulk power-on result (Datacenter.PowerOnMultiVM_Task)
+    ("cluster.PowerOnVmResult", "attempted.vm"),
+    ("cluster.PowerOnVmResult", "attempted.task"),
+    ("cluster.PowerOnVmResult", "notAttempted.vm"),
+    ("cluster.PowerOnVmResult", "notAttempted.fault.msg"),
     ("TaskInfo", "state"),
     ("TaskInfo", "error"),
     ("TaskInfo", "result"),
     ("TaskInfo", "progress"),
     ("TaskInfo", "entityName"),
     ("TaskInfo", "descriptionId"),
+    # Deploy preflight ISO check (HostDatastoreBrowser.SearchDatastore_Task)
+    ("host.DatastoreBrowser.SearchResults", "file"),
+    ("host.DatastoreBrowser.FileInfo", "path"),
     # Alarms — C2 regression: AlarmFilterSpec has ONLY these three fields
     ("alarm.AlarmFilterSpec", "status"),
     ("alarm.AlarmFilterSpec", "typeEntity"),
@@ -201,6 +240,8 @@ PROPERTY_CHAINS = [
     ("alarm.AlarmState", "entity.name"),
     ("alarm.AlarmState", "overallStatus"),
     ("alarm.AlarmState", "acknowledged"),
+    ("ManagedEntity", "triggeredAlarmState"),
+    ("alarm.Alarm", "info.name"),
     # Events
     ("event.Event", "fullFormattedMessage"),
     ("event.Event", "createdTime"),
@@ -224,7 +265,17 @@ METHODS = [
     ("ServiceInstance", "CurrentTime"),
     ("view.ViewManager", "CreateContainerView"),
     ("view.ContainerView", "Destroy"),
+    # Alarm watch mode (PropertyCollector push updates)
+    ("PropertyCollector", "CreatePropertyCollector"),
+    ("PropertyCollector", "CreateFilter"),
+    ("PropertyCollector", "WaitForUpdatesEx"),
+    ("PropertyCollector", "CancelWaitForUpdates"),
+    ("PropertyCollector", "Destroy"),
     ("event.EventManager", "QueryEvents"),
+    # VM locators (uuid:/bios:/ip:/inventory path)
+    ("SearchIndex", "FindByInventoryPath"),
+    ("SearchIndex", "FindAllByUuid"),
+    ("SearchIndex", "FindAllByIp"),
     # C1 regression: the Folder method is MoveIntoFolder_Task (param 'list');
     # plain MoveInto_Task exists only on ClusterComputeResource (param 'host').
     ("Folder", "MoveIntoFolder_Task"),
@@ -236,6 +287,7 @@ METHODS = [
     ("ComputeResource", "ReconfigureComputeResource_Task"),
     ("ManagedEntity", "Destroy_Task"),
     ("ManagedEntity", "Rename_Task"),
+    ("Datacenter", "PowerOnMultiVM_Task"),
     # VirtualMachine lifecycle
     ("VirtualMachine", "PowerOn"),
     ("VirtualMachine", "PowerOff"),
@@ -245,6 +297,7 @@ METHODS = [
     ("VirtualMachine", "RebootGuest"),
     ("VirtualMachine", "Relocate"),
     ("VirtualMachine", "Clone"),
+    ("VirtualMachine", "InstantClone_Task"),
     ("VirtualMachine", "CreateSnapshot_Task"),
     ("VirtualMachine", "ReconfigVM_Task"),
     ("VirtualMachine", "MarkAsTemplate"),
@@ -260,6 +313,7 @@ METHODS = [
     ("host.StorageSystem", "RescanVmfs"),
     ("host.StorageSystem", "UpdateSoftwareInternetScsiEnabled"),
     ("host.DatastoreBrowser", "SearchDatastoreSubFolders_Task"),
+    ("host.DatastoreBrowser", "SearchDatastore_Task"),
     # Alarms — C2 regression
     ("alarm.AlarmManager", "AcknowledgeAlarm"),
     ("alarm.AlarmManager", "ClearTriggeredAlarms"),
@@ -0,0 +1,115 @@
+"""Regression — VM detail comes from batched property reads (``get_vm_info``).
+
+Before: ``get_vm_info`` touched ``vm.config``, ``vm.guest``, ``vm.runtime``,
+``vm.snapshot`` and ``runtime.host.name`` lazily — one SOAP round-trip each,
+on every CLI write preview.
+
+Locked here:
+1. one VM is read with ONE ``RetrievePropertiesEx`` for its detail paths
+   (devices and snapshot tree included) plus one for the host name — no
+   lazy access on the VM or host moref (the fakes would fail loudly);
+2. ``get_vms_info`` serves N VMs in three paged collections (names, detail,
+   host names), in request order, with an error entry per unknown name;
+3. the returned dict keeps the shape the CLI previews rely on.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, make_si
+from vmware_aiops.ops.vm_lifecycle import get_vm_info, get_vms_info
+
+
+def _disk(label, gb, thin):
+    return vim.vm.device.VirtualDisk(
+        deviceInfo=vim.Description(label=label, summary=""),
+        capacityInKB=gb * 1024 * 1024,
+        backing=vim.vm.device.VirtualDisk.FlatVer2BackingInfo(thinProvisioned=thin),
+    )
+
+
+def _nic(network):
+    return vim.vm.device.VirtualVmxnet3(
+        deviceInfo=vim.Description(label="Network adapter 1", summary=""),
+        macAddress="00:50:56:aa:bb:cc",
+        connectable=vim.vm.device.VirtualDevice.ConnectInfo(connected=True),
+        backing=vim.vm.device.VirtualEthernetCard.NetworkBackingInfo(deviceName=network),
+    )
+
+
+def _fixtures():
+    stub = _CountingStub()
+    host = vim.HostSystem("host-1", stub)
+    web1 = vim.VirtualMachine("vm-1", stub)
+    web2 = vim.VirtualMachine("vm-2", stub)
+    tree = [SimpleNamespace(childSnapshotList=[SimpleNamespace(childSnapshotList=None)])]
+    return stub, {
+        vim.VirtualMachine: [
+            (web1, {
+                "name": "web-01",
+                "runtime.powerState": "poweredOn",
+                "runtime.host": host,
+                "config.hardware.numCPU": 4,
+                "config.hardware.memoryMB": 8192,
+                "config.hardware.device": [_disk("Hard disk 1", 40, True), _nic("VM Network")],
+                "config.guestFullName": "Ubuntu Linux (64-bit)",
+                "config.guestId": "ubuntu64Guest",
+                "config.uuid": "4201-aaaa",
+                "config.instanceUuid": "5001-aaaa",
+                "guest.ipAddress": "10.0.0.11",
+                "guest.hostName": "web-01.lab",
+                "guest.toolsRunningStatus": "guestToolsRunning",
+                "guest.toolsVersion": "12352",
+                "snapshot.rootSnapshotList": tree,
+            }),
+            (web2, {"name": "web-02", "runtime.powerState": "poweredOff"}),
+        ],
+        vim.HostSystem: [(host, {"name": "esxi-01.lab"})],
+    }
+
+
+def test_single_vm_is_two_batched_reads():
+    stub, fixtures = _fixtures()
+    si = make_si(fixtures)
+    info = get_vm_info(si, "web-01")
+    # 1 name lookup + 1 VM detail read + 1 host-name read.
+    assert si.pc.call_count == 3
+    assert stub.calls == 0
+    assert info == {
+        "name": "web-01",
+        "power_state": "poweredOn",
+        "cpu": 4,
+        "memory_mb": 8192,
+        "guest_os": "Ubuntu Linux (64-bit)",
+        "guest_id": "ubuntu64Guest",
+        "uuid": "4201-aaaa",
+        "instance_uuid": "5001-aaaa",
+        "host": "esxi-01.lab",
+        "ip_address": "10.0.0.11",
+        "hostname": "web-01.lab",
+        "tools_status": "guestToolsRunning",
+        "tools_version": "12352",
+        "disks": [{"label": "Hard disk 1", "size_gb": 40.0, "thin": True}],
+        "nics": [{"label": "Network adapter 1", "mac": "00:50:56:aa:bb:cc",
+                  "connected": True, "network": "VM Network"}],
+        "annotation": "",
+        "snapshot_count": 2,
+    }
+
+
+def test_many_vms_in_three_collections():
+    stub, fixtures = _fixtures()
+    si = make_si(fixtures, page_size=1)
+    infos = get_vms_info(si, ["web-02", "nope", "web-01"])
+    assert [i["name"] for i in infos] == ["web-02", "nope", "web-01"]
+    assert "not found" in infos[1]["error"]
+    assert infos[2]["host"] == "esxi-01.lab"
+    # Unset config / guest / snapshot: defaults, not lazy reads.
+    assert infos[0]["cpu"] == 0
+    assert infos[0]["host"] == "N/A"
+    assert (infos[0]["tools_status"], infos[0]["snapshot_count"]) == ("N/A", 0)
+    assert si.pc.call_count == 3
+    assert stub.calls == 0
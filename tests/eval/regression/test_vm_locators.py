@@ -0,0 +1,124 @@
+"""Regression — addressing VMs by UUID, IP or inventory path.
+
+Before: every VM argument was a display name, resolved by scanning every VM's
+``name``; two VMs called ``web-01`` in different folders could not be told
+apart, and a bulk run could only report "rename one".
+
+Locked here:
+1. ``uuid:``/``bios:``/``ip:`` and inventory paths resolve with ONE
+   ``SearchIndex`` call and no name scan; a BIOS UUID or IP shared by clones
+   is an error, never a guess;
+2. ``select_vms`` picks one of two same-named VMs by locator, still refuses a
+   template and reports an unknown locator with the accepted forms; with
+   only locators it reads just those VMs and their folders' parents, never
+   the whole inventory;
+3. ``get_vms_info`` mixes names and locators, skipping the name scan when
+   every argument is a locator.
+"""
+
+from __future__ import annotations
+
+import pytest
+from pyVmomi import vim
+
+from tests.eval.regression._pc_fakes import _CountingStub, make_si
+from vmware_aiops.ops.fleet import select_vms
+from vmware_aiops.ops.inventory import InventoryError, find_vm_by_name, is_vm_locator
+from vmware_aiops.ops.vm_lifecycle import VMNotFoundError, _require_vm, get_vms_info
+
+_stub = _CountingStub()
+A = vim.VirtualMachine("vm-1", _stub)
+B = vim.VirtualMachine("vm-2", _stub)
+TPL = vim.VirtualMachine("vm-3", _stub)
+DC = vim.Datacenter("datacenter-1", _stub)
+PROD, VM_ROOT = vim.Folder("group-v7", _stub), vim.Folder("group-v3", _stub)
+
+
+class _SearchIndex:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def FindByInventoryPath(self, inventoryPath):  # noqa: N802,N803 - pyVmomi API
+        self.calls.append(("path", inventoryPath))
+        return {"dc1/vm/prod/web-01": A, "dc1/vm/tpl/golden": TPL}.get(
+            inventoryPath, DC if inventoryPath == "dc1" else None
+        )
+
+    def FindAllByUuid(self, uuid, vmSearch, instanceUuid):  # noqa: N802,N803
+        self.calls.append(("uuid" if instanceUuid else "bios", uuid))
+        if instanceUuid:
+            return {"5001-a": [A], "5001-b": [B]}.get(uuid, [])
+        return [A, B] if uuid == "4201-cloned" else []
+
+    def FindAllByIp(self, ip, vmSearch):  # noqa: N802,N803 - pyVmomi API
+        self.calls.append(("ip", ip))
+        return [B] if ip == "10.0.0.2" else []
+
+
+def _props(name, template=False):
+    return {
+        "name": name, "config.template": template, "runtime.powerState": "poweredOn",
+        "parent": PROD,
+    }
+
+
+@pytest.fixture()
+def si():
+    si = make_si({
+        vim.Datacenter: [(DC, {"name": "dc1"})],
+        vim.VirtualMachine: [
+            (A, _props("web-01")), (B, _props("web-01")), (TPL, _props("golden", True)),
+        ],
+        vim.ManagedEntity: [(PROD, {"parent": VM_ROOT}), (VM_ROOT, {"parent": DC})],
+    })
+    si._content.searchIndex = _SearchIndex()
+    return si
+
+
+def test_locators_resolve_with_one_search_index_call(si):
+    index = si._content.searchIndex
+    assert find_vm_by_name(si, "uuid:5001-b") is B
+    assert find_vm_by_name(si, "ip:10.0.0.2") is B
+    assert find_vm_by_name(si, "/dc1/vm/prod/web-01/") is A
+    assert find_vm_by_name(si, "path:dc1") is None  # a datacenter, not a VM
+    assert index.calls == [
+        ("uuid", "5001-b"), ("ip", "10.0.0.2"), ("path", "dc1/vm/prod/web-01"), ("path", "dc1"),
+    ]
+    assert si.pc.call_count == 0  # no name scan
+
+    with pytest.raises(InventoryError, match="2 VMs match 'bios:4201-cloned'"):
+        find_vm_by_name(si, "bios:4201-cloned")
+    with pytest.raises(VMNotFoundError, match="Locators: uuid:"):
+        _require_vm(si, "uuid:nope")
+    assert not is_vm_locator("web-01") and is_vm_locator("dc1/vm/web-01")
+
+
+def test_select_vms_disambiguates_by_locator(si):
+    targets, errors = select_vms(
+        si, vm_names=["web-01", "uuid:5001-a", "ip:10.0.0.2", "dc1/vm/tpl/golden", "uuid:nope"],
+    )
+    assert [t.vm for t in targets] == [A, B]
+    msgs = {r["name"]: r["message"] for r in errors}
+    assert "address one by uuid:<instanceUuid>" in msgs["web-01"]
+    assert "Is a template" in msgs["dc1/vm/tpl/golden"]
+    assert msgs["uuid:nope"].startswith("No VM matches this locator. Locators:")
+
+
+def test_select_vms_locators_only_skip_the_inventory_scan(si):
+    targets, errors = select_vms(
+        si, vm_names=["uuid:5001-b", "dc1/vm/tpl/golden", "bios:4201-cloned"],
+    )
+    assert [(t.vm, t.datacenter) for t in targets] == [(B, DC)]
+    assert [r["name"] for r in errors] == ["dc1/vm/tpl/golden", "bios:4201-cloned"]
+    # the located VMs, then one parent read per folder level (prod, vm)
+    assert si.pc.call_count == 3
+
+
+def test_get_vms_info_locators_skip_the_name_scan(si):
+    rows = get_vms_info(si, ["uuid:5001-b", "uuid:nope"])
+    assert si.pc.call_count == 1  # B's detail paths only: no name scan, no host
+    assert rows[0]["name"] == "web-01"
+    assert rows[1]["error"].startswith("No VM matches 'uuid:nope'. Locators:")
+
+    rows = get_vms_info(si, ["golden", "ip:10.0.0.2"])
+    assert [r["name"] for r in rows] == ["golden", "web-01"]
@@ -0,0 +1,198 @@
+"""Regression — webhook delivery is spooled, retried and coalesced.
+
+Before: ``_run_scan`` called ``httpx.post`` inline. A slow endpoint stalled the
+cycle for ``webhook_timeout`` seconds and any failure dropped the batch.
+
+Exercised against a real local HTTP server (``_StandIn``) that can inject
+latency and scripted failures:
+1. ``enqueue`` returns immediately even when the endpoint is slow;
+2. 5xx keeps the batch, backs the endpoint off, and the retry coalesces every
+   spooled batch into one POST;
+3. batches survive a sender restart (the spool is on disk);
+4. ``Retry-After`` on 429 is honoured; a permanent 4xx is moved to ``*.dead``;
+5. one keep-alive connection is reused across POSTs.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vmware_aiops.notify.webhook_queue import WebhookSender, WebhookSpool
+
+
+class _StandIn:
+    """Local webhook endpoint. ``script`` is a list of status codes to answer
+    with, in order (200 once exhausted); ``delay`` sleeps before answering."""
+
+    def __init__(self) -> None:
+        self.script: list[int] = []
+        self.delay = 0.0
+        self.headers: dict[str, str] = {}
+        self.bodies: list[dict] = []
+        self.peers: set[tuple] = set()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # noqa: N802 - http.server API name
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(stand_in.delay)
+                stand_in.peers.add(self.client_address)
+                code = stand_in.script.pop(0) if stand_in.script else 200
+                if code < 300:
+                    stand_in.bodies.append(json.loads(body))
+                self.send_response(code)
+                for k, v in stand_in.headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/hook"
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = _StandIn()
+    yield server
+    server.close()
+
+
+def _issue(msg: str) -> dict:
+    return {"severity": "critical", "source": "alarm", "message": msg, "entity": "e"}
+
+
+def _sender(url, tmp_path, **kw) -> WebhookSender:
+    kw.setdefault("rate_per_minute", 0)
+    kw.setdefault("backoff_base", 0.05)
+    return WebhookSender(url, WebhookSpool(str(tmp_path / "spool")), timeout=5, **kw)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_enqueue_does_not_wait_for_a_slow_endpoint(stand_in, tmp_path):
+    stand_in.delay = 0.5
+    sender = _sender(stand_in.url, tmp_path)
+    sender.start()
+    try:
+        start = time.perf_counter()
+        sender.enqueue([_issue("slow")])
+        assert time.perf_counter() - start < 0.2
+        assert _wait_for(lambda: len(stand_in.bodies) == 1)
+    finally:
+        sender.stop()
+
+
+def test_failure_backs_off_then_coalesces(stand_in, tmp_path):
+    stand_in.script = [503]
+    sender = _sender(stand_in.url, tmp_path, backoff_base=0.2)
+    sender.enqueue([_issue("a")])
+    assert sender.drain_once() == "failed"
+    sender.enqueue([_issue("b")])
+    sender.enqueue([_issue("c")])
+    assert sender.drain_once() == "waiting"
+    time.sleep(0.3)
+    assert sender.drain_once() == "sent"
+    sender.stop()
+
+    assert len(stand_in.bodies) == 1
+    assert [i["message"] for i in stand_in.bodies[0]["issues"]] == ["a", "b", "c"]
+    assert stand_in.bodies[0]["summary"].startswith("VMware AIops: 3 critical")
+    assert sender.drain_once() == "idle"
+
+
+def test_max_batch_splits_large_backlogs(stand_in, tmp_path):
+    sender = _sender(stand_in.url, tmp_path, max_batch=2)
+    for m in "abc":
+        sender.enqueue([_issue(m)])
+    assert sender.drain_once() == "sent"
+    assert sender.drain_once() == "sent"
+    sender.stop()
+    assert [[i["message"] for i in b["issues"]] for b in stand_in.bodies] == [["a", "b"], ["c"]]
+
+
+def test_spool_survives_restart(stand_in, tmp_path):
+    stand_in.script = [500]
+    first = _sender(stand_in.url, tmp_path)
+    first.enqueue([_issue("persisted")])
+    assert first.drain_once() == "failed"
+    first.stop()
+
+    second = _sender(stand_in.url, tmp_path)
+    assert second.drain_once() == "sent"
+    second.stop()
+    assert stand_in.bodies[0]["issues"][0]["message"] == "persisted"
+
+
+def test_retry_after_is_honoured(stand_in, tmp_path):
+    stand_in.script = [429]
+    stand_in.headers = {"Retry-After": "30"}
+    sender = _sender(stand_in.url, tmp_path)
+    sender.enqueue([_issue("x")])
+    assert sender.drain_once() == "failed"
+    time.sleep(0.2)  # well past backoff_base, well short of Retry-After
+    assert sender.drain_once() == "waiting"
+    sender.stop()
+
+
+def test_permanent_rejection_is_moved_aside(stand_in, tmp_path):
+    stand_in.script = [400]
+    sender = _sender(stand_in.url, tmp_path)
+    sender.enqueue([_issue("bad")])
+    assert sender.drain_once() == "dead"
+    sender.stop()
+    spool = tmp_path / "spool"
+    assert not list(spool.glob("*.json"))
+    assert len(list(spool.glob("*.dead"))) == 1
+
+
+def test_rate_limit_spaces_posts(stand_in, tmp_path):
+    sender = _sender(stand_in.url, tmp_path, rate_per_minute=60, max_batch=1)
+    sender.enqueue([_issue("a")])
+    sender.enqueue([_issue("b")])
+    assert sender.drain_once() == "sent"
+    assert sender.drain_once() == "waiting"
+    sender.stop()
+
+
+def test_keep_alive_connection_is_reused(stand_in, tmp_path):
+    sender = _sender(stand_in.url, tmp_path, max_batch=1)
+    for m in "abc":
+        sender.enqueue([_issue(m)])
+    for _ in range(3):
+        assert sender.drain_once() == "sent"
+    sender.stop()
+    assert len(stand_in.bodies) == 3
+    assert len(stand_in.peers) == 1
+
+
+def test_spool_is_bounded(tmp_path):
+    spool = WebhookSpool(str(tmp_path / "spool"), max_files=3)
+    for m in "abcde":
+        spool.put([_issue(m)])
+    kept = [spool.read(p)[0]["message"] for p in spool.pending()]
+    assert kept == ["c", "d", "e"]
@@ -155,3 +155,76 @@ def test_username_and_password_rotate_together(sample_config_file: Path, monkeyp
     assert (target.username, target.password) == ("svc-b@vsphere.local", "pw-b"), (
         "the pair came apart — one half is bound at load time and the other at access"
     )
+
+
+@pytest.mark.unit
+def test_host_log_patterns_default(sample_config_file: Path) -> None:
+    from vmware_aiops.config import DEFAULT_HOST_LOG_PATTERNS
+
+    cfg = load_config(sample_config_file)
+    assert cfg.scanner.host_log_patterns == DEFAULT_HOST_LOG_PATTERNS
+
+
+@pytest.mark.unit
+def test_host_log_patterns_from_yaml(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text("""
+scanner:
+  host_log_patterns:
+    warning: [Timeout, "APD"]
+    critical: PSOD
+""", encoding="utf-8")
+    cfg = load_config(path)
+    # Ordered most-severe first, lowercased, bare strings accepted.
+    assert cfg.scanner.host_log_patterns == (
+        ("critical", ("psod",)),
+        ("warning", ("timeout", "apd")),
+    )
+
+
+@pytest.mark.unit
+def test_host_log_patterns_unknown_severity(tmp_path: Path) -> None:
+    from vmware_aiops.config import ConfigError
+
+    path = tmp_path / "config.yaml"
+    path.write_text("scanner:\n  host_log_patterns:\n    fatal: [panic]\n", encoding="utf-8")
+    with pytest.raises(ConfigError, match="fatal"):
+        load_config(path)
+
+
+@pytest.mark.unit
+def test_notify_dedup_settings(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "notify:\n  dedup_enabled: false\n  renotify_minutes: 0\n"
+        "  state_file: /tmp/x.json\n",
+        encoding="utf-8",
+    )
+    cfg = load_config(path)
+    assert cfg.notify.dedup_enabled is False
+    assert cfg.notify.renotify_minutes == 0
+    assert cfg.notify.state_file == "/tmp/x.json"
+    assert cfg.notify.state_max_entries == 5000
+
+
+def test_metrics_settings(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "metrics:\n  enabled: true\n  port: 9464\n", encoding="utf-8",
+    )
+    cfg = load_config(path)
+    assert cfg.metrics.enabled is True
+    assert cfg.metrics.port == 9464
+    assert cfg.metrics.textfile.endswith("metrics.prom")
+
+
+def test_notify_history_settings(tmp_path: Path) -> None:
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "notify:\n  history_enabled: false\n  history_retention_days: 7\n",
+        encoding="utf-8",
+    )
+    cfg = load_config(path)
+    assert cfg.notify.history_enabled is False
+    assert cfg.notify.history_retention_days == 7
+    assert cfg.notify.history_file.endswith("scan_history.db")
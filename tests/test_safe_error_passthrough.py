@@ -128,13 +128,14 @@ def test_failed_browse_task_keeps_its_remedy_through_the_wrapper() -> None:
     remedy written into it — deliberately capped so it would survive the
     300-char truncation — was replaced by "RuntimeError: operation failed."
     before it ever reached the agent."""
-    from unittest.mock import MagicMock
+    from types import SimpleNamespace
 
+    from tests.eval.regression._pc_fakes import fake_task
     from vmware_aiops.ops.datastore_browser import _wait_for_task
 
-    task = MagicMock()
-    task.info.state = "error"
-    task.info.error.msg = "The object or item referred to could not be found."
+    task = fake_task(state="error", error=SimpleNamespace(
+        msg="The object or item referred to could not be found.",
+    ))
 
     with pytest.raises(DatastoreBrowseError) as caught:
         _wait_for_task(task)
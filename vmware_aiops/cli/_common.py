@@ -38,6 +38,7 @@ def _cli_error_types() -> tuple[type[BaseException], ...]:
 
     from vmware_aiops.ops.cluster_mgmt import ClusterError, ClusterNotFoundError
     from vmware_aiops.ops.guest_ops import GuestOpsError
+    from vmware_aiops.ops.inventory import InventoryError
     from vmware_aiops.ops.vm_lifecycle import (
         TaskFailedError,
         TaskStillRunning,
@@ -51,6 +52,7 @@ def _cli_error_types() -> tuple[type[BaseException], ...]:
         TaskStillRunning,
         ClusterNotFoundError,
         ClusterError,
+        InventoryError,
         KeyError,
         OSError,
         vim.fault.InvalidLogin,
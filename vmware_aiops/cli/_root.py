@@ -14,6 +14,7 @@ from vmware_aiops.cli.doctor import doctor_cmd
 from vmware_aiops.cli.hub import hub_app
 from vmware_aiops.cli.investigate import attention_cmd, investigate_app
 from vmware_aiops.cli.mcp_config import mcp_config_app
+from vmware_aiops.cli.metrics import metrics_cmd
 from vmware_aiops.cli.plan import plan_app
 from vmware_aiops.cli.scan import daemon_app, scan_app
 from vmware_aiops.cli.summary import cluster_summary_cmd
@@ -42,6 +43,7 @@ app.command("summary")(cluster_summary_cmd)
 app.command("attention")(attention_cmd)
 app.add_typer(investigate_app, name="investigate")
 app.command("doctor")(doctor_cmd)
+app.command("metrics")(metrics_cmd)
 
 
 @app.command("init")
@@ -1,10 +1,11 @@
-"""Cluster management commands: create, delete, configure HA/DRS, add/remove hosts."""
+"""Cluster management commands: create, delete, configure HA/DRS, add/remove/evacuate hosts."""
 
 from __future__ import annotations
 
 from typing import Annotated
 
 import typer
+from rich.table import Table
 from vmware_policy import guarded
 
 from vmware_aiops.cli._common import (
@@ -370,3 +371,65 @@ def cluster_drs_rule_delete_cmd(
         resource=f"{name}/{rule_name}",
         before_state=out["deleted"]["rule"], result=out["action"],
     )
+
+
+@cluster_app.command("evacuate-host")
+@cli_errors
+@guarded(risk_level='high')
+def cluster_evacuate_host_cmd(
+    host: str,
+    to: Annotated[
+        list[str] | None, typer.Option("--to", help="Only move VMs to this host (repeatable)")
+    ] = None,
+    skip_powered_off: Annotated[
+        bool, typer.Option("--skip-powered-off", help="Leave powered-off VMs on the host")
+    ] = False,
+    concurrency: Annotated[int, typer.Option(min=1, help="Max VMs moved at once")] = 8,
+    per_host: Annotated[
+        int | None,
+        typer.Option(min=1, help="Max vMotions per host (default: 4 on 1GbE, 8 on 10GbE+)"),
+    ] = None,
+    target: TargetOption = None,
+    config: ConfigOption = None,
+    dry_run: DryRunOption = False,
+) -> None:
+    """vMotion every VM off a host to the other hosts of its cluster, in parallel."""
+    from vmware_aiops.ops.host_evacuate import apply_evacuation, plan_evacuation
+
+    si, _ = _get_connection(target, config)
+    plan = plan_evacuation(si, host, destinations=to, include_powered_off=not skip_powered_off)
+    table = Table(title=f"Evacuation Plan: {plan.host}")
+    table.add_column("VM", style="cyan")
+    table.add_column("To")
+    table.add_column("Mem(MB)", justify="right")
+    for m in plan.moves:
+        table.add_row(m.name, m.destination_name, str(m.memory_mb))
+    for r in plan.unplaced:
+        style = "dim" if r["status"] == "skipped" else "red"
+        table.add_row(r["name"], f"[{style}]{r['status']}[/]", r["message"])
+    console.print(table)
+    limits = ", ".join(f"{h}={n}" for h, n in plan.limits.items())
+    console.print(f"  Concurrent vMotions per host: {limits}")
+    if dry_run:
+        console.print(f"[magenta][DRY-RUN] would move {len(plan.moves)} VM(s) off {plan.host}[/]")
+        return
+    if not plan.moves:
+        console.print("[yellow]Nothing to move.[/]")
+        return
+    _double_confirm(
+        f"迁移 {len(plan.moves)} 台虚拟机", host, _resolve_target(target), resource_type="Host",
+    )
+
+    def progress(r: dict) -> None:
+        style = "green" if r["status"] == "ok" else "yellow" if r["status"] == "running" else "red"
+        console.print(f"  [{style}]{r['status']:>7}[/] {r['name']}: {r['message']}")
+
+    results = apply_evacuation(plan, concurrency=concurrency, per_host=per_host, on_result=progress)
+    ok = sum(1 for r in results if r["status"] == "ok")
+    console.print(f"[green]Moved {ok}/{len(results)} VM(s) off {plan.host}.[/]")
+    _audit.log(
+        target=_resolve_target(target), operation="host_evacuate", resource=host,
+        parameters={"to": to, "skip_powered_off": skip_powered_off,
+                    "concurrency": concurrency, "per_host": per_host},
+        result=f"{ok}/{len(results)} OK, {len(plan.unplaced)} not moved",
+    )
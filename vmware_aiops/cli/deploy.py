@@ -209,6 +209,10 @@ def deploy_linked_clone_cmd(
     )
 
 
+# "skipped": not started because the spec's preflight found problems elsewhere
+_BATCH_STATUS_STYLE = {"ok": "green", "skipped": "dim"}
+
+
 @deploy_app.command("batch")
 @cli_errors
 @guarded(risk_level='high')
@@ -236,7 +240,12 @@ def deploy_batch_cmd(
     vm_names = [v["name"] for v in deploy_spec["vms"]]
     console.print(f"[bold yellow]批量部署 {len(vm_names)} 台 VM: {', '.join(vm_names)}[/]")
     _double_confirm(f"批量部署 {len(vm_names)} 台 VM", ", ".join(vm_names), _resolve_target(target))
-    results = batch_deploy(si, spec)
+
+    def progress(r: dict) -> None:
+        style = _BATCH_STATUS_STYLE.get(r["status"], "red")
+        console.print(f"  [{style}]{r['status']:>7}[/] {r['name']}: {r['messages'][-1]}")
+
+    results = batch_deploy(si, spec, on_result=progress)
 
     # Display results
     table = Table(title="Batch Deploy Results")
@@ -244,11 +253,17 @@ def deploy_batch_cmd(
     table.add_column("Status")
     table.add_column("Details")
     for r in results:
-        status_style = "green" if r["status"] == "ok" else "red"
+        status_style = _BATCH_STATUS_STYLE.get(r["status"], "red")
+        details = r.get("messages", [])
+        if r.get("placement"):
+            where = r["placement"]
+            details = [
+                f"placed on {where['host'] or where['cluster']} / {where['datastore'] or '-'}"
+            ] + details
         table.add_row(
             r["name"],
             f"[{status_style}]{r['status']}[/]",
-            " | ".join(r.get("messages", [])),
+            " | ".join(details),
         )
     console.print(table)
 
@@ -273,11 +288,16 @@ def deploy_batch_clone_cmd(
     memory: Annotated[int | None, typer.Option(help="Memory (MB)")] = None,
     snapshot: Annotated[str, typer.Option(help="Create baseline snapshot")] = "",
     power_on: Annotated[bool, typer.Option("--power-on")] = False,
+    concurrency: Annotated[int, typer.Option(min=1, help="Max clones in flight")] = 8,
+    per_host: Annotated[int, typer.Option(min=1, help="Max clones in flight per host")] = 8,
+    per_datastore: Annotated[
+        int, typer.Option(min=1, help="Max clones in flight per datastore")
+    ] = 4,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
 ) -> None:
-    """Batch clone VMs from a source VM (gold image)."""
+    """Batch clone VMs from a source VM (gold image), several clones in flight."""
     from vmware_aiops.ops.vm_deploy import batch_clone
 
     vm_names = [f"{prefix}-{i:02d}" for i in range(1, count + 1)]
@@ -286,16 +306,27 @@ def deploy_batch_clone_cmd(
             target=_resolve_target(target), vm_name=", ".join(vm_names),
             operation="batch_clone",
             api_call="vim.VirtualMachine.Clone() x N",
-            parameters={"source": source, "count": count, "prefix": prefix},
+            parameters={
+                "source": source, "count": count, "prefix": prefix,
+                "concurrency": concurrency, "per_host": per_host,
+                "per_datastore": per_datastore,
+            },
         )
         return
     si, _ = _get_connection(target, config)
     console.print(f"[bold yellow]批量克隆 {count} 台: {', '.join(vm_names)}[/]")
     _double_confirm(f"从 '{source}' 批量克隆 {count} 台", source, _resolve_target(target))
+
+    def progress(r: dict) -> None:
+        style = "green" if r["status"] == "ok" else "red"
+        console.print(f"  [{style}]{r['status']:>7}[/] {r['name']}: {r['messages'][-1]}")
+
     results = batch_clone(
         si, source_vm_name=source, vm_names=vm_names,
         cpu=cpu, memory_mb=memory,
         snapshot_name=snapshot or None, power_on=power_on,
+        concurrency=concurrency, per_host=per_host, per_datastore=per_datastore,
+        on_result=progress,
     )
 
     table = Table(title="Batch Clone Results")
@@ -314,6 +345,64 @@ def deploy_batch_clone_cmd(
     )
 
 
+@deploy_app.command("instant-clone")
+@cli_errors
+@guarded(risk_level='medium')
+def deploy_instant_clone_cmd(
+    source: Annotated[str, typer.Option(help="Running parent VM name")],
+    prefix: Annotated[str, typer.Option(help="VM name prefix")] = "vm",
+    count: Annotated[int, typer.Option(help="Number of clones")] = 1,
+    extra_config: Annotated[
+        list[str] | None,
+        typer.Option("--extra-config", help="key=value extraConfig ({name} = VM name), repeatable"),
+    ] = None,
+    concurrency: Annotated[int, typer.Option(min=1, help="Max clones in flight")] = 8,
+    per_host: Annotated[int, typer.Option(min=1, help="Max clones in flight per host")] = 8,
+    target: TargetOption = None,
+    config: ConfigOption = None,
+    dry_run: DryRunOption = False,
+) -> None:
+    """Instant-clone a running VM: clones fork its memory and come up running."""
+    from vmware_aiops.ops.vm_deploy import batch_instant_clone
+
+    pairs = [item.partition("=") for item in extra_config or []]
+    bad = [key for key, sep, _ in pairs if not sep or not key]
+    if bad:
+        raise typer.BadParameter(f"Expected key=value, got: {', '.join(bad)}")
+    keys = {key: value for key, _, value in pairs}
+    vm_names = [f"{prefix}-{i:02d}" for i in range(1, count + 1)]
+    if dry_run:
+        _dry_run_print(
+            target=_resolve_target(target), vm_name=", ".join(vm_names),
+            operation="instant_clone",
+            api_call="vim.VirtualMachine.InstantClone_Task() x N",
+            parameters={
+                "source": source, "count": count, "prefix": prefix,
+                "extra_config": keys, "concurrency": concurrency, "per_host": per_host,
+            },
+        )
+        return
+    si, _ = _get_connection(target, config)
+    console.print(f"[bold yellow]即时克隆 {count} 台: {', '.join(vm_names)}[/]")
+    _double_confirm(f"从 '{source}' 即时克隆 {count} 台", source, _resolve_target(target))
+
+    def progress(r: dict) -> None:
+        style = "green" if r["status"] == "ok" else "red"
+        console.print(f"  [{style}]{r['status']:>7}[/] {r['name']}: {r['messages'][-1]}")
+
+    results = batch_instant_clone(
+        si, parent_vm_name=source, vm_names=vm_names, extra_config=keys,
+        concurrency=concurrency, per_host=per_host, on_result=progress,
+    )
+    ok_count = sum(1 for r in results if r["status"] == "ok")
+    console.print(f"[bold]Result: {ok_count}/{len(results)} VMs instant-cloned.[/]")
+    _audit.log(
+        target=_resolve_target(target), operation="instant_clone",
+        resource=source, parameters={"count": count, "prefix": prefix},
+        result=f"{ok_count}/{len(results)} OK",
+    )
+
+
 @deploy_app.command("mark-template")
 @cli_errors
 @guarded(risk_level='medium')
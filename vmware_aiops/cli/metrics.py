@@ -0,0 +1,35 @@
+"""Metrics top-level command: print the self-telemetry snapshots."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from vmware_aiops.cli._common import ConfigOption, cli_errors, console
+
+
+@cli_errors
+def metrics_cmd(config: ConfigOption = None) -> None:
+    """Print the daemon and MCP server metrics (Prometheus text format)."""
+    from vmware_aiops.config import load_config
+
+    cfg = load_config(config)
+    daemon_file = Path(cfg.metrics.textfile).expanduser()
+    sources = [
+        ("daemon", daemon_file),
+        ("mcp", daemon_file.with_name("metrics-mcp.prom")),
+    ]
+    found = False
+    for label, path in sources:
+        if not path.is_file():
+            continue
+        found = True
+        typer.echo(f"# source: {label} ({path})")
+        typer.echo(path.read_text(encoding="utf-8"), nl=False)
+    if not found:
+        console.print(
+            "[yellow]No metrics recorded yet.[/] Set metrics.enabled: true in "
+            "config.yaml (daemon) or VMWARE_AIOPS_METRICS=1 (MCP server)."
+        )
+        raise typer.Exit(1)
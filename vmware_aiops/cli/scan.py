@@ -1,10 +1,15 @@
-"""Scan and daemon commands: one-time scan, daemon start/stop/status."""
+"""Scan and daemon commands: one-time scan, scan history, daemon start/stop/status."""
 
 from __future__ import annotations
 
+import re
 import signal
+import time
+from datetime import datetime
+from typing import Annotated
 
 import typer
+from rich.table import Table
 
 from vmware_aiops.cli._common import (
     ConfigOption,
@@ -47,6 +52,96 @@ def scan_now(target: TargetOption = None, config: ConfigOption = None) -> None:
             )
 
 
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([mhdw])$")
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def _parse_when(value: str | None, now: float) -> float | None:
+    """``30m`` / ``24h`` / ``7d`` / ``2w`` ago, or an ISO date/datetime -> epoch."""
+    if value is None:
+        return None
+    match = _RELATIVE.match(value.strip())
+    if match:
+        return now - float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise typer.BadParameter(
+            f"'{value}' is neither a relative age (30m, 24h, 7d, 2w) "
+            "nor an ISO date/datetime (2026-10-01, 2026-10-01T08:00)."
+        ) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()  # naive input means local time
+    return parsed.timestamp()
+
+
+@scan_app.command("history")
+@cli_errors
+def scan_history(
+    since: Annotated[str, typer.Option(help="Age (30m, 24h, 7d, 2w) or ISO date")] = "24h",
+    until: Annotated[str | None, typer.Option(help="Age or ISO date (exclusive)")] = None,
+    severity: Annotated[str | None, typer.Option(help="critical, warning or info")] = None,
+    entity: Annotated[str | None, typer.Option(help="Exact entity name")] = None,
+    source: Annotated[
+        str | None, typer.Option(help="alarm, event, connection or host_log:<log>")
+    ] = None,
+    transition: Annotated[
+        str | None, typer.Option(help="new, escalated, renotify or resolved")
+    ] = None,
+    limit: Annotated[int, typer.Option(help="Max rows (0 = all)")] = 50,
+    target: TargetOption = None,
+    config: ConfigOption = None,
+) -> None:
+    """Query logged scan issues from the indexed history store, newest first."""
+    from vmware_aiops.config import load_config
+    from vmware_aiops.notify.history import ScanHistory
+
+    cfg = load_config(config)
+    now = time.time()
+    try:
+        rows, total = ScanHistory(cfg.notify.history_file).query(
+            since=_parse_when(since, now),
+            until=_parse_when(until, now),
+            limit=limit,
+            severity=severity,
+            entity=entity,
+            source=source,
+            target=target,
+            transition=transition,
+        )
+    except ValueError as e:  # unknown severity
+        raise typer.BadParameter(str(e), param_hint="--severity") from None
+    if not rows:
+        console.print("[green]No matching issues in scan history.[/]")
+        return
+    table = Table(title="Scan History")
+    table.add_column("Time")
+    table.add_column("Severity", style="bold")
+    table.add_column("Target")
+    table.add_column("Source")
+    table.add_column("Entity")
+    table.add_column("Transition")
+    table.add_column("Message", overflow="fold")
+    for r in rows:
+        sev = r.get("severity", "info")
+        sev_style = {"critical": "red", "warning": "yellow", "info": "cyan"}.get(sev, "white")
+        when = datetime.fromisoformat(r["timestamp"]) if r.get("timestamp") else None
+        table.add_row(
+            when.astimezone().strftime("%Y-%m-%d %H:%M:%S") if when else "-",
+            f"[{sev_style}]{sev.upper()}[/]",
+            r.get("target", "-"),
+            r.get("source", "-"),
+            r.get("entity", "-"),
+            r.get("transition", "-"),
+            r.get("message", ""),
+        )
+    console.print(table)
+    if total > len(rows):
+        console.print(
+            f"[dim]Showing {len(rows)} of {total}; raise --limit or narrow the filters.[/]"
+        )
+
+
 # ─── Daemon ───────────────────────────────────────────────────────────────────
 
 
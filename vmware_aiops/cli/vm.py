@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Annotated
 
 import typer
@@ -26,21 +27,174 @@ from vmware_aiops.cli._common import (
 vm_app = typer.Typer(help="VM lifecycle: power, snapshot, clone, migrate.")
 
 
+# ─── Info ─────────────────────────────────────────────────────────────────────
+
+
+@vm_app.command("info")
+@cli_errors
+def vm_info(
+    names: Annotated[list[str], typer.Argument(help="VM name(s)")],
+    target: TargetOption = None,
+    config: ConfigOption = None,
+) -> None:
+    """Show VM details (power, sizing, host, guest, disks, NICs, snapshots)."""
+    from vmware_aiops.ops.vm_lifecycle import get_vms_info
+
+    si, _ = _get_connection(target, config)
+    table = Table(title="VM Info")
+    for column in ("VM", "Power", "CPU", "Mem(MB)", "Host", "IP", "Tools", "Disks", "NICs",
+                   "Snapshots"):
+        table.add_column(column, style="cyan" if column == "VM" else None)
+    missing = []
+    for info in get_vms_info(si, names):
+        if "error" in info:
+            missing.append(info["error"])
+            continue
+        table.add_row(
+            info["name"], info["power_state"], str(info["cpu"]), str(info["memory_mb"]),
+            info["host"], info["ip_address"] or "-", info["tools_status"],
+            ", ".join(f"{d['size_gb']}G" for d in info["disks"]) or "-",
+            ", ".join(n["network"] for n in info["nics"]) or "-",
+            str(info["snapshot_count"]),
+        )
+    if table.row_count:
+        console.print(table)
+    for message in missing:
+        console.print(f"[red]{message}[/]")
+    if missing:
+        raise typer.Exit(1)
+
+
 # ─── Power ────────────────────────────────────────────────────────────────────
 
 
+NamesArgument = Annotated[
+    list[str] | None, typer.Argument(
+        help="VM name(s) or locators (uuid:, bios:, ip:, dc/vm/folder/name); "
+        "several run as one bulk operation"
+    )
+]
+MatchOption = Annotated[
+    str | None,
+    typer.Option("--match", help="Also select VMs whose name matches this glob, e.g. 'web-*'"),
+]
+ConcurrencyOption = Annotated[
+    int, typer.Option(min=1, help="Max VMs processed at once in a bulk operation")
+]
+
+_BULK_API = {
+    "on": "vim.Datacenter.PowerOnMultiVM_Task() per datacenter",
+    "off": "vim.VirtualMachine.ShutdownGuest() x N",
+    "off-force": "vim.VirtualMachine.PowerOff() x N",
+    "reset": "vim.VirtualMachine.Reset() x N",
+    "suspend": "vim.VirtualMachine.Suspend() x N",
+    "snapshot-create": "vim.VirtualMachine.CreateSnapshot_Task() x N",
+    "snapshot-revert": "vim.vm.Snapshot.RevertToSnapshot_Task() x N",
+    "snapshot-delete": "vim.vm.Snapshot.RemoveSnapshot_Task() x N",
+    "clean-slate": "vim.VirtualMachine.PowerOff() + vim.vm.Snapshot.RevertToSnapshot_Task() x N",
+}
+_STATUS_STYLE = {"ok": "green", "skipped": "dim", "running": "yellow", "error": "red"}
+
+
+def _run_bulk(
+    operation: str,
+    api_call: str,
+    label: str,
+    names: list[str],
+    match: str | None,
+    target: str | None,
+    config: str | None,
+    dry_run: bool,
+    parameters: dict,
+    apply: Callable[[list], list[dict]],
+    confirm: bool = True,
+    paths: tuple[str, ...] = (),
+) -> None:
+    """Resolve, confirm and run one bulk operation, then print per-VM results."""
+    from vmware_aiops.ops.fleet import select_vms
+
+    si, _ = _get_connection(target, config)
+    try:
+        targets, errors = select_vms(si, names, match, paths)
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    selector = match or ", ".join(names)
+    vm_list = ", ".join(t.name for t in targets)
+    if dry_run:
+        _dry_run_print(
+            target=_resolve_target(target), vm_name=vm_list or "(no VM matched)",
+            operation=operation, api_call=api_call,
+            parameters={**parameters, "count": len(targets)},
+        )
+        return
+    if targets and confirm:
+        console.print(f"[bold yellow]批量{label} {len(targets)} 台: {vm_list}[/]")
+        _double_confirm(f"批量{label} {len(targets)} 台", selector, _resolve_target(target))
+    results = apply(targets) + errors
+
+    table = Table(title=f"{operation.replace('_', ' ').title()} Results")
+    table.add_column("VM", style="cyan")
+    table.add_column("Status")
+    table.add_column("Details")
+    for r in results:
+        style = _STATUS_STYLE.get(r["status"], "red")
+        table.add_row(r["name"], f"[{style}]{r['status']}[/]", r["message"])
+    console.print(table)
+    _audit.log(
+        target=_resolve_target(target), operation=operation,
+        resource=selector, parameters=parameters,
+        result=f"{sum(1 for r in results if r['status'] in ('ok', 'skipped'))}/{len(results)} OK",
+    )
+
+
+def _bulk_power(
+    action: str,
+    label: str,
+    names: list[str],
+    match: str | None,
+    target: str | None,
+    config: str | None,
+    dry_run: bool,
+    force: bool = False,
+    concurrency: int = 8,
+    confirm: bool = True,
+    shutdown_timeout: int = 120,
+    escalate: bool = False,
+) -> None:
+    from vmware_aiops.ops.bulk_power import apply_power
+
+    parameters = {"names": names, "match": match, "force": force, "concurrency": concurrency}
+    if action == "off" and not force:
+        parameters.update(timeout=shutdown_timeout, escalate=escalate)
+    _run_bulk(
+        f"batch_power_{action}", _BULK_API["off-force" if action == "off" and force else action],
+        label, names, match, target, config, dry_run, parameters,
+        lambda targets: apply_power(
+            targets, action, force=force, concurrency=concurrency,
+            shutdown_timeout=shutdown_timeout, escalate=escalate,
+        ),
+        confirm=confirm,
+    )
+
+
 @vm_app.command("power-on")
 @cli_errors
 @guarded(risk_level='medium')
 def vm_power_on(
-    name: str,
+    names: NamesArgument = None,
+    match: MatchOption = None,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
 ) -> None:
-    """Power on a VM."""
+    """Power on one VM, or many by name / --match (one multi-VM task per datacenter)."""
     from vmware_aiops.ops.vm_lifecycle import power_on_vm
 
+    names = names or []
+    if len(names) != 1 or match:
+        _bulk_power("on", "开机", names, match, target, config, dry_run, confirm=False)
+        return
+    name = names[0]
     si, _ = _get_connection(target, config)
     if dry_run:
         from vmware_aiops.ops.vm_lifecycle import get_vm_info
@@ -67,41 +221,91 @@ def vm_power_on(
 @cli_errors
 @guarded(risk_level='medium')
 def vm_power_off(
-    name: str,
+    names: NamesArgument = None,
+    match: MatchOption = None,
     force: Annotated[bool, typer.Option(help="Force power off")] = False,
+    timeout: Annotated[
+        int, typer.Option(min=1, help="Seconds to wait for a graceful shutdown")
+    ] = 120,
+    escalate: Annotated[
+        bool, typer.Option(help="Hard power off if the guest has not stopped after --timeout")
+    ] = False,
+    concurrency: ConcurrencyOption = 8,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
 ) -> None:
-    """Power off a VM (graceful shutdown or force)."""
+    """Power off one VM, or many by name / --match (graceful shutdown or force)."""
     from vmware_aiops.ops.vm_lifecycle import get_vm_info, power_off_vm
 
+    names = names or []
+    if len(names) != 1 or match:
+        _bulk_power(
+            "off", "关机", names, match, target, config, dry_run,
+            force=force, concurrency=concurrency, shutdown_timeout=timeout, escalate=escalate,
+        )
+        return
+    name = names[0]
     si, _ = _get_connection(target, config)
     before = get_vm_info(si, name)
     if dry_run:
         api = "vim.VirtualMachine.PowerOff()" if force else "vim.VirtualMachine.ShutdownGuest()"
         _dry_run_print(
             target=_resolve_target(target), vm_name=name, operation="power_off",
-            api_call=api, parameters={"force": force},
+            api_call=api, parameters={"force": force, "timeout": timeout, "escalate": escalate},
             before_state={"power_state": before.get("power_state")},
             expected_after={"power_state": "poweredOff"},
         )
         return
     _show_state_preview(before, "关机", name)
     _double_confirm("关机", name, _resolve_target(target))
-    result = power_off_vm(si, name, force=force)
+    result = power_off_vm(si, name, force=force, timeout=timeout, escalate=escalate)
     console.print(f"[green]{result}[/]")
     _audit.log(
         target=_resolve_target(target),
         operation="power_off",
         resource=name,
-        parameters={"force": force},
+        parameters={"force": force, "timeout": timeout, "escalate": escalate},
         before_state={"power_state": before.get("power_state")},
         after_state={"power_state": "poweredOff"},
         result=result,
     )
 
 
+@vm_app.command("reset")
+@cli_errors
+@guarded(risk_level='high')
+def vm_reset(
+    names: NamesArgument = None,
+    match: MatchOption = None,
+    concurrency: ConcurrencyOption = 8,
+    target: TargetOption = None,
+    config: ConfigOption = None,
+    dry_run: DryRunOption = False,
+) -> None:
+    """Reset (hard reboot) powered-on VMs by name / --match."""
+    _bulk_power(
+        "reset", "重置", names or [], match, target, config, dry_run, concurrency=concurrency,
+    )
+
+
+@vm_app.command("suspend")
+@cli_errors
+@guarded(risk_level='medium')
+def vm_suspend(
+    names: NamesArgument = None,
+    match: MatchOption = None,
+    concurrency: ConcurrencyOption = 8,
+    target: TargetOption = None,
+    config: ConfigOption = None,
+    dry_run: DryRunOption = False,
+) -> None:
+    """Suspend powered-on VMs by name / --match."""
+    _bulk_power(
+        "suspend", "挂起", names or [], match, target, config, dry_run, concurrency=concurrency,
+    )
+
+
 @vm_app.command("create")
 @cli_errors
 @guarded(risk_level='medium')
@@ -257,24 +461,77 @@ def vm_reconfigure(
 # ─── Snapshots ────────────────────────────────────────────────────────────────
 
 
+PerDatastoreOption = Annotated[
+    int, typer.Option(min=1, help="Max concurrent snapshot tasks per datastore (bulk only)")
+]
+
+
+def _bulk_snapshot(
+    action: str,
+    label: str,
+    snap_name: str,
+    names: list[str],
+    match: str | None,
+    target: str | None,
+    config: str | None,
+    dry_run: bool,
+    concurrency: int,
+    per_datastore: int,
+    confirm: bool = True,
+    timeout: int | None = None,
+    **options,
+) -> None:
+    from vmware_aiops.ops.bulk_snapshot import SNAPSHOT_PATHS, apply_snapshot
+
+    parameters = {
+        "names": names, "match": match, "snap_name": snap_name, **options,
+        "concurrency": concurrency, "per_datastore": per_datastore,
+    }
+    _run_bulk(
+        f"batch_snapshot_{action}", _BULK_API[f"snapshot-{action}"],
+        label, names, match, target, config, dry_run, parameters,
+        lambda targets: apply_snapshot(
+            targets, action, snap_name, concurrency=concurrency,
+            per_datastore=per_datastore, timeout=timeout, **options,
+        ),
+        confirm=confirm, paths=SNAPSHOT_PATHS,
+    )
+
+
 @vm_app.command("snapshot-create")
 @cli_errors
 @guarded(risk_level='medium')
 def vm_snapshot_create(
-    vm_name: str,
+    names: NamesArgument = None,
+    match: MatchOption = None,
     snap_name: Annotated[str, typer.Option("--name", help="Snapshot name")] = "snapshot",
     description: Annotated[str, typer.Option(help="Snapshot description")] = "",
-    memory: Annotated[bool, typer.Option(help="Include memory")] = True,
+    memory: Annotated[
+        bool | None,
+        typer.Option(help="Include memory (default: yes for one VM, no for a bulk run)"),
+    ] = None,
     quiesce: Annotated[
         bool, typer.Option(help="Quiesce guest filesystem (requires running VMware Tools)")
     ] = False,
+    concurrency: ConcurrencyOption = 8,
+    per_datastore: PerDatastoreOption = 2,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
 ) -> None:
-    """Create a VM snapshot."""
+    """Create a snapshot on one VM, or on many by name / --match."""
     from vmware_aiops.ops.vm_lifecycle import create_snapshot
 
+    names = names or []
+    if len(names) != 1 or match:
+        _bulk_snapshot(
+            "create", "创建快照", snap_name, names, match, target, config, dry_run,
+            concurrency, per_datastore, confirm=False,
+            description=description, memory=bool(memory), quiesce=quiesce,
+        )
+        return
+    vm_name = names[0]
+    memory = True if memory is None else memory
     if dry_run:
         _dry_run_print(
             target=_resolve_target(target), vm_name=vm_name, operation="snapshot_create",
@@ -320,19 +577,115 @@ def vm_snapshot_list(
         console.print(f"{prefix}[cyan]{s['name']}[/] ({s['created']}) - {s['description']}")
 
 
+@vm_app.command("snapshot-sprawl")
+@cli_errors
+def vm_snapshot_sprawl(
+    older_than: Annotated[
+        float, typer.Option(min=0, help="Only VMs whose oldest snapshot is this many days old")
+    ] = 0,
+    min_gb: Annotated[
+        float, typer.Option(min=0, help="Only VMs whose snapshots use at least this many GB")
+    ] = 0,
+    datastore: Annotated[
+        str | None, typer.Option(help="Only VMs with snapshot files on this datastore")
+    ] = None,
+    match: Annotated[str | None, typer.Option("--match", help="VM name glob, e.g. 'web-*'")] = None,
+    sort: Annotated[
+        str, typer.Option(help="delta_gb | age_days | depth | count | name")
+    ] = "delta_gb",
+    limit: Annotated[int, typer.Option(min=0, help="VM rows to show (0 = all)")] = 20,
+    target: TargetOption = None,
+    config: ConfigOption = None,
+) -> None:
+    """Rank snapshot sprawl across all VMs: age, chain depth, delta size per datastore."""
+    from vmware_aiops.ops.snapshot_sprawl import SORT_KEYS, snapshot_sprawl
+
+    if sort not in SORT_KEYS:
+        raise typer.BadParameter(f"--sort must be one of: {', '.join(SORT_KEYS)}")
+    si, _ = _get_connection(target, config)
+    report = snapshot_sprawl(
+        si, older_than_days=older_than, min_delta_gb=min_gb, datastore=datastore,
+        pattern=match, sort_by=sort, limit=limit,
+    )
+    if not report["total"]:
+        console.print("[yellow]No VM snapshots match.[/]")
+        return
+
+    ds_table = Table(title=f"Snapshot Delta by Datastore ({report['delta_gb']} GB total)")
+    for column in ("Datastore", "Delta(GB)", "VMs", "Worst"):
+        ds_table.add_column(column, style="cyan" if column == "Datastore" else None)
+    for d in report["datastores"]:
+        ds_table.add_row(
+            d["datastore"], str(d["delta_gb"]), str(d["vm_count"]),
+            ", ".join(f"{w['name']} ({w['delta_gb']})" for w in d["worst"]),
+        )
+    console.print(ds_table)
+
+    vm_table = Table(title=f"VM Snapshots ({len(report['vms'])} of {report['total']})")
+    for column in ("VM", "Snapshots", "Depth", "Oldest", "Age(d)", "Delta(GB)"):
+        vm_table.add_column(column, style="cyan" if column == "VM" else None)
+    for r in report["vms"]:
+        vm_table.add_row(
+            r["name"], str(r["count"]), str(r["depth"]), r["oldest"],
+            str(r["age_days"]), str(r["delta_gb"]),
+        )
+    console.print(vm_table)
+
+    if report["cleanup"]:
+        console.print("[bold]Cleanup (bulk delete, double confirm):[/]")
+        for group in report["cleanup"][:10]:
+            _print_cleanup_group(group)
+
+
+_CLEANUP_NAMES = 10
+
+
+def _print_cleanup_group(group: dict) -> None:
+    """One snapshot-delete line per sprawl cleanup group, names capped."""
+    snap, vms, templates = group["snapshot"], group["vms"], group["templates"]
+    if 0 < len(vms) <= _CLEANUP_NAMES:
+        console.print(f"  vmware-aiops vm snapshot-delete {' '.join(vms)} --name '{snap}'")
+    elif vms:
+        console.print(
+            f"  '{snap}' on {len(vms)} VMs ({_capped(vms)}): "
+            f"vmware-aiops vm snapshot-delete --match '<glob>' --name '{snap}'"
+        )
+    if templates:
+        console.print(
+            f"  [dim]'{snap}' is also on template(s) {_capped(templates)}: bulk delete "
+            f"rejects templates; convert one to a VM to delete its snapshots.[/]"
+        )
+
+
+def _capped(names: list[str], shown: int = 5) -> str:
+    more = f", ... +{len(names) - shown} more" if len(names) > shown else ""
+    return ", ".join(names[:shown]) + more
+
+
 @vm_app.command("snapshot-revert")
 @cli_errors
 @guarded(risk_level='high')
 def vm_snapshot_revert(
-    vm_name: str,
     snap_name: Annotated[str, typer.Option("--name", help="Snapshot name to revert to")],
+    names: NamesArgument = None,
+    match: MatchOption = None,
+    concurrency: ConcurrencyOption = 8,
+    per_datastore: PerDatastoreOption = 2,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
 ) -> None:
-    """Revert VM to a snapshot."""
+    """Revert one VM, or many by name / --match, to a snapshot."""
     from vmware_aiops.ops.vm_lifecycle import get_vm_info, revert_to_snapshot
 
+    names = names or []
+    if len(names) != 1 or match:
+        _bulk_snapshot(
+            "revert", "恢复快照", snap_name, names, match, target, config, dry_run,
+            concurrency, per_datastore,
+        )
+        return
+    vm_name = names[0]
     si, _ = _get_connection(target, config)
     before = get_vm_info(si, vm_name)
     if dry_run:
@@ -362,8 +715,11 @@ def vm_snapshot_revert(
 @cli_errors
 @guarded(risk_level='high')
 def vm_snapshot_delete(
-    vm_name: str,
     snap_name: Annotated[str, typer.Option("--name", help="Snapshot name to delete")],
+    names: NamesArgument = None,
+    match: MatchOption = None,
+    concurrency: ConcurrencyOption = 8,
+    per_datastore: PerDatastoreOption = 2,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
@@ -380,9 +736,17 @@ def vm_snapshot_delete(
         typer.Option(help="Seconds to wait for consolidation before returning the task id."),
     ] = 1800,
 ) -> None:
-    """Delete a VM snapshot (waits up to 30 min for delta consolidation)."""
+    """Delete a snapshot from one VM, or many by name / --match (waits up to 30 min)."""
     from vmware_aiops.ops.vm_lifecycle import delete_snapshot
 
+    names = names or []
+    if len(names) != 1 or match:
+        _bulk_snapshot(
+            "delete", "删除快照", snap_name, names, match, target, config, dry_run,
+            concurrency, per_datastore, timeout=0 if no_wait else timeout,
+        )
+        return
+    vm_name = names[0]
     if dry_run:
         _dry_run_print(
             target=_resolve_target(target), vm_name=vm_name, operation="snapshot_delete",
@@ -407,21 +771,38 @@ def vm_snapshot_delete(
 @vm_app.command("task-status")
 @cli_errors
 def vm_task_status(
-    task_id: Annotated[str, typer.Argument(help="Task id from a --no-wait operation")],
+    task_ids: Annotated[
+        list[str], typer.Argument(help="Task id(s) from --no-wait or bulk operations")
+    ],
     target: TargetOption = None,
     config: ConfigOption = None,
 ) -> None:
-    """Poll a long-running task (e.g. an async snapshot delete) by its id."""
-    from vmware_aiops.ops.vm_lifecycle import get_task_status
+    """Poll long-running tasks (e.g. async snapshot deletes) by id; many ids are one call."""
+    from vmware_aiops.ops.vm_lifecycle import get_task_status, get_tasks_status
 
     si, _ = _get_connection(target, config)
-    status = get_task_status(si, task_id)
-    state = status.get("state")
-    colour = {"success": "green", "error": "red", "gone": "yellow"}.get(state, "cyan")
-    console.print(f"[bold {colour}]Task {task_id}: {state}[/]")
-    for key in ("operation", "entity", "progress_pct", "task_error", "note"):
-        if status.get(key) is not None:
-            console.print(f"  {key}: {status[key]}")
+    colours = {"success": "green", "error": "red", "gone": "yellow"}
+    if len(task_ids) == 1:
+        status = get_task_status(si, task_ids[0])
+        state = status.get("state")
+        console.print(f"[bold {colours.get(state, 'cyan')}]Task {task_ids[0]}: {state}[/]")
+        for key in ("operation", "entity", "progress_pct", "task_error", "note"):
+            if status.get(key) is not None:
+                console.print(f"  {key}: {status[key]}")
+        return
+    table = Table(title="Task Status")
+    for column in ("Task", "State", "Progress", "Operation", "Entity", "Details"):
+        table.add_column(column, style="cyan" if column == "Task" else None)
+    for status in get_tasks_status(si, task_ids):
+        state = status["state"]
+        progress = status.get("progress_pct")
+        table.add_row(
+            status["task_id"], f"[{colours.get(state, 'cyan')}]{state}[/]",
+            "-" if progress is None else f"{progress}%",
+            status.get("operation") or "-", status.get("entity") or "-",
+            status.get("task_error") or ("garbage-collected" if state == "gone" else ""),
+        )
+    console.print(table)
 
 
 # ─── Clone & Migrate ──────────────────────────────────────────────────────────
@@ -614,15 +995,32 @@ def vm_list_ttl() -> None:
 @cli_errors
 @guarded(risk_level='high')
 def vm_clean_slate(
-    vm_name: str,
+    names: NamesArgument = None,
+    match: MatchOption = None,
     snapshot: Annotated[str, typer.Option("--snapshot", "-s", help="Snapshot name")] = "baseline",
+    power_on: Annotated[
+        bool, typer.Option("--power-on", help="Power VMs back on after the revert (bulk only)")
+    ] = False,
+    concurrency: ConcurrencyOption = 8,
+    per_host: Annotated[
+        int, typer.Option(min=1, help="Max VMs reset at once per host (bulk only)")
+    ] = 4,
+    per_datastore: PerDatastoreOption = 2,
     target: TargetOption = None,
     config: ConfigOption = None,
     dry_run: DryRunOption = False,
 ) -> None:
-    """Revert VM to baseline snapshot (Clean Slate). Powers off first if needed."""
+    """Revert VMs to a baseline snapshot (Clean Slate). Powers off first if needed."""
     from vmware_aiops.ops.vm_lifecycle import clean_slate, get_vm_info
 
+    names = names or []
+    if len(names) != 1 or match:
+        _bulk_clean_slate(
+            snapshot, names, match, target, config, dry_run, power_on=power_on,
+            concurrency=concurrency, per_host=per_host, per_datastore=per_datastore,
+        )
+        return
+    vm_name = names[0]
     if dry_run:
         _dry_run_print(
             target=_resolve_target(target), vm_name=vm_name, operation="clean_slate",
@@ -647,6 +1045,30 @@ def vm_clean_slate(
     )
 
 
+def _bulk_clean_slate(
+    snapshot: str,
+    names: list[str],
+    match: str | None,
+    target: str | None,
+    config: str | None,
+    dry_run: bool,
+    **options,
+) -> None:
+    from vmware_aiops.ops.bulk_snapshot import CLEAN_SLATE_PATHS, clean_slate_targets
+
+    def progress(r: dict) -> None:
+        style = _STATUS_STYLE.get(r["status"], "red")
+        console.print(f"  [{style}]{r['status']:>7}[/] {r['name']}: {r['message']}")
+
+    _run_bulk(
+        "batch_clean_slate", _BULK_API["clean-slate"], "恢复基线快照",
+        names, match, target, config, dry_run,
+        {"names": names, "match": match, "snapshot": snapshot, **options},
+        lambda targets: clean_slate_targets(targets, snapshot, on_result=progress, **options),
+        paths=CLEAN_SLATE_PATHS,
+    )
+
+
 # ─── Guest Operations ────────────────────────────────────────────────────────
 
 
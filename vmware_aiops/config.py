@@ -150,6 +150,8 @@ class TargetConfig:
     target that declares none is simply not matched by such a rule and is
     never refused for lacking a label. See :mod:`vmware_policy.environment`.
     """
+    scan_interval_minutes: int = 0
+    """Daemon scan interval for this target; 0 uses ``scanner.interval_minutes``."""
 
     @property
     def username(self) -> str:
@@ -180,15 +182,41 @@ class TargetConfig:
         return _decode_secret(pw)
 
 
+# Host log substrings and the severity each one implies. A line that matches
+# any critical pattern is critical even when a warning pattern matches first.
+DEFAULT_HOST_LOG_PATTERNS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("critical", ("critical", "panic", "corrupt")),
+    ("warning", ("error", "fail", "lost access", "cannot", "timeout", "refused")),
+)
+
+_HOST_LOG_SEVERITIES = ("critical", "warning", "info")
+
+
 @dataclass(frozen=True)
 class ScannerConfig:
     """Scanner daemon settings."""
 
     enabled: bool = True
     interval_minutes: int = 15
+    jitter_seconds: int = 60
+    """Random start offset per target (and per run), so vCenters are not all
+    hit at the same instant."""
+    adaptive: bool = True
+    """Stretch a target's interval on overruns / slow vCenter, shrink it while
+    issues are active (see :mod:`vmware_aiops.scanner.pacing`)."""
+    min_interval_minutes: int = 5
+    max_interval_minutes: int = 45
+    """Must stay below ``lookback_hours`` less ``jitter_seconds``, or events
+    that land between two scans are never scanned."""
     log_types: tuple[str, ...] = ("vpxd", "hostd", "vmkernel")
     severity_threshold: str = "warning"
     lookback_hours: int = 1
+    host_log_patterns: tuple[tuple[str, tuple[str, ...]], ...] = DEFAULT_HOST_LOG_PATTERNS
+    """``(severity, substrings)`` pairs for ESXi host log classification,
+    matched case-insensitively. Severities are critical / warning / info."""
+    alarm_watch: bool = False
+    """Stream alarm changes via PropertyCollector instead of polling them."""
+    alarm_watch_max_wait_seconds: int = 60
 
 
 @dataclass(frozen=True)
@@ -198,6 +226,42 @@ class NotifyConfig:
     log_file: str = str(CONFIG_DIR / "scan.log")
     webhook_url: str = ""
     webhook_timeout: int = 10
+    webhook_async: bool = True
+    """Deliver through the on-disk spool and a background sender."""
+    webhook_spool_dir: str = str(CONFIG_DIR / "webhook_spool")
+    webhook_rate_per_minute: int = 20
+    webhook_max_batch: int = 200
+    webhook_backoff_max_seconds: int = 900
+    log_max_bytes: int = 10 * 1024 * 1024
+    """Rotate ``log_file`` at this size; 0 disables size rotation."""
+    log_rotate_hours: int = 24
+    """Rotate ``log_file`` once its oldest entry is this old; 0 disables."""
+    log_backups: int = 7
+    log_compress: bool = True
+    console_limit: int = 50
+    """Max issues echoed to the console per scan cycle; -1 is unlimited."""
+    dedup_enabled: bool = True
+    """Only log/notify new, escalated, re-notified and resolved issues."""
+    renotify_minutes: int = 240
+    """Re-send a still-active issue after this long; 0 never re-sends."""
+    state_file: str = str(CONFIG_DIR / "issue_state.json")
+    state_max_entries: int = 5000
+    state_expire_hours: int = 72
+    history_enabled: bool = True
+    """Also record logged issues in the indexed SQLite history store."""
+    history_file: str = str(CONFIG_DIR / "scan_history.db")
+    history_retention_days: int = 90
+    """Compact history rows older than this; 0 keeps everything."""
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    """Self-telemetry settings (see :mod:`vmware_aiops.metrics`)."""
+
+    enabled: bool = False
+    port: int = 0
+    """Loopback HTTP ``/metrics`` port for the daemon; 0 disables the listener."""
+    textfile: str = str(CONFIG_DIR / "metrics.prom")
 
 
 @dataclass(frozen=True)
@@ -207,6 +271,7 @@ class AppConfig:
     targets: tuple[TargetConfig, ...] = ()
     scanner: ScannerConfig = field(default_factory=ScannerConfig)
     notify: NotifyConfig = field(default_factory=NotifyConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
 
     def get_target(self, name: str) -> TargetConfig:
         for t in self.targets:
@@ -243,6 +308,61 @@ class AppConfig:
         return self.targets[0]
 
 
+def _parse_host_log_patterns(raw: object) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Turn the ``scanner.host_log_patterns`` mapping into ordered pairs.
+
+    Expects ``{severity: [substring, ...]}``. Omitted means the built-in set.
+    Unknown severities raise ``ConfigError`` rather than being silently dropped,
+    which would stop a whole class of log lines from ever alerting.
+    """
+    if raw is None:
+        return DEFAULT_HOST_LOG_PATTERNS
+    if not isinstance(raw, dict):
+        raise ConfigError(
+            f"scanner.host_log_patterns in {CONFIG_FILE} must be a mapping of "
+            f"severity to a list of substrings, e.g. 'critical: [panic, corrupt]'."
+        )
+    unknown = sorted(set(raw) - set(_HOST_LOG_SEVERITIES))
+    if unknown:
+        raise ConfigError(
+            f"scanner.host_log_patterns in {CONFIG_FILE} has unknown severities "
+            f"{unknown}. Use only: {', '.join(_HOST_LOG_SEVERITIES)}."
+        )
+    pairs: list[tuple[str, tuple[str, ...]]] = []
+    for severity in _HOST_LOG_SEVERITIES:
+        patterns = raw.get(severity)
+        if not patterns:
+            continue
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        cleaned = tuple(str(p).strip().lower() for p in patterns if str(p).strip())
+        if cleaned:
+            pairs.append((severity, cleaned))
+    return tuple(pairs)
+
+
+def _check_scan_window(scanner: ScannerConfig, targets: tuple[TargetConfig, ...]) -> None:
+    """Reject intervals that can leave events between two scans' windows.
+
+    The event scan looks back ``lookback_hours``; the longest gap between two
+    scans of a target is its largest interval (``max_interval_minutes`` when
+    adaptive) plus ``jitter_seconds``.
+    """
+    intervals = [scanner.interval_minutes] + [t.scan_interval_minutes for t in targets]
+    if scanner.adaptive:
+        intervals.append(scanner.max_interval_minutes)
+    longest = max(intervals)
+    if longest * 60 + scanner.jitter_seconds >= scanner.lookback_hours * 3600:
+        limit = (scanner.lookback_hours * 3600 - scanner.jitter_seconds) / 60
+        raise ConfigError(
+            f"scanner in {CONFIG_FILE}: scans can be {longest} min apart plus "
+            f"{scanner.jitter_seconds}s jitter, but lookback_hours is "
+            f"{scanner.lookback_hours}, so events between two scans would never be "
+            f"scanned. Keep max_interval_minutes, interval_minutes and every "
+            f"scan_interval_minutes below {limit:g}, or raise lookback_hours."
+        )
+
+
 def load_config(config_path: Path | None = None) -> AppConfig:
     """Load config from YAML file, with env var overrides for passwords."""
     path = config_path or CONFIG_FILE
@@ -276,6 +396,7 @@ def load_config(config_path: Path | None = None) -> AppConfig:
             port=t.get("port", 443),
             verify_ssl=t.get("verify_ssl", True),
             environment=str(t.get("environment", "") or "").strip(),
+            scan_interval_minutes=t.get("scan_interval_minutes", 0),
         )
         for t in raw.get("targets", [])
     )
@@ -284,20 +405,56 @@ def load_config(config_path: Path | None = None) -> AppConfig:
     scanner = ScannerConfig(
         enabled=scanner_raw.get("enabled", True),
         interval_minutes=scanner_raw.get("interval_minutes", 15),
+        jitter_seconds=scanner_raw.get("jitter_seconds", 60),
+        adaptive=scanner_raw.get("adaptive", True),
+        min_interval_minutes=scanner_raw.get("min_interval_minutes", 5),
+        max_interval_minutes=scanner_raw.get("max_interval_minutes", 45),
         log_types=tuple(scanner_raw.get("log_types", ["vpxd", "hostd", "vmkernel"])),
         severity_threshold=scanner_raw.get("severity_threshold", "warning"),
         lookback_hours=scanner_raw.get("lookback_hours", 1),
+        host_log_patterns=_parse_host_log_patterns(scanner_raw.get("host_log_patterns")),
+        alarm_watch=scanner_raw.get("alarm_watch", False),
+        alarm_watch_max_wait_seconds=scanner_raw.get("alarm_watch_max_wait_seconds", 60),
     )
+    _check_scan_window(scanner, targets)
 
     notify_raw = raw.get("notify", {})
     notify = NotifyConfig(
         log_file=notify_raw.get("log_file", str(CONFIG_DIR / "scan.log")),
         webhook_url=notify_raw.get("webhook_url", ""),
         webhook_timeout=notify_raw.get("webhook_timeout", 10),
+        webhook_async=notify_raw.get("webhook_async", True),
+        webhook_spool_dir=notify_raw.get(
+            "webhook_spool_dir", str(CONFIG_DIR / "webhook_spool")
+        ),
+        webhook_rate_per_minute=notify_raw.get("webhook_rate_per_minute", 20),
+        webhook_max_batch=notify_raw.get("webhook_max_batch", 200),
+        webhook_backoff_max_seconds=notify_raw.get("webhook_backoff_max_seconds", 900),
+        log_max_bytes=notify_raw.get("log_max_bytes", 10 * 1024 * 1024),
+        log_rotate_hours=notify_raw.get("log_rotate_hours", 24),
+        log_backups=notify_raw.get("log_backups", 7),
+        log_compress=notify_raw.get("log_compress", True),
+        console_limit=notify_raw.get("console_limit", 50),
+        dedup_enabled=notify_raw.get("dedup_enabled", True),
+        renotify_minutes=notify_raw.get("renotify_minutes", 240),
+        state_file=notify_raw.get("state_file", str(CONFIG_DIR / "issue_state.json")),
+        state_max_entries=notify_raw.get("state_max_entries", 5000),
+        state_expire_hours=notify_raw.get("state_expire_hours", 72),
+        history_enabled=notify_raw.get("history_enabled", True),
+        history_file=notify_raw.get("history_file", str(CONFIG_DIR / "scan_history.db")),
+        history_retention_days=notify_raw.get("history_retention_days", 90),
+    )
+
+    metrics_raw = raw.get("metrics", {})
+    metrics = MetricsConfig(
+        enabled=metrics_raw.get("enabled", False),
+        port=metrics_raw.get("port", 0),
+        textfile=metrics_raw.get("textfile", str(CONFIG_DIR / "metrics.prom")),
     )
 
     return AppConfig(
         targets=targets,
         scanner=scanner,
         notify=notify,
+        metrics=metrics,
     )
@@ -20,7 +20,8 @@ from typing import Any, Callable, Optional
 from mcp.server.fastmcp import FastMCP
 from vmware_policy import report_tool_failure, sanitize
 
-from vmware_aiops.config import ConfigError, load_config
+from vmware_aiops import metrics
+from vmware_aiops.config import CONFIG_DIR, AppConfig, ConfigError, load_config
 from vmware_aiops.connection import ConnectionManager
 from vmware_aiops.ops.cluster_mgmt import ClusterError, ClusterNotFoundError
 from vmware_aiops.ops.datastore_browser import DatastoreBrowseError
@@ -35,6 +36,10 @@ logger = logging.getLogger(__name__)
 
 _DOCTOR_HINT = "Run 'vmware-aiops doctor' to verify connectivity and credentials."
 
+# With VMWARE_AIOPS_METRICS=1 tool calls are counted and timed; the stdio
+# server has no listener, so the snapshot goes to a textfile instead.
+_METRICS_FILE = metrics.ThrottledTextfile(CONFIG_DIR / "metrics-mcp.prom")
+
 
 def _safe_error(exc: Exception, tool: str) -> str:
     """Return an agent-safe error string; log full detail server-side only.
@@ -138,8 +143,14 @@ def tool_errors(shape: str = "str") -> Callable:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                return func(*args, **kwargs)
+                with metrics.timer("mcp_tool_seconds", tool=name):
+                    result = func(*args, **kwargs)
+                metrics.inc("mcp_tool_calls_total", tool=name, outcome="ok")
+                _METRICS_FILE.maybe_write()
+                return result
             except Exception as e:  # noqa: BLE001 — sanitised below
+                metrics.inc("mcp_tool_calls_total", tool=name, outcome="error")
+                _METRICS_FILE.maybe_write()
                 msg = _safe_error(e, name)
                 # This wrapper swallows the exception, so @vmware_tool above it
                 # sees an ordinary return and would record the call as ``ok``.
@@ -164,6 +175,9 @@ mcp = FastMCP(
         "Manage VM power state, deploy VMs (OVA/template/clone/batch), "
         "browse datastores, manage clusters, execute guest commands, "
         "and plan multi-step operations. "
+        "Any VM name argument also accepts a locator: uuid:<instanceUuid>, "
+        "bios:<uuid>, ip:<guest IP> or an inventory path (dc/vm/folder/name), "
+        "which is unambiguous when several VMs share a display name. "
         "For read-only monitoring (inventory/alarms/events/VM info), "
         "use vmware-monitor. For storage/iSCSI/vSAN, use vmware-storage. "
         "For Tanzu Kubernetes, use vmware-vks."
@@ -177,14 +191,18 @@ mcp = FastMCP(
 _conn_mgr: Optional[ConnectionManager] = None
 
 
+def _load_app_config() -> AppConfig:
+    """Load config.yaml, honouring ``VMWARE_AIOPS_CONFIG``."""
+    config_path_str = os.environ.get("VMWARE_AIOPS_CONFIG")
+    config_path = Path(config_path_str) if config_path_str else None
+    return load_config(config_path)
+
+
 def _ensure_conn_mgr() -> ConnectionManager:
     """Lazily build the shared ConnectionManager (does not connect anything)."""
     global _conn_mgr  # noqa: PLW0603
     if _conn_mgr is None:
-        config_path_str = os.environ.get("VMWARE_AIOPS_CONFIG")
-        config_path = Path(config_path_str) if config_path_str else None
-        config = load_config(config_path)
-        _conn_mgr = ConnectionManager(config)
+        _conn_mgr = ConnectionManager(_load_app_config())
     return _conn_mgr
 
 
@@ -294,3 +294,67 @@ def delete_drs_rule(
     from vmware_aiops.ops.cluster_mgmt import delete_drs_rule as _delete
     si = _get_connection(target)
     return _delete(si, cluster, rule_name=rule_name, confirm=confirm)
+
+
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": True})
+@vmware_tool(risk_level="low")
+@tool_errors("dict")
+def host_evacuation_plan(
+    host_name: str,
+    destinations: Optional[list[str]] = None,
+    include_powered_off: bool = True,
+    target: Optional[str] = None,
+) -> dict:
+    """[READ] Preview where host_evacuate would move each VM on a host. Changes nothing.
+
+    Places the largest VMs first, each on the cluster host with the most free memory
+    that mounts all of the VM's datastores and networks (10% of every host kept free).
+    Returns {host, moves: [{name, to, memory_mb, power_state}], unplaced: [{name,
+    status, message}], by_destination, limits} — limits is the concurrent vMotions
+    per host (4 on 1GbE, 8 on 10GbE+). Show this to the user before host_evacuate.
+
+    Args:
+        host_name: ESXi host to drain (exact name, from cluster_info).
+        destinations: Only use these hosts of the same cluster; omit for all of them.
+        include_powered_off: Also move powered-off VMs and templates (default True).
+        target: Optional vCenter target name from config.
+    """
+    from vmware_aiops.ops.host_evacuate import plan_evacuation
+    si = _get_connection(target)
+    return plan_evacuation(si, host_name, destinations, include_powered_off).as_dict()
+
+
+@mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": False, "idempotentHint": False, "openWorldHint": True})
+@vmware_tool(risk_level="high")
+@tool_errors("list")
+def host_evacuate(
+    host_name: str,
+    destinations: Optional[list[str]] = None,
+    include_powered_off: bool = True,
+    concurrency: int = 8,
+    per_host: Optional[int] = None,
+    target: Optional[str] = None,
+) -> list[dict]:
+    """[WRITE] vMotion every VM off a host to other hosts of its cluster, in parallel.
+
+    Use before host maintenance or removal (cluster_remove_host). Plans exactly like
+    host_evacuation_plan, then runs up to `concurrency` migrations at once within
+    vSphere's per-host vMotion limit. VMs stay on their datastores. Returns one dict
+    per VM: name, status (ok | skipped | running | error), message; "error" rows
+    include VMs no host could take. "running" means the vMotion outlived its
+    10-minute wait — poll with vm_tasks_status, do not retry. For one VM use vm_migrate.
+
+    Args:
+        host_name: ESXi host to drain (exact name, from cluster_info).
+        destinations: Only use these hosts of the same cluster; omit for all of them.
+        include_powered_off: Also move powered-off VMs and templates (default True).
+        concurrency: Max VMs moved at once (default 8).
+        per_host: Max concurrent vMotions per host; omit to derive 4 (1GbE) or 8 (10GbE+).
+        target: Optional vCenter target name from config.
+    """
+    from vmware_aiops.ops.host_evacuate import evacuate_host
+    si = _get_connection(target)
+    return evacuate_host(
+        si, host_name, destinations, include_powered_off,
+        concurrency=concurrency, per_host=per_host,
+    )
@@ -180,14 +180,19 @@ def batch_clone_vms(
     memory_mb: Optional[int] = None,
     snapshot_name: Optional[str] = None,
     power_on: bool = False,
+    concurrency: int = 8,
+    per_host: int = 8,
+    per_datastore: int = 4,
     target: Optional[str] = None,
 ) -> list[dict]:
     """[WRITE] Batch clone multiple VMs from a source VM (gold image).
 
-    Each clone: full copy → optional reconfigure → optional snapshot → optional power
-    on. Returns one dict per VM with its status. Clones run sequentially, so a long
-    vm_names list may take a while — prefer batch_linked_clone_vms for disposable
-    test copies.
+    Each clone is one task (CPU/memory and power-on applied by the clone itself),
+    plus a baseline snapshot if asked, taken before power-on. Up to `concurrency`
+    clones are in flight, at most `per_host` per host and `per_datastore` per
+    datastore; each moves to its next step as soon as the last finishes. Returns
+    one dict per VM with its status. Full copies still cost disk I/O — prefer
+    batch_linked_clone_vms for disposable test copies.
 
     Args:
         source_vm_name: Source VM to clone from.
@@ -196,6 +201,9 @@ def batch_clone_vms(
         memory_mb: Override memory for all clones (optional).
         snapshot_name: Snapshot each clone with this name (optional).
         power_on: Power on each clone after creation.
+        concurrency: Max clones in flight (default 8).
+        per_host: Max clones in flight per host (default 8).
+        per_datastore: Max clones in flight per datastore (default 4).
         target: Optional vCenter/ESXi target name from config.
     """
     si = _get_connection(target)
@@ -203,6 +211,7 @@ def batch_clone_vms(
         si, source_vm_name=source_vm_name, vm_names=vm_names,
         cpu=cpu, memory_mb=memory_mb,
         snapshot_name=snapshot_name, power_on=power_on,
+        concurrency=concurrency, per_host=per_host, per_datastore=per_datastore,
     )
 
 
@@ -217,12 +226,16 @@ def batch_linked_clone_vms(
     memory_mb: Optional[int] = None,
     power_on: bool = False,
     baseline_snapshot: Optional[str] = None,
+    hosts: Optional[list[str]] = None,
+    concurrency: int = 8,
     target: Optional[str] = None,
 ) -> list[dict]:
     """[WRITE] Batch create linked clones from a VM snapshot (fastest batch provisioning).
 
     Clones share the source disk via copy-on-write, so the source must stay intact.
-    Returns one dict per clone. Prefer batch_clone_vms for independent copies.
+    They are spread round-robin over the source cluster's hosts that mount its
+    datastores, up to `concurrency` at once. Returns one dict per clone. Prefer
+    batch_clone_vms for independent copies.
 
     Args:
         source_vm_name: Source VM to clone from.
@@ -232,6 +245,8 @@ def batch_linked_clone_vms(
         memory_mb: Override memory (optional).
         power_on: Power on each clone.
         baseline_snapshot: Snapshot each clone with this name (optional).
+        hosts: Only spread clones over these host names (optional).
+        concurrency: Max clones in flight (default 8).
         target: Optional vCenter/ESXi target from config.
     """
     si = _get_connection(target)
@@ -239,6 +254,44 @@ def batch_linked_clone_vms(
         si, source_vm_name=source_vm_name, snapshot_name=snapshot_name,
         vm_names=vm_names, cpu=cpu, memory_mb=memory_mb,
         power_on=power_on, baseline_snapshot=baseline_snapshot,
+        hosts=hosts, concurrency=concurrency,
+    )
+
+
+@mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": False, "idempotentHint": False, "openWorldHint": True})
+@vmware_tool(risk_level="medium")
+@tool_errors("list")
+def batch_instant_clone_vms(
+    parent_vm_name: str,
+    vm_names: list[str],
+    extra_config: Optional[dict[str, str]] = None,
+    overrides: Optional[dict[str, dict[str, str]]] = None,
+    concurrency: int = 8,
+    per_host: int = 8,
+    target: Optional[str] = None,
+) -> list[dict]:
+    """[WRITE] Batch instant-clone a running VM: clones come up already running.
+
+    Use for warm pools (CI runners, VDI) where boot time matters; the parent must be
+    powered on, and clones stay on its host sharing its memory. Give each clone its
+    identity via guestinfo.* extra_config keys ("{name}" is replaced by the clone's
+    name). Returns one dict per clone. Prefer batch_linked_clone_vms for powered-off
+    parents.
+
+    Args:
+        parent_vm_name: Running VM to fork.
+        vm_names: Names for the new instant clones.
+        extra_config: extraConfig keys set on every clone (optional).
+        overrides: Per-clone extraConfig keys, keyed by clone name (optional).
+        concurrency: Max clones in flight (default 8).
+        per_host: Max clones in flight on the parent's host (default 8).
+        target: Optional vCenter/ESXi target from config.
+    """
+    si = _get_connection(target)
+    return vm_deploy.batch_instant_clone(
+        si, parent_vm_name=parent_vm_name, vm_names=vm_names,
+        extra_config=extra_config, overrides=overrides,
+        concurrency=concurrency, per_host=per_host,
     )
 
 
@@ -254,10 +307,17 @@ def batch_deploy_from_spec(
     Use for fleet provisioning (several VMs, shared defaults); for a single VM prefer
     deploy_vm_from_template, vm_clone, deploy_vm_from_ova, or deploy_linked_clone.
     The channel is chosen by spec keys: "source" (full clone), "template",
-    "linked_clone: {source, snapshot}", per-VM "ova", else empty-VM creation
-    (optionally "iso"). A "defaults" block sets cpu/memory_mb/disk_gb/network/
-    datastore/snapshot/power_on, overridable per VM. VMs deploy sequentially and
-    one VM's failure does not stop the rest.
+    "linked_clone: {source, snapshot}", "instant_clone: {source, extra_config}",
+    per-VM "ova", else empty-VM creation (optionally "iso"). A "defaults" block sets
+    cpu/memory_mb/disk_gb/network/datastore/snapshot/power_on, overridable per VM.
+    An optional "placement: {strategy: spread|pack, cluster, hosts, datastores}"
+    block places the batch by free host memory and datastore space first; each
+    placed VM's dict then carries its "placement". VMs deploy in parallel, each VM's
+    steps in order, capped by an optional "concurrency: {max, per_host,
+    per_datastore}" block (default 8/8/4); one VM's failure does not stop the rest.
+    Before any task starts, the whole spec is checked (source, existing names,
+    datastores, networks, ISOs, OVA files, capacity); if anything is wrong nothing is
+    deployed and every problem is returned at once — fix the spec and call again.
 
     Args:
         spec_path: Local filesystem path to the deploy.yaml specification file.
@@ -265,6 +325,8 @@ def batch_deploy_from_spec(
 
     Returns:
         One dict per VM: name, status ("ok" or "error"), and messages with per-step results.
+        After a failed preflight: a row per batch-wide problem (source, "hosts", a
+        datastore, "placement"), then each VM as "error" with its problems or "skipped".
     """
     si = _get_connection(target)
     return vm_deploy.batch_deploy(si, spec_path)
@@ -0,0 +1,60 @@
+"""Scan history tools: query issues recorded by the scanner daemon."""
+
+import time
+from typing import Optional
+
+from vmware_policy import paginated, vmware_tool
+
+from vmware_aiops.mcp_server._shared import _load_app_config, mcp, tool_errors
+
+
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": False})
+@vmware_tool(risk_level="low")
+@tool_errors("dict")
+def scan_history(
+    since_hours: float = 24,
+    severity: Optional[str] = None,
+    entity: Optional[str] = None,
+    source: Optional[str] = None,
+    target: Optional[str] = None,
+    transition: Optional[str] = None,
+    limit: Optional[int] = 100,
+) -> dict:
+    """[READ] Query issues the scanner daemon has logged, newest first.
+
+    Use this for "what happened on X" questions over days or months — e.g.
+    every critical issue on one ESXi host in the last week — instead of live
+    scans, which only see the current state. Answers come from the local
+    indexed history store (~/.vmware-aiops/scan_history.db); no vCenter call
+    is made. An error saying no history exists means the daemon has not run
+    with notify.history_enabled.
+
+    Returns the list envelope: 'items' holds log entries (timestamp, severity,
+    source, target, entity, message and, with dedup on, transition
+    new/escalated/renotify/resolved); 'total' is the real match count, so
+    'truncated' is exact.
+
+    Args:
+        since_hours: How far back to look (default 24; 168 = one week).
+        severity: Exact severity: critical, warning or info.
+        entity: Exact entity name (VM, host, datastore...).
+        source: Exact source: "alarm", "event", "connection" or
+            "host_log:<log>" (e.g. "host_log:vmkernel").
+        target: vCenter/ESXi target name from config.
+        transition: new, escalated, renotify or resolved.
+        limit: Max entries to return (None = all matches).
+    """
+    from vmware_aiops.notify.history import ScanHistory
+
+    cfg = _load_app_config()
+    history = ScanHistory(cfg.notify.history_file)
+    rows, total = history.query(
+        since=time.time() - since_hours * 3600,
+        limit=limit,
+        severity=severity,
+        entity=entity,
+        source=source,
+        target=target,
+        transition=transition,
+    )
+    return paginated(rows, limit=limit, total=total)
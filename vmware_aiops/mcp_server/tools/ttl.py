@@ -95,3 +95,46 @@ def vm_clean_slate(
     from vmware_aiops.ops.vm_lifecycle import clean_slate
     si = _get_connection(target)
     return clean_slate(si, vm_name, snapshot_name=snapshot_name)
+
+
+@mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": True, "idempotentHint": False, "openWorldHint": True})
+@vmware_tool(risk_level="high")
+@tool_errors("list")
+def batch_clean_slate_vms(
+    snapshot_name: str = "baseline",
+    vm_names: Optional[list[str]] = None,
+    pattern: Optional[str] = None,
+    power_on: bool = False,
+    concurrency: int = 8,
+    per_host: int = 4,
+    per_datastore: int = 2,
+    target: Optional[str] = None,
+) -> list[dict]:
+    """[WRITE] Clean Slate many VMs at once: power off if running, then revert to a snapshot.
+
+    Typical use: reset every VM of a lab (e.g. pattern "lab3-*") to "baseline" between
+    classes or test runs. Runs up to `concurrency` VMs in parallel, at most `per_host`
+    per ESXi host and `per_datastore` per datastore. VMs without the snapshot are
+    reported as errors and left running. Irreversible — everything written since the
+    snapshot is lost; confirm with the user first. Templates are never selected.
+    Returns one dict per VM: name, status (ok | running | error), message; "running"
+    means a task outlived its 5-minute wait — poll it with vm_tasks_status, do not retry.
+    For one VM prefer vm_clean_slate.
+
+    Args:
+        snapshot_name: Snapshot name to revert to (default: "baseline").
+        vm_names: Exact VM names (case-sensitive) or locators (uuid:..., path).
+        pattern: Shell-style glob over VM names, e.g. "lab-*"; combined with vm_names.
+        power_on: Power each VM back on after the revert (a memory snapshot of a
+            running VM already comes back running).
+        concurrency: Max VMs processed at once (default 8).
+        per_host: Max VMs reset at once per host (default 4).
+        per_datastore: Max VMs reset at once per datastore (default 2).
+        target: Optional vCenter/ESXi target name from config.
+    """
+    from vmware_aiops.ops.bulk_snapshot import clean_slate_vms
+    si = _get_connection(target)
+    return clean_slate_vms(
+        si, snapshot_name, vm_names=vm_names, pattern=pattern, power_on=power_on,
+        concurrency=concurrency, per_host=per_host, per_datastore=per_datastore,
+    )
@@ -5,6 +5,10 @@ from typing import Optional
 from vmware_policy import paginated, vmware_tool
 
 from vmware_aiops.mcp_server._shared import _get_connection, mcp, tool_errors
+from vmware_aiops.ops.bulk_power import power_vms
+from vmware_aiops.ops.bulk_snapshot import DEFAULT_PER_DATASTORE, snapshot_vms
+from vmware_aiops.ops.fleet import DEFAULT_CONCURRENCY
+from vmware_aiops.ops.snapshot_sprawl import snapshot_sprawl
 from vmware_aiops.ops.vm_lifecycle import (
     clone_vm,
     create_snapshot,
@@ -12,6 +16,7 @@ from vmware_aiops.ops.vm_lifecycle import (
     delete_snapshot,
     delete_vm,
     get_task_status,
+    get_tasks_status,
     list_snapshots,
     migrate_vm,
     power_off_vm,
@@ -61,12 +66,16 @@ def vm_power_on(vm_name: str, target: Optional[str] = None) -> str:
 def vm_power_off(
     vm_name: str,
     force: bool = False,
+    timeout: int = 120,
+    escalate: bool = False,
     target: Optional[str] = None,
 ) -> str:
     """[WRITE] Power off a VM — graceful guest shutdown by default, hard power-off with force=True.
 
-    Graceful mode calls VMware Tools guest shutdown and waits up to 120s; if Tools is
-    not running or shutdown stalls, the response tells you to retry with force=True.
+    Graceful mode calls VMware Tools guest shutdown and waits up to `timeout` seconds
+    (returning as soon as the VM stops); if Tools is not running or shutdown stalls, the
+    response tells you to retry with force=True — or pass escalate=True to do that
+    automatically.
     An already-off VM returns success without change. Use vm_power_on to start a VM;
     vm_delete requires the VM to be off first.
 
@@ -74,13 +83,59 @@ def vm_power_off(
         vm_name: Exact VM name as shown in vCenter inventory (case-sensitive).
         force: False (default) = graceful guest shutdown via VMware Tools;
             True = immediate hard power-off (risks guest filesystem damage).
+        timeout: Seconds to wait for a graceful shutdown (default 120).
+        escalate: Hard power-off if the guest has not stopped within `timeout` or has
+            no VMware Tools (same filesystem risk as force).
         target: vCenter/ESXi target from config.yaml; omit for the default target.
 
     Returns:
         Status string: shut down, force powered off, already off, or a Tools hint.
     """
     si = _get_connection(target)
-    return power_off_vm(si, vm_name, force=force)
+    return power_off_vm(si, vm_name, force=force, timeout=timeout, escalate=escalate)
+
+
+@mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": True, "idempotentHint": False, "openWorldHint": True})
+@vmware_tool(risk_level="high")
+@tool_errors("list")
+def batch_power_vms(
+    action: str,
+    vm_names: Optional[list[str]] = None,
+    pattern: Optional[str] = None,
+    force: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    shutdown_timeout: int = 120,
+    escalate: bool = False,
+    target: Optional[str] = None,
+) -> list[dict]:
+    """[WRITE] Power on / off / reset / suspend many VMs at once, by name and/or name pattern.
+
+    "on" starts every selected VM with one multi-VM power-on task per datacenter
+    (DRS places them together); "off" requests a guest shutdown of every VM and waits
+    for all of them together (hard power-off with force=True); "reset", "suspend" and
+    forced "off" run up to `concurrency` VMs in parallel. Templates are never selected.
+    Returns one dict per VM: name, status (ok | skipped | running | error), message.
+    "skipped" means already in the wanted state; "running" means the task is still
+    going — poll it with vm_tasks_status, do not retry. For one VM prefer
+    vm_power_on / vm_power_off.
+
+    Args:
+        action: "on", "off", "reset" or "suspend".
+        vm_names: Exact VM names (case-sensitive) or locators (uuid:..., path).
+        pattern: Shell-style glob over VM names, e.g. "web-*"; combined with vm_names.
+        force: For "off" only — hard power-off instead of guest shutdown.
+        concurrency: Max VMs processed at once for off / reset / suspend (default 8).
+        shutdown_timeout: For graceful "off" — seconds to wait for guests to stop.
+        escalate: For graceful "off" — hard power-off VMs still running after
+            shutdown_timeout or lacking VMware Tools.
+        target: vCenter/ESXi target from config.yaml; omit for the default target.
+    """
+    si = _get_connection(target)
+    return power_vms(
+        si, action, vm_names=vm_names, pattern=pattern,
+        force=force, concurrency=concurrency,
+        shutdown_timeout=shutdown_timeout, escalate=escalate,
+    )
 
 
 @mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": False, "idempotentHint": False, "openWorldHint": True})
@@ -348,6 +403,59 @@ def vm_delete_snapshot(
     )
 
 
+@mcp.tool(annotations={"readOnlyHint": False, "destructiveHint": True, "idempotentHint": False, "openWorldHint": True})
+@vmware_tool(risk_level="high")
+@tool_errors("list")
+def batch_snapshot_vms(
+    action: str,
+    snapshot_name: str,
+    vm_names: Optional[list[str]] = None,
+    pattern: Optional[str] = None,
+    description: str = "",
+    memory: bool = False,
+    quiesce: bool = False,
+    remove_children: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_datastore: int = DEFAULT_PER_DATASTORE,
+    wait: bool = True,
+    target: Optional[str] = None,
+) -> list[dict]:
+    """[WRITE] Create, revert to, or delete one named snapshot on many VMs at once.
+
+    Typical use: "create" a pre-change snapshot on every VM matching a pattern before
+    patching, then "delete" it once the change is verified (or "revert" to roll back).
+    Runs up to `concurrency` VMs in parallel, at most `per_datastore` snapshot tasks per
+    datastore. "revert" discards all changes since the snapshot and "delete" is
+    irreversible — confirm with the user first. Templates are never selected.
+    Returns one dict per VM: name, status (ok | skipped | running | error), message.
+    "skipped" means the snapshot already exists (create); "running" means the task is
+    still going — poll it with vm_tasks_status, do not retry. For one VM prefer
+    vm_create_snapshot / vm_revert_snapshot / vm_delete_snapshot.
+
+    Args:
+        action: "create", "revert" or "delete".
+        snapshot_name: Snapshot name (exact, as shown by vm_list_snapshots).
+        vm_names: Exact VM names (case-sensitive) or locators (uuid:..., path).
+        pattern: Shell-style glob over VM names, e.g. "web-*"; combined with vm_names.
+        description: For "create" — snapshot description.
+        memory: For "create" — include memory state (much slower across many VMs).
+        quiesce: For "create" — quiesce guest filesystems (requires VMware Tools).
+        remove_children: For "delete" — also delete the snapshots below this one.
+        concurrency: Max VMs processed at once (default 8).
+        per_datastore: Max concurrent snapshot tasks per datastore (default 2).
+        wait: False = start every task and return at once; rows are "running" with a
+            task id. Recommended for "delete" of large snapshots.
+        target: vCenter/ESXi target from config.yaml; omit for the default target.
+    """
+    si = _get_connection(target)
+    return snapshot_vms(
+        si, action, snapshot_name, vm_names=vm_names, pattern=pattern,
+        description=description, memory=memory, quiesce=quiesce,
+        remove_children=remove_children, concurrency=concurrency,
+        per_datastore=per_datastore, timeout=None if wait else 0,
+    )
+
+
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": True})
 @vmware_tool(risk_level="low")
 @tool_errors("dict")
@@ -372,6 +480,32 @@ def vm_task_status(task_id: str, target: Optional[str] = None) -> dict:
     return get_task_status(si, task_id)
 
 
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": True})
+@vmware_tool(risk_level="low")
+@tool_errors("dict")
+def vm_tasks_status(task_ids: list[str], target: Optional[str] = None) -> dict:
+    """[READ] Poll many vSphere tasks at once (e.g. every "running" row of a batch_* call).
+
+    One vCenter call for all ids — use this instead of vm_task_status in a loop. Poll
+    every 15-30 s until no task is queued/running; do not re-run the operation.
+
+    Args:
+        task_ids: Task ids (e.g. "task-1234") returned by async or batch write operations.
+        target: vCenter/ESXi target name from config.yaml; omit to use the default target.
+
+    Returns:
+        The list envelope. 'items' is one dict per distinct id in request order, shaped
+        like vm_task_status (task_id, state, progress_pct, operation, entity, task_error
+        or note). Extra key 'states' counts ids per state, e.g. {"running": 3, "success": 9}.
+    """
+    si = _get_connection(target)
+    rows = get_tasks_status(si, task_ids)
+    states: dict[str, int] = {}
+    for r in rows:
+        states[r["state"]] = states.get(r["state"], 0) + 1
+    return paginated(rows, total=len(rows), states=states)
+
+
 @mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": True})
 @vmware_tool(risk_level="low")
 @tool_errors("dict")
@@ -398,3 +532,51 @@ def vm_list_snapshots(vm_name: str, target: Optional[str] = None) -> dict:
         for s in snaps
     ]
     return paginated(rows, total=len(rows))
+
+
+@mcp.tool(annotations={"readOnlyHint": True, "destructiveHint": False, "idempotentHint": True, "openWorldHint": True})
+@vmware_tool(risk_level="low")
+@tool_errors("dict")
+def vm_snapshot_sprawl(
+    older_than_days: float = 0,
+    min_delta_gb: float = 0,
+    datastore: Optional[str] = None,
+    pattern: Optional[str] = None,
+    sort_by: str = "delta_gb",
+    limit: int = 50,
+    target: Optional[str] = None,
+) -> dict:
+    """[READ] Rank snapshot sprawl across ALL VMs: snapshot age, chain depth, on-disk delta size.
+
+    Read-only, no side effects; one inventory pass, fast even on very large vCenters.
+    Use it to find which VMs and datastores old snapshots are filling, then clean up
+    with batch_snapshot_vms(action="delete") using the 'cleanup' groups (confirm with
+    the user first — deletion is irreversible).
+
+    Args:
+        older_than_days: Only VMs whose oldest snapshot is at least this many days old;
+            also the age threshold for the 'cleanup' groups.
+        min_delta_gb: Only VMs whose snapshot files use at least this many GB.
+        datastore: Only VMs with snapshot files on this datastore.
+        pattern: Shell-style glob over VM names, e.g. "web-*".
+        sort_by: "delta_gb" (default), "age_days", "depth", "count" — worst first — or "name".
+        limit: Max VM rows in 'items' (default 50).
+        target: vCenter/ESXi target name from config.yaml; omit to use the default target.
+
+    Returns:
+        The list envelope. 'items' is one dict per VM with snapshots: name, count, depth,
+        oldest, age_days, newest_age_days, delta_gb, datastores ({name: GB}), snapshots
+        ([{name, age_days, level}]), template. Extra keys: 'delta_gb' (total over all
+        matches), 'datastores' (ranked, with their worst VMs) and 'cleanup' (snapshots
+        older than older_than_days grouped by name: snapshot, vms, count, and templates —
+        templates carrying the snapshot, which batch delete rejects; never pass them).
+    """
+    si = _get_connection(target)
+    report = snapshot_sprawl(
+        si, older_than_days=older_than_days, min_delta_gb=min_delta_gb,
+        datastore=datastore, pattern=pattern, sort_by=sort_by, limit=limit,
+    )
+    return paginated(
+        report["vms"], limit=limit, total=report["total"], delta_gb=report["delta_gb"],
+        datastores=report["datastores"], cleanup=report["cleanup"],
+    )
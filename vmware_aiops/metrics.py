@@ -0,0 +1,252 @@
+"""Opt-in in-process metrics: counters and histograms, Prometheus text format.
+
+Disabled by default; every ``inc`` / ``observe`` / ``timer`` is then a single
+flag check. Turn it on with ``metrics.enabled: true`` in config.yaml (daemon)
+or ``VMWARE_AIOPS_METRICS=1`` in the environment (any process, including the
+MCP server).
+
+Exposure, all local-only:
+
+* the daemon rewrites ``~/.vmware-aiops/metrics.prom`` after every scan, and
+  the MCP server rewrites ``metrics-mcp.prom`` at most every 15 s — both in the
+  node_exporter textfile-collector format; ``vmware-aiops metrics`` prints them;
+* ``metrics.port`` starts a loopback-only HTTP endpoint (``/metrics``) in the
+  daemon for a Prometheus scrape.
+
+Instrumented hot paths (``vmware_aiops_`` prefix): PropertyCollector batches
+and pages (``inventory._collect``), task waits (``ops.tasks``), scan
+cycles, webhook deliveries and MCP tool calls.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger("vmware-aiops.metrics")
+
+PREFIX = "vmware_aiops_"
+ENV_FLAG = "VMWARE_AIOPS_METRICS"
+
+# Prometheus client defaults, extended for multi-minute tasks and scans.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    30.0, 60.0, 120.0, 300.0, 600.0,
+)
+
+_HELP = {
+    "pc_collect_total": "PropertyCollector batch retrievals, by managed-object type.",
+    "pc_pages_total": "PropertyCollector result pages fetched (1 + continuations).",
+    "pc_objects_total": "Managed objects returned by PropertyCollector batches.",
+    "pc_collect_seconds": "Wall time of one PropertyCollector batch retrieval.",
+    "task_wait_seconds": "Time spent waiting on a vSphere task, by outcome.",
+    "task_polls_total": "Task status round-trips (WaitForUpdatesEx calls or TaskInfo polls).",
+    "scan_target_seconds": "Duration of one target's scan.",
+    "scan_issues_total": "Issues found by scans, by target and severity.",
+    "scan_reported_total": "Issues reported after dedup, by transition.",
+    "webhook_seconds": "Webhook POST latency, by result.",
+    "webhook_requests_total": "Webhook POSTs, by result.",
+    "mcp_tool_calls_total": "MCP tool invocations, by tool and outcome.",
+    "mcp_tool_seconds": "MCP tool wall time, by tool.",
+}
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+def _key(labels: dict[str, object]) -> _Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Thread-safe store of counters and histograms keyed by name + labels."""
+
+    def __init__(self) -> None:
+        self.enabled = os.environ.get(ENV_FLAG, "").lower() in ("1", "true", "yes")
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[_Labels, float]] = {}
+        self._histograms: dict[str, dict[_Labels, _Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(DEFAULT_BUCKETS)
+            hist.observe(value)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[dict[str, object]]:
+        """Observe the block's wall time into histogram ``name``.
+
+        Yields the label dict, so the block can add a label decided inside it
+        (e.g. ``outcome``) before the observation is recorded.
+        """
+        if not self.enabled:
+            yield labels
+            return
+        start = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def counter_value(self, name: str, **labels: object) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_key(labels), 0)
+
+    def histogram_count(self, name: str, **labels: object) -> int:
+        with self._lock:
+            hist = self._histograms.get(name, {}).get(_key(labels))
+            return hist.count if hist else 0
+
+    # ── exposition ──────────────────────────────────────────────────────────
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                full = PREFIX + name
+                _header(lines, name, full, "counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{full}{_fmt_labels(labels)} {_num(value)}")
+            for name in sorted(self._histograms):
+                full = PREFIX + name
+                _header(lines, name, full, "histogram")
+                for labels, hist in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        le = _fmt_labels(labels + (("le", _num(bound)),))
+                        lines.append(f"{full}_bucket{le} {cumulative}")
+                    inf = _fmt_labels(labels + (("le", "+Inf"),))
+                    lines.append(f"{full}_bucket{inf} {hist.count}")
+                    lines.append(f"{full}_sum{_fmt_labels(labels)} {_num(hist.sum)}")
+                    lines.append(f"{full}_count{_fmt_labels(labels)} {hist.count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def write_textfile(self, path: str | Path) -> None:
+        """Atomically (re)write ``path`` with the current exposition."""
+        from vmware_aiops._fsutil import secure_chmod_file, secure_mkdir
+
+        target = Path(path).expanduser()
+        secure_mkdir(target.parent)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        secure_chmod_file(tmp)
+        os.replace(tmp, target)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` on ``host:port`` from a daemon thread."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API name
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=server.serve_forever, name="metrics-http", daemon=True
+        ).start()
+        logger.info("Metrics endpoint on http://%s:%d/metrics", host, server.server_port)
+        return server
+
+
+def _header(lines: list[str], name: str, full: str, kind: str) -> None:
+    if name in _HELP:
+        lines.append(f"# HELP {full} {_HELP[name]}")
+    lines.append(f"# TYPE {full} {kind}")
+
+
+def _fmt_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = Registry()
+
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+
+class ThrottledTextfile:
+    """Rewrites a textfile at most every ``min_interval`` seconds (MCP server)."""
+
+    def __init__(self, path: str | Path, min_interval: float = 15.0) -> None:
+        self._path = path
+        self._min_interval = min_interval
+        self._last: float | None = None
+
+    def maybe_write(self) -> None:
+        if not REGISTRY.enabled:
+            return
+        now = time.monotonic()
+        if self._last is not None and now - self._last < self._min_interval:
+            return
+        self._last = now
+        try:
+            REGISTRY.write_textfile(self._path)
+        except OSError as e:
+            logger.debug("Could not write metrics textfile: %s", e)
@@ -0,0 +1,241 @@
+"""Indexed scan history in a local SQLite database.
+
+``scan.log`` is append-only JSONL: "every critical issue on host X last week"
+means reading every line of every rotated segment. :class:`ScanHistory`
+records the same entries (written by :class:`ScanLogger` alongside the JSONL
+line) into ``~/.vmware-aiops/scan_history.db``:
+
+* one row per logged issue, the full entry kept as JSON;
+* indexes on time and on (severity | entity | source | target, time), so a
+  range query filtered on any of those is an index range scan;
+* WAL journal, so the daemon can write while the CLI / MCP server read;
+* rows older than ``retention_days`` are deleted at most once a day and the
+  freed pages returned to the OS (incremental auto-vacuum).
+
+Every operation opens its own short-lived connection, which keeps the store
+safe to share between the scheduler's job threads and alarm watchers.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger("vmware-aiops.history")
+
+_COMPACT_EVERY_S = 24 * 3600
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS issues (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        severity TEXT NOT NULL,
+        source TEXT NOT NULL,
+        target TEXT NOT NULL DEFAULT '',
+        entity TEXT NOT NULL DEFAULT '',
+        transition TEXT NOT NULL DEFAULT '',
+        message TEXT NOT NULL DEFAULT '',
+        entry TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_issues_ts ON issues (ts)",
+    "CREATE INDEX IF NOT EXISTS ix_issues_severity_ts ON issues (severity, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_issues_entity_ts ON issues (entity, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_issues_source_ts ON issues (source, ts)",
+    "CREATE INDEX IF NOT EXISTS ix_issues_target_ts ON issues (target, ts)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+_FILTERS = ("severity", "entity", "source", "target", "transition")
+SEVERITIES = ("critical", "warning", "info")
+
+
+class ScanHistory:
+    """SQLite-backed, queryable record of logged scan issues."""
+
+    def __init__(self, db_file: str, retention_days: int = 90) -> None:
+        """
+        Args:
+            db_file: Database path; created (0600, in a 0700 dir) on first write.
+            retention_days: Rows older than this are compacted away; 0 keeps
+                everything.
+        """
+        self._path = Path(db_file).expanduser()
+        self._retention_s = max(0, retention_days) * 86400
+        self._ready = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def exists(self) -> bool:
+        return self._path.is_file()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            self._init(conn)
+        return conn
+
+    def _init(self, conn: sqlite3.Connection) -> None:
+        from vmware_aiops._fsutil import secure_chmod_file
+
+        # auto_vacuum only takes effect before the first table is created.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        secure_chmod_file(self._path)
+        self._ready = True
+
+    # ── write side ──────────────────────────────────────────────────────────
+
+    def record(self, entries: list[dict], now: float | None = None) -> int:
+        """Insert log entries (each with an ISO ``timestamp``); returns the count.
+
+        Runs :meth:`compact` when the last compaction is over a day old.
+        """
+        if not entries:
+            return 0
+        from vmware_aiops._fsutil import secure_mkdir
+
+        secure_mkdir(self._path.parent)
+        now = time.time() if now is None else now
+        rows = [
+            (
+                _epoch(entry.get("timestamp"), now),
+                entry.get("severity", "info"),
+                entry.get("source", ""),
+                entry.get("target", ""),
+                entry.get("entity", ""),
+                entry.get("transition", ""),
+                entry.get("message", ""),
+                json.dumps(entry, ensure_ascii=False),
+            )
+            for entry in entries
+        ]
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO issues (ts, severity, source, target, entity, "
+                    "transition, message, entry) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            last = conn.execute(
+                "SELECT value FROM meta WHERE key = 'last_compact'"
+            ).fetchone()
+            if last is None:
+                _set_meta(conn, "last_compact", now)
+            elif now - float(last["value"]) >= _COMPACT_EVERY_S:
+                self._compact(conn, now)
+        return len(rows)
+
+    def compact(self, now: float | None = None) -> int:
+        """Delete rows past retention and release their pages; returns rows deleted."""
+        if not self.exists():
+            return 0
+        with closing(self._connect()) as conn:
+            return self._compact(conn, time.time() if now is None else now)
+
+    def _compact(self, conn: sqlite3.Connection, now: float) -> int:
+        deleted = 0
+        if self._retention_s:
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM issues WHERE ts < ?", (now - self._retention_s,)
+                ).rowcount
+        if deleted:
+            conn.execute("PRAGMA incremental_vacuum")
+            logger.info("Scan history: compacted %d row(s) past retention", deleted)
+        _set_meta(conn, "last_compact", now)
+        return deleted
+
+    # ── read side ───────────────────────────────────────────────────────────
+
+    def query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = 100,
+        **filters: str | None,
+    ) -> tuple[list[dict], int]:
+        """Entries in ``[since, until)`` matching ``filters``, newest first.
+
+        Args:
+            since: Epoch seconds lower bound (inclusive); None is unbounded.
+            until: Epoch seconds upper bound (exclusive); None is unbounded.
+            limit: Max rows returned; None or <= 0 returns all.
+            **filters: Exact-match ``severity``, ``entity``, ``source``,
+                ``target`` or ``transition``; None values are ignored.
+
+        Returns:
+            ``(entries, total)`` — the page and the number of matching rows.
+
+        Raises:
+            ValueError: Unknown filter or severity.
+            FileNotFoundError: No history has been recorded yet.
+        """
+        unknown = set(filters) - set(_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown history filter(s): {', '.join(sorted(unknown))}")
+        severity = filters.get("severity")
+        if severity is not None and severity not in SEVERITIES:
+            raise ValueError(
+                f"Unknown severity '{severity}'. Use one of: {', '.join(SEVERITIES)}."
+            )
+        if not self.exists():
+            raise FileNotFoundError(
+                f"No scan history at {self._path} yet. It is recorded by the "
+                "scanner daemon ('vmware-aiops daemon start') while "
+                "notify.history_enabled is true."
+            )
+
+        clauses: list[str] = []
+        params: list[object] = []
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        for column in _FILTERS:
+            value = filters.get(column)
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with closing(self._connect()) as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM issues{where}", params).fetchone()[0]
+            sql = f"SELECT entry FROM issues{where} ORDER BY ts DESC, id DESC"
+            if limit is not None and limit > 0:
+                sql += f" LIMIT {int(limit)}"
+            rows = conn.execute(sql, params).fetchall()
+        return [json.loads(r["entry"]) for r in rows], total
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: object) -> None:
+    with conn:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+
+def _epoch(timestamp: object, default: float) -> float:
+    if not isinstance(timestamp, str):
+        return default
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return default
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
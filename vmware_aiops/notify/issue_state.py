@@ -0,0 +1,233 @@
+"""Cross-cycle issue state: fingerprint dedup and transition-only notification.
+
+Every scan cycle re-reports every still-active alarm and every event still
+inside the lookback window. Without state, a single long-lived alarm pages the
+webhook and appends to ``scan.log`` on every cycle. :class:`IssueStateStore`
+remembers each issue by a stable fingerprint and lets only transitions through:
+
+* ``new``       — first sighting (or first since it resolved / expired)
+* ``escalated`` — same fingerprint, higher severity than last seen
+* ``renotify``  — still active and ``renotify_minutes`` have passed since the
+  last notification (0 disables reminders)
+* ``resolved``  — a *stateful* issue (alarm, connection failure) that was
+  active last cycle and is absent this cycle, for a target/source that was
+  actually scanned this cycle. Events and host log lines are point-in-time:
+  their absence means they aged out of the lookback window, not that anything
+  recovered, so they expire silently instead.
+
+Storage: ``~/.vmware-aiops/issue_state.json`` (owner-only), rewritten once per
+cycle. Memory and disk are bounded by ``max_entries`` (least recently seen
+entries are evicted first) and ``expire_hours`` (entries not seen for that long
+are dropped).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger("vmware-aiops.issue-state")
+
+# Sources whose issues reflect a current condition rather than a past event.
+STATEFUL_SOURCES = frozenset({"alarm", "connection"})
+
+_SEVERITY_RANK = {"critical": 0, "warning": 1, "info": 2}
+
+# Volatile fragments that differ between two reports of the same problem.
+_VOLATILE_RE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:[+-]\d{2}:?\d{2}|Z)?"  # timestamps
+    r"|\b0x[0-9a-f]+\b"                                       # hex ids / addresses
+    r"|\b[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}\b"       # uuids
+    r"|\d+",                                                  # counters, opIDs
+    re.IGNORECASE,
+)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Reduce ``message`` to the part that identifies the problem."""
+    text = _VOLATILE_RE.sub("#", message.lower())
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def issue_fingerprint(issue: dict) -> str:
+    """Stable fingerprint: target, source, entity, alarm/event type, message."""
+    kind = issue.get("alarm_name") or issue.get("event_type") or ""
+    parts = (
+        str(issue.get("target", "")),
+        str(issue.get("source", "")),
+        str(issue.get("entity", "")),
+        str(kind),
+        normalize_message(str(issue.get("message", ""))),
+    )
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()[:20]
+
+
+def _is_stateful(source: str) -> bool:
+    return source in STATEFUL_SOURCES
+
+
+class IssueStateStore:
+    """Persisted fingerprint -> last-known-state map for scan issues."""
+
+    def __init__(
+        self,
+        state_file: str,
+        renotify_minutes: int = 240,
+        max_entries: int = 5000,
+        expire_hours: int = 72,
+    ) -> None:
+        self._path = Path(state_file).expanduser()
+        self._renotify_s = max(0, renotify_minutes) * 60
+        self._max_entries = max(1, max_entries)
+        self._expire_s = max(1, expire_hours) * 3600
+        self._entries: OrderedDict[str, dict] = self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── persistence ─────────────────────────────────────────────────────────
+
+    def _load(self) -> OrderedDict[str, dict]:
+        if not self._path.exists():
+            return OrderedDict()
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Failed to load issue state, starting fresh: %s", e)
+            return OrderedDict()
+        entries = raw.get("entries", {}) if isinstance(raw, dict) else {}
+        ordered = sorted(entries.items(), key=lambda kv: kv[1].get("last_seen", 0))
+        return OrderedDict(ordered)
+
+    def save(self) -> None:
+        """Write the store atomically (temp file + rename), owner-only."""
+        from vmware_aiops._fsutil import secure_chmod_file, secure_mkdir
+
+        secure_mkdir(self._path.parent)
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"version": 1, "entries": self._entries}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        secure_chmod_file(tmp)
+        os.replace(tmp, self._path)
+
+    # ── transitions ─────────────────────────────────────────────────────────
+
+    def process(
+        self,
+        issues: list[dict],
+        scanned_scopes: set[tuple[str, str]],
+        now: float | None = None,
+    ) -> list[dict]:
+        """Fold one cycle's issues into the store and return the transitions.
+
+        Args:
+            issues: Every issue the cycle produced. Each should carry
+                ``target`` so identical entity names on two vCenters stay apart.
+            scanned_scopes: ``(target, source)`` pairs that were scanned
+                successfully this cycle. Only stateful issues inside one of
+                these scopes can resolve — a failed alarm scan must not read as
+                "every alarm cleared".
+            now: Epoch seconds (tests); defaults to ``time.time()``.
+
+        Returns:
+            Issue dicts annotated with ``transition``, ``fingerprint``,
+            ``first_seen`` and ``occurrences``, in input order with resolutions
+            last. Suppressed repeats are not returned.
+        """
+        now = time.time() if now is None else now
+        emitted: list[dict] = []
+        seen_now: set[str] = set()
+
+        for issue in issues:
+            fp = issue_fingerprint(issue)
+            if fp in seen_now:
+                continue
+            seen_now.add(fp)
+            severity = issue.get("severity", "info")
+            entry = self._entries.get(fp)
+
+            transition: str | None
+            if entry is None or not entry.get("active", True):
+                transition = "new"
+                entry = {
+                    "target": issue.get("target", ""),
+                    "source": issue.get("source", ""),
+                    "entity": issue.get("entity", ""),
+                    "message": str(issue.get("message", ""))[:500],
+                    "severity": severity,
+                    "first_seen": now,
+                    "count": 0,
+                }
+            elif _SEVERITY_RANK.get(severity, 9) < _SEVERITY_RANK.get(entry["severity"], 9):
+                transition = "escalated"
+            elif self._renotify_s and now - entry.get("last_notified", 0) >= self._renotify_s:
+                transition = "renotify"
+            else:
+                transition = None
+
+            entry["severity"] = severity
+            entry["last_seen"] = now
+            entry["active"] = True
+            entry["count"] = entry.get("count", 0) + 1
+            if transition is not None:
+                entry["last_notified"] = now
+                emitted.append(self._annotate(issue, fp, entry, transition))
+            self._entries[fp] = entry
+            self._entries.move_to_end(fp)
+
+        for fp, entry in list(self._entries.items()):
+            if fp in seen_now or not entry.get("active", True):
+                continue
+            if not _is_stateful(entry.get("source", "")):
+                continue
+            if (entry.get("target", ""), entry.get("source", "")) not in scanned_scopes:
+                continue
+            entry["active"] = False
+            entry["resolved_at"] = now
+            emitted.append(self._annotate(
+                {
+                    "severity": entry["severity"],
+                    "source": entry["source"],
+                    "message": entry["message"],
+                    "time": "",
+                    "entity": entry["entity"],
+                    "target": entry["target"],
+                },
+                fp, entry, "resolved",
+            ))
+
+        self._evict(now)
+        return emitted
+
+    @staticmethod
+    def _annotate(issue: dict, fp: str, entry: dict, transition: str) -> dict:
+        return {
+            **issue,
+            "transition": transition,
+            "fingerprint": fp,
+            "first_seen": entry["first_seen"],
+            "occurrences": entry["count"],
+        }
+
+    def _evict(self, now: float) -> None:
+        """Drop entries unseen for ``expire_hours``, then trim to ``max_entries``.
+
+        ``_entries`` is kept in last-seen order, so both passes pop from the
+        front: the least recently seen entry always goes first.
+        """
+        while self._entries:
+            fp, entry = next(iter(self._entries.items()))
+            if now - entry.get("last_seen", 0) < self._expire_s:
+                break
+            del self._entries[fp]
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
@@ -1,43 +1,184 @@
-"""Structured logging for scan results."""
+"""Structured logging for scan results.
+
+Issues are buffered per scan cycle and written with one file handle and one
+flush (:meth:`ScanLogger.log_issues`). Before each write the active file is
+rotated when it has outgrown ``max_bytes`` or its first entry is older than
+``rotate_hours``; rotated segments are renamed ``scan.log.<UTC stamp>``,
+optionally gzipped, and only the newest ``backups`` are kept.
+
+With a :class:`~vmware_aiops.notify.history.ScanHistory` attached, each batch
+is also recorded in the indexed SQLite store that backs
+``vmware-aiops scan history``.
+"""
 
 from __future__ import annotations
 
+import gzip
 import json
 import logging
+import os
+import shutil
+import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from vmware_aiops.notify.history import ScanHistory
+
+_LEVELS = {
+    "critical": logging.CRITICAL,
+    "warning": logging.WARNING,
+    "info": logging.INFO,
+}
 
 
 class ScanLogger:
     """Writes scan issues to a structured log file (JSON Lines format)."""
 
-    def __init__(self, log_file: str) -> None:
+    def __init__(
+        self,
+        log_file: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_hours: int = 24,
+        backups: int = 7,
+        compress: bool = True,
+        console_limit: int = 50,
+        history: ScanHistory | None = None,
+    ) -> None:
+        """
+        Args:
+            log_file: Active JSONL file.
+            max_bytes: Rotate once the active file reaches this size; 0 disables.
+            rotate_hours: Rotate once the oldest entry in the active file is
+                this old; 0 disables.
+            backups: Rotated segments to keep; older ones are deleted.
+            compress: Gzip rotated segments.
+            console_limit: Max issues echoed to the console per batch; the
+                rest are summarised in one line. Negative means unlimited.
+            history: Optional indexed store that receives every batch too.
+        """
         self._path = Path(log_file).expanduser()
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max(0, max_bytes)
+        self._rotate_s = max(0, rotate_hours) * 3600
+        self._backups = max(0, backups)
+        self._compress = compress
+        self._console_limit = console_limit
+        self._history = history
         self._logger = logging.getLogger("vmware-aiops.scan")
 
     def log_issue(self, issue: dict) -> None:
         """Append a single issue to the log file and emit to console."""
-        entry = {
-            "timestamp": datetime.now(tz=timezone.utc).isoformat(),
-            **issue,
-        }
+        self.log_issues([issue])
 
-        # Append to JSONL file
-        with open(self._path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
-        # Also log to console
-        level = {
-            "critical": logging.CRITICAL,
-            "warning": logging.WARNING,
-            "info": logging.INFO,
-        }.get(issue.get("severity", "info"), logging.INFO)
-
-        self._logger.log(
-            level,
-            "[%s] %s | %s",
-            issue.get("severity", "?").upper(),
-            issue.get("source", "?"),
-            issue.get("message", ""),
+    def log_issues(self, issues: list[dict]) -> None:
+        """Append a batch of issues with one open/write/flush and echo them."""
+        if not issues:
+            return
+        timestamp = datetime.now(tz=timezone.utc).isoformat()
+        entries = [{"timestamp": timestamp, **issue} for issue in issues]
+        payload = "".join(
+            json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries
         )
+
+        self._maybe_rotate()
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write(payload)
+
+        if self._history is not None:
+            try:
+                self._history.record(entries)
+            except (sqlite3.Error, OSError) as e:
+                self._logger.warning("Could not record scan history: %s", e)
+
+        self._echo(issues)
+
+    # ── console ─────────────────────────────────────────────────────────────
+
+    def _echo(self, issues: list[dict]) -> None:
+        limit = self._console_limit
+        shown = issues if limit < 0 else issues[:limit]
+        for issue in shown:
+            self._logger.log(
+                _LEVELS.get(issue.get("severity", "info"), logging.INFO),
+                "[%s] %s | %s",
+                issue.get("severity", "?").upper(),
+                issue.get("source", "?"),
+                issue.get("message", ""),
+            )
+        if len(shown) < len(issues):
+            self._logger.warning(
+                "... %d more issue(s) written to %s",
+                len(issues) - len(shown),
+                self._path,
+            )
+
+    # ── rotation ────────────────────────────────────────────────────────────
+
+    def _maybe_rotate(self) -> None:
+        try:
+            size = self._path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == 0:
+            return
+        if self._max_bytes and size >= self._max_bytes:
+            self._rotate()
+            return
+        if self._rotate_s:
+            started = self._first_entry_time()
+            now = datetime.now(tz=timezone.utc)
+            if started is not None and (now - started).total_seconds() >= self._rotate_s:
+                self._rotate()
+
+    def _first_entry_time(self) -> datetime | None:
+        """Timestamp of the first line in the active file, if parseable."""
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                first = f.readline()
+            started = datetime.fromisoformat(json.loads(first)["timestamp"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+        return started
+
+    def _rotate(self) -> None:
+        stamp = datetime.now(tz=timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        rotated = self._path.with_name(f"{self._path.name}.{stamp}")
+        n = 1
+        while rotated.exists() or rotated.with_name(rotated.name + ".gz").exists():
+            rotated = self._path.with_name(f"{self._path.name}.{stamp}-{n}")
+            n += 1
+        os.replace(self._path, rotated)
+
+        if self._compress:
+            try:
+                with open(rotated, "rb") as src, gzip.open(
+                    rotated.with_name(rotated.name + ".gz"), "wb"
+                ) as dst:
+                    shutil.copyfileobj(src, dst)
+                rotated.unlink()
+            except OSError as e:
+                self._logger.warning("Could not compress %s: %s", rotated, e)
+
+        self._prune()
+
+    def rotated_segments(self) -> list[Path]:
+        """Rotated segments, oldest first (by last write, then name)."""
+        prefix = self._path.name + "."
+        segments = [
+            p for p in self._path.parent.iterdir()
+            if p.name.startswith(prefix) and p.name[len(prefix):][:1].isdigit()
+        ]
+        return sorted(segments, key=lambda p: (p.stat().st_mtime, p.name))
+
+    def _prune(self) -> None:
+        segments = self.rotated_segments()
+        excess = len(segments) - self._backups
+        for old in segments[:max(0, excess)]:
+            try:
+                old.unlink()
+            except OSError as e:
+                self._logger.warning("Could not remove %s: %s", old, e)
@@ -8,6 +8,8 @@ from datetime import datetime, timezone
 
 import httpx
 
+from vmware_aiops import metrics
+
 logger = logging.getLogger("vmware-aiops.webhook")
 
 
@@ -27,49 +29,76 @@ class WebhookNotifier:
         if not self._url:
             return False
 
-        critical = [i for i in issues if i["severity"] == "critical"]
-        warning = [i for i in issues if i["severity"] == "warning"]
-
-        payload = {
-            "source": "vmware-aiops",
-            "timestamp": datetime.now(tz=timezone.utc).isoformat(),
-            "summary": (
-                f"VMware AIops: {len(critical)} critical, "
-                f"{len(warning)} warning issue(s)"
-            ),
-            "issues": issues,
-            # Slack-compatible text field
-            "text": _format_slack_text(issues),
-        }
-
-        try:
-            response = httpx.post(
-                self._url,
-                content=json.dumps(payload, ensure_ascii=False),
-                headers={"Content-Type": "application/json"},
-                timeout=self._timeout,
-            )
-            if response.status_code < 300:
-                logger.info("Webhook sent successfully (%d issues)", len(issues))
-                return True
-            logger.warning(
-                "Webhook returned %d: %s",
-                response.status_code,
-                # Strip CR/LF so a hostile endpoint can't inject forged log lines.
-                response.text[:200].replace("\n", " ").replace("\r", " "),
-            )
-            return False
-        except httpx.HTTPError as e:
-            logger.error("Webhook failed: %s", e)
-            return False
+        with metrics.timer("webhook_seconds", mode="inline") as labels:
+            try:
+                response = httpx.post(
+                    self._url,
+                    content=json.dumps(build_payload(issues), ensure_ascii=False),
+                    headers={"Content-Type": "application/json"},
+                    timeout=self._timeout,
+                )
+            except httpx.HTTPError as e:
+                logger.error("Webhook failed: %s", e)
+                labels["result"] = "error"
+                metrics.inc("webhook_requests_total", **labels)
+                return False
+            ok = _log_response(response, len(issues))
+            labels["result"] = str(response.status_code)
+        metrics.inc("webhook_requests_total", **labels)
+        return ok
+
+
+def build_payload(issues: list[dict]) -> dict:
+    """Webhook JSON body: summary counts, the issues, and Slack ``text``."""
+    active = [i for i in issues if i.get("transition") != "resolved"]
+    critical = [i for i in active if i["severity"] == "critical"]
+    warning = [i for i in active if i["severity"] == "warning"]
+    resolved = len(issues) - len(active)
+
+    summary = (
+        f"VMware AIops: {len(critical)} critical, "
+        f"{len(warning)} warning issue(s)"
+    )
+    if resolved:
+        summary += f", {resolved} resolved"
+
+    return {
+        "source": "vmware-aiops",
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "summary": summary,
+        "issues": issues,
+        # Slack-compatible text field
+        "text": _format_slack_text(issues),
+    }
+
+
+def _log_response(response: httpx.Response, count: int) -> bool:
+    if response.status_code < 300:
+        logger.info("Webhook sent successfully (%d issues)", count)
+        return True
+    logger.warning(
+        "Webhook returned %d: %s",
+        response.status_code,
+        # Strip CR/LF so a hostile endpoint can't inject forged log lines.
+        response.text[:200].replace("\n", " ").replace("\r", " "),
+    )
+    return False
 
 
 def _format_slack_text(issues: list[dict]) -> str:
     """Format issues as Slack-compatible text."""
     lines = ["*VMware AIops Scanner Alert*\n"]
     for issue in issues[:20]:  # Cap at 20 to avoid message limits
-        icon = ":red_circle:" if issue["severity"] == "critical" else ":warning:"
-        lines.append(f"{icon} `{issue.get('entity', 'N/A')}` {issue['message']}")
+        transition = issue.get("transition")
+        if transition == "resolved":
+            icon = ":white_check_mark:"
+        elif issue["severity"] == "critical":
+            icon = ":red_circle:"
+        else:
+            icon = ":warning:"
+        # Dedup transitions other than a first sighting are worth calling out.
+        tag = f" *{transition.upper()}*" if transition and transition != "new" else ""
+        lines.append(f"{icon}{tag} `{issue.get('entity', 'N/A')}` {issue['message']}")
     if len(issues) > 20:
         lines.append(f"\n... and {len(issues) - 20} more")
     return "\n".join(lines)
@@ -0,0 +1,259 @@
+"""Durable, background webhook delivery.
+
+:class:`WebhookNotifier.send` posts inline: a slow endpoint stalls the scan
+cycle for ``webhook_timeout`` seconds and a failed delivery is lost. Here the
+scan cycle only writes a batch into an on-disk spool
+(``~/.vmware-aiops/webhook_spool/``) and returns; a daemon thread drains it:
+
+* batches that are due are coalesced into one POST (up to ``max_batch``
+  issues), so a backlog built up during an outage goes out in a few requests;
+* a failed POST backs the *endpoint* off exponentially (``backoff_base`` ...
+  ``backoff_max`` seconds, with jitter; ``Retry-After`` honoured on 429/503);
+* POSTs are spaced to at most ``rate_per_minute`` for the endpoint;
+* one ``httpx.Client`` is reused so keep-alive connections survive between
+  batches;
+* a permanent 4xx (anything but 408/429) moves the batch to ``*.dead`` for
+  inspection instead of retrying forever;
+* the spool is bounded by ``max_spool_files`` (oldest dropped first).
+
+Batches survive a daemon restart: the spool is re-read on start.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from vmware_aiops import metrics
+from vmware_aiops.notify.webhook import _log_response, build_payload
+
+logger = logging.getLogger("vmware-aiops.webhook")
+
+_RETRYABLE_4XX = frozenset({408, 429})
+
+
+class WebhookSpool:
+    """Directory of pending webhook batches, one JSON file per batch."""
+
+    def __init__(self, spool_dir: str, max_files: int = 1000) -> None:
+        self._dir = Path(spool_dir).expanduser()
+        self._max_files = max(1, max_files)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._dir
+
+    def put(self, issues: list[dict]) -> Path:
+        """Persist one batch atomically and return its file."""
+        from vmware_aiops._fsutil import secure_chmod_file, secure_mkdir
+
+        secure_mkdir(self._dir)
+        with self._lock:
+            self._seq += 1
+            name = f"{time.time_ns():020d}-{os.getpid()}-{self._seq:06d}.json"
+        final = self._dir / name
+        tmp = final.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"enqueued_at": time.time(), "issues": issues}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        secure_chmod_file(tmp)
+        os.replace(tmp, final)
+        self._trim()
+        return final
+
+    def pending(self) -> list[Path]:
+        """Batch files, oldest first."""
+        if not self._dir.is_dir():
+            return []
+        return sorted(self._dir.glob("*.json"))
+
+    def read(self, path: Path) -> list[dict]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["issues"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Discarding unreadable webhook batch %s: %s", path.name, e)
+            path.unlink(missing_ok=True)
+            return []
+
+    def remove(self, paths: list[Path]) -> None:
+        for p in paths:
+            p.unlink(missing_ok=True)
+
+    def bury(self, paths: list[Path]) -> None:
+        """Keep undeliverable batches as ``*.dead`` for inspection."""
+        for p in paths:
+            try:
+                os.replace(p, p.with_suffix(".dead"))
+            except OSError:
+                p.unlink(missing_ok=True)
+
+    def _trim(self) -> None:
+        files = self.pending()
+        excess = len(files) - self._max_files
+        if excess > 0:
+            logger.warning("Webhook spool full; dropping %d oldest batch(es)", excess)
+            self.remove(files[:excess])
+
+
+class WebhookSender:
+    """Background sender draining a :class:`WebhookSpool` to one endpoint."""
+
+    def __init__(
+        self,
+        url: str,
+        spool: WebhookSpool,
+        timeout: int = 10,
+        max_batch: int = 200,
+        rate_per_minute: int = 20,
+        backoff_base: float = 5.0,
+        backoff_max: float = 900.0,
+    ) -> None:
+        self._url = url
+        self._spool = spool
+        self._timeout = timeout
+        self._max_batch = max(1, max_batch)
+        self._min_interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._failures = 0
+        self._not_before = 0.0   # endpoint backoff / rate limit gate (monotonic)
+        self._client: httpx.Client | None = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ── producer side ───────────────────────────────────────────────────────
+
+    def enqueue(self, issues: list[dict]) -> None:
+        """Spool ``issues`` for delivery and wake the sender. Never blocks on I/O
+        to the endpoint."""
+        if not issues:
+            return
+        self._spool.put(issues)
+        self._wake.set()
+
+    # ── lifecycle ───────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="webhook-sender", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the thread; undelivered batches stay in the spool."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.drain_once()
+            except Exception:  # keep the thread alive on unexpected errors
+                logger.exception("Webhook sender iteration failed")
+            wait = self._not_before - time.monotonic()
+            if not self._spool.pending():
+                wait = None  # sleep until the next enqueue
+            self._wake.wait(None if wait is None else max(0.05, wait))
+            self._wake.clear()
+
+    # ── delivery ────────────────────────────────────────────────────────────
+
+    def drain_once(self) -> str:
+        """Deliver at most one coalesced batch.
+
+        Returns ``"idle"`` (nothing spooled), ``"waiting"`` (backoff or rate
+        limit in effect), ``"sent"``, ``"failed"`` (will retry) or ``"dead"``
+        (permanent 4xx; batch moved aside).
+        """
+        files = self._spool.pending()
+        if not files:
+            return "idle"
+        if time.monotonic() < self._not_before:
+            return "waiting"
+
+        taken: list[Path] = []
+        issues: list[dict] = []
+        for path in files:
+            batch = self._spool.read(path)
+            if taken and len(issues) + len(batch) > self._max_batch:
+                break
+            taken.append(path)
+            issues.extend(batch)
+        if not issues:
+            self._spool.remove(taken)
+            return "idle"
+
+        status, retry_after = self._post(issues)
+        now = time.monotonic()
+        if status == "sent":
+            self._failures = 0
+            self._spool.remove(taken)
+            self._not_before = now + self._min_interval
+        elif status == "dead":
+            self._spool.bury(taken)
+            self._not_before = now + self._min_interval
+        else:
+            self._failures += 1
+            delay = min(self._backoff_max, self._backoff_base * 2 ** (self._failures - 1))
+            delay *= random.uniform(0.8, 1.2)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            self._not_before = now + max(delay, self._min_interval)
+            logger.warning(
+                "Webhook delivery failed (%d in a row); %d batch(es) kept, retry in %.0fs",
+                self._failures, len(taken), delay,
+            )
+        return status
+
+    def _post(self, issues: list[dict]) -> tuple[str, float | None]:
+        if self._client is None:
+            self._client = httpx.Client(timeout=self._timeout)
+        with metrics.timer("webhook_seconds", mode="spool") as labels:
+            try:
+                response = self._client.post(
+                    self._url,
+                    content=json.dumps(build_payload(issues), ensure_ascii=False),
+                    headers={"Content-Type": "application/json"},
+                )
+                labels["result"] = str(response.status_code)
+            except httpx.HTTPError as e:
+                logger.error("Webhook failed: %s", e)
+                labels["result"] = "error"
+        metrics.inc("webhook_requests_total", **labels)
+        if labels["result"] == "error":
+            return "failed", None
+        if _log_response(response, len(issues)):
+            return "sent", None
+        code = response.status_code
+        if 400 <= code < 500 and code not in _RETRYABLE_4XX:
+            logger.error("Webhook rejected batch permanently (%d); moved aside", code)
+            return "dead", None
+        return "failed", _retry_after(response)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After", "")
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
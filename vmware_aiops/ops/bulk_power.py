@@ -0,0 +1,318 @@
+"""Bulk VM power operations: many VMs per call, selected by name or pattern.
+
+The single-VM helpers (``power_on_vm`` & co.) each do a full-inventory name
+lookup, start one task and wait for it before the next VM is touched. Here:
+
+* targets are resolved in one PropertyCollector pass per datacenter (see
+  :func:`vmware_aiops.ops.fleet.select_vms`);
+* power-on is one ``Datacenter.PowerOnMultiVM_Task`` per datacenter, so DRS
+  places and starts the VMs together; standalone ESXi (no multi-VM power-on)
+  falls back to per-VM ``PowerOn``. All resulting tasks are awaited in one
+  PropertyCollector filter;
+* guest shutdowns are requested in parallel and then awaited together in one
+  ``runtime.powerState`` filter, optionally escalating to hard power-off;
+* hard power-off / reset / suspend fan out on a bounded thread pool.
+
+Every function returns one :func:`~vmware_aiops.ops.fleet.row` per VM
+(``skipped`` meaning already in the wanted state).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim, vmodl
+
+from vmware_aiops.ops.fleet import (
+    DEFAULT_CONCURRENCY,
+    VMTarget,
+    fault_text,
+    guarded,
+    outcome_row,
+    row,
+    run_each,
+    select_vms,
+)
+from vmware_aiops.ops.tasks import wait_for_tasks, wait_for_values
+from vmware_aiops.ops.vm_lifecycle import _wait_for_task
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+_log = logging.getLogger("vmware-aiops.bulk_power")
+
+ACTIONS = ("on", "off", "reset", "suspend")
+
+_ON = vim.VirtualMachine.PowerState.poweredOn
+_OFF = vim.VirtualMachine.PowerState.poweredOff
+
+
+# ─── Power on ────────────────────────────────────────────────────────────────
+
+
+def power_on_vms(
+    si: ServiceInstance,
+    vm_names: list[str] | None = None,
+    pattern: str | None = None,
+    timeout: int = 600,
+) -> list[dict]:
+    """Power on many VMs with one ``PowerOnMultiVM_Task`` per datacenter.
+
+    ``OverrideAutomationLevel`` makes DRS start the VMs even in a cluster set
+    to manual mode; VMs DRS still declines are reported as errors with its
+    reason. VMs already on are ``skipped``.
+    """
+    targets, errors = select_vms(si, vm_names, pattern)
+    return _power_on_targets(targets, timeout) + errors
+
+
+def _power_on_targets(targets: list[VMTarget], timeout: int) -> list[dict]:
+    start = time.monotonic()
+    rows: list[dict | None] = [None] * len(targets)
+
+    pending: dict[object, list[int]] = {}
+    for i, t in enumerate(targets):
+        if t.power_state == _ON:
+            rows[i] = row(t.name, "skipped", "Already powered on.")
+        else:
+            pending.setdefault(t.datacenter, []).append(i)
+
+    vm_tasks: dict[object, int] = {}
+    dc_tasks: dict[object, list[int]] = {}
+    option = [vim.option.OptionValue(key="OverrideAutomationLevel", value=True)]
+    for dc, idx in pending.items():
+        try:
+            task = dc.PowerOnMultiVM_Task(vm=[targets[i].vm for i in idx], option=option)
+        except (vmodl.fault.NotSupported, vmodl.fault.MethodNotFound):
+            vm_tasks.update(_power_on_each(targets, idx, rows))
+            continue
+        dc_tasks[task] = idx
+
+    for outcome in wait_for_tasks(dc_tasks, timeout):
+        idx = dc_tasks[outcome.task]
+        if outcome.state == "success":
+            vm_tasks.update(_attempted_tasks(outcome.result, targets, idx, rows))
+        elif outcome.state == "error" and isinstance(outcome.error, vmodl.fault.NotSupported):
+            vm_tasks.update(_power_on_each(targets, idx, rows))
+        else:
+            for i in idx:
+                rows[i] = outcome_row(targets[i].name, outcome, "")
+
+    remaining = max(0.0, timeout - (time.monotonic() - start))
+    for outcome in wait_for_tasks(vm_tasks, remaining):
+        i = vm_tasks[outcome.task]
+        rows[i] = outcome_row(targets[i].name, outcome, "Powered on.")
+    return [r for r in rows if r is not None]
+
+
+def _power_on_each(targets: list[VMTarget], idx: list[int], rows: list) -> dict:
+    """Per-VM ``PowerOn`` — the fallback where multi-VM power-on is unsupported."""
+    tasks: dict[object, int] = {}
+    for i in idx:
+        try:
+            tasks[targets[i].vm.PowerOn()] = i
+        except vmodl.MethodFault as e:
+            rows[i] = row(targets[i].name, "error", fault_text(e))
+    return tasks
+
+
+def _attempted_tasks(result, targets: list[VMTarget], idx: list[int], rows: list) -> dict:
+    """Map a ``cluster.PowerOnVmResult`` back onto per-VM tasks / error rows."""
+    by_vm = {targets[i].vm: i for i in idx}
+    tasks: dict[object, int] = {}
+    for info in getattr(result, "attempted", None) or []:
+        i = by_vm.pop(info.vm, None)
+        if i is None:
+            continue
+        if info.task is None:
+            rows[i] = row(targets[i].name, "ok", "Powered on.")
+        else:
+            tasks[info.task] = i
+    for info in getattr(result, "notAttempted", None) or []:
+        i = by_vm.pop(info.vm, None)
+        if i is not None:
+            rows[i] = row(targets[i].name, "error", fault_text(info.fault))
+    for i in by_vm.values():
+        rows[i] = row(
+            targets[i].name, "error",
+            "Not attempted: DRS returned a placement recommendation instead. "
+            "Apply it in vCenter or power the VM on individually.",
+        )
+    return tasks
+
+
+# ─── Power off / reset / suspend ─────────────────────────────────────────────
+
+
+def power_vms(
+    si: ServiceInstance,
+    action: str,
+    vm_names: list[str] | None = None,
+    pattern: str | None = None,
+    force: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = 300,
+    shutdown_timeout: int = 120,
+    escalate: bool = False,
+) -> list[dict]:
+    """Select VMs (see :func:`.fleet.select_vms`) and apply a power ``action`` to them.
+
+    Raises:
+        ValueError: Unknown action, concurrency < 1, or no selector.
+    """
+    _check_action(action, concurrency)
+    targets, errors = select_vms(si, vm_names, pattern)
+    return apply_power(
+        targets, action, force, concurrency, timeout,
+        shutdown_timeout=shutdown_timeout, escalate=escalate,
+    ) + errors
+
+
+def apply_power(
+    targets: list[VMTarget],
+    action: str,
+    force: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = 300,
+    shutdown_timeout: int = 120,
+    escalate: bool = False,
+) -> list[dict]:
+    """Apply a power ``action`` (on / off / reset / suspend) to selected VMs.
+
+    ``on`` uses :func:`power_on_vms`' multi-VM path. ``off`` is a guest
+    shutdown awaited for all VMs together (see :func:`shutdown_targets`)
+    unless ``force`` asks for a hard power-off. The rest run at most
+    ``concurrency`` VMs at a time.
+    """
+    _check_action(action, concurrency)
+    if not targets:
+        return []
+    if action == "on":
+        rows = _power_on_targets(targets, timeout)
+    elif action == "off" and not force:
+        rows = shutdown_targets(targets, shutdown_timeout, escalate, concurrency, timeout)
+    else:
+        rows = run_each(targets, lambda t: _power_one(t, action, timeout), concurrency,
+                        name="power")
+    _log.info(
+        "Bulk power %s: %d/%d ok", action,
+        sum(1 for r in rows if r["status"] == "ok"), len(rows),
+    )
+    return rows
+
+
+def _check_action(action: str, concurrency: int) -> None:
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown power action '{action}'. Use one of: {', '.join(ACTIONS)}.")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+
+
+def _power_one(t: VMTarget, action: str, timeout: int) -> dict:
+    def run() -> dict:
+        if action == "off":
+            if t.power_state == _OFF:
+                return row(t.name, "skipped", "Already powered off.")
+            _wait_for_task(t.vm.PowerOff(), timeout)
+            return row(t.name, "ok", "Force powered off.")
+        if t.power_state != _ON:
+            return row(t.name, "skipped", f"Not powered on ({t.power_state}).")
+        if action == "reset":
+            _wait_for_task(t.vm.Reset(), timeout)
+            return row(t.name, "ok", "Reset.")
+        _wait_for_task(t.vm.Suspend(), timeout)
+        return row(t.name, "ok", "Suspended.")
+
+    return guarded(t.name, run)
+
+
+# ─── Guest shutdown ──────────────────────────────────────────────────────────
+
+
+def shutdown_targets(
+    targets: list[VMTarget],
+    shutdown_timeout: int = 120,
+    escalate: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = 300,
+) -> list[dict]:
+    """Guest-shut-down many VMs and wait for all of them in one filter.
+
+    ``ShutdownGuest`` returns at once (no task), so the requests are issued
+    ``concurrency`` at a time and then ``runtime.powerState`` of every VM is
+    watched by a single PropertyCollector wait for ``shutdown_timeout``
+    seconds — no thread is held per VM. With ``escalate``, VMs still running
+    after that, or without VMware Tools, are hard powered off.
+    """
+    rows: list[dict | None] = [None] * len(targets)
+    no_tools: set[int] = set()
+
+    def request(i: int) -> None:
+        t = targets[i]
+        if t.power_state == _OFF:
+            rows[i] = row(t.name, "skipped", "Already powered off.")
+            return
+        try:
+            t.vm.ShutdownGuest()
+        except vim.fault.ToolsUnavailable:
+            no_tools.add(i)
+            if not escalate:
+                rows[i] = row(
+                    t.name, "error", "VMware Tools not running. Use force for hard power off."
+                )
+        except vmodl.MethodFault as e:
+            rows[i] = row(t.name, "error", fault_text(e))
+
+    run_each(list(range(len(targets))), request, concurrency, name="shutdown")
+
+    requested = {
+        targets[i].vm: i for i in range(len(targets)) if rows[i] is None and i not in no_tools
+    }
+    stuck: list[int] = []
+    waiter = wait_for_values(list(requested), "runtime.powerState", (_OFF,), shutdown_timeout)
+    for vm, _, reached in waiter:
+        i = requested[vm]
+        if reached:
+            rows[i] = row(targets[i].name, "ok", "Gracefully shut down.")
+        elif escalate:
+            stuck.append(i)
+        else:
+            rows[i] = row(
+                targets[i].name, "running",
+                f"Shutdown initiated but still running after {shutdown_timeout}s. "
+                f"Retry with force if needed.",
+            )
+
+    if escalate:
+        _escalate(targets, sorted(no_tools) + stuck, rows, no_tools, shutdown_timeout, timeout)
+    return [r for r in rows if r is not None]
+
+
+def _escalate(
+    targets: list[VMTarget],
+    idx: list[int],
+    rows: list,
+    no_tools: set[int],
+    shutdown_timeout: int,
+    timeout: int,
+) -> None:
+    """Hard power-off for VMs a guest shutdown did not stop."""
+    tasks: dict[object, int] = {}
+    for i in idx:
+        try:
+            tasks[targets[i].vm.PowerOff()] = i
+        except vmodl.MethodFault as e:
+            rows[i] = row(targets[i].name, "error", fault_text(e))
+    for outcome in wait_for_tasks(tasks, timeout):
+        i = tasks[outcome.task]
+        if outcome.state == "error" and isinstance(outcome.error, vim.fault.InvalidPowerState):
+            # The guest finished shutting down between the wait and PowerOff.
+            rows[i] = row(targets[i].name, "ok", "Gracefully shut down.")
+            continue
+        done = (
+            "VMware Tools not running; force powered off." if i in no_tools
+            else f"Did not shut down within {shutdown_timeout}s; force powered off."
+        )
+        rows[i] = outcome_row(targets[i].name, outcome, done)
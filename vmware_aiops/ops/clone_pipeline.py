@@ -0,0 +1,413 @@
+"""Pipelined batch cloning: many clones of one source, several in flight.
+
+``batch_clone`` used to run each name to completion before starting the
+next, and every stage (clone, reconfigure, snapshot, power on) resolved its
+VM again by a full-inventory name lookup. Here:
+
+* the source is resolved once (a name lookup plus one PropertyCollector read
+  of its folder, host, datastores and snapshot tree);
+* CPU/memory overrides and power-on ride in the clone task's own spec
+  (:func:`.vm_lifecycle.clone_spec`, shared with ``clone_vm``). A baseline
+  snapshot is the only extra task (the power-on then follows it), run on the
+  moref the clone task returned, so no stage looks anything up by name;
+* linked clones (:func:`linked_clone_jobs`) take the source's snapshot from
+  the same read and are spread round-robin over the hosts of its cluster
+  that mount its datastores, from one read of every host;
+* instant clones (:func:`run_instant_clones`) fork the running source in
+  memory on its own host, each with its own ``extraConfig`` identity;
+* up to ``concurrency`` clones are in flight at once, each moving to its next
+  stage as soon as the previous one finishes, with at most ``per_host``
+  clones per host and ``per_datastore`` per datastore — a full clone is a
+  disk copy, and vCenter queues provisioning beyond 8 per host anyway.
+
+Every clone yields one ``{"name", "status", "messages"}`` dict, the shape the
+sequential ``batch_clone`` returned: one message per finished task, plus the
+failure (``status`` ``error``) or task id to poll (``running``) last.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim
+
+from vmware_aiops.ops.fleet import DEFAULT_CONCURRENCY, guarded, row, run_each
+from vmware_aiops.ops.inventory import InventoryError, _collect, _collect_object
+from vmware_aiops.ops.vm_lifecycle import (
+    SnapshotIndex,
+    SnapshotNode,
+    TaskFailedError,
+    _require_vm,
+    _wait_for_task,
+    clone_spec,
+    describe_spec,
+)
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+_log = logging.getLogger("vmware-aiops.clone_pipeline")
+
+DEFAULT_PER_HOST = 8
+"""vCenter runs at most 8 provisioning operations per host; more only queue."""
+DEFAULT_PER_DATASTORE = 4
+LINKED_PER_DATASTORE = 16
+"""Linked clones only write delta descriptors, so a datastore takes many more."""
+
+SOURCE_PATHS = [
+    "parent", "runtime.host", "runtime.powerState", "datastore", "config.template",
+    "snapshot.rootSnapshotList", "summary.storage.committed", "resourcePool",
+]
+_LINKED = vim.vm.RelocateSpec.DiskMoveOptions.createNewChildDiskBacking
+_ON = vim.VirtualMachine.PowerState.poweredOn
+_HOST_PATHS = [
+    "name", "parent", "runtime.connectionState", "runtime.inMaintenanceMode", "datastore",
+]
+
+
+@dataclass(frozen=True)
+class CloneSource:
+    """A clone source resolved once for the whole batch."""
+
+    name: str
+    vm: object
+    folder: object
+    host: object
+    datastores: tuple
+    template: bool = False
+    snapshots: SnapshotIndex = field(default_factory=SnapshotIndex)
+    power_state: str = ""
+    committed: int = 0
+    """Bytes the source occupies on its datastores — what a full clone copies."""
+    pool: object = None
+    """The source's resource pool or vApp; None for a template."""
+
+
+@dataclass(frozen=True)
+class CloneJob:
+    """One clone to make: its name and where it lands."""
+
+    name: str
+    location: object
+    """``vim.vm.RelocateSpec`` for the clone."""
+    host: object = None
+    """Host the clone runs on (concurrency key), None to inherit the source's."""
+    datastores: tuple = ()
+    """Datastores the clone is written to, empty to inherit the source's."""
+    host_name: str = ""
+
+
+def resolve_source(si: ServiceInstance, name: str) -> CloneSource:
+    """Find the source VM or template and read its placement and snapshot
+    tree in one call.
+
+    Raises:
+        VMNotFoundError: No VM or template has that name.
+    """
+    vm = _require_vm(si, name)
+    return source_from_props(name, vm, _collect_object(si, vm, vim.VirtualMachine, SOURCE_PATHS))
+
+
+def source_from_props(name: str, vm: object, props: dict) -> CloneSource:
+    """A :class:`CloneSource` from ``SOURCE_PATHS`` already collected for ``vm``."""
+    return CloneSource(
+        name=name,
+        vm=vm,
+        folder=props.get("parent"),
+        host=props.get("runtime.host"),
+        datastores=tuple(props.get("datastore") or ()),
+        template=bool(props.get("config.template")),
+        snapshots=SnapshotIndex(props.get("snapshot.rootSnapshotList")),
+        power_state=str(props.get("runtime.powerState", "")),
+        committed=props.get("summary.storage.committed") or 0,
+        pool=props.get("resourcePool"),
+    )
+
+
+def clone_jobs(vm_names: list[str]) -> list[CloneJob]:
+    """Jobs that place every clone where the source is."""
+    return [CloneJob(name, vim.vm.RelocateSpec()) for name in dict.fromkeys(vm_names)]
+
+
+def linked_clone_jobs(
+    si: ServiceInstance,
+    source: CloneSource,
+    vm_names: list[str],
+    hosts: list[str] | None = None,
+) -> list[CloneJob]:
+    """Linked-clone jobs spread round-robin over the source's cluster.
+
+    Candidates are the hosts of the source host's cluster (or standalone
+    host) that are connected, out of maintenance mode and mount every
+    datastore of the source — a linked clone reads the source's base disks.
+    ``hosts`` narrows them to those names. Clones join the source's resource
+    pool (or vApp), keeping its shares and limits; only a source without one
+    (a template) falls back to the cluster's root pool. One host read, plus
+    that pool read, whatever the batch size.
+
+    Raises:
+        InventoryError: A name in ``hosts`` is not a usable candidate, or no
+            host is.
+    """
+    all_hosts = _collect(si, [vim.HostSystem], _HOST_PATHS)
+    by_ref = dict(all_hosts)
+    home = by_ref.get(source.host, {}).get("parent")
+    candidates = [
+        (h, p) for h, p in all_hosts
+        if home is not None and p.get("parent") == home
+        and str(p.get("runtime.connectionState")) == "connected"
+        and not p.get("runtime.inMaintenanceMode")
+        and set(source.datastores) <= set(p.get("datastore") or [])
+    ]
+    if hosts:
+        unknown = set(hosts) - {p.get("name") for _, p in candidates}
+        if unknown:
+            raise InventoryError(
+                f"Host(s) {', '.join(sorted(unknown))} cannot take linked clones of "
+                f"'{source.name}': they must be connected, out of maintenance mode, in "
+                f"the source's cluster and mount all of its datastores."
+            )
+        candidates = [(h, p) for h, p in candidates if p.get("name") in hosts]
+    if not candidates:
+        raise InventoryError(
+            f"No connected host in the cluster of '{source.name}' mounts all of its "
+            f"datastores, so no host can run its linked clones."
+        )
+    pool = source.pool
+    if pool is None:
+        pool = _collect_object(
+            si, home, vim.ComputeResource, ["resourcePool"]
+        ).get("resourcePool")
+    return [
+        linked_clone_job(source, name, h, pool, p.get("name", ""))
+        for name, (h, p) in zip(
+            dict.fromkeys(vm_names),
+            (candidates[i % len(candidates)] for i in range(len(vm_names))),
+        )
+    ]
+
+
+def linked_clone_job(
+    source: CloneSource,
+    name: str,
+    host: object = None,
+    pool: object = None,
+    host_name: str = "",
+) -> CloneJob:
+    """A linked clone of ``source`` on ``host`` (None: the source's own), in
+    the source's resource pool — ``pool`` only stands in for a source without
+    one (a template)."""
+    return CloneJob(
+        name,
+        vim.vm.RelocateSpec(diskMoveType=_LINKED, host=host, pool=source.pool or pool),
+        host=host, datastores=source.datastores, host_name=host_name,
+    )
+
+
+def clone_one(
+    source: CloneSource,
+    job: CloneJob,
+    cpu: int | None = None,
+    memory_mb: int | None = None,
+    snapshot_name: str | None = None,
+    power_on: bool = False,
+    timeout: int = 600,
+    snapshot: SnapshotNode | None = None,
+    messages: list[str] | None = None,
+) -> str:
+    """Make one clone of ``source``: the clone task, then the baseline
+    snapshot and power-on on the moref it returned.
+
+    Appends one message per finished task to ``messages`` (so a caller keeps
+    them when a later task fails) and returns them joined with `` | ``.
+    """
+    messages = [] if messages is None else messages
+    spec = clone_spec(
+        job.location, cpu, memory_mb, power_on and not snapshot_name,
+        snapshot=snapshot.snapshot if snapshot is not None else None,
+    )
+    clone = _wait_for_task(source.vm.Clone(folder=source.folder, name=job.name, spec=spec), timeout)
+    if job.location.diskMoveType == _LINKED:
+        verb = "linked-cloned from"
+    else:
+        verb = "deployed from template" if source.template else "cloned from"
+    at = f" @ snapshot '{snapshot.name}'" if snapshot is not None else ""
+    where = f" on '{job.host_name}'" if job.host_name else ""
+    messages.append(
+        f"VM '{job.name}' {verb} '{source.name}'{at}{where}{describe_spec(spec)}."
+    )
+    if snapshot_name:
+        _wait_for_task(clone.CreateSnapshot_Task(
+            name=snapshot_name, description="Baseline snapshot",
+            memory=False, quiesce=False,
+        ))
+        messages.append(f"Snapshot '{snapshot_name}' created.")
+        if power_on:
+            _wait_for_task(clone.PowerOn())
+            messages.append("Powered on.")
+    return " | ".join(messages)
+
+
+def run_clones(
+    source: CloneSource,
+    jobs: list[CloneJob],
+    cpu: int | None = None,
+    memory_mb: int | None = None,
+    snapshot_name: str | None = None,
+    power_on: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+    per_datastore: int = DEFAULT_PER_DATASTORE,
+    timeout: int = 600,
+    on_result: Callable[[dict], None] | None = None,
+    snapshot: SnapshotNode | None = None,
+) -> list[dict]:
+    """Clone ``source`` once per job, pipelined; results in ``jobs`` order.
+
+    ``snapshot`` (from :attr:`CloneSource.snapshots`) clones from that
+    snapshot instead of the current state — with the job locations of
+    :func:`linked_clone_jobs`, a linked clone. ``on_result`` gets each
+    clone's dict as soon as its last stage finishes.
+
+    Raises:
+        ValueError: ``concurrency``, ``per_host`` or ``per_datastore`` below 1.
+    """
+    if per_host < 1 or per_datastore < 1:
+        raise ValueError("per_host and per_datastore must be at least 1.")
+    limits = {"host": per_host, "datastore": per_datastore}
+
+    def keys(job: CloneJob) -> list:
+        host = job.host or source.host
+        return [("host", host)] * (host is not None) + [
+            ("datastore", ds) for ds in job.datastores or source.datastores
+        ]
+
+    def one(job: CloneJob) -> dict:
+        messages: list[str] = []
+
+        def run() -> dict:
+            clone_one(
+                source, job, cpu, memory_mb, snapshot_name, power_on, timeout, snapshot,
+                messages,
+            )
+            return {"name": job.name, "status": "ok", "message": ""}
+
+        r = guarded(job.name, run)
+        return {
+            "name": job.name,
+            "status": r["status"],
+            "messages": messages + [r["message"]] * bool(r["message"]),
+        }
+
+    results = run_each(
+        jobs, one, concurrency, keys=keys, per_key=lambda k: limits[k[0]],
+        name="clone", on_done=on_result,
+    )
+    _log.info(
+        "Batch clone from '%s': %d/%d ok", source.name,
+        sum(1 for r in results if r["status"] == "ok"), len(results),
+    )
+    return results
+
+
+
+def instant_clone_spec(
+    name: str, extra_config: dict[str, str] | None = None
+) -> vim.vm.InstantCloneSpec:
+    """An InstantCloneSpec placing the clone with its parent.
+
+    ``extra_config`` becomes the clone's ``extraConfig`` — typically
+    ``guestinfo.*`` keys a guest agent reads to take on its own hostname and
+    network identity. ``{name}`` in a value is replaced by the clone's name.
+    """
+    config = None
+    if extra_config:
+        config = [
+            vim.option.OptionValue(key=k, value=str(v).replace("{name}", name))
+            for k, v in extra_config.items()
+        ]
+    return vim.vm.InstantCloneSpec(name=name, location=vim.vm.RelocateSpec(), config=config)
+
+
+def instant_clone_one(
+    source: CloneSource,
+    name: str,
+    extra_config: dict[str, str] | None = None,
+    timeout: int = 300,
+) -> str:
+    """Instant-clone the resolved ``source`` once, on its moref; returns the
+    success message.
+
+    Raises:
+        TaskFailedError: The parent is not running, or the task failed.
+        TaskStillRunning: The task outlived ``timeout``.
+    """
+    if source.power_state != _ON:
+        raise TaskFailedError(_not_running(source))
+    spec = instant_clone_spec(name, extra_config)
+    _wait_for_task(source.vm.InstantClone_Task(spec=spec), timeout)
+    keys = f" ({len(extra_config)} extraConfig keys)" if extra_config else ""
+    return f"VM '{name}' instant-cloned from '{source.name}'{keys}, running."
+
+
+def _not_running(source: CloneSource) -> str:
+    return (
+        f"Instant clone needs a running parent; '{source.name}' is "
+        f"{source.power_state or 'not running'}. Power it on (and let the guest "
+        f"settle) first, or use a linked clone from a snapshot instead."
+    )
+
+
+def run_instant_clones(
+    source: CloneSource,
+    vm_names: list[str],
+    extra_config: dict[str, str] | None = None,
+    overrides: dict[str, dict[str, str]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+    timeout: int = 300,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Instant-clone the running ``source`` once per name; results in order.
+
+    An instant clone shares the parent's memory and disks at the moment of
+    the fork and comes up already running, so there is no power-on or boot.
+    ``overrides`` maps a clone name to ``extraConfig`` keys that replace or
+    add to ``extra_config`` for that clone only.
+
+    Raises:
+        ValueError: ``concurrency`` or ``per_host`` below 1.
+    """
+    if per_host < 1:
+        raise ValueError("per_host must be at least 1.")
+    names = list(dict.fromkeys(vm_names))
+    if source.power_state != _ON:
+        message = _not_running(source)
+        rows = [{"name": n, "status": "error", "messages": [message]} for n in names]
+        if on_result is not None:
+            for r in rows:
+                on_result(r)
+        return rows
+
+    def one(name: str) -> dict:
+        config = {**(extra_config or {}), **(overrides or {}).get(name, {})}
+
+        def run() -> dict:
+            return row(name, "ok", instant_clone_one(source, name, config, timeout))
+
+        r = guarded(name, run)
+        return {"name": name, "status": r["status"], "messages": [r["message"]]}
+
+    results = run_each(
+        names, one, concurrency,
+        keys=lambda _name: [source.host] if source.host is not None else [],
+        per_key=per_host, name="instant-clone", on_done=on_result,
+    )
+    _log.info(
+        "Instant clone from '%s': %d/%d ok", source.name,
+        sum(1 for r in results if r["status"] == "ok"), len(results),
+    )
+    return results
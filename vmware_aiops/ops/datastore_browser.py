@@ -12,7 +12,6 @@ from __future__ import annotations
 
 import json
 import logging
-import time
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
@@ -21,6 +20,7 @@ from vmware_policy import paginated, sanitize
 
 from vmware_aiops.config import CONFIG_DIR
 from vmware_aiops.ops.inventory import find_datastore_by_name
+from vmware_aiops.ops.tasks import wait_for_task
 
 if TYPE_CHECKING:
     from pyVmomi.vim import ServiceInstance
@@ -44,19 +44,17 @@ class DatastoreBrowseError(Exception):
 
 
 def _wait_for_task(task, timeout: int = 120) -> object:
-    """Wait for a vSphere task to complete."""
-    start = time.time()
-    while task.info.state in (vim.TaskInfo.State.running, vim.TaskInfo.State.queued):
-        if time.time() - start > timeout:
-            raise TimeoutError(
-                f"Datastore browse timed out after {timeout}s — the search covered too "
-                f"many files. Retry browse_datastore with a narrower 'path' (one folder "
-                f"instead of the datastore root) and a specific 'pattern' such as '*.ova'."
-            )
-        time.sleep(1)
-    if task.info.state == vim.TaskInfo.State.success:
-        return task.info.result
-    error_msg = str(task.info.error.msg) if task.info.error else "Unknown error"
+    """Wait for a datastore search task to complete."""
+    outcome = wait_for_task(task, timeout)
+    if outcome.state == "running":
+        raise TimeoutError(
+            f"Datastore browse timed out after {timeout}s — the search covered too "
+            f"many files. Retry browse_datastore with a narrower 'path' (one folder "
+            f"instead of the datastore root) and a specific 'pattern' such as '*.ova'."
+        )
+    if outcome.state == "success":
+        return outcome.result
+    error_msg = str(outcome.error.msg) if outcome.error else "Unknown error"
     # Cap the vCenter fault text: the remedy that follows it must survive the
     # MCP layer's 300-char sanitize truncation, and fault strings are unbounded.
     raise DatastoreBrowseError(
@@ -0,0 +1,332 @@
+"""Preflight for deploy specs: every problem, before the first task.
+
+``batch_deploy`` used to find a missing template, datastore or network — or
+a name that already exists — only when it reached the VM that used it, so a
+bad entry at VM 37 of 50 left 36 VMs built and the rest not. Here the whole
+spec is checked up front against a handful of batched reads, whatever the
+batch size:
+
+* every VM and template name, in one PropertyCollector call (the clone
+  source, and any name the spec would collide with);
+* the source's placement, power state, snapshot tree and size in one more;
+* the capacity snapshot of :mod:`.placement` (hosts, datastores, compute
+  resources: three calls), which also places the batch when the spec has a
+  ``placement:`` block;
+* every network name, in one call (only when a VM needs a network);
+* one datastore search per folder holding the spec's ISOs, all waited on
+  together.
+
+Without a ``placement:`` block the batch's total memory is checked against
+the usable hosts' free memory, and each datastore's disk demand against its
+free space, both keeping the placement headroom.
+"""
+
+from __future__ import annotations
+
+import logging
+import posixpath
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim
+
+from vmware_aiops.ops import clone_pipeline, placement
+from vmware_aiops.ops.inventory import _collect, _collect_objects
+from vmware_aiops.ops.tasks import wait_for_tasks
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+_log = logging.getLogger("vmware-aiops.deploy_preflight")
+
+_GB = 1024**3
+_ON = vim.VirtualMachine.PowerState.poweredOn
+_ISO_PATH = re.compile(r"^\[(?P<ds>[^\]]+)\]\s*(?P<path>.+)$")
+_SOURCE_LABELS = {
+    "instant_clone": "Parent VM", "linked_clone": "Source VM",
+    "template": "Template", "source": "Source VM",
+}
+
+
+@dataclass
+class SpecCheck:
+    """What preflight found, and the placement it planned."""
+
+    problems: list[dict] = field(default_factory=list)
+    """Rows for problems shared by the batch (source, capacity)."""
+    vm_problems: dict[str, list[str]] = field(default_factory=dict)
+    placements: dict[str, placement.Placement] = field(default_factory=dict)
+    source: clone_pipeline.CloneSource | None = None
+    """The clone source, resolved once for the whole batch (if any VM clones)."""
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems and not self.vm_problems
+
+    def add(self, name: str, message: str) -> None:
+        self.vm_problems.setdefault(name, []).append(message)
+
+    def rows(self, vm_names: list[str]) -> list[dict]:
+        """Batch-wide rows, then one row per VM: its problems, or skipped."""
+        count = len(self.problems) + sum(len(m) for m in self.vm_problems.values())
+        skipped = f"Not deployed: preflight found {count} problem(s); nothing was started."
+        return self.problems + [
+            {"name": n, "status": "error", "messages": self.vm_problems[n]}
+            if n in self.vm_problems
+            else {"name": n, "status": "skipped", "messages": [skipped]}
+            for n in vm_names
+        ]
+
+
+def channel(spec: dict, vm_spec: dict) -> str:
+    """The provisioning channel ``batch_deploy`` uses for one VM."""
+    if vm_spec.get("ova"):
+        return "ova"
+    for key in ("instant_clone", "linked_clone", "template", "source"):
+        if spec.get(key):
+            return key
+    return "create"
+
+
+def source_name(spec: dict) -> tuple[str, str] | None:
+    """``(channel, name)`` of the VM or template a spec clones from, if any."""
+    kind = next((k for k in _SOURCE_LABELS if spec.get(k)), None)
+    if kind is None:
+        return None
+    config = spec[kind]
+    return kind, config["source"] if isinstance(config, dict) else config
+
+
+def check_spec(si: ServiceInstance, spec: dict) -> SpecCheck:
+    """Check a loaded deploy spec against the inventory; see the module doc."""
+    check = SpecCheck()
+    defaults = spec.get("defaults", {})
+    vm_specs = spec["vms"]
+    channels = {v["name"]: channel(spec, v) for v in vm_specs}
+
+    existing: dict[str, list] = {}
+    for vm, p in _collect(si, [vim.VirtualMachine], ["name"]):
+        existing.setdefault(p.get("name", ""), []).append(vm)
+    for name, n in Counter(v["name"] for v in vm_specs).items():
+        if n > 1:
+            check.add(name, f"Listed {n} times in the spec; VM names must be unique.")
+        if name in existing:
+            check.add(name, f"A VM or template named '{name}' already exists.")
+
+    source = check.source = _check_source(si, spec, existing, channels, check)
+    snapshot = placement.take_snapshot(si)
+    ds_by_name = {d.name: d for d in snapshot.datastores.values()}
+
+    def datastore_problem(name: str) -> str | None:
+        if name in ds_by_name:
+            return None
+        if name in snapshot.unusable:
+            return f"Datastore '{name}' is inaccessible or in maintenance mode."
+        return f"Datastore '{name}' not found."
+
+    networks = None
+    isos: dict[tuple[str, str], dict[str, list[str]]] = {}
+    for vm_spec in vm_specs:
+        name = vm_spec["name"]
+        datastore = vm_spec.get("datastore", defaults.get("datastore"))
+        if datastore and channels[name] not in ("linked_clone", "instant_clone"):
+            problem = datastore_problem(datastore)
+            if problem:
+                check.add(name, problem)
+        if channels[name] in ("create", "ova"):
+            if networks is None:
+                networks = {p.get("name") for _, p in _collect(si, [vim.Network], ["name"])}
+            network = vm_spec.get("network", defaults.get("network", "VM Network"))
+            if network not in networks:
+                check.add(name, f"Network '{network}' not found.")
+        ova = vm_spec.get("ova")
+        if ova and not Path(ova).is_file():
+            check.add(name, f"OVA file '{ova}' not found on this machine.")
+        iso = vm_spec.get("iso")
+        if iso:
+            m = _ISO_PATH.match(iso)
+            if m is None:
+                check.add(name, f"ISO path '{iso}' must look like '[datastore] folder/file.iso'.")
+                continue
+            problem = datastore_problem(m["ds"])
+            if problem:
+                check.add(name, problem)
+                continue
+            folder, file = posixpath.split(m["path"].strip())
+            isos.setdefault((m["ds"], folder), {}).setdefault(file, []).append(name)
+    for (ds, folder), files in _missing_isos(ds_by_name, isos).items():
+        for file in files:
+            for name in isos[(ds, folder)][file]:
+                path = posixpath.join(folder, file)
+                check.add(name, f"ISO '[{ds}] {path}' not found.")
+
+    if spec.get("placement"):
+        try:
+            check.placements, unplaced = place_batch(spec, snapshot, source)
+        except ValueError as e:
+            check.problems.append({"name": "placement", "status": "error", "messages": [str(e)]})
+        else:
+            for r in unplaced:
+                check.add(r["name"], r["messages"][0])
+    else:
+        _check_capacity(spec, snapshot, source, channels, check)
+
+    _log.info(
+        "Deploy preflight: %d VMs, %d problem rows", len(vm_specs),
+        len(check.problems) + len(check.vm_problems),
+    )
+    return check
+
+
+def place_batch(
+    spec: dict,
+    snapshot: placement.CapacitySnapshot,
+    source: clone_pipeline.CloneSource | None,
+) -> tuple[dict[str, placement.Placement], list[dict]]:
+    """Place a deploy spec's VMs on ``snapshot``.
+
+    Each VM asks for its memory and the disk its channel writes: ``disk_gb``
+    for a new VM or OVA, the source's committed storage for a full clone or
+    template deploy, none for a linked clone (whose host must mount the
+    source's datastores instead). A ``datastore`` in the VM entry or the
+    defaults pins it. Instant clones stay on their parent's host and are
+    not placed.
+    """
+    defaults = spec.get("defaults", {})
+    config = spec["placement"] if isinstance(spec["placement"], dict) else {}
+    demands = []
+    for vm_spec in spec["vms"]:
+        kind = channel(spec, vm_spec)
+        if kind == "instant_clone":
+            continue
+        linked = kind == "linked_clone"
+        disk_gb = vm_spec.get("disk_gb", defaults.get("disk_gb", 40))
+        if source is not None and kind in ("template", "source"):
+            disk_gb = source.committed / _GB
+        demands.append(placement.Demand(
+            name=vm_spec["name"],
+            memory_mb=vm_spec.get("memory_mb", defaults.get("memory_mb", 4096)),
+            disk_gb=0 if linked else disk_gb,
+            datastore=None if linked else vm_spec.get("datastore", defaults.get("datastore")),
+            mounts=source.datastores if linked and source is not None else (),
+            place_datastore=not linked,
+        ))
+    return placement.plan_placement(
+        snapshot, demands,
+        strategy=config.get("strategy", "spread"),
+        hosts=config.get("hosts"), datastores=config.get("datastores"),
+        cluster=config.get("cluster"),
+    )
+
+
+def _check_source(
+    si: ServiceInstance,
+    spec: dict,
+    existing: dict[str, list],
+    channels: dict[str, str],
+    check: SpecCheck,
+) -> clone_pipeline.CloneSource | None:
+    """Resolve the clone source (one read) and check it suits its channel."""
+    kind, name = source_name(spec) or (None, "")
+    if kind is None or kind not in channels.values():
+        return None
+    config = spec[kind]
+    label = _SOURCE_LABELS[kind]
+
+    def problem(message: str) -> None:
+        check.problems.append({"name": name, "status": "error", "messages": [message]})
+
+    refs = existing.get(name, [])
+    if not refs:
+        problem(f"{label} '{name}' not found.")
+        return None
+    if len(refs) > 1:
+        problem(
+            f"{len(refs)} VMs share the name '{name}'; the {label.lower()} must be unique."
+        )
+        return None
+    [vm] = refs
+    rows = dict(_collect_objects(si, refs, vim.VirtualMachine, clone_pipeline.SOURCE_PATHS))
+    source = clone_pipeline.source_from_props(name, vm, rows.get(vm, {}))
+    if kind == "template" and not source.template:
+        problem(f"'{name}' is not a template. Use 'source: {name}' for a full clone.")
+    elif kind == "linked_clone" and source.snapshots.find(config["snapshot"]) is None:
+        problem(source.snapshots.not_found(config["snapshot"]))
+    elif kind == "instant_clone" and source.power_state != _ON:
+        problem(
+            f"Instant clone needs a running parent; '{name}' is "
+            f"{source.power_state or 'not running'}."
+        )
+    return source
+
+
+def _missing_isos(
+    ds_by_name: dict[str, placement.DatastoreCapacity],
+    isos: dict[tuple[str, str], dict[str, list[str]]],
+) -> dict[tuple[str, str], list[str]]:
+    """File names missing per ``(datastore, folder)``: one search per folder,
+    all submitted before any is waited on."""
+    tasks = {}
+    for (ds, folder), files in isos.items():
+        spec = vim.host.DatastoreBrowser.SearchSpec(matchPattern=sorted(files))
+        task = ds_by_name[ds].browser.SearchDatastore_Task(
+            datastorePath=f"[{ds}] {folder}".rstrip(), searchSpec=spec,
+        )
+        tasks[id(task)] = ((ds, folder), task)
+    found: dict[tuple[str, str], set] = {key: set() for key in isos}
+    for outcome in wait_for_tasks([t for _, t in tasks.values()], timeout=120):
+        key = tasks[id(outcome.task)][0]
+        if outcome.state == "success" and outcome.result is not None:
+            found[key] = {f.path for f in outcome.result.file or []}
+    return {key: sorted(set(files) - found[key]) for key, files in isos.items()}
+
+
+def _check_capacity(
+    spec: dict,
+    snapshot: placement.CapacitySnapshot,
+    source: clone_pipeline.CloneSource | None,
+    channels: dict[str, str],
+    check: SpecCheck,
+) -> None:
+    """Total memory against the usable hosts, disk against each datastore."""
+    defaults = spec.get("defaults", {})
+    memory = 0
+    disk: Counter = Counter()
+    for vm_spec in spec["vms"]:
+        kind = channels[vm_spec["name"]]
+        if kind == "instant_clone":
+            continue  # shares its parent's memory and disks
+        memory += vm_spec.get("memory_mb", defaults.get("memory_mb", 4096))
+        if kind == "linked_clone":
+            continue
+        datastore = vm_spec.get("datastore", defaults.get("datastore"))
+        need = vm_spec.get("disk_gb", defaults.get("disk_gb", 40))
+        if kind in ("template", "source"):
+            if source is None:
+                continue
+            if datastore is None and source.datastores:
+                # Without a datastore a clone is written next to its source.
+                home = snapshot.datastores.get(source.datastores[0])
+                datastore = home.name if home else None
+            need = source.committed / _GB
+        if datastore:
+            disk[datastore] += need
+
+    free = sum(max(h.memory_mb, 0) for h in snapshot.hosts)
+    if memory > free:
+        check.problems.append({"name": "hosts", "status": "error", "messages": [
+            f"The batch needs {memory:.0f} MB of memory; the {len(snapshot.hosts)} usable "
+            f"hosts have {free:.0f} MB free (keeping {placement.HEADROOM:.0%} headroom)."
+        ]})
+    by_name = {d.name: d for d in snapshot.datastores.values()}
+    for name, need in sorted(disk.items()):
+        ds = by_name.get(name)
+        if ds is not None and need > ds.free_gb:
+            check.problems.append({"name": name, "status": "error", "messages": [
+                f"The batch writes {need:.0f} GB to datastore '{name}', which has "
+                f"{max(ds.free_gb, 0):.0f} GB free (keeping "
+                f"{placement.DATASTORE_HEADROOM:.0%} headroom)."
+            ]})
@@ -0,0 +1,333 @@
+"""Shared plumbing for operations over many VMs at once.
+
+* :func:`select_vms` resolves VMs by exact names and/or an fnmatch pattern in
+  one PropertyCollector pass per datacenter, carrying along whatever extra
+  properties the caller needs (power state, snapshot tree, datastores) so no
+  per-VM lookup follows;
+* :func:`run_each` fans a per-VM function out on a bounded thread pool, with
+  an optional per-resource cap (e.g. concurrent snapshot tasks per
+  datastore).
+
+Bulk operations built on these (``bulk_power``, ``bulk_snapshot``) return one
+``{"name", "status", "message"}`` dict per VM; ``status`` is ``ok``,
+``skipped`` (nothing to do), ``running`` (task outlived the wait budget — not
+a failure) or ``error``.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import logging
+import threading
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TypeVar
+
+from pyVmomi import vim, vmodl
+
+from vmware_aiops.ops.inventory import (
+    VM_LOCATOR_HELP,
+    InventoryError,
+    _collect,
+    _collect_objects,
+    find_vm_by_locator,
+    is_vm_locator,
+)
+from vmware_aiops.ops.tasks import TaskOutcome
+from vmware_aiops.ops.vm_lifecycle import TaskFailedError, TaskStillRunning, _task_failed
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_log = logging.getLogger("vmware-aiops.fleet")
+
+DEFAULT_CONCURRENCY = 8
+
+_VM_PATHS = ["name", "runtime.powerState", "config.template"]
+
+
+@dataclass(frozen=True)
+class VMTarget:
+    """A VM selected for a bulk operation."""
+
+    name: str
+    vm: object
+    datacenter: object
+    power_state: str
+    props: dict = field(default_factory=dict, compare=False, repr=False)
+    """Every property collected for the VM, including the caller's extra paths."""
+
+
+def row(name: str, status: str, message: str) -> dict:
+    """One per-VM result row."""
+    return {"name": name, "status": status, "message": message}
+
+
+def outcome_row(name: str, outcome: TaskOutcome, done: str) -> dict:
+    """Row for a finished (or still running) task; ``done`` is the success message."""
+    if outcome.state == "success":
+        return row(name, "ok", done)
+    if outcome.state == "running":
+        return row(
+            name, "running",
+            f"Task {outcome.task_id} still running — not a failure. "
+            f"Poll with: vm task-status {outcome.task_id}",
+        )
+    return row(name, "error", str(_task_failed(outcome.task_id, outcome.error)))
+
+
+def guarded(name: str, fn: Callable[[], dict]) -> dict:
+    """``fn()``, with task timeouts, vSphere faults and any other error (a
+    dropped connection, say) turned into rows — one item never fails the
+    whole fan-out."""
+    try:
+        return fn()
+    except TaskStillRunning as e:
+        return row(name, "running", str(e))
+    except TaskFailedError as e:
+        return row(name, "error", str(e))
+    except vmodl.MethodFault as e:
+        return row(name, "error", fault_text(e))
+    except Exception as e:
+        _log.warning("%s failed: %s", name, e)
+        return row(name, "error", str(e) or type(e).__name__)
+
+
+def fault_text(fault) -> str:
+    if fault is None:
+        return "Failed; vCenter gave no reason."
+    return getattr(fault, "msg", None) or type(fault).__name__
+
+
+def select_vms(
+    si: ServiceInstance,
+    vm_names: list[str] | None = None,
+    pattern: str | None = None,
+    paths: Iterable[str] = (),
+) -> tuple[list[VMTarget], list[dict]]:
+    """Resolve VMs by exact name and/or fnmatch ``pattern`` (e.g. ``web-*``).
+
+    A name may also be a locator (``uuid:``, ``bios:``, ``ip:``, inventory
+    path; see :func:`.inventory.find_vm_by_locator`), resolved with one
+    ``SearchIndex`` call — the way to pick one of several same-named VMs.
+    When every name is a locator and there is no pattern, only the located
+    VMs are read (see :func:`_read_vms`), never the whole inventory.
+    Templates never match a pattern. A VM matched by both a name and the
+    pattern is selected once. ``paths`` are read in the same pass and land in
+    :attr:`VMTarget.props`.
+
+    Returns:
+        ``(targets, errors)`` — selected VMs (named ones in request order,
+        then pattern matches sorted by name) and an error row for each name
+        that is missing, ambiguous or a template.
+
+    Raises:
+        ValueError: Neither names nor a pattern given.
+    """
+    names = list(dict.fromkeys(vm_names or []))
+    if not names and not pattern:
+        raise ValueError("Give at least one VM name or a name pattern (e.g. 'web-*').")
+    vm_paths = list(dict.fromkeys([*_VM_PATHS, *paths]))
+
+    # Locators first: a ref, None (no match) or the InventoryError (ambiguous).
+    located: dict[str, object] = {}
+    for name in names:
+        if is_vm_locator(name):
+            try:
+                located[name] = find_vm_by_locator(si, name)
+            except InventoryError as e:
+                located[name] = e
+
+    by_name: dict[str, list[VMTarget]] = {}
+    by_ref: dict[object, VMTarget] = {}
+    templates: set = set()
+    if pattern or any(not is_vm_locator(n) for n in names):
+        for dc, _ in _collect(si, [vim.Datacenter], ["name"]):
+            for vm, props in _collect(si, [vim.VirtualMachine], vm_paths, root=dc):
+                name = props.get("name", "")
+                if props.get("config.template"):
+                    templates.update((name, vm))
+                    continue
+                target = VMTarget(name, vm, dc, str(props.get("runtime.powerState", "")), props)
+                by_name.setdefault(name, []).append(target)
+                by_ref[vm] = target
+    else:
+        refs = [vm for vm in located.values() if isinstance(vm, vim.VirtualMachine)]
+        by_ref, templates = _read_vms(si, refs, vm_paths)
+
+    targets: list[VMTarget] = []
+    errors: list[dict] = []
+    seen: set = set()
+
+    def take(matches: list[VMTarget]) -> None:
+        for t in matches:
+            if t.vm not in seen:
+                seen.add(t.vm)
+                targets.append(t)
+
+    for name in names:
+        if is_vm_locator(name):
+            key = located[name]
+            if isinstance(key, InventoryError):
+                errors.append(row(name, "error", str(key)))
+                continue
+            if key is None:
+                errors.append(row(name, "error", f"No VM matches this locator. {VM_LOCATOR_HELP}"))
+                continue
+            matches = [by_ref[key]] if key in by_ref else []
+        else:
+            key = name
+            matches = by_name.get(name, [])
+        if len(matches) == 1:
+            take(matches)
+        elif matches:
+            errors.append(row(
+                name, "error",
+                f"{len(matches)} VMs share this name (different folders or "
+                f"datacenters); address one by uuid:<instanceUuid> or inventory path.",
+            ))
+        elif key in templates:
+            errors.append(row(
+                name, "error",
+                "Is a template, not a VM: it cannot be powered or snapshotted. "
+                "Deploy a VM from it first.",
+            ))
+        else:
+            errors.append(row(
+                name, "error",
+                "VM not found. Names are exact and case-sensitive; use a pattern "
+                "(e.g. 'web-*') to match several.",
+            ))
+    if pattern:
+        for name in sorted(by_name):
+            if fnmatch.fnmatchcase(name, pattern):
+                take(by_name[name])
+    return targets, errors
+
+
+def _read_vms(
+    si: ServiceInstance, refs: list, vm_paths: list[str]
+) -> tuple[dict[object, VMTarget], set]:
+    """Targets for already-located VMs, and the refs that are templates.
+
+    One call reads ``vm_paths`` for just these VMs; their datacenters are then
+    found by reading ``parent`` one folder level per call, so the cost grows
+    with folder depth, not with the inventory.
+    """
+    rows = dict(_collect_objects(
+        si, refs, vim.VirtualMachine, [*vm_paths, "parent", "parentVApp"]
+    ))
+    up: dict = {vm: p.get("parent") or p.get("parentVApp") for vm, p in rows.items()}
+    pending = set(up.values())
+    while True:
+        pending = {
+            obj for obj in pending
+            if obj is not None and obj not in up and not isinstance(obj, vim.Datacenter)
+        }
+        if not pending:
+            break
+        got = dict(_collect_objects(si, list(pending), vim.ManagedEntity, ["parent"]))
+        for obj in pending:
+            up[obj] = got.get(obj, {}).get("parent")
+        pending = {up[obj] for obj in pending}
+
+    def datacenter(obj):
+        while obj is not None and not isinstance(obj, vim.Datacenter):
+            obj = up.get(obj)
+        return obj
+
+    by_ref: dict[object, VMTarget] = {}
+    templates: set = set()
+    for vm, props in rows.items():
+        if props.get("config.template"):
+            templates.add(vm)
+            continue
+        by_ref[vm] = VMTarget(
+            props.get("name", ""), vm, datacenter(up[vm]),
+            str(props.get("runtime.powerState", "")), props,
+        )
+    return by_ref, templates
+
+
+def run_each(
+    items: list[T],
+    fn: Callable[[T], R],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    keys: Callable[[T], Iterable[Hashable]] | None = None,
+    per_key: int | Callable[[Hashable], int] = 0,
+    name: str = "fleet",
+    on_done: Callable[[R], None] | None = None,
+) -> list[R]:
+    """``[fn(item) for item in items]`` on at most ``concurrency`` threads.
+
+    With ``keys`` and ``per_key``, at most ``per_key`` items sharing a key
+    (e.g. a datastore) run at once; ``per_key`` may also map each key to its
+    own limit (e.g. hosts vs datastores). An item holding several keys takes
+    all of their slots, in a fixed order so two items never wait on each
+    other. Items are started round-robin across their first key, so one busy
+    datastore does not hold the pool while others sit idle.
+
+    ``on_done`` is called with each result as it completes (one call at a
+    time), for streaming progress.
+
+    Returns:
+        Results in ``items`` order.
+
+    Raises:
+        ValueError: ``concurrency`` (or a given ``per_key``) below 1.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    limit = per_key if callable(per_key) else (lambda _key: per_key)
+    if not items:
+        return []
+
+    item_keys: list[list] = [
+        sorted(set(keys(item)), key=repr) if keys else [] for item in items
+    ]
+    slots = {}
+    for ks in item_keys:
+        for k in ks:
+            if k not in slots:
+                if limit(k) < 1:
+                    raise ValueError("per_key must be at least 1.")
+                slots[k] = threading.BoundedSemaphore(limit(k))
+    report = threading.Lock()
+
+    def call(i: int) -> R:
+        held = [slots[k] for k in item_keys[i]]
+        for slot in held:
+            slot.acquire()
+        try:
+            result = fn(items[i])
+        finally:
+            for slot in reversed(held):
+                slot.release()
+        if on_done is not None:
+            with report:
+                on_done(result)
+        return result
+
+    with ThreadPoolExecutor(
+        max_workers=min(concurrency, len(items)), thread_name_prefix=name
+    ) as pool:
+        futures = {i: pool.submit(call, i) for i in _interleave(item_keys)}
+    return [futures[i].result() for i in range(len(items))]
+
+
+def _interleave(item_keys: list[list]) -> list[int]:
+    """Item indexes round-robin across their first key, stable within a key."""
+    groups: dict[object, list[int]] = {}
+    for i, ks in enumerate(item_keys):
+        groups.setdefault(ks[0] if ks else None, []).append(i)
+    order: list[int] = []
+    queues = list(groups.values())
+    depth = 0
+    while len(order) < len(item_keys):
+        order.extend(q[depth] for q in queues if depth < len(q))
+        depth += 1
+    return order
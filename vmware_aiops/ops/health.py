@@ -55,17 +55,7 @@ def get_active_alarms(si: ServiceInstance) -> list[dict]:
     results = []
 
     def _emit(alarm_states) -> None:
-        for alarm_state in alarm_states or []:
-            severity = str(alarm_state.overallStatus)
-            severity_map = {"red": "critical", "yellow": "warning", "green": "info"}
-            results.append({
-                "severity": severity_map.get(severity, severity),
-                "alarm_name": sanitize(alarm_state.alarm.info.name),
-                "entity_name": sanitize(alarm_state.entity.name),
-                "entity_type": type(alarm_state.entity).__name__,
-                "time": str(alarm_state.time),
-                "acknowledged": getattr(alarm_state, "acknowledged", False),
-            })
+        results.extend(alarm_state_row(a) for a in alarm_states or [])
 
     # Root folder's triggeredAlarmState aggregates every descendant alarm;
     # fetched in one call rather than a lazy read.
@@ -81,10 +71,38 @@ def get_active_alarms(si: ServiceInstance) -> list[dict]:
         for _obj, props in _collect(si, [obj_type], ["triggeredAlarmState"]):
             _emit(props.get("triggeredAlarmState"))
 
-    # Deduplicate by alarm + entity
+    return dedupe_alarm_rows(results)
+
+
+def alarm_state_row(
+    alarm_state, alarm_name: str | None = None, entity_name: str | None = None
+) -> dict:
+    """Flatten one ``vim.alarm.AlarmState`` into an alarm row.
+
+    ``alarm_name`` / ``entity_name``, when already collected, stand in for
+    the lazy ``alarm.info.name`` / ``entity.name`` reads (a round-trip each).
+    """
+    severity = str(alarm_state.overallStatus)
+    severity_map = {"red": "critical", "yellow": "warning", "green": "info"}
+    if alarm_name is None:
+        alarm_name = alarm_state.alarm.info.name
+    if entity_name is None:
+        entity_name = alarm_state.entity.name
+    return {
+        "severity": severity_map.get(severity, severity),
+        "alarm_name": sanitize(alarm_name),
+        "entity_name": sanitize(entity_name),
+        "entity_type": type(alarm_state.entity).__name__,
+        "time": str(alarm_state.time),
+        "acknowledged": getattr(alarm_state, "acknowledged", False),
+    }
+
+
+def dedupe_alarm_rows(rows: list[dict]) -> list[dict]:
+    """Collapse propagated/aggregated duplicates (alarm + entity), most severe first."""
     seen = set()
     unique = []
-    for a in results:
+    for a in rows:
         key = (a["alarm_name"], a["entity_name"])
         if key not in seen:
             seen.add(key)
@@ -0,0 +1,294 @@
+"""Host evacuation: vMotion every VM off one host, in parallel.
+
+``migrate_vm`` moves one VM per call and reads the VM's host, datastore and
+the datastore's mounts lazily; draining a host of 80 VMs that way is 80
+sequential calls of up to 10 minutes each. Here:
+
+* one PropertyCollector pass reads every host (capacity, usage, datastores,
+  networks, physical NICs) and one more reads the VMs on the source host
+  (power state, size, datastores, networks);
+* destinations are planned in memory: largest VMs first, each onto the
+  cluster host with the most free memory among those that mount all of the
+  VM's datastores and networks, keeping :data:`HEADROOM` of every host free;
+* migrations run in parallel within vSphere's concurrent vMotion limit,
+  which depends on the vMotion network speed — 4 per host on 1GbE, 8 on
+  10GbE and faster — and applies to the source and the destination alike.
+
+VMs stay on their datastores (compute-only vMotion), so datastore limits do
+not come into play. Results are :func:`~vmware_aiops.ops.fleet.row` dicts.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim
+from vmware_policy import sanitize
+
+from vmware_aiops.ops.cluster_mgmt import ClusterError
+from vmware_aiops.ops.fleet import DEFAULT_CONCURRENCY, guarded, row, run_each
+from vmware_aiops.ops.inventory import _collect
+from vmware_aiops.ops.vm_lifecycle import _wait_for_task
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+_log = logging.getLogger("vmware-aiops.host_evacuate")
+
+HEADROOM = 0.1
+"""Fraction of each destination's memory and CPU left free by the plan."""
+
+_HOST_PATHS = [
+    "name",
+    "parent",
+    "runtime.connectionState",
+    "runtime.inMaintenanceMode",
+    "summary.hardware.cpuMhz",
+    "summary.hardware.numCpuCores",
+    "summary.hardware.memorySize",
+    "summary.quickStats.overallCpuUsage",
+    "summary.quickStats.overallMemoryUsage",
+    "datastore",
+    "network",
+    "config.network.pnic",
+]
+_VM_PATHS = [
+    "name",
+    "config.template",
+    "runtime.powerState",
+    "summary.config.memorySizeMB",
+    "summary.quickStats.overallCpuUsage",
+    "datastore",
+    "network",
+]
+_ON = vim.VirtualMachine.PowerState.poweredOn
+_MB = 1024**2
+
+
+@dataclass(frozen=True)
+class Move:
+    """One planned vMotion."""
+
+    name: str
+    vm: object
+    destination: object
+    destination_name: str
+    memory_mb: int
+    power_state: str
+
+
+@dataclass
+class EvacuationPlan:
+    """Where each VM on ``host`` goes, and what cannot move."""
+
+    host: str
+    moves: list[Move] = field(default_factory=list)
+    unplaced: list[dict] = field(default_factory=list)
+    limits: dict[str, int] = field(default_factory=dict)
+    """Concurrent vMotions allowed per host name (source and destinations)."""
+
+    def as_dict(self) -> dict:
+        by_destination: dict[str, int] = {}
+        for m in self.moves:
+            by_destination[m.destination_name] = by_destination.get(m.destination_name, 0) + 1
+        return {
+            "host": self.host,
+            "moves": [
+                {"name": m.name, "to": m.destination_name, "memory_mb": m.memory_mb,
+                 "power_state": m.power_state}
+                for m in self.moves
+            ],
+            "unplaced": self.unplaced,
+            "by_destination": by_destination,
+            "limits": self.limits,
+        }
+
+
+@dataclass
+class _Capacity:
+    name: str
+    ref: object
+    memory_mb: float
+    cpu_mhz: float
+    datastores: set
+    networks: set
+
+
+def plan_evacuation(
+    si: ServiceInstance,
+    host_name: str,
+    destinations: list[str] | None = None,
+    include_powered_off: bool = True,
+) -> EvacuationPlan:
+    """Plan moving every VM off ``host_name`` to other hosts of its cluster.
+
+    Args:
+        destinations: Only use these host names (all must be in the cluster).
+        include_powered_off: Also move powered-off VMs and templates (they
+            cost the destination no memory or CPU). If False they are
+            reported ``skipped``.
+
+    Raises:
+        ClusterError: Host not found, or no usable destination host.
+    """
+    hosts = _collect(si, [vim.HostSystem], _HOST_PATHS)
+    source = next((h for h, p in hosts if p.get("name") == host_name), None)
+    if source is None:
+        raise ClusterError(
+            f"Host '{host_name}' not found. Run cluster_info (CLI: vmware-aiops "
+            f"cluster info <cluster>) for exact host names."
+        )
+    source_props = dict(hosts)[source]
+    wanted = set(destinations or [])
+    candidates = []
+    for h, p in hosts:
+        if h == source or p.get("parent") != source_props.get("parent"):
+            continue
+        if wanted and p.get("name") not in wanted:
+            continue
+        if str(p.get("runtime.connectionState")) != "connected" or p.get(
+            "runtime.inMaintenanceMode"
+        ):
+            continue
+        candidates.append((h, p))
+    unknown = wanted - {p.get("name") for _, p in candidates}
+    if unknown:
+        raise ClusterError(
+            f"Destination host(s) not usable: {', '.join(sorted(unknown))}. They must be "
+            f"connected, out of maintenance mode and in the same cluster as '{host_name}'."
+        )
+    if not candidates:
+        raise ClusterError(
+            f"Host '{host_name}' has no other connected host out of maintenance mode "
+            f"in its cluster to move VMs to."
+        )
+
+    plan = EvacuationPlan(host=sanitize(host_name))
+    plan.limits[plan.host] = vmotion_limit(source_props)
+    free = [_capacity(h, p) for h, p in candidates]
+    vms = []
+    for vm, p in _collect(si, [vim.VirtualMachine], _VM_PATHS, root=source):
+        on = str(p.get("runtime.powerState")) == _ON and not p.get("config.template")
+        if not on and not include_powered_off:
+            plan.unplaced.append(row(
+                sanitize(p.get("name", "")), "skipped",
+                "Powered off; left on the host (include powered-off VMs to move it).",
+            ))
+            continue
+        memory = (p.get("summary.config.memorySizeMB") or 0) if on else 0
+        cpu = (p.get("summary.quickStats.overallCpuUsage") or 0) if on else 0
+        vms.append((vm, p, memory, cpu))
+    # Largest first: they are the hardest to fit once the cluster fills up.
+    vms.sort(key=lambda v: (-v[2], v[1].get("name", "")))
+
+    for vm, p, memory, cpu in vms:
+        name = sanitize(p.get("name", ""))
+        reachable = [
+            c for c in free
+            if set(p.get("datastore") or []) <= c.datastores
+            and set(p.get("network") or []) <= c.networks
+        ]
+        fits = [c for c in reachable if c.memory_mb >= memory and c.cpu_mhz >= cpu]
+        if not fits:
+            plan.unplaced.append(row(name, "error", (
+                f"No host with access to its datastores and networks has {memory} MB "
+                f"memory and {cpu} MHz CPU free (keeping {HEADROOM:.0%} headroom)."
+            ) if reachable else (
+                "No other host in the cluster mounts all of its datastores and networks."
+            )))
+            continue
+        best = max(fits, key=lambda c: (c.memory_mb, c.name))
+        best.memory_mb -= memory
+        best.cpu_mhz -= cpu
+        plan.moves.append(
+            Move(name, vm, best.ref, best.name, memory, str(p.get("runtime.powerState")))
+        )
+    used = {m.destination for m in plan.moves}
+    for h, p in candidates:
+        if h in used:
+            plan.limits[sanitize(p.get("name", ""))] = vmotion_limit(p)
+    return plan
+
+
+def evacuate_host(
+    si: ServiceInstance,
+    host_name: str,
+    destinations: list[str] | None = None,
+    include_powered_off: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int | None = None,
+    timeout: int = 600,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Plan (see :func:`plan_evacuation`) and run the evacuation of ``host_name``."""
+    plan = plan_evacuation(si, host_name, destinations, include_powered_off)
+    if on_result is not None:
+        for r in plan.unplaced:
+            on_result(r)
+    return apply_evacuation(
+        plan, concurrency=concurrency, per_host=per_host, timeout=timeout, on_result=on_result,
+    ) + plan.unplaced
+
+
+def apply_evacuation(
+    plan: EvacuationPlan,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int | None = None,
+    timeout: int = 600,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Run a plan's moves in parallel; ``on_result`` gets each row as it finishes.
+
+    ``per_host`` overrides the per-host vMotion limits derived from NIC speed
+    (set it lower to leave bandwidth for other traffic).
+
+    Raises:
+        ValueError: ``concurrency`` or ``per_host`` below 1.
+    """
+    if per_host is not None and per_host < 1:
+        raise ValueError("per_host must be at least 1.")
+
+    def one(m: Move) -> dict:
+        def run() -> dict:
+            _wait_for_task(m.vm.Relocate(spec=vim.vm.RelocateSpec(host=m.destination)), timeout)
+            return row(m.name, "ok", f"Moved to '{m.destination_name}'.")
+
+        return guarded(m.name, run)
+
+    rows = run_each(
+        plan.moves, one, concurrency,
+        keys=lambda m: [plan.host, m.destination_name],
+        per_key=lambda k: per_host or plan.limits.get(k, 4),
+        name="evacuate", on_done=on_result,
+    )
+    _log.info(
+        "Evacuated host '%s': %d/%d moved", plan.host,
+        sum(1 for r in rows if r["status"] == "ok"), len(rows),
+    )
+    return rows
+
+
+def vmotion_limit(host_props: dict) -> int:
+    """Concurrent vMotions vSphere allows on a host: 8 with a 10GbE+ NIC, else 4."""
+    speeds = [
+        pnic.linkSpeed.speedMb
+        for pnic in host_props.get("config.network.pnic") or []
+        if getattr(pnic, "linkSpeed", None) is not None
+    ]
+    return 8 if speeds and max(speeds) >= 10000 else 4
+
+
+def _capacity(host: object, p: dict) -> _Capacity:
+    memory = (p.get("summary.hardware.memorySize") or 0) / _MB
+    cpu = (p.get("summary.hardware.cpuMhz") or 0) * (p.get("summary.hardware.numCpuCores") or 0)
+    return _Capacity(
+        name=sanitize(p.get("name", "")),
+        ref=host,
+        memory_mb=memory * (1 - HEADROOM) - (p.get("summary.quickStats.overallMemoryUsage") or 0),
+        cpu_mhz=cpu * (1 - HEADROOM) - (p.get("summary.quickStats.overallCpuUsage") or 0),
+        datastores=set(p.get("datastore") or []),
+        networks=set(p.get("network") or []),
+    )
@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING
 from pyVmomi import vim, vmodl
 from vmware_policy import sanitize
 
+from vmware_aiops import metrics
+
 if TYPE_CHECKING:
     from pyVmomi.vim import ServiceInstance
 
@@ -22,7 +24,7 @@ _PC_PAGE_SIZE = 1000
 
 
 def _collect(
-    si: ServiceInstance, obj_type: list, paths: list[str]
+    si: ServiceInstance, obj_type: list, paths: list[str], root: object | None = None
 ) -> list[tuple[object, dict]]:
     """Batch-retrieve ``paths`` for every ``obj_type`` object in one operation.
 
@@ -39,13 +41,15 @@ def _collect(
         paths: Property paths to fetch, e.g. ``["name", "runtime.powerState"]``.
             Array properties (e.g. ``vm``) come back as lists; unset properties
             are simply absent from the returned dict.
+        root: Container to search under (e.g. one datacenter); defaults to the
+            inventory root folder.
 
     Returns:
         List of ``(managed_object, {path: value})`` tuples in server order.
     """
     content = si.RetrieveContent()
     view = content.viewManager.CreateContainerView(
-        content.rootFolder, obj_type, True
+        root if root is not None else content.rootFolder, obj_type, True
     )
     try:
         traversal = vmodl.query.PropertyCollector.TraversalSpec(
@@ -60,13 +64,21 @@ def _collect(
         filter_spec = vmodl.query.PropertyCollector.FilterSpec(
             objectSet=[obj_spec], propSet=[prop_spec]
         )
-        options = vmodl.query.PropertyCollector.RetrieveOptions(
-            maxObjects=_PC_PAGE_SIZE
-        )
-        pc = content.propertyCollector
-        results: list[tuple[object, dict]] = []
+        return _retrieve_all(content.propertyCollector, filter_spec, obj_type[0])
+    finally:
+        view.Destroy()
+
+
+def _retrieve_all(pc, filter_spec, obj_type: type) -> list[tuple[object, dict]]:
+    """Run one filter through ``RetrievePropertiesEx``, following continuation tokens."""
+    options = vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=_PC_PAGE_SIZE)
+    results: list[tuple[object, dict]] = []
+    type_name = getattr(obj_type, "__name__", str(obj_type))
+    pages = 0
+    with metrics.timer("pc_collect_seconds", type=type_name):
         batch = pc.RetrievePropertiesEx([filter_spec], options)
         while batch is not None:
+            pages += 1
             for obj_content in batch.objects:
                 props = {p.name: p.val for p in (obj_content.propSet or [])}
                 results.append((obj_content.obj, props))
@@ -74,9 +86,10 @@ def _collect(
             if not token:
                 break
             batch = pc.ContinueRetrievePropertiesEx(token)
-        return results
-    finally:
-        view.Destroy()
+    metrics.inc("pc_collect_total", type=type_name)
+    metrics.inc("pc_pages_total", max(pages, 1), type=type_name)
+    metrics.inc("pc_objects_total", len(results), type=type_name)
+    return results
 
 
 def _collect_object(
@@ -115,6 +128,28 @@ def _collect_object(
     return {p.name: p.val for p in (batch.objects[0].propSet or [])}
 
 
+def _collect_objects(
+    si: ServiceInstance, objs: list, obj_type: type, paths: list[str]
+) -> list[tuple[object, dict]]:
+    """Batch-retrieve ``paths`` for several already-known objects of one type.
+
+    The many-object form of :func:`_collect_object`: one ``ObjectSpec`` per
+    object in a single filter, paged like :func:`_collect`, so detail for N
+    objects costs one call per page rather than one (or dozens) per object.
+
+    Returns:
+        ``(managed_object, {path: value})`` tuples in server order.
+    """
+    if not objs:
+        return []
+    pc = vmodl.query.PropertyCollector
+    filter_spec = pc.FilterSpec(
+        objectSet=[pc.ObjectSpec(obj=o, skip=False) for o in objs],
+        propSet=[pc.PropertySpec(type=obj_type, pathSet=list(paths), all=False)],
+    )
+    return _retrieve_all(si.RetrieveContent().propertyCollector, filter_spec, obj_type)
+
+
 _VM_SORT_KEYS = {"name", "cpu", "memory_mb", "power_state"}
 _COMPACT_FIELDS = ("name", "power_state", "cpu", "memory_mb")
 _VM_PROPS = [
@@ -335,8 +370,63 @@ def _find_by_name(si: ServiceInstance, obj_type: list, name: str):
     return None
 
 
+VM_LOCATOR_PREFIXES = ("uuid:", "bios:", "ip:", "path:")
+VM_LOCATOR_HELP = (
+    "Locators: uuid:<instanceUuid> (from vm info), bios:<BIOS uuid>, ip:<guest IP> "
+    "(needs VMware Tools), or an inventory path like 'dc1/vm/folder/web-01'."
+)
+
+
+def is_vm_locator(ref: str) -> bool:
+    """True if ``ref`` is a VM locator rather than a display name.
+
+    vSphere stores a ``/`` in an entity name as ``%2f``, so a raw ``/`` can
+    only mean an inventory path.
+    """
+    return ref.startswith(VM_LOCATOR_PREFIXES) or "/" in ref
+
+
+def find_vm_by_locator(si: ServiceInstance, ref: str) -> vim.VirtualMachine | None:
+    """Resolve a VM locator with one ``SearchIndex`` call.
+
+    * ``uuid:<instanceUuid>`` — vCenter-unique;
+    * ``bios:<uuid>`` — the SMBIOS UUID the guest sees (clones can share it);
+    * ``ip:<address>`` — a guest IP reported by VMware Tools;
+    * ``path:<dc>/vm/<folder>/<name>`` or just ``<dc>/vm/<folder>/<name>`` —
+      the inventory path, unambiguous where display names are not.
+
+    Returns None if nothing matches (or the path is not a VM).
+
+    Raises:
+        InventoryError: A ``bios:`` or ``ip:`` locator matches several VMs.
+    """
+    index = si.RetrieveContent().searchIndex
+    kind, _, value = ref.partition(":") if ref.startswith(VM_LOCATOR_PREFIXES) else (
+        "path", "", ref
+    )
+    if kind == "path":
+        found = index.FindByInventoryPath(inventoryPath=value.strip("/"))
+        return found if isinstance(found, vim.VirtualMachine) else None
+    if kind == "ip":
+        matches = index.FindAllByIp(ip=value, vmSearch=True)
+    else:
+        matches = index.FindAllByUuid(uuid=value, vmSearch=True, instanceUuid=kind == "uuid")
+    matches = [m for m in matches or [] if isinstance(m, vim.VirtualMachine)]
+    if len(matches) > 1:
+        raise InventoryError(
+            f"{len(matches)} VMs match '{ref}'. Address one with uuid:<instanceUuid> "
+            f"(unique per vCenter, shown by vm info) or its inventory path."
+        )
+    return matches[0] if matches else None
+
+
 def find_vm_by_name(si: ServiceInstance, vm_name: str) -> vim.VirtualMachine | None:
-    """Find a VM by exact name. Returns None if not found."""
+    """Find a VM by exact name, or by locator (see :func:`find_vm_by_locator`).
+
+    Returns None if not found.
+    """
+    if is_vm_locator(vm_name):
+        return find_vm_by_locator(si, vm_name)
     return _find_by_name(si, [vim.VirtualMachine], vm_name)
 
 
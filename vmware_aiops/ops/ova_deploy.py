@@ -271,20 +271,22 @@ def deploy_ova(
 
     Returns:
         Status message.
+
+    Raises:
+        InventoryError: the datastore, datacenter, cluster or folder cannot be resolved.
     """
     content = si.RetrieveContent()
 
     # Find datastore
     ds = find_datastore_by_name(si, datastore_name)
     if ds is None:
-        return f"Datastore '{datastore_name}' not found."
+        raise InventoryError(
+            f"Datastore '{datastore_name}' not found. List: vmware-aiops datastore list"
+        )
 
     # Find datacenter, folder, resource pool
-    try:
-        datacenter = resolve_datacenter(si, datacenter_name)
-        compute_resource = find_compute_resource(datacenter, cluster)
-    except InventoryError as e:
-        return str(e)
+    datacenter = resolve_datacenter(si, datacenter_name)
+    compute_resource = find_compute_resource(datacenter, cluster)
     vm_folder = datacenter.vmFolder
     if folder_path:
         for part in folder_path.split("/"):
@@ -295,7 +297,10 @@ def deploy_ova(
                     found = True
                     break
             if not found:
-                return f"Folder '{folder_path}' not found."
+                raise InventoryError(
+                    f"Folder '{folder_path}' not found. Check the folder path "
+                    f"(e.g. 'Prod/Web') in the vSphere Client's VMs and Templates view."
+                )
 
     resource_pool = compute_resource.resourcePool
 
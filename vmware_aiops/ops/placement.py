@@ -0,0 +1,282 @@
+"""Capacity-aware placement of a batch of new VMs.
+
+``batch_deploy`` used to put every VM wherever its source or template lives,
+or on the spec's one ``datastore``, so a large batch filled one host and one
+datastore while the rest of the cluster sat idle. Here:
+
+* one capacity snapshot (:func:`take_snapshot`) reads every host (cluster,
+  state, memory and CPU capacity and usage, mounted datastores), every
+  datastore (free space, accessibility, maintenance) and every compute
+  resource's name and root pool — three PropertyCollector calls, whatever
+  the batch size;
+* :func:`plan_placement` then places the whole batch in memory, largest VM
+  first: ``spread`` puts each VM on the host with the most free memory and
+  the datastore with the most free space, ``pack`` on the fullest host and
+  datastore it still fits. Each placement is charged against the snapshot,
+  so later VMs see the earlier ones, and :data:`HEADROOM` of every host's
+  memory and :data:`DATASTORE_HEADROOM` of every datastore stay free.
+
+Only memory and disk decide whether a VM fits — a new VM's CPU use is not
+known before it runs — but free CPU breaks ties between hosts.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim
+from vmware_policy import sanitize
+
+from vmware_aiops.ops.inventory import _collect
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+_log = logging.getLogger("vmware-aiops.placement")
+
+HEADROOM = 0.1
+"""Fraction of each host's memory and CPU left free by the plan."""
+DATASTORE_HEADROOM = 0.1
+"""Fraction of each datastore's capacity left free by the plan."""
+STRATEGIES = ("spread", "pack")
+
+_HOST_PATHS = [
+    "name",
+    "parent",
+    "runtime.connectionState",
+    "runtime.inMaintenanceMode",
+    "summary.hardware.cpuMhz",
+    "summary.hardware.numCpuCores",
+    "summary.hardware.memorySize",
+    "summary.quickStats.overallCpuUsage",
+    "summary.quickStats.overallMemoryUsage",
+    "datastore",
+]
+_DATASTORE_PATHS = [
+    "name",
+    "summary.capacity",
+    "summary.freeSpace",
+    "summary.accessible",
+    "summary.maintenanceMode",
+    "browser",
+]
+_MB = 1024**2
+_GB = 1024**3
+
+
+@dataclass
+class HostCapacity:
+    """A usable host and what is still free on it."""
+
+    name: str
+    ref: object
+    cluster: str
+    memory_mb: float
+    cpu_mhz: float
+    datastores: set = field(default_factory=set)
+    pool: object = None
+    """Root resource pool of its cluster (or standalone host)."""
+
+
+@dataclass
+class DatastoreCapacity:
+    """A usable datastore and its free space."""
+
+    name: str
+    ref: object
+    free_gb: float
+    browser: object = None
+
+
+@dataclass
+class CapacitySnapshot:
+    """Free capacity of every usable host and datastore at one moment."""
+
+    hosts: list[HostCapacity] = field(default_factory=list)
+    datastores: dict[object, DatastoreCapacity] = field(default_factory=dict)
+    """Usable datastores by moref."""
+    unusable: set[str] = field(default_factory=set)
+    """Names of datastores left out (inaccessible or in maintenance mode)."""
+
+
+@dataclass(frozen=True)
+class Demand:
+    """What one new VM needs, and where it may go."""
+
+    name: str
+    memory_mb: float
+    disk_gb: float = 0
+    datastore: str | None = None
+    """Datastore the VM must use (pinned in the spec)."""
+    mounts: tuple = ()
+    """Datastores its host must mount (a linked clone's source disks)."""
+    place_datastore: bool = True
+    """False when the channel keeps the disks where they are (linked clones)."""
+
+
+@dataclass(frozen=True)
+class Placement:
+    """Where one VM goes."""
+
+    name: str
+    host: str
+    cluster: str
+    datastore: str | None
+    host_ref: object = None
+    pool: object = None
+    """The host's moref and its cluster's root pool, for a clone's RelocateSpec."""
+
+    def as_dict(self) -> dict:
+        return {"host": self.host, "cluster": self.cluster, "datastore": self.datastore}
+
+
+def take_snapshot(si: ServiceInstance) -> CapacitySnapshot:
+    """Read the free capacity of every host and datastore in three calls.
+
+    Hosts that are disconnected or in maintenance mode, and datastores that
+    are inaccessible or in maintenance mode, are left out.
+    """
+    compute = _collect(si, [vim.ComputeResource], ["name", "resourcePool"])
+    clusters = {cr: sanitize(p.get("name", "")) for cr, p in compute}
+    pools = {cr: p.get("resourcePool") for cr, p in compute}
+    snapshot = CapacitySnapshot()
+    for ds, p in _collect(si, [vim.Datastore], _DATASTORE_PATHS):
+        if p.get("summary.accessible") is False or p.get("summary.maintenanceMode") not in (
+            None, "normal",
+        ):
+            snapshot.unusable.add(sanitize(p.get("name", "")))
+            continue
+        free = (p.get("summary.freeSpace") or 0) - (
+            (p.get("summary.capacity") or 0) * DATASTORE_HEADROOM
+        )
+        snapshot.datastores[ds] = DatastoreCapacity(
+            sanitize(p.get("name", "")), ds, free / _GB, p.get("browser"),
+        )
+    for host, p in _collect(si, [vim.HostSystem], _HOST_PATHS):
+        if str(p.get("runtime.connectionState")) != "connected" or p.get(
+            "runtime.inMaintenanceMode"
+        ):
+            continue
+        memory = (p.get("summary.hardware.memorySize") or 0) / _MB
+        cpu = (p.get("summary.hardware.cpuMhz") or 0) * (
+            p.get("summary.hardware.numCpuCores") or 0
+        )
+        snapshot.hosts.append(HostCapacity(
+            name=sanitize(p.get("name", "")),
+            ref=host,
+            cluster=clusters.get(p.get("parent"), ""),
+            memory_mb=memory * (1 - HEADROOM)
+            - (p.get("summary.quickStats.overallMemoryUsage") or 0),
+            cpu_mhz=cpu * (1 - HEADROOM) - (p.get("summary.quickStats.overallCpuUsage") or 0),
+            datastores={d for d in p.get("datastore") or [] if d in snapshot.datastores},
+            pool=pools.get(p.get("parent")),
+        ))
+    return snapshot
+
+
+def plan_placement(
+    snapshot: CapacitySnapshot,
+    demands: list[Demand],
+    strategy: str = "spread",
+    hosts: list[str] | None = None,
+    datastores: list[str] | None = None,
+    cluster: str | None = None,
+) -> tuple[dict[str, Placement], list[dict]]:
+    """Place every demand on a host (and datastore), charging the snapshot.
+
+    Args:
+        strategy: ``spread`` (most free first) or ``pack`` (fullest that fits).
+        hosts: Only place on these host names.
+        datastores: Only place on these datastore names.
+        cluster: Only place on hosts of this cluster.
+
+    Returns:
+        Placements by VM name, and one ``{"name", "status": "error",
+        "messages"}`` row per VM that fits nowhere.
+
+    Raises:
+        ValueError: Unknown strategy, or a named host, datastore or cluster
+            that is not usable.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown placement strategy '{strategy}'. Use one of: {', '.join(STRATEGIES)}."
+        )
+    candidates = [
+        h for h in snapshot.hosts
+        if (not hosts or h.name in hosts) and (not cluster or h.cluster == cluster)
+    ]
+    allowed = {
+        ref for ref, ds in snapshot.datastores.items() if not datastores or ds.name in datastores
+    }
+    unknown = sorted(
+        set(hosts or []) - {h.name for h in snapshot.hosts}
+        | set(datastores or []) - {ds.name for ds in snapshot.datastores.values()}
+    )
+    if cluster and not any(h.cluster == cluster for h in snapshot.hosts):
+        unknown.append(cluster)
+    if unknown:
+        raise ValueError(
+            f"Placement target(s) not usable: {', '.join(unknown)}. Hosts must be connected "
+            f"and out of maintenance mode, datastores accessible and out of maintenance mode."
+        )
+
+    placements: dict[str, Placement] = {}
+    errors: list[dict] = []
+    # Largest first: they are the hardest to fit once hosts fill up.
+    for d in sorted(demands, key=lambda d: (-d.memory_mb, -d.disk_gb, d.name)):
+        fits = []
+        for h in candidates:
+            if h.memory_mb < d.memory_mb or not set(d.mounts) <= h.datastores:
+                continue
+            ds = None
+            if d.place_datastore:
+                options = [
+                    snapshot.datastores[r] for r in h.datastores
+                    if (r in allowed if d.datastore is None
+                        else snapshot.datastores[r].name == d.datastore)
+                    and snapshot.datastores[r].free_gb >= d.disk_gb
+                ]
+                if not options:
+                    continue
+                ds = _choose(options, strategy, lambda x: x.free_gb)
+            fits.append((h, ds))
+        if not fits:
+            errors.append({"name": d.name, "status": "error", "messages": [_why(d, candidates)]})
+            continue
+        host, ds = _choose(fits, strategy, lambda f: (f[0].memory_mb, f[0].cpu_mhz))
+        host.memory_mb -= d.memory_mb
+        if ds is not None:
+            ds.free_gb -= d.disk_gb
+        placements[d.name] = Placement(
+            d.name, host.name, host.cluster, ds and ds.name, host.ref, host.pool,
+        )
+    _log.info(
+        "Placed %d/%d VMs (%s)", len(placements), len(demands), strategy,
+    )
+    return placements, errors
+
+
+def _choose(options: list, strategy: str, free):
+    return max(options, key=free) if strategy == "spread" else min(options, key=free)
+
+
+def _why(d: Demand, candidates: list[HostCapacity]) -> str:
+    if not any(h.memory_mb >= d.memory_mb for h in candidates):
+        return (
+            f"Not placed: no host has {d.memory_mb:.0f} MB memory free "
+            f"(keeping {HEADROOM:.0%} headroom)."
+        )
+    if d.datastore:
+        return (
+            f"Not placed: datastore '{d.datastore}' is not mounted by a host with room "
+            f"or lacks {d.disk_gb:.0f} GB free (keeping {DATASTORE_HEADROOM:.0%} headroom)."
+        )
+    if not d.place_datastore:
+        return "Not placed: no host with room mounts all of the source's datastores."
+    return (
+        f"Not placed: no datastore mounted by a host with room has {d.disk_gb:.0f} GB "
+        f"free (keeping {DATASTORE_HEADROOM:.0%} headroom)."
+    )
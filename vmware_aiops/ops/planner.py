@@ -11,10 +11,10 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from pyVmomi import vim
 from vmware_policy import paginated
 
 from vmware_aiops.ops.inventory import find_vm_by_name
+from vmware_aiops.ops.vm_lifecycle import snapshot_index
 
 if TYPE_CHECKING:
     from pyVmomi.vim import ServiceInstance
@@ -338,8 +338,10 @@ def precheck_targets(si: ServiceInstance, operations: list[dict[str, Any]]) -> l
             # Check snapshot existence
             snap_name = op.get("snapshot_name") or op.get("snapshot")
             if snap_name and action in ("revert_snapshot", "delete_snapshot", "linked_clone"):
-                if not _find_snapshot(vm, snap_name):
-                    errors.append(f"Step {i} ({action}): snapshot '{snap_name}' not found on VM '{vm_name}'")
+                if snapshot_index(si, vm).find(snap_name) is None:
+                    errors.append(
+                        f"Step {i} ({action}): snapshot '{snap_name}' not found on VM '{vm_name}'"
+                    )
 
         # Check source VM for clone/template operations
         source = op.get("source_vm_name") or op.get("template_name")
@@ -357,25 +359,6 @@ def precheck_targets(si: ServiceInstance, operations: list[dict[str, Any]]) -> l
     return errors
 
 
-def _find_snapshot(
-    vm: vim.VirtualMachine, snap_name: str
-) -> vim.vm.Snapshot | None:
-    """Recursively find a snapshot by name."""
-    if not vm.snapshot or not vm.snapshot.rootSnapshotList:
-        return None
-
-    def _walk(snap_list: list) -> vim.vm.Snapshot | None:
-        for snap_info in snap_list:
-            if snap_info.name == snap_name:
-                return snap_info.snapshot
-            found = _walk(snap_info.childSnapshotList)
-            if found:
-                return found
-        return None
-
-    return _walk(vm.snapshot.rootSnapshotList)
-
-
 def create_plan(
     si: ServiceInstance,
     operations: list[dict[str, Any]],
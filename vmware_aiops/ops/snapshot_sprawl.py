@@ -0,0 +1,212 @@
+"""Fleet snapshot sprawl: age, chain depth and on-disk delta size for every VM.
+
+One paged PropertyCollector pass reads, for all VMs, the snapshot tree and
+the file layout (``layoutEx``: every file with its size, and the disk chains
+of the running VM and of each snapshot). Ages, depth, delta sizes, the
+per-datastore ranking, filtering and sorting are then computed in memory, so
+the cost on 30k VMs is the one collection — seconds — rather than a lazy
+``vm.snapshot`` / ``vm.layoutEx`` read per VM.
+
+Delta size counts what snapshots cost on disk: every delta disk not part of
+the VM's base disks (for a linked clone, its own base delta is base too) plus
+the snapshot state and memory files. It is attributed to the datastore in
+each file's ``[datastore] path`` name.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim
+from vmware_policy import sanitize
+
+from vmware_aiops.ops.inventory import _collect
+from vmware_aiops.ops.vm_lifecycle import SnapshotIndex
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+SORT_KEYS = ("delta_gb", "age_days", "depth", "count", "name")
+
+_PATHS = [
+    "name",
+    "config.template",
+    "snapshot.rootSnapshotList",
+    "snapshot.currentSnapshot",
+    "layoutEx.file",
+    "layoutEx.disk",
+    "layoutEx.snapshot",
+]
+_SNAPSHOT_FILE_TYPES = ("snapshotData", "snapshotMemory")
+_GB = 1024**3
+_TOP_PER_DATASTORE = 5
+
+
+def collect_sprawl(si: ServiceInstance, now: datetime | None = None) -> list[dict]:
+    """One row per VM (templates included) that has at least one snapshot.
+
+    Each row: name, count, depth (longest chain), oldest (snapshot name),
+    age_days (of the oldest), newest_age_days, delta_gb, datastores
+    (``{name: delta_gb}``), snapshots (``[{name, age_days, level}]``
+    depth-first) and template.
+    """
+    now = now or datetime.now(timezone.utc)
+    rows = []
+    for _vm, props in _collect(si, [vim.VirtualMachine], _PATHS):
+        index = SnapshotIndex(props.get("snapshot.rootSnapshotList"))
+        if not len(index):
+            continue
+        snaps = [
+            {"name": sanitize(n.name), "age_days": _age_days(n.created, now), "level": n.level}
+            for n in index
+        ]
+        oldest = max(snaps, key=lambda s: s["age_days"])
+        per_ds = _delta_bytes(props, index)
+        rows.append({
+            "name": sanitize(props.get("name", "")),
+            "count": len(snaps),
+            "depth": max(s["level"] for s in snaps) + 1,
+            "oldest": oldest["name"],
+            "age_days": oldest["age_days"],
+            "newest_age_days": min(s["age_days"] for s in snaps),
+            "delta_gb": round(sum(per_ds.values()) / _GB, 2),
+            "datastores": {ds: round(b / _GB, 2) for ds, b in sorted(per_ds.items())},
+            "snapshots": snaps,
+            "template": bool(props.get("config.template")),
+        })
+    return rows
+
+
+def snapshot_sprawl(
+    si: ServiceInstance,
+    older_than_days: float = 0,
+    min_delta_gb: float = 0,
+    datastore: str | None = None,
+    pattern: str | None = None,
+    sort_by: str = "delta_gb",
+    limit: int | None = None,
+    now: datetime | None = None,
+) -> dict:
+    """Rank VMs by snapshot sprawl and summarise it per datastore.
+
+    Args:
+        older_than_days: Keep VMs whose oldest snapshot is at least this old.
+        min_delta_gb: Keep VMs whose snapshots use at least this much disk.
+        datastore: Keep VMs with snapshot files on this datastore.
+        pattern: Keep VMs whose name matches this fnmatch glob.
+        sort_by: "delta_gb" | "age_days" | "depth" | "count" (worst first) or "name".
+        limit: Max VM rows returned (None = all); totals cover every match.
+
+    Returns:
+        ``{"vms", "total", "delta_gb", "datastores", "cleanup"}`` — ``datastores``
+        ranks datastores by snapshot delta (with their worst VMs); ``cleanup``
+        groups snapshots older than ``older_than_days`` by name, ready for a
+        bulk ``snapshot-delete``: ``{"snapshot", "vms", "count", "templates"}``,
+        where ``templates`` holds the templates bulk delete would reject.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key '{sort_by}'. Use one of: {', '.join(SORT_KEYS)}.")
+    rows = [
+        r for r in collect_sprawl(si, now)
+        if r["age_days"] >= older_than_days
+        and r["delta_gb"] >= min_delta_gb
+        and (datastore is None or datastore in r["datastores"])
+        and (pattern is None or fnmatch.fnmatchcase(r["name"], pattern))
+    ]
+    if sort_by == "name":
+        rows.sort(key=lambda r: r["name"])
+    else:
+        rows.sort(key=lambda r: (-r[sort_by], r["name"]))
+    return {
+        "vms": rows[:limit] if limit and limit > 0 else rows,
+        "total": len(rows),
+        "delta_gb": round(sum(r["delta_gb"] for r in rows), 2),
+        "datastores": _rank_datastores(rows),
+        "cleanup": _cleanup_groups(rows, older_than_days),
+    }
+
+
+def _age_days(created: str, now: datetime) -> float:
+    try:
+        when = datetime.fromisoformat(created)
+    except ValueError:
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return round(max(0.0, (now - when).total_seconds() / 86400), 1)
+
+
+def _delta_bytes(props: dict, index: SnapshotIndex) -> dict[str, int]:
+    """Bytes of snapshot files per datastore, from ``layoutEx``."""
+    files = {f.key: f for f in props.get("layoutEx.file") or []}
+    current = props.get("snapshot.currentSnapshot")
+    node = next((n for n in index if n.snapshot == current), None) if current else None
+    # Deltas on the running chain: one per snapshot from the root to the current one.
+    own = node.level + 1 if node else max(n.level for n in index) + 1
+
+    base: set = set()
+    chained: set = set()
+    for disk in props.get("layoutEx.disk") or []:
+        chain = disk.chain or []
+        split = max(1, len(chain) - own)
+        for i, unit in enumerate(chain):
+            (base if i < split else chained).update(unit.fileKey or [])
+    for snap in props.get("layoutEx.snapshot") or []:
+        for disk in snap.disk or []:
+            for unit in disk.chain or []:
+                chained.update(unit.fileKey or [])
+    keys = (chained - base) | {
+        k for k, f in files.items() if f.type in _SNAPSHOT_FILE_TYPES
+    }
+
+    per_ds: dict[str, int] = {}
+    for key in keys:
+        f = files.get(key)
+        if f is None:
+            continue
+        ds = _datastore_of(f.name)
+        per_ds[ds] = per_ds.get(ds, 0) + (f.size or 0)
+    return per_ds
+
+
+def _datastore_of(path: str) -> str:
+    """``"[ds1] vm/vm-000001.vmdk"`` → ``"ds1"``."""
+    if path.startswith("[") and "]" in path:
+        return path[1:path.index("]")]
+    return "unknown"
+
+
+def _rank_datastores(rows: list[dict]) -> list[dict]:
+    by_ds: dict[str, list[tuple[float, str]]] = {}
+    for r in rows:
+        for ds, gb in r["datastores"].items():
+            by_ds.setdefault(ds, []).append((gb, r["name"]))
+    ranked = []
+    for ds, vms in by_ds.items():
+        vms.sort(key=lambda v: (-v[0], v[1]))
+        ranked.append({
+            "datastore": ds,
+            "delta_gb": round(sum(gb for gb, _ in vms), 2),
+            "vm_count": len(vms),
+            "worst": [{"name": name, "delta_gb": gb} for gb, name in vms[:_TOP_PER_DATASTORE]],
+        })
+    return sorted(ranked, key=lambda d: (-d["delta_gb"], d["datastore"]))
+
+
+def _cleanup_groups(rows: list[dict], older_than_days: float) -> list[dict]:
+    """Old snapshots by name; templates apart, as bulk delete rejects them."""
+    groups: dict[str, tuple[dict[str, None], dict[str, None]]] = {}
+    for r in rows:
+        for s in r["snapshots"]:
+            if s["age_days"] >= older_than_days:
+                vms, templates = groups.setdefault(s["name"], ({}, {}))
+                (templates if r["template"] else vms)[r["name"]] = None
+    return sorted(
+        (
+            {"snapshot": name, "vms": list(vms), "count": len(vms), "templates": list(templates)}
+            for name, (vms, templates) in groups.items()
+        ),
+        key=lambda g: (-g["count"], g["snapshot"]),
+    )
@@ -0,0 +1,219 @@
+"""Wait on vSphere tasks with PropertyCollector push updates.
+
+Polling ``task.info.state`` costs a round-trip per task per poll, plus one
+more for ``task.info`` at the end, and adds up to one poll interval of
+latency to every finished task. :func:`wait_for_tasks` instead registers one
+filter on ``info.state`` / ``info.progress`` / ``info.error`` /
+``info.result`` for *all* the given tasks on a private collector and blocks
+in ``WaitForUpdatesEx``; each task is yielded the moment vCenter reports it
+finished.
+
+:func:`wait_for_values` does the same for any managed-object property —
+e.g. ``runtime.powerState`` after ``ShutdownGuest``, which returns no task.
+
+A private collector per wait (created and destroyed here) keeps concurrent
+waiters on one session from consuming each other's updates. An object that
+leaves the collector's view (a deleted VM, a task purged before it was seen
+to finish) ends its wait as gone rather than holding it to the timeout.
+"""
+
+from __future__ import annotations
+
+import time
+import weakref
+from collections.abc import Callable, Collection, Iterable, Iterator
+from dataclasses import dataclass
+
+from pyVmomi import vim, vmodl
+
+from vmware_aiops import metrics
+
+_PATHS = ["info.state", "info.progress", "info.error", "info.result"]
+_DONE = ("success", "error")
+_MAX_WAIT_SECONDS = 60
+# How a watched object's wait ended (see _watch).
+_FINISHED, _GONE, _TIMED_OUT = "finished", "gone", "timed_out"
+
+_COLLECTORS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class TaskOutcome:
+    """Final (or, past the wait budget, last known) state of one task."""
+
+    task: object
+    task_id: str
+    state: str
+    """``success``, ``error``, or ``running`` when the wait budget ran out."""
+    result: object = None
+    error: object = None
+    progress: int | None = None
+    elapsed: float = 0.0
+
+
+def wait_for_tasks(tasks: Iterable, timeout: float = 300) -> Iterator[TaskOutcome]:
+    """Yield a :class:`TaskOutcome` per task, in completion order.
+
+    Tasks still queued/running once ``timeout`` seconds have passed are
+    yielded last with state ``running``; their vCenter tasks are not
+    cancelled. A task that disappears before it is seen to finish is an
+    ``error`` whose ``error`` is a ``ManagedObjectNotFound`` fault.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return
+    start = time.monotonic()
+    for outcome in _wait_collector(tasks, start, timeout):
+        metrics.observe("task_wait_seconds", outcome.elapsed, outcome=_outcome_label(outcome))
+        yield outcome
+
+
+def wait_for_task(task, timeout: float = 300) -> TaskOutcome:
+    """Single-task form of :func:`wait_for_tasks`."""
+    return next(wait_for_tasks([task], timeout))
+
+
+def _outcome_label(outcome: TaskOutcome) -> str:
+    return "still_running" if outcome.state == "running" else outcome.state
+
+
+def _moid(obj) -> str:
+    return getattr(obj, "_moId", "") or ""
+
+
+def _wait_collector(tasks: list, start: float, timeout: float) -> Iterator[TaskOutcome]:
+    def finished(props: dict) -> bool:
+        return str(props.get("info.state")) in _DONE
+
+    for task, props, end in _watch(
+        tasks, vim.Task, _PATHS, finished, start, timeout, "task_polls_total"
+    ):
+        if end == _GONE:
+            props = {"info.error": vmodl.fault.ManagedObjectNotFound(
+                obj=task,
+                msg=f"Task {_moid(task)} disappeared before it finished. Check the "
+                f"vSphere Client's Recent Tasks for its result, then retry.",
+            )}
+        state = {_FINISHED: str(props.get("info.state")), _GONE: "error"}.get(end, "running")
+        yield _outcome(task, state, props, start)
+
+
+def wait_for_values(
+    objs: Iterable, path: str, wanted: Collection[str], timeout: float = 120
+) -> Iterator[tuple[object, object, bool]]:
+    """Yield ``(obj, value, reached)`` as each object's ``path`` takes a ``wanted`` value.
+
+    Objects are yielded in the order they get there (``reached=True``); those
+    still elsewhere after ``timeout`` seconds come last with their current
+    value and ``reached=False``, as does one deleted while waiting. All
+    objects must be of one managed type.
+    """
+    objs = list(objs)
+    if not objs:
+        return
+    start = time.monotonic()
+
+    def finished(props: dict) -> bool:
+        return path in props and str(props[path]) in wanted
+
+    for obj, props, end in _watch(objs, type(objs[0]), [path], finished, start, timeout):
+        yield obj, props.get(path), end == _FINISHED
+
+
+def _watch(
+    objs: list,
+    obj_type: type,
+    paths: list[str],
+    finished: Callable[[dict], bool],
+    start: float,
+    timeout: float,
+    metric: str | None = None,
+) -> Iterator[tuple[object, dict, bool]]:
+    """One filter on ``paths`` for all ``objs``; yield ``(obj, props, end)``.
+
+    Objects are yielded once ``finished(props)`` holds (``end`` is
+    ``_FINISHED``), as soon as they leave the filter (``_GONE``: deleted), or
+    at the end of the budget (``_TIMED_OUT``).
+    """
+    pc = vmodl.query.PropertyCollector
+    collector = _service_collector(objs[0]._stub).CreatePropertyCollector()
+    calls = 0
+    try:
+        collector.CreateFilter(
+            pc.FilterSpec(
+                objectSet=[pc.ObjectSpec(obj=o, skip=False) for o in objs],
+                propSet=[pc.PropertySpec(type=obj_type, pathSet=paths, all=False)],
+            ),
+            partialUpdates=False,
+        )
+        by_id = {_moid(o): o for o in objs}
+        props: dict[str, dict] = {oid: {} for oid in by_id}
+        pending = set(by_id)
+        version = ""
+        while pending:
+            remaining = timeout - (time.monotonic() - start)
+            # The first call (empty version) returns the current state at once,
+            # so objects already there are reported even with timeout=0.
+            if version and remaining <= 0:
+                break
+            wait = max(1, min(_MAX_WAIT_SECONDS, int(remaining + 0.999)))
+            calls += 1
+            update = collector.WaitForUpdatesEx(version, pc.WaitOptions(maxWaitSeconds=wait))
+            if update is None:  # maxWaitSeconds elapsed without a change
+                continue
+            version = update.version
+            for filter_update in update.filterSet or []:
+                for change in filter_update.objectSet or []:
+                    oid = _moid(change.obj)
+                    if oid not in pending:
+                        continue
+                    if change.kind == "leave":
+                        pending.discard(oid)
+                        yield by_id[oid], props[oid], _GONE
+                        continue
+                    for prop in change.changeSet or []:
+                        props[oid][prop.name] = None if prop.op == "remove" else prop.val
+                    if finished(props[oid]):
+                        pending.discard(oid)
+                        yield by_id[oid], props[oid], _FINISHED
+        for oid in pending:
+            yield by_id[oid], props[oid], _TIMED_OUT
+    finally:
+        if metric:
+            metrics.inc(metric, calls)
+        try:
+            collector.Destroy()
+        except Exception:  # noqa: BLE001 — best-effort cleanup; session may be gone
+            pass
+
+
+def _service_collector(stub):
+    """The session's PropertyCollector, resolved once per connection.
+
+    Its moref id differs between vCenter and ESXi, so it is read from the
+    ServiceContent rather than assumed.
+    """
+    try:
+        collector = _COLLECTORS.get(stub)
+    except TypeError:  # stub not weak-referenceable
+        collector = None
+    if collector is None:
+        content = vim.ServiceInstance("ServiceInstance", stub).RetrieveContent()
+        collector = content.propertyCollector
+        try:
+            _COLLECTORS[stub] = collector
+        except TypeError:
+            pass
+    return collector
+
+
+def _outcome(task, state: str, props: dict, start: float) -> TaskOutcome:
+    return TaskOutcome(
+        task=task,
+        task_id=_moid(task),
+        state=state,
+        result=props.get("info.result"),
+        error=props.get("info.error"),
+        progress=props.get("info.progress"),
+        elapsed=time.monotonic() - start,
+    )
@@ -6,7 +6,8 @@ Channels:
 3. Full clone — full copy from source VM
 4. Linked clone — instant clone from snapshot (shared base disk, COW delta)
 5. Template deploy — clone from vSphere template
-6. Batch deploy — YAML spec for multiple VMs via any channel above
+6. Instant clone — fork a running VM in memory (InstantClone_Task), no boot
+7. Batch deploy — YAML spec for multiple VMs via any channel above
 
 Composes existing VM lifecycle operations (create, clone, snapshot, power)
 with new OVA/ISO/linked-clone/template capabilities.
@@ -15,11 +16,16 @@ with new OVA/ISO/linked-clone/template capabilities.
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
 from typing import TYPE_CHECKING
 
 import yaml
 from pyVmomi import vim
 
+from vmware_aiops.ops import clone_pipeline, deploy_preflight, placement
+from vmware_aiops.ops.fleet import DEFAULT_CONCURRENCY, run_each
 from vmware_aiops.ops.inventory import (
     InventoryError,
     find_compute_resource,
@@ -32,12 +38,14 @@ from vmware_aiops.ops.inventory import (
 # ``vm_deploy.deploy_ova`` call sites and ``batch_deploy`` keep working.
 from vmware_aiops.ops.ova_deploy import deploy_ova
 from vmware_aiops.ops.vm_lifecycle import (
+    TaskFailedError,
+    VMNotFoundError,
+    _require_vm,
     _wait_for_task,
     clone_vm,
     create_snapshot,
     create_vm,
     power_on_vm,
-    reconfigure_vm,
 )
 
 if TYPE_CHECKING:
@@ -54,6 +62,8 @@ __all__ = [
     "convert_to_vm",
     "deploy_from_template",
     "batch_linked_clone",
+    "instant_clone",
+    "batch_instant_clone",
     "load_deploy_spec",
     "batch_deploy",
 ]
@@ -76,10 +86,12 @@ def attach_iso(
 
     Returns:
         Status message.
+
+    Raises:
+        VMNotFoundError: the VM does not exist.
+        InventoryError: the VM has no CD-ROM and no IDE controller to add one on.
     """
-    vm = find_vm_by_name(si, vm_name)
-    if vm is None:
-        return f"VM '{vm_name}' not found."
+    vm = _require_vm(si, vm_name)
 
     # Find existing CD-ROM or create one
     cdrom = None
@@ -112,7 +124,10 @@ def attach_iso(
     else:
         # Add new CD-ROM device
         if ide_controller is None:
-            return f"VM '{vm_name}' has no IDE controller for CD-ROM."
+            raise InventoryError(
+                f"VM '{vm_name}' has no IDE controller for CD-ROM. Add a CD-ROM drive "
+                f"in the vSphere Client (Edit Settings), then re-run attach_iso."
+            )
 
         cdrom_spec = vim.vm.device.VirtualDeviceSpec(
             operation=vim.vm.device.VirtualDeviceSpec.Operation.add,
@@ -147,56 +162,38 @@ def batch_clone(
     memory_mb: int | None = None,
     snapshot_name: str | None = None,
     power_on: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = clone_pipeline.DEFAULT_PER_HOST,
+    per_datastore: int = clone_pipeline.DEFAULT_PER_DATASTORE,
+    on_result: Callable[[dict], None] | None = None,
 ) -> list[dict]:
     """Clone multiple VMs from a source VM (gold image).
 
     For each clone:
-    1. Clone from source
-    2. Reconfigure CPU/memory (if specified)
-    3. Create baseline snapshot (if specified)
-    4. Power on (if specified)
+    1. Clone from source, with CPU/memory (and power-on, when no snapshot
+       is asked for) in the clone spec
+    2. Create baseline snapshot (if specified)
+    3. Power on (if specified and not done by the clone)
+
+    The source is resolved once and clones are pipelined, ``concurrency`` in
+    flight (see :mod:`.clone_pipeline`); ``on_result`` gets each clone's
+    result as it finishes.
 
     Returns:
-        List of result dicts with name, status, message.
+        List of result dicts with name, status, messages, in ``vm_names`` order.
     """
-    source = find_vm_by_name(si, source_vm_name)
-    if source is None:
+    try:
+        source = clone_pipeline.resolve_source(si, source_vm_name)
+    except VMNotFoundError:
         return [{"name": source_vm_name, "status": "error",
-                 "message": f"Source VM '{source_vm_name}' not found."}]
-
-    results: list[dict] = []
-    for name in vm_names:
-        result = {"name": name, "status": "ok", "messages": []}
-        try:
-            # 1. Clone
-            msg = clone_vm(si, source_vm_name, name)
-            result["messages"].append(msg)
-
-            # 2. Reconfigure
-            if cpu is not None or memory_mb is not None:
-                msg = reconfigure_vm(si, name, cpu=cpu, memory_mb=memory_mb)
-                result["messages"].append(msg)
-
-            # 3. Snapshot
-            if snapshot_name:
-                msg = create_snapshot(si, name, snapshot_name,
-                                      description="Baseline snapshot",
-                                      memory=False)
-                result["messages"].append(msg)
-
-            # 4. Power on
-            if power_on:
-                msg = power_on_vm(si, name)
-                result["messages"].append(msg)
-
-        except Exception as e:
-            result["status"] = "error"
-            result["messages"].append(str(e))
-
-        results.append(result)
-        _log.info("Batch clone %s: %s", name, result["status"])
+                 "messages": [f"Source VM '{source_vm_name}' not found."]}]
 
-    return results
+    return clone_pipeline.run_clones(
+        source, clone_pipeline.clone_jobs(vm_names),
+        cpu=cpu, memory_mb=memory_mb, snapshot_name=snapshot_name, power_on=power_on,
+        concurrency=concurrency, per_host=per_host, per_datastore=per_datastore,
+        on_result=on_result,
+    )
 
 
 # ─── Linked Clone (from snapshot, instant) ───────────────────────────────────
@@ -231,65 +228,44 @@ def linked_clone(
         memory_mb: Override memory (optional).
         power_on: Power on after creation.
         baseline_snapshot: Create a new snapshot on the clone (optional).
+
+    CPU/memory and power-on are part of the clone task's spec; only a
+    baseline snapshot (then the power-on) runs as a separate task.
+
+    Raises:
+        VMNotFoundError: the source VM does not exist.
+        InventoryError: the snapshot or ``target_host`` cannot be used.
     """
-    from vmware_aiops.ops.vm_lifecycle import list_snapshots
+    from vmware_aiops.ops.vm_lifecycle import snapshot_index
 
-    source = find_vm_by_name(si, source_vm_name)
-    if source is None:
-        return f"Source VM '{source_vm_name}' not found."
+    source = _require_vm(si, source_vm_name)
 
     # Find the snapshot
-    snaps = list_snapshots(si, source_vm_name)
-    target_snap = next((s for s in snaps if s["name"] == snapshot_name), None)
+    snaps = snapshot_index(si, source)
+    target_snap = snaps.find(snapshot_name)
     if target_snap is None:
-        available = ", ".join(s["name"] for s in snaps) or "none"
-        return f"Snapshot '{snapshot_name}' not found. Available: {available}"
+        raise InventoryError(snaps.not_found(snapshot_name))
 
     # Linked clone spec: use snapshot as disk move type
     relocate_spec = vim.vm.RelocateSpec(
         diskMoveType=vim.vm.RelocateSpec.DiskMoveOptions.createNewChildDiskBacking,
     )
     if target_host:
-        from vmware_aiops.ops.inventory import find_host_by_name
-
-        host = find_host_by_name(si, target_host)
-        if host is None:
-            return f"Target host '{target_host}' not found."
-        if host.parent is None or getattr(host.parent, "resourcePool", None) is None:
-            return f"Target host '{target_host}' has no resource pool."
-        relocate_spec.host = host
-        relocate_spec.pool = host.parent.resourcePool
-    clone_spec = vim.vm.CloneSpec(
-        location=relocate_spec,
-        powerOn=False,
-        template=False,
-        snapshot=target_snap["snapshot_ref"],
+        relocate_spec.host, relocate_spec.pool = _target_host(si, target_host)
+    spec = clone_pipeline.clone_spec(
+        relocate_spec, cpu, memory_mb, power_on and not baseline_snapshot,
+        snapshot=target_snap.snapshot,
     )
 
     folder = source.parent
-    task = source.Clone(folder=folder, name=new_name, spec=clone_spec)
-    _wait_for_task(task, timeout=300)
+    task = source.Clone(folder=folder, name=new_name, spec=spec)
+    clone = _wait_for_task(task, timeout=300)
     result_parts = [
         f"Linked clone '{new_name}' created from "
-        f"'{source_vm_name}' @ snapshot '{snapshot_name}'."
+        f"'{source_vm_name}' @ snapshot '{snapshot_name}'"
+        f"{clone_pipeline.describe_spec(spec)}."
     ]
-
-    # Reconfigure
-    if cpu is not None or memory_mb is not None:
-        msg = reconfigure_vm(si, new_name, cpu=cpu, memory_mb=memory_mb)
-        result_parts.append(msg)
-
-    # Baseline snapshot on clone
-    if baseline_snapshot:
-        msg = create_snapshot(si, new_name, baseline_snapshot,
-                              description="Baseline snapshot", memory=False)
-        result_parts.append(msg)
-
-    # Power on
-    if power_on:
-        msg = power_on_vm(si, new_name)
-        result_parts.append(msg)
-
+    result_parts += _snapshot_then_power_on(clone, new_name, baseline_snapshot, power_on)
     return " | ".join(result_parts)
 
 
@@ -359,7 +335,8 @@ def deploy_from_template(
     """Deploy a new VM by cloning from a vSphere template.
 
     Without ``target_host`` the new VM lands on the **template's** host —
-    pass ``target_host`` to place it on a specific ESXi.
+    pass ``target_host`` to place it on a specific ESXi. CPU/memory and
+    power-on are applied by the clone task itself.
 
     Args:
         template_name: Name of the source template.
@@ -370,59 +347,74 @@ def deploy_from_template(
         power_on: Power on after deploy.
         snapshot_name: Create baseline snapshot (optional).
         target_host: Target ESXi host name (optional, uses template's host if omitted).
-    """
-    from vmware_aiops.ops.inventory import find_host_by_name
-
-    template = find_vm_by_name(si, template_name)
-    if template is None:
-        return f"Template '{template_name}' not found."
 
+    Raises:
+        VMNotFoundError: the template does not exist.
+        InventoryError: it is not a template, or the host or datastore cannot be used.
+    """
+    template = _require_vm(si, template_name)
     if not template.config.template:
-        return f"'{template_name}' is not a template. Use 'clone' instead."
+        raise InventoryError(f"'{template_name}' is not a template. Use 'clone' instead.")
 
     relocate_spec = vim.vm.RelocateSpec()
     if target_host:
-        host = find_host_by_name(si, target_host)
-        if host is None:
-            return f"Target host '{target_host}' not found."
-        if host.parent is None or getattr(host.parent, "resourcePool", None) is None:
-            return f"Target host '{target_host}' has no resource pool."
-        relocate_spec.host = host
-        relocate_spec.pool = host.parent.resourcePool
+        relocate_spec.host, relocate_spec.pool = _target_host(si, target_host)
     if datastore_name:
         ds = find_datastore_by_name(si, datastore_name)
         if ds is None:
-            return f"Datastore '{datastore_name}' not found."
+            raise InventoryError(
+                f"Datastore '{datastore_name}' not found. List: vmware-aiops datastore list"
+            )
         relocate_spec.datastore = ds
 
-    clone_spec = vim.vm.CloneSpec(
-        location=relocate_spec,
-        powerOn=False,
-        template=False,
+    spec = clone_pipeline.clone_spec(
+        relocate_spec, cpu, memory_mb, power_on and not snapshot_name
     )
 
     folder = template.parent
-    task = template.Clone(folder=folder, name=new_name, spec=clone_spec)
-    _wait_for_task(task, timeout=600)
-    result_parts = [f"VM '{new_name}' deployed from template '{template_name}'."]
+    task = template.Clone(folder=folder, name=new_name, spec=spec)
+    clone = _wait_for_task(task, timeout=600)
+    result_parts = [
+        f"VM '{new_name}' deployed from template '{template_name}'"
+        f"{clone_pipeline.describe_spec(spec)}."
+    ]
+    result_parts += _snapshot_then_power_on(clone, new_name, snapshot_name, power_on)
+    return " | ".join(result_parts)
 
-    # Reconfigure
-    if cpu is not None or memory_mb is not None:
-        msg = reconfigure_vm(si, new_name, cpu=cpu, memory_mb=memory_mb)
-        result_parts.append(msg)
 
-    # Baseline snapshot
-    if snapshot_name:
-        msg = create_snapshot(si, new_name, snapshot_name,
-                              description="Baseline snapshot", memory=False)
-        result_parts.append(msg)
+def _target_host(si: ServiceInstance, target_host: str) -> tuple:
+    """``target_host`` and its cluster's root pool, for a clone's RelocateSpec."""
+    from vmware_aiops.ops.inventory import find_host_by_name
 
-    # Power on
+    host = find_host_by_name(si, target_host)
+    if host is None:
+        raise InventoryError(
+            f"Target host '{target_host}' not found. "
+            f"List hosts: vmware-aiops cluster list-hosts"
+        )
+    if host.parent is None or getattr(host.parent, "resourcePool", None) is None:
+        raise InventoryError(
+            f"Target host '{target_host}' has no resource pool "
+            "(standalone host outside cluster?). Pick a clustered host."
+        )
+    return host, host.parent.resourcePool
+
+
+def _snapshot_then_power_on(
+    clone: vim.VirtualMachine, name: str, snapshot_name: str | None, power_on: bool
+) -> list[str]:
+    """Baseline-snapshot a fresh clone, then power it on (which the clone
+    spec could not do, since the snapshot must capture it powered off)."""
+    if not snapshot_name:
+        return []
+    _wait_for_task(clone.CreateSnapshot_Task(
+        name=snapshot_name, description="Baseline snapshot", memory=False, quiesce=False,
+    ))
+    parts = [f"Snapshot '{snapshot_name}' created for VM '{name}'."]
     if power_on:
-        msg = power_on_vm(si, new_name)
-        result_parts.append(msg)
-
-    return " | ".join(result_parts)
+        _wait_for_task(clone.PowerOn())
+        parts.append(f"VM '{name}' powered on successfully.")
+    return parts
 
 
 # ─── Batch Linked Clone ─────────────────────────────────────────────────────
@@ -437,27 +429,93 @@ def batch_linked_clone(
     memory_mb: int | None = None,
     power_on: bool = False,
     baseline_snapshot: str | None = None,
+    hosts: list[str] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = clone_pipeline.DEFAULT_PER_HOST,
+    per_datastore: int = clone_pipeline.LINKED_PER_DATASTORE,
+    on_result: Callable[[dict], None] | None = None,
 ) -> list[dict]:
     """Create multiple linked clones from a source VM snapshot.
 
     This is the fastest batch provisioning method — each clone shares the
-    source disk and only stores delta changes.
+    source disk and only stores delta changes. The source, its snapshot,
+    folder and candidate hosts are resolved once; clones are spread
+    round-robin over the hosts of the source's cluster that mount its
+    datastores (or over ``hosts``) and submitted ``concurrency`` at a time
+    (see :mod:`.clone_pipeline`).
     """
-    results: list[dict] = []
-    for name in vm_names:
-        result = {"name": name, "status": "ok", "messages": []}
-        try:
-            msg = linked_clone(
-                si, source_vm_name, name, snapshot_name,
-                cpu=cpu, memory_mb=memory_mb,
-                power_on=power_on, baseline_snapshot=baseline_snapshot,
-            )
-            result["messages"].append(msg)
-        except Exception as e:
-            result["status"] = "error"
-            result["messages"].append(str(e))
-        results.append(result)
-    return results
+    try:
+        source = clone_pipeline.resolve_source(si, source_vm_name)
+    except VMNotFoundError:
+        return [{"name": source_vm_name, "status": "error",
+                 "messages": [f"Source VM '{source_vm_name}' not found."]}]
+    node = source.snapshots.find(snapshot_name)
+    if node is None:
+        return [{"name": source_vm_name, "status": "error",
+                 "messages": [source.snapshots.not_found(snapshot_name)]}]
+    try:
+        jobs = clone_pipeline.linked_clone_jobs(si, source, vm_names, hosts)
+    except InventoryError as e:
+        return [{"name": source_vm_name, "status": "error", "messages": [str(e)]}]
+
+    return clone_pipeline.run_clones(
+        source, jobs, cpu=cpu, memory_mb=memory_mb,
+        snapshot_name=baseline_snapshot, power_on=power_on,
+        concurrency=concurrency, per_host=per_host, per_datastore=per_datastore,
+        timeout=300, on_result=on_result, snapshot=node,
+    )
+
+
+# ─── Instant Clone (fork a running VM) ──────────────────────────────────────
+
+
+def instant_clone(
+    si: ServiceInstance,
+    parent_vm_name: str,
+    new_name: str,
+    extra_config: dict[str, str] | None = None,
+) -> str:
+    """Instant-clone a running VM: the clone forks the parent's memory and
+    disks and is running as soon as the task ends (no boot).
+
+    Args:
+        parent_vm_name: Running VM to fork.
+        new_name: Name for the new VM.
+        extra_config: ``extraConfig`` keys (e.g. ``guestinfo.hostname``) that
+            give the clone its identity; ``{name}`` becomes ``new_name``.
+    """
+    [result] = batch_instant_clone(si, parent_vm_name, [new_name], extra_config)
+    if result["status"] == "error":
+        raise TaskFailedError(result["messages"][-1])
+    return result["messages"][-1]
+
+
+def batch_instant_clone(
+    si: ServiceInstance,
+    parent_vm_name: str,
+    vm_names: list[str],
+    extra_config: dict[str, str] | None = None,
+    overrides: dict[str, dict[str, str]] | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = clone_pipeline.DEFAULT_PER_HOST,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Instant-clone a running VM many times, ``concurrency`` in flight.
+
+    The parent is resolved once; every clone lands on the parent's host
+    (where it shares the parent's memory) with ``extra_config`` — ``{name}``
+    replaced per clone — plus its own ``overrides`` entry as ``extraConfig``.
+    See :func:`.clone_pipeline.run_instant_clones`.
+    """
+    try:
+        source = clone_pipeline.resolve_source(si, parent_vm_name)
+    except VMNotFoundError:
+        return [{"name": parent_vm_name, "status": "error",
+                 "messages": [f"Parent VM '{parent_vm_name}' not found."]}]
+    return clone_pipeline.run_instant_clones(
+        source, vm_names, extra_config, overrides,
+        concurrency=concurrency, per_host=per_host, on_result=on_result,
+    )
 
 
 # ─── Batch Deploy from YAML ─────────────────────────────────────────────────
@@ -483,6 +541,21 @@ def load_deploy_spec(spec_path: str) -> dict:
     #   linked_clone:                 # Linked clone (fastest)
     #     source: golden-vm
     #     snapshot: clean-state
+    #   instant_clone:                # Fork a running VM (no boot)
+    #     source: ci-runner-parent
+    #     extra_config:               # per-clone identity, {name} = VM name
+    #       guestinfo.hostname: "{name}"
+
+    placement:                        # Optional: capacity-aware host/datastore
+      strategy: spread                # spread (default) | pack
+      cluster: prod-cluster           # optional: only this cluster's hosts
+      hosts: [esx-01, esx-02]         # optional: only these hosts
+      datastores: [ds-ssd-01]         # optional: only these datastores
+
+    concurrency:                      # Optional: VMs deployed in parallel
+      max: 8                          # VMs in flight (1 = one at a time)
+      per_host: 8
+      per_datastore: 4                # 16 for linked/instant clones
 
     vms:
       - name: sandbox-01
@@ -493,6 +566,9 @@ def load_deploy_spec(spec_path: str) -> dict:
         guest_id: windows2019srv_64Guest
         iso: "[datastore1] iso/win2022.iso"
         ova: /path/to/image.ova       # Per-VM OVA override
+      - name: ci-runner-07
+        extra_config:                 # Instant clone: merged over the shared keys
+          guestinfo.ip: 10.0.0.7
     ```
     """
     with open(spec_path, encoding="utf-8") as f:
@@ -511,6 +587,8 @@ def load_deploy_spec(spec_path: str) -> dict:
 def batch_deploy(
     si: ServiceInstance,
     spec_path: str,
+    on_result: Callable[[dict], None] | None = None,
+    preflight: bool = True,
 ) -> list[dict]:
     """Deploy multiple VMs from a YAML specification file.
 
@@ -518,104 +596,285 @@ def batch_deploy(
     - Clone mode: 'source' specified → full clone from VM
     - Template mode: 'template' specified → clone from vSphere template
     - Linked clone mode: 'linked_clone' specified → instant clone from snapshot
+    - Instant clone mode: 'instant_clone' specified → fork a running VM
     - OVA mode: per-VM 'ova' field → deploy from OVA file
     - Create mode: fallback → create empty VM (optionally with ISO)
 
+    With a ``placement:`` block, the whole batch is placed on hosts and
+    datastores from one capacity snapshot before anything is deployed (see
+    :mod:`.placement`); each placed VM's result gets a ``placement`` dict
+    (host, cluster, datastore) and a VM that fits nowhere is an error row.
+    Instant clones stay on their parent's host and are not placed; linked
+    clones go to the planned host in their source's resource pool.
+
+    Each VM is compiled into a chain of steps (deploy → ISO attach →
+    snapshot → power on, each needing the one before) and the chains run
+    in parallel: at most ``concurrency.max`` VMs at once, ``per_host`` per
+    host and ``per_datastore`` per datastore (the spec's optional
+    ``concurrency:`` block; ``concurrency: 1`` deploys one VM at a time).
+    A slow OVA upload only holds its own host and datastore. ``on_result``
+    gets each VM's result as soon as its last step finishes.
+
+    First, a preflight (:func:`.deploy_preflight.check_spec`) checks the
+    whole spec — source, names, datastores, networks, ISOs, OVAs, capacity —
+    in a few batched reads. If it finds anything, nothing is deployed: the
+    result is a row per problem shared by the batch, then one per VM with
+    its own problems (``error``) or ``skipped``. ``preflight=False`` skips
+    it; a VM that cannot be placed is then an error row and the rest deploy.
+
     Returns:
-        List of result dicts per VM.
+        List of result dicts per VM, in ``vms`` order.
     """
     spec = load_deploy_spec(spec_path)
+    limits = _concurrency_limits(spec)
+    placements: dict[str, placement.Placement] = {}
+    # Rows for VMs that fail before any step runs (not placed, no source).
+    not_started: dict[str, dict] = {}
+    # Instant and linked clones run from the source resolved once here.
+    shared = [
+        v["name"] for v in spec["vms"]
+        if deploy_preflight.channel(spec, v) in ("instant_clone", "linked_clone")
+    ]
+    source = None
+    if preflight:
+        check = deploy_preflight.check_spec(si, spec)
+        if not check.ok:
+            rows = check.rows([v["name"] for v in spec["vms"]])
+            if on_result is not None:
+                for r in rows:
+                    on_result(r)
+            return rows
+        placements = check.placements
+        source = check.source
+    else:
+        found = deploy_preflight.source_name(spec)
+        if found and (shared or spec.get("placement")):
+            try:
+                source = clone_pipeline.resolve_source(si, found[1])
+            except VMNotFoundError:
+                pass  # a full clone or template deploy reports it itself
+        if spec.get("placement"):
+            placements, errors = deploy_preflight.place_batch(
+                spec, placement.take_snapshot(si), source,
+            )
+            not_started = {r["name"]: r for r in errors}
+        problem = _shared_source_problem(spec, source) if shared else None
+        if problem:
+            not_started.update(
+                (n, {"name": n, "status": "error", "messages": [problem]}) for n in shared
+            )
+
+    results: list[dict | None] = []
+    jobs: list[tuple[int, DeployJob]] = []
+    for vm_spec in spec["vms"]:
+        name = vm_spec["name"]
+        if name in not_started:
+            results.append(not_started[name])
+            _log.info("Batch deploy %s: not started", name)
+            if on_result is not None:
+                on_result(not_started[name])
+            continue
+        job = _compile_vm(si, spec, vm_spec, placements.get(name), source)
+        jobs.append((len(results), job))
+        results.append(None)
+
+    done = run_each(
+        [job for _, job in jobs], _run_job, limits["max"],
+        keys=lambda job: job.keys, per_key=lambda k: limits[k[0]],
+        name="deploy", on_done=on_result,
+    )
+    for (i, _), result in zip(jobs, done):
+        results[i] = result
+    return results
+
+
+@dataclass
+class DeployJob:
+    """One VM of a deploy spec, compiled: its steps in order, and the host
+    and datastore it holds a concurrency slot on while they run."""
+
+    name: str
+    steps: list[Callable[[], str]]
+    keys: list[tuple[str, str]] = field(default_factory=list)
+    placement: dict | None = None
+
+
+def _concurrency_limits(spec: dict) -> dict[str, int]:
+    """The spec's ``concurrency:`` block (or a bare number for ``max``)."""
+    config = spec.get("concurrency") or {}
+    if not isinstance(config, dict):
+        config = {"max": config}
+    linked = spec.get("linked_clone") or spec.get("instant_clone")
+    limits = {
+        "max": config.get("max", DEFAULT_CONCURRENCY),
+        "host": config.get("per_host", clone_pipeline.DEFAULT_PER_HOST),
+        "datastore": config.get("per_datastore", (
+            clone_pipeline.LINKED_PER_DATASTORE if linked
+            else clone_pipeline.DEFAULT_PER_DATASTORE
+        )),
+    }
+    bad = [k for k, v in limits.items() if not isinstance(v, int) or v < 1]
+    if bad:
+        raise ValueError(
+            f"Invalid deploy spec: concurrency {', '.join(bad)} must be a whole number of "
+            f"at least 1 (keys: max, per_host, per_datastore)."
+        )
+    return limits
+
+
+def _compile_vm(
+    si: ServiceInstance,
+    spec: dict,
+    vm_spec: dict,
+    where: placement.Placement | None,
+    resolved: clone_pipeline.CloneSource | None = None,
+) -> DeployJob:
+    """Turn one ``vms:`` entry into its deploy steps. ``resolved`` is the
+    instant- or linked-clone source, resolved once for the batch."""
     defaults = spec.get("defaults", {})
     source_vm = spec.get("source")
     template = spec.get("template")
     lc_config = spec.get("linked_clone")
-    vm_specs = spec["vms"]
-
-    results: list[dict] = []
+    ic_config = spec.get("instant_clone")
+
+    name = vm_spec["name"]
+    # Merge defaults with per-VM overrides
+    cpu = vm_spec.get("cpu", defaults.get("cpu", 2))
+    memory_mb = vm_spec.get("memory_mb", defaults.get("memory_mb", 4096))
+    disk_gb = vm_spec.get("disk_gb", defaults.get("disk_gb", 40))
+    network = vm_spec.get("network", defaults.get("network", "VM Network"))
+    datastore = vm_spec.get("datastore", defaults.get("datastore"))
+    snapshot = vm_spec.get("snapshot", defaults.get("snapshot"))
+    do_power_on = vm_spec.get("power_on", defaults.get("power_on", False))
+    iso = vm_spec.get("iso")
+    ova = vm_spec.get("ova")
+    guest_id = vm_spec.get("guest_id", defaults.get("guest_id", "otherGuest64"))
+
+    # Clones are pinned to the planned host; a new VM or OVA goes to the
+    # planned cluster and datastore, and DRS picks its host.
+    cluster = where.cluster if where else None
+    cloned = not ova and bool(lc_config or template or source_vm)
+    host = where.host if where and cloned else None
+    if where and where.datastore:
+        datastore = where.datastore
+    # Without an ISO to attach, the clone channels take the baseline
+    # snapshot and power on themselves, on the clone task's result.
+    finish = not iso
+    finished = False
+    source = None
+
+    if ova:
+        # OVA mode (per-VM)
+        deploy = partial(
+            deploy_ova, si, ova_path=ova, vm_name=name,
+            datastore_name=datastore or "", network_name=network, cluster=cluster,
+        )
+    elif ic_config:
+        # Instant clone mode, on the parent's moref: comes up running, so no
+        # power-on step
+        source = ic_config["source"]
+        deploy = partial(
+            clone_pipeline.instant_clone_one, resolved, name,
+            extra_config={
+                **(ic_config.get("extra_config") or {}),
+                **(vm_spec.get("extra_config") or {}),
+            },
+        )
+        do_power_on = False
+    elif lc_config:
+        # Linked clone mode (fastest): the batch's source and snapshot, on the
+        # planned host's moref, in the source's own resource pool
+        source = lc_config["source"]
+        job = clone_pipeline.linked_clone_job(
+            resolved, name, where.host_ref if where else None,
+            where.pool if where else None, host or "",
+        )
+        deploy = partial(
+            clone_pipeline.clone_one, resolved, job, cpu=cpu, memory_mb=memory_mb,
+            snapshot_name=snapshot if finish else None, power_on=do_power_on and finish,
+            timeout=300, snapshot=resolved.snapshots.find(lc_config["snapshot"]),
+        )
+        finished = finish
+    elif template:
+        # Template mode
+        source = template
+        deploy = partial(
+            deploy_from_template, si, template_name=template, new_name=name,
+            datastore_name=datastore, cpu=cpu, memory_mb=memory_mb,
+            power_on=do_power_on and finish,
+            snapshot_name=snapshot if finish else None, target_host=host,
+        )
+        finished = finish
+    elif source_vm:
+        # Full clone mode: CPU/memory (and power-on) in the clone task
+        source = source_vm
+        deploy = partial(
+            clone_vm, si, source_vm, name, cpu=cpu, memory_mb=memory_mb,
+            power_on=do_power_on and finish and not snapshot,
+            target_host=host, target_datastore=where.datastore if where else None,
+        )
+        finished = finish and not snapshot
+    else:
+        # Create empty VM mode
+        deploy = partial(
+            create_vm, si, vm_name=name, cpu=cpu, memory_mb=memory_mb,
+            disk_gb=disk_gb, network_name=network,
+            datastore_name=datastore, guest_id=guest_id, cluster=cluster,
+        )
 
-    for vm_spec in vm_specs:
-        name = vm_spec["name"]
-        # Merge defaults with per-VM overrides
-        cpu = vm_spec.get("cpu", defaults.get("cpu", 2))
-        memory_mb = vm_spec.get("memory_mb", defaults.get("memory_mb", 4096))
-        disk_gb = vm_spec.get("disk_gb", defaults.get("disk_gb", 40))
-        network = vm_spec.get("network", defaults.get("network", "VM Network"))
-        datastore = vm_spec.get("datastore", defaults.get("datastore"))
-        snapshot = vm_spec.get("snapshot", defaults.get("snapshot"))
-        do_power_on = vm_spec.get("power_on", defaults.get("power_on", False))
-        iso = vm_spec.get("iso")
-        ova = vm_spec.get("ova")
-        guest_id = vm_spec.get("guest_id", defaults.get("guest_id", "otherGuest64"))
-
-        result = {"name": name, "status": "ok", "messages": []}
+    steps = [deploy]
+    # Attach ISO if specified (works with all modes)
+    if iso:
+        steps.append(partial(attach_iso, si, name, iso))
+    # Create baseline snapshot
+    if snapshot and not finished:
+        steps.append(partial(
+            create_snapshot, si, name, snapshot, description="Baseline snapshot", memory=False,
+        ))
+    # Power on
+    if do_power_on and not finished:
+        steps.append(partial(power_on_vm, si, name))
+
+    # An unplaced clone lands on its source's host and datastores, so the
+    # source's name stands in for both; DRS places a new VM's host.
+    host_key = host or source
+    datastore_key = (where.datastore if where else None) or (source if cloned else datastore)
+    keys = []
+    if host_key:
+        keys.append(("host", host_key))
+    if datastore_key:
+        keys.append(("datastore", datastore_key))
+    return DeployJob(
+        name, steps, keys,
+        placement={**where.as_dict(), "host": host} if where else None,
+    )
 
-        try:
-            if ova:
-                # OVA mode (per-VM)
-                msg = deploy_ova(
-                    si, ova_path=ova, vm_name=name,
-                    datastore_name=datastore or "",
-                    network_name=network,
-                )
-                result["messages"].append(msg)
-
-            elif lc_config:
-                # Linked clone mode (fastest)
-                msg = linked_clone(
-                    si, source_vm_name=lc_config["source"],
-                    new_name=name,
-                    snapshot_name=lc_config["snapshot"],
-                    cpu=cpu, memory_mb=memory_mb,
-                )
-                result["messages"].append(msg)
-
-            elif template:
-                # Template mode
-                msg = deploy_from_template(
-                    si, template_name=template, new_name=name,
-                    datastore_name=datastore, cpu=cpu, memory_mb=memory_mb,
-                )
-                result["messages"].append(msg)
-
-            elif source_vm:
-                # Full clone mode
-                msg = clone_vm(si, source_vm, name)
-                result["messages"].append(msg)
-                if cpu or memory_mb:
-                    msg = reconfigure_vm(si, name, cpu=cpu, memory_mb=memory_mb)
-                    result["messages"].append(msg)
-
-            else:
-                # Create empty VM mode
-                msg = create_vm(
-                    si, vm_name=name, cpu=cpu, memory_mb=memory_mb,
-                    disk_gb=disk_gb, network_name=network,
-                    datastore_name=datastore, guest_id=guest_id,
-                )
-                result["messages"].append(msg)
-
-            # Attach ISO if specified (works with all modes)
-            if iso:
-                msg = attach_iso(si, name, iso)
-                result["messages"].append(msg)
-
-            # Create baseline snapshot
-            if snapshot:
-                msg = create_snapshot(si, name, snapshot,
-                                      description="Baseline snapshot",
-                                      memory=False)
-                result["messages"].append(msg)
-
-            # Power on
-            if do_power_on:
-                msg = power_on_vm(si, name)
-                result["messages"].append(msg)
-
-        except Exception as e:
-            result["status"] = "error"
-            result["messages"].append(str(e))
-
-        results.append(result)
-        _log.info("Batch deploy %s: %s", name, result["status"])
 
-    return results
+def _run_job(job: DeployJob) -> dict:
+    """Run one VM's steps in order; the first failure ends its chain."""
+    result: dict = {"name": job.name, "status": "ok", "messages": []}
+    if job.placement is not None:
+        result["placement"] = job.placement
+    try:
+        for step in job.steps:
+            result["messages"].append(step())
+    except Exception as e:
+        result["status"] = "error"
+        result["messages"].append(str(e))
+    _log.info("Batch deploy %s: %s", job.name, result["status"])
+    return result
+
+
+def _shared_source_problem(
+    spec: dict, source: clone_pipeline.CloneSource | None
+) -> str | None:
+    """Why the batch's instant- or linked-clone source cannot be used, when
+    the preflight did not run: it is gone, or lacks the linked snapshot."""
+    kind, name = deploy_preflight.source_name(spec)
+    if source is None:
+        return f"{'Parent' if kind == 'instant_clone' else 'Source'} VM '{name}' not found."
+    if kind == "linked_clone":
+        snapshot = spec["linked_clone"]["snapshot"]
+        if source.snapshots.find(snapshot) is None:
+            return source.snapshots.not_found(snapshot)
+    return None
@@ -2,21 +2,29 @@
 
 from __future__ import annotations
 
-import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from pyVmomi import vim
+from pyVmomi import vim, vmodl
 
 from vmware_policy import sanitize
 
 from vmware_aiops.ops.inventory import (
+    VM_LOCATOR_HELP,
     InventoryError,
+    _collect,
+    _collect_object,
+    _collect_objects,
     find_compute_resource,
     find_datastore_by_name,
     find_host_by_name,
+    find_vm_by_locator,
     find_vm_by_name,
+    is_vm_locator,
     resolve_datacenter,
 )
+from vmware_aiops.ops.tasks import wait_for_task, wait_for_values
 
 if TYPE_CHECKING:
     from pyVmomi.vim import ServiceInstance
@@ -54,26 +62,28 @@ def _task_moid(task) -> str:
 
 
 def _wait_for_task(task, timeout: int = 300) -> object:
-    """Wait for a vSphere task to complete.
+    """Wait for a vSphere task to complete and return its result.
 
-    Raises TaskStillRunning (not TimeoutError) when the budget is exceeded so
-    callers can surface the task id and keep polling — a slow snapshot
-    consolidation is not a failure.
+    Blocks on a PropertyCollector update (:func:`~vmware_aiops.ops.tasks.wait_for_task`)
+    rather than polling, so the call returns as soon as vCenter reports the
+    task finished. Raises TaskStillRunning (not TimeoutError) when the budget
+    is exceeded so callers can surface the task id and keep polling — a slow
+    snapshot consolidation is not a failure.
     """
-    start = time.time()
-    while task.info.state in (vim.TaskInfo.State.running, vim.TaskInfo.State.queued):
-        if time.time() - start > timeout:
-            raise TaskStillRunning(_task_moid(task), timeout)
-        time.sleep(2)
+    outcome = wait_for_task(task, timeout)
+    if outcome.state == "running":
+        raise TaskStillRunning(outcome.task_id, timeout)
+    if outcome.state == "success":
+        return outcome.result
+    raise _task_failed(outcome.task_id, outcome.error)
 
-    if task.info.state == vim.TaskInfo.State.success:
-        return task.info.result
 
-    err = task.info.error
+def _task_failed(task_id: str, err) -> TaskFailedError:
+    """Build a TaskFailedError that keeps the fault chain."""
     if err is None:
-        raise TaskFailedError(
-            f"Task {_task_moid(task)} failed but vCenter attached no fault detail. "
-            f"Run vm_task_status with task_id='{_task_moid(task)}' for its final state, "
+        return TaskFailedError(
+            f"Task {task_id} failed but vCenter attached no fault detail. "
+            f"Run vm_task_status with task_id='{task_id}' for its final state, "
             f"and check get_events (vmware-monitor skill) around now for the underlying "
             f"cause before retrying."
         )
@@ -93,12 +103,14 @@ def _wait_for_task(task, timeout: int = 300) -> object:
         if m:
             parts.append(f"detail={m}")
 
-    raise TaskFailedError("Task failed: " + " | ".join(parts))
+    return TaskFailedError("Task failed: " + " | ".join(parts))
 
 
 def _require_vm(si: ServiceInstance, vm_name: str) -> vim.VirtualMachine:
     """Find a VM or raise VMNotFoundError."""
     vm = find_vm_by_name(si, vm_name)
+    if vm is None and is_vm_locator(vm_name):
+        raise VMNotFoundError(f"No VM matches '{vm_name}'. {VM_LOCATOR_HELP}")
     if vm is None:
         raise VMNotFoundError(
             f"VM '{vm_name}' not found. Run list_virtual_machines (vmware-monitor skill, "
@@ -111,68 +123,131 @@ def _require_vm(si: ServiceInstance, vm_name: str) -> vim.VirtualMachine:
 # ─── Info ─────────────────────────────────────────────────────────────────────
 
 
+_VM_INFO_PATHS = [
+    "name",
+    "runtime.powerState",
+    "runtime.host",
+    "config.hardware.numCPU",
+    "config.hardware.memoryMB",
+    "config.hardware.device",
+    "config.guestFullName",
+    "config.guestId",
+    "config.uuid",
+    "config.instanceUuid",
+    "config.annotation",
+    "guest.ipAddress",
+    "guest.hostName",
+    "guest.toolsRunningStatus",
+    "guest.toolsVersion",
+    "snapshot.rootSnapshotList",
+]
+
+
 def get_vm_info(si: ServiceInstance, vm_name: str) -> dict:
-    """Get detailed VM information."""
+    """Get detailed VM information.
+
+    Every field comes from one batched read of the VM (devices included) plus
+    one for its host's name, instead of a lazy round-trip per property.
+    """
     vm = _require_vm(si, vm_name)
-    config = vm.config
-    guest = vm.guest
-    runtime = vm.runtime
+    props = _collect_object(si, vm, vim.VirtualMachine, _VM_INFO_PATHS)
+    host = props.get("runtime.host")
+    host_name = _collect_object(si, host, vim.HostSystem, ["name"]).get("name") if host else None
+    return _vm_info(props, host_name)
+
+
+def get_vms_info(si: ServiceInstance, vm_names: list[str]) -> list[dict]:
+    """Detailed information for many VMs, in ``vm_names`` order.
+
+    Three paged collections whatever the count: names, then every matched
+    VM's detail paths, then their hosts' names; a locator (``uuid:``,
+    ``bios:``, ``ip:``, inventory path) is one ``SearchIndex`` call instead of
+    a name. A name shared by several VMs yields one entry per VM; an unknown
+    name yields ``{"name", "error"}``.
+    """
+    wanted = {n for n in vm_names if not is_vm_locator(n)}
+    by_name: dict[str, list] = {}
+    if wanted:
+        for vm, p in _collect(si, [vim.VirtualMachine], ["name"]):
+            if p.get("name") in wanted:
+                by_name.setdefault(p["name"], []).append(vm)
+    for ref in dict.fromkeys(n for n in vm_names if is_vm_locator(n)):
+        vm = find_vm_by_locator(si, ref)
+        by_name[ref] = [vm] if vm is not None else []
+    vms = [vm for name in dict.fromkeys(vm_names) for vm in by_name.get(name, [])]
+    details = dict(_collect_objects(si, vms, vim.VirtualMachine, _VM_INFO_PATHS))
+    hosts = {p.get("runtime.host") for p in details.values()} - {None}
+    host_names = {
+        host: p.get("name")
+        for host, p in _collect_objects(si, list(hosts), vim.HostSystem, ["name"])
+    }
+
+    out: list[dict] = []
+    for name in dict.fromkeys(vm_names):
+        matches = [vm for vm in by_name.get(name, []) if vm in details]
+        if not matches:
+            out.append({
+                "name": sanitize(name),
+                "error": f"No VM matches '{name}'. {VM_LOCATOR_HELP}" if is_vm_locator(name)
+                else f"VM '{name}' not found. vSphere VM names are case-sensitive.",
+            })
+        for vm in matches:
+            props = details[vm]
+            out.append(_vm_info(props, host_names.get(props.get("runtime.host"))))
+    return out
+
+
+def _vm_info(props: dict, host_name: str | None) -> dict:
+    """Shape one VM's batched properties into the get_vm_info dict."""
+    has_config = "config.uuid" in props
+    guest_props = any(k.startswith("guest.") for k in props)
 
     disks = []
     nics = []
-    if config and config.hardware:
-        for dev in config.hardware.device:
-            if isinstance(dev, vim.vm.device.VirtualDisk):
-                disks.append({
-                    "label": sanitize(dev.deviceInfo.label),
-                    "size_gb": round(dev.capacityInKB / (1024 * 1024), 1),
-                    "thin": getattr(dev.backing, "thinProvisioned", None),
-                })
-            elif isinstance(dev, vim.vm.device.VirtualEthernetCard):
-                nics.append({
-                    "label": sanitize(dev.deviceInfo.label),
-                    "mac": dev.macAddress,
-                    "connected": dev.connectable.connected if dev.connectable else False,
-                    "network": sanitize(dev.backing.deviceName)
-                    if hasattr(dev.backing, "deviceName")
-                    else sanitize(str(dev.backing)),
-                })
+    for dev in props.get("config.hardware.device") or []:
+        if isinstance(dev, vim.vm.device.VirtualDisk):
+            disks.append({
+                "label": sanitize(dev.deviceInfo.label),
+                "size_gb": round(dev.capacityInKB / (1024 * 1024), 1),
+                "thin": getattr(dev.backing, "thinProvisioned", None),
+            })
+        elif isinstance(dev, vim.vm.device.VirtualEthernetCard):
+            nics.append({
+                "label": sanitize(dev.deviceInfo.label),
+                "mac": dev.macAddress,
+                "connected": dev.connectable.connected if dev.connectable else False,
+                "network": sanitize(dev.backing.deviceName)
+                if hasattr(dev.backing, "deviceName")
+                else sanitize(str(dev.backing)),
+            })
 
+    hostname = props.get("guest.hostName")
+    tools_version = props.get("guest.toolsVersion")
+    annotation = props.get("config.annotation")
     return {
-        "name": sanitize(vm.name),
-        "power_state": str(runtime.powerState),
-        "cpu": config.hardware.numCPU if config else 0,
-        "memory_mb": config.hardware.memoryMB if config else 0,
-        "guest_os": sanitize(config.guestFullName) if config else "N/A",
-        "guest_id": config.guestId if config else "N/A",
-        "uuid": config.uuid if config else "N/A",
-        "instance_uuid": config.instanceUuid if config else "N/A",
-        "host": sanitize(runtime.host.name) if runtime.host else "N/A",
-        "ip_address": guest.ipAddress if guest else None,
-        "hostname": sanitize(guest.hostName) if guest and guest.hostName else None,
-        "tools_status": str(guest.toolsRunningStatus) if guest else "N/A",
-        "tools_version": str(guest.toolsVersion) if guest and guest.toolsVersion else "N/A",
+        "name": sanitize(props.get("name", "")),
+        "power_state": str(props.get("runtime.powerState")),
+        "cpu": props.get("config.hardware.numCPU", 0),
+        "memory_mb": props.get("config.hardware.memoryMB", 0),
+        "guest_os": sanitize(props.get("config.guestFullName", "")) if has_config else "N/A",
+        "guest_id": props.get("config.guestId", "N/A"),
+        "uuid": props.get("config.uuid", "N/A"),
+        "instance_uuid": props.get("config.instanceUuid", "N/A"),
+        "host": sanitize(host_name) if host_name else "N/A",
+        "ip_address": props.get("guest.ipAddress"),
+        "hostname": sanitize(hostname) if hostname else None,
+        "tools_status": str(props.get("guest.toolsRunningStatus")) if guest_props else "N/A",
+        "tools_version": str(tools_version) if tools_version else "N/A",
         "disks": disks,
         "nics": nics,
-        "annotation": sanitize(config.annotation, max_len=1000) if config and config.annotation else "",
-        "snapshot_count": _count_snapshots(vm.snapshot) if vm.snapshot else 0,
+        "annotation": sanitize(annotation, max_len=1000) if annotation else "",
+        "snapshot_count": _count_tree(props.get("snapshot.rootSnapshotList") or []),
     }
 
 
-def _count_snapshots(snapshot_info) -> int:
-    """Count total snapshots recursively."""
-    count = 0
-    if snapshot_info and snapshot_info.rootSnapshotList:
-        for snap in snapshot_info.rootSnapshotList:
-            count += 1 + _count_children(snap)
-    return count
-
-
-def _count_children(snap_tree) -> int:
-    count = 0
-    for child in (snap_tree.childSnapshotList or []):
-        count += 1 + _count_children(child)
-    return count
+def _count_tree(snapshots) -> int:
+    """Count snapshots in a ``rootSnapshotList`` recursively."""
+    return sum(1 + _count_tree(snap.childSnapshotList or []) for snap in snapshots)
 
 
 # ─── Power Operations ────────────────────────────────────────────────────────
@@ -188,8 +263,19 @@ def power_on_vm(si: ServiceInstance, vm_name: str) -> str:
     return f"VM '{vm_name}' powered on successfully."
 
 
-def power_off_vm(si: ServiceInstance, vm_name: str, force: bool = False) -> str:
-    """Power off a VM. Graceful (guest shutdown) by default, force if specified."""
+def power_off_vm(
+    si: ServiceInstance,
+    vm_name: str,
+    force: bool = False,
+    timeout: int = 120,
+    escalate: bool = False,
+) -> str:
+    """Power off a VM. Graceful (guest shutdown) by default, force if specified.
+
+    A guest shutdown is awaited for up to ``timeout`` seconds. With
+    ``escalate``, a VM that is still running by then, or has no VMware Tools,
+    is hard powered off instead of left as-is.
+    """
     vm = _require_vm(si, vm_name)
     if vm.runtime.powerState == vim.VirtualMachine.PowerState.poweredOff:
         return f"VM '{vm_name}' is already powered off."
@@ -202,20 +288,47 @@ def power_off_vm(si: ServiceInstance, vm_name: str, force: bool = False) -> str:
     # Graceful shutdown via VMware Tools
     try:
         vm.ShutdownGuest()
-        # Wait for power off (no task returned for ShutdownGuest)
-        for _ in range(60):
-            time.sleep(2)
-            if vm.runtime.powerState == vim.VirtualMachine.PowerState.poweredOff:
-                return f"VM '{vm_name}' gracefully shut down."
-        return (
-            f"VM '{vm_name}' shutdown initiated but still running "
-            f"after 120s. Use --force if needed."
-        )
     except vim.fault.ToolsUnavailable:
+        if escalate:
+            _escalate_power_off(vm)
+            return f"VMware Tools not running on '{vm_name}'; force powered off."
         return (
             f"VMware Tools not running on '{vm_name}'. "
             f"Use --force for hard power off."
         )
+    if _await_powered_off(vm, timeout):
+        return f"VM '{vm_name}' gracefully shut down."
+    if escalate:
+        if _escalate_power_off(vm):
+            return f"VM '{vm_name}' did not shut down within {timeout}s; force powered off."
+        return f"VM '{vm_name}' gracefully shut down."
+    return (
+        f"VM '{vm_name}' shutdown initiated but still running "
+        f"after {timeout}s. Use --force if needed."
+    )
+
+
+def _await_powered_off(vm, timeout: int = 120) -> bool:
+    """Wait for a guest-initiated shutdown; True once the VM is powered off.
+
+    ShutdownGuest returns no task, so ``runtime.powerState`` is watched with a
+    PropertyCollector wait that returns the moment the VM stops.
+    """
+    [(_, _, reached)] = wait_for_values(
+        [vm], "runtime.powerState", (vim.VirtualMachine.PowerState.poweredOff,), timeout
+    )
+    return reached
+
+
+def _escalate_power_off(vm, timeout: int = 300) -> bool:
+    """Hard power-off after a failed shutdown; False if the guest beat us to it."""
+    try:
+        _wait_for_task(vm.PowerOff(), timeout)
+    except TaskFailedError:
+        if vm.runtime.powerState == vim.VirtualMachine.PowerState.poweredOff:
+            return False
+        raise
+    return True
 
 
 def reset_vm(si: ServiceInstance, vm_name: str) -> str:
@@ -250,13 +363,14 @@ def create_vm(
     datacenter_name: str | None = None,
     cluster: str | None = None,
 ) -> str:
-    """Create a new VM with basic configuration."""
+    """Create a new VM with basic configuration.
+
+    Raises InventoryError when the datacenter, cluster, folder or datastore
+    cannot be resolved.
+    """
     # Find datacenter and folder
-    try:
-        datacenter = resolve_datacenter(si, datacenter_name)
-        compute_resource = find_compute_resource(datacenter, cluster)
-    except InventoryError as e:
-        return str(e)
+    datacenter = resolve_datacenter(si, datacenter_name)
+    compute_resource = find_compute_resource(datacenter, cluster)
     vm_folder = datacenter.vmFolder
     if folder_path:
         for part in folder_path.split("/"):
@@ -267,7 +381,10 @@ def create_vm(
                     found = True
                     break
             if not found:
-                return f"Folder '{folder_path}' not found."
+                raise InventoryError(
+                    f"Folder '{folder_path}' not found. Check the folder path "
+                    f"(e.g. 'Prod/Web') in the vSphere Client's VMs and Templates view."
+                )
 
     # Find resource pool
     resource_pool = compute_resource.resourcePool
@@ -276,7 +393,9 @@ def create_vm(
     if datastore_name:
         ds = find_datastore_by_name(si, datastore_name)
         if ds is None:
-            return f"Datastore '{datastore_name}' not found."
+            raise InventoryError(
+                f"Datastore '{datastore_name}' not found. List: vmware-aiops datastore list"
+            )
         ds_path = f"[{datastore_name}] {vm_name}"
     else:
         ds_path = f"{vm_name}"
@@ -411,42 +530,95 @@ def create_snapshot(
     return f"Snapshot '{snap_name}' created for VM '{vm_name}'."
 
 
-def list_snapshots(si: ServiceInstance, vm_name: str) -> list[dict]:
-    """List all snapshots for a VM."""
-    vm = _require_vm(si, vm_name)
-    if not vm.snapshot:
-        return []
+@dataclass(frozen=True)
+class SnapshotNode:
+    """One snapshot in a VM's tree, as read from ``snapshot.rootSnapshotList``."""
+
+    name: str
+    description: str
+    created: str
+    state: str
+    level: int
+    snapshot: object
+    """The ``vim.vm.Snapshot`` moref (target of revert / remove)."""
 
-    results: list[dict] = []
+    def as_dict(self) -> dict:
+        return {
+            "name": sanitize(self.name),
+            "description": sanitize(self.description, max_len=1000),
+            "created": self.created,
+            "state": self.state,
+            "level": self.level,
+            "snapshot_ref": self.snapshot,
+        }
 
-    def _walk(snap_list, level: int = 0) -> None:
+
+class SnapshotIndex:
+    """A VM's snapshot tree flattened depth-first, searchable by name.
+
+    Built from the ``rootSnapshotList`` value of one property read — the tree
+    items are data objects, so walking them costs no further round-trips.
+    """
+
+    def __init__(self, root_snapshot_list=None) -> None:
+        self._nodes: list[SnapshotNode] = []
+        self._walk(root_snapshot_list or [], 0)
+
+    def _walk(self, snap_list, level: int) -> None:
         for snap in snap_list:
-            results.append({
-                "name": sanitize(snap.name),
-                "description": sanitize(snap.description, max_len=1000),
-                "created": str(snap.createTime),
-                "state": str(snap.state),
-                "level": level,
-                "snapshot_ref": snap.snapshot,
-            })
-            if snap.childSnapshotList:
-                _walk(snap.childSnapshotList, level + 1)
+            self._nodes.append(SnapshotNode(
+                name=snap.name or "",
+                description=snap.description or "",
+                created=str(snap.createTime),
+                state=str(snap.state),
+                level=level,
+                snapshot=snap.snapshot,
+            ))
+            self._walk(snap.childSnapshotList or [], level + 1)
+
+    def __iter__(self) -> Iterator[SnapshotNode]:
+        return iter(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def find(self, name: str) -> SnapshotNode | None:
+        """First snapshot (depth-first) whose raw or displayed name is ``name``."""
+        return next(
+            (n for n in self._nodes if name in (n.name, sanitize(n.name))), None
+        )
+
+    def not_found(self, name: str) -> str:
+        available = ", ".join(sanitize(n.name) for n in self._nodes) or "none"
+        return f"Snapshot '{name}' not found. Available: {available}"
+
+
+def snapshot_index(si: ServiceInstance, vm: vim.VirtualMachine) -> SnapshotIndex:
+    """Read ``vm``'s whole snapshot tree in one ``RetrievePropertiesEx`` call."""
+    props = _collect_object(si, vm, vim.VirtualMachine, ["snapshot.rootSnapshotList"])
+    return SnapshotIndex(props.get("snapshot.rootSnapshotList"))
+
 
-    _walk(vm.snapshot.rootSnapshotList)
-    return results
+def list_snapshots(si: ServiceInstance, vm_name: str) -> list[dict]:
+    """List all snapshots for a VM."""
+    vm = _require_vm(si, vm_name)
+    return [node.as_dict() for node in snapshot_index(si, vm)]
 
 
 def revert_to_snapshot(
     si: ServiceInstance, vm_name: str, snap_name: str
 ) -> str:
     """Revert VM to a named snapshot."""
-    snaps = list_snapshots(si, vm_name)
-    target = next((s for s in snaps if s["name"] == snap_name), None)
+    index = snapshot_index(si, _require_vm(si, vm_name))
+    return _revert(index, vm_name, snap_name)
+
+
+def _revert(index: SnapshotIndex, vm_name: str, snap_name: str) -> str:
+    target = index.find(snap_name)
     if target is None:
-        available = ", ".join(s["name"] for s in snaps) or "none"
-        return f"Snapshot '{snap_name}' not found. Available: {available}"
+        return index.not_found(snap_name)
 
-    task = target["snapshot_ref"].RevertToSnapshot_Task()
+    task = target.snapshot.RevertToSnapshot_Task()
     _wait_for_task(task)
     return f"VM '{vm_name}' reverted to snapshot '{snap_name}'."
 
@@ -468,13 +640,12 @@ def delete_snapshot(
     and the task id returned immediately (use ``get_task_status`` to poll) — this
     avoids blocking an agent's context window on a long consolidation.
     """
-    snaps = list_snapshots(si, vm_name)
-    target = next((s for s in snaps if s["name"] == snap_name), None)
+    index = snapshot_index(si, _require_vm(si, vm_name))
+    target = index.find(snap_name)
     if target is None:
-        available = ", ".join(s["name"] for s in snaps) or "none"
-        return f"Snapshot '{snap_name}' not found. Available: {available}"
+        return index.not_found(snap_name)
 
-    task = target["snapshot_ref"].RemoveSnapshot_Task(removeChildren=remove_children)
+    task = target.snapshot.RemoveSnapshot_Task(removeChildren=remove_children)
     task_id = _task_moid(task)
 
     if not wait:
@@ -514,6 +685,40 @@ def get_task_status(si: ServiceInstance, task_id: str) -> dict:
     try:
         info = task.info
     except Exception:  # noqa: BLE001 — translated to a teaching status
+        info = None
+    return _task_status(task_id, info)
+
+
+def get_tasks_status(si: ServiceInstance, task_ids: list[str]) -> list[dict]:
+    """:func:`get_task_status` for many task ids in one PropertyCollector call.
+
+    Polling the tasks of a bulk ``wait=False`` run one id at a time is a
+    round-trip per task per poll. Here every ``info`` is read in one
+    ``RetrievePropertiesEx``; vCenter rejects the whole call when one id is
+    gone, so each gone id costs one retry without it.
+
+    Returns:
+        One status dict per distinct id, in request order.
+    """
+    ids = list(dict.fromkeys(task_ids))
+    pending = {tid: vim.Task(tid, si._stub) for tid in ids}
+    infos: dict[str, object] = {}
+    while pending:
+        try:
+            rows = _collect_objects(si, list(pending.values()), vim.Task, ["info"])
+        except vmodl.fault.ManagedObjectNotFound as e:
+            missing = getattr(e.obj, "_moId", None)
+            if missing not in pending:
+                raise
+            del pending[missing]
+            continue
+        infos.update((task._moId, props.get("info")) for task, props in rows)
+        break
+    return [_task_status(tid, infos.get(tid)) for tid in ids]
+
+
+def _task_status(task_id: str, info) -> dict:
+    if info is None:
         return {
             "task_id": task_id,
             "state": "gone",
@@ -540,6 +745,54 @@ def get_task_status(si: ServiceInstance, task_id: str) -> dict:
 # ─── Clone ────────────────────────────────────────────────────────────────────
 
 
+def clone_spec(
+    location: object,
+    cpu: int | None = None,
+    memory_mb: int | None = None,
+    power_on: bool = False,
+    **kwargs,
+) -> vim.vm.CloneSpec:
+    """A CloneSpec that also sets CPU/memory and powers the clone on.
+
+    vCenter applies ``config`` and ``powerOn`` as part of the clone task, so
+    one task replaces clone + ``ReconfigVM_Task`` + ``PowerOn``. Pass
+    ``power_on=False`` when something (a baseline snapshot) must happen
+    between the clone and the power-on. ``kwargs`` go to the CloneSpec
+    (e.g. ``snapshot`` for a linked clone).
+    """
+    config = None
+    if cpu is not None or memory_mb is not None:
+        config = vim.vm.ConfigSpec(numCPUs=cpu, memoryMB=memory_mb)
+    return vim.vm.CloneSpec(
+        location=location, config=config, powerOn=power_on, template=False, **kwargs
+    )
+
+
+def spec_changes(
+    cpu: int | None = None, memory_mb: int | None = None, power_on: bool = False
+) -> list[str]:
+    """What :func:`clone_spec` folds in: ``["CPU: 4", "Memory: 8192MB", "powered on"]``."""
+    parts = []
+    if cpu is not None:
+        parts.append(f"CPU: {cpu}")
+    if memory_mb is not None:
+        parts.append(f"Memory: {memory_mb}MB")
+    if power_on:
+        parts.append("powered on")
+    return parts
+
+
+def describe_spec(spec: vim.vm.CloneSpec) -> str:
+    """`` (CPU: 4, Memory: 8192MB, powered on)`` for what ``spec`` folds in, else ``""``."""
+    config = spec.config
+    parts = spec_changes(
+        config.numCPUs if config is not None else None,
+        config.memoryMB if config is not None else None,
+        spec.powerOn,
+    )
+    return f" ({', '.join(parts)})" if parts else ""
+
+
 def clone_vm(
     si: ServiceInstance,
     vm_name: str,
@@ -548,12 +801,16 @@ def clone_vm(
     target_host: str | None = None,
     target_datastore: str | None = None,
     power_on: bool = False,
+    cpu: int | None = None,
+    memory_mb: int | None = None,
 ) -> str:
     """Clone a VM with the same configuration.
 
     Without ``target_host`` / ``target_datastore`` vCenter places the clone on
     the **source VM/template's** host and datastore. To land it elsewhere
     (different site, different cluster, different storage), pass both.
+    ``cpu`` / ``memory_mb`` are applied by the clone task itself, as is
+    ``power_on`` — no separate reconfigure or power-on task.
     """
     vm = _require_vm(si, vm_name)
     folder = vm.parent
@@ -563,7 +820,7 @@ def clone_vm(
     if target_host:
         host = find_host_by_name(si, target_host)
         if host is None:
-            return (
+            raise InventoryError(
                 f"Target host '{target_host}' not found. "
                 f"List hosts: vmware-aiops cluster list-hosts"
             )
@@ -571,7 +828,7 @@ def clone_vm(
         if host.parent and getattr(host.parent, "resourcePool", None):
             relocate_spec.pool = host.parent.resourcePool
         else:
-            return (
+            raise InventoryError(
                 f"Target host '{target_host}' has no resource pool "
                 "(standalone host outside cluster?). Cannot clone."
             )
@@ -579,19 +836,14 @@ def clone_vm(
     if target_datastore:
         ds = find_datastore_by_name(si, target_datastore)
         if ds is None:
-            return (
+            raise InventoryError(
                 f"Target datastore '{target_datastore}' not found. "
                 f"List: vmware-aiops datastore list"
             )
         relocate_spec.datastore = ds
 
-    clone_spec = vim.vm.CloneSpec(
-        location=relocate_spec,
-        powerOn=power_on,
-        template=False,
-    )
-
-    task = vm.Clone(folder=folder, name=new_name, spec=clone_spec)
+    spec = clone_spec(relocate_spec, cpu, memory_mb, power_on)
+    task = vm.Clone(folder=folder, name=new_name, spec=spec)
     _wait_for_task(task, timeout=600)
 
     placement = []
@@ -600,7 +852,10 @@ def clone_vm(
     if target_datastore:
         placement.append(f"datastore={target_datastore}")
     where = f" ({', '.join(placement)})" if placement else " (inherited from source)"
-    return f"VM '{vm_name}' cloned as '{new_name}'{where}."
+    applied = spec_changes(cpu, memory_mb, power_on)
+    return f"VM '{vm_name}' cloned as '{new_name}'{where}" + (
+        f"; {', '.join(applied)}." if applied else "."
+    )
 
 
 # ─── Migrate (vMotion) ───────────────────────────────────────────────────────
@@ -690,12 +945,18 @@ def clean_slate(
         snapshot_name: Snapshot to revert to (default: "baseline").
     """
     vm = _require_vm(si, vm_name)
+    props = _collect_object(
+        si, vm, vim.VirtualMachine, ["runtime.powerState", "snapshot.rootSnapshotList"]
+    )
+    index = SnapshotIndex(props.get("snapshot.rootSnapshotList"))
+    if index.find(snapshot_name) is None:
+        return f"Clean Slate: {index.not_found(snapshot_name)}"
 
     # Power off if running — revert is more predictable on a powered-off VM
-    if vm.runtime.powerState == vim.VirtualMachine.PowerState.poweredOn:
+    if props.get("runtime.powerState") == vim.VirtualMachine.PowerState.poweredOn:
         task = vm.PowerOff()
         _wait_for_task(task)
 
     # Revert to named snapshot
-    result = revert_to_snapshot(si, vm_name, snapshot_name)
+    result = _revert(index, vm_name, snapshot_name)
     return f"Clean Slate: {result}"
@@ -15,7 +15,11 @@ def scan_alarms(si: ServiceInstance) -> list[dict]:
 
     Returns issues compatible with the notification pipeline.
     """
-    alarms = get_active_alarms(si)
+    return alarms_to_issues(get_active_alarms(si))
+
+
+def alarms_to_issues(alarms: list[dict]) -> list[dict]:
+    """Convert alarm rows (see ``ops.health``) to notification issues."""
     issues: list[dict] = []
 
     for alarm in alarms:
@@ -32,6 +36,8 @@ def scan_alarms(si: ServiceInstance) -> list[dict]:
             ),
             "time": alarm["time"],
             "entity": alarm["entity_name"],
+            "entity_type": alarm["entity_type"],
+            "alarm_name": alarm["alarm_name"],
         })
 
     return issues
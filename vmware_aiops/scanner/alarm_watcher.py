@@ -0,0 +1,250 @@
+"""Alarm watcher: push-based alarm detection via PropertyCollector updates.
+
+The polling scanner re-downloads ``triggeredAlarmState`` for the root folder
+and every datacenter, cluster and host each ``interval_minutes``. In watch mode
+(``scanner.alarm_watch: true``) one :class:`AlarmWatcher` per target instead:
+
+1. creates a private PropertyCollector (so its filter never leaks into the
+   shared one used by ops code);
+2. registers one filter on ``triggeredAlarmState`` for the root folder plus a
+   container view of datacenters, clusters and hosts;
+3. blocks in ``WaitForUpdatesEx``. The first call returns the full current
+   state; later calls return only objects whose alarm state changed, within
+   seconds of the change. Between changes vCenter does no work for us.
+
+After every update set the watcher rebuilds the alarm rows of the objects
+that changed, then the target's issue list (same rows and dedup as
+:func:`scan_alarms`) and, if it differs from the last one, hands it to
+``on_change(target, issues)``. Alarm and entity names are cached by moref:
+the first update that mentions an alarm or entity reads the names of all
+new ones in one PropertyCollector call, so a steady stream of updates costs
+no name reads at all. The scheduler feeds that into
+the same dedup / log / webhook pipeline as a polling cycle, and every scan
+cycle also re-submits :meth:`AlarmWatcher.current_issues` in place of the
+alarm poll, so alarms that stay active still get ``renotify`` reminders and
+never age out of the issue state.
+
+Failures (session expiry, network) mark the watcher unhealthy, and it
+reconnects after ``retry_seconds``. While it is unhealthy the polling scan
+covers alarms for that target again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim, vmodl
+
+from vmware_aiops.ops.health import alarm_state_row, dedupe_alarm_rows
+from vmware_aiops.ops.inventory import _retrieve_all
+from vmware_aiops.scanner.alarm_scanner import alarms_to_issues
+
+if TYPE_CHECKING:
+    from pyVmomi.vim import ServiceInstance
+
+logger = logging.getLogger("vmware-aiops.alarm-watcher")
+
+_WATCHED_TYPES = [vim.Datacenter, vim.ClusterComputeResource, vim.HostSystem]
+
+
+def _issue_key(issue: dict) -> tuple:
+    return (issue["alarm_name"], issue["entity"], issue["severity"])
+
+
+class AlarmWatcher:
+    """Background thread streaming alarm changes for one target."""
+
+    def __init__(
+        self,
+        target: str,
+        connect: Callable[[], ServiceInstance],
+        on_change: Callable[[str, list[dict]], None],
+        max_wait_seconds: int = 60,
+        retry_seconds: int = 30,
+    ) -> None:
+        """
+        Args:
+            target: Target name, passed back to ``on_change``.
+            connect: Returns a live ServiceInstance for the target. Called on
+                start and after every failure.
+            on_change: ``(target, issues)`` with the target's full current
+                alarm issue list, whenever it changes.
+            max_wait_seconds: ``WaitOptions.maxWaitSeconds``; bounds how long a
+                stop request can go unnoticed if cancellation fails.
+            retry_seconds: Delay before reconnecting after a failure.
+        """
+        self.target = target
+        self._connect = connect
+        self._on_change = on_change
+        self._max_wait = max_wait_seconds
+        self._retry = retry_seconds
+        self._stop = threading.Event()
+        self._healthy = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pc = None
+        self._rows: dict = {}
+        """Alarm rows per watched object, rebuilt when its alarm state changes."""
+        self._names: dict = {}
+        """Alarm and entity names by moref, for the current connection."""
+        self._last_keys: set[tuple] | None = None
+        self._issues: list[dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        """True once the initial state arrived and the watch is running."""
+        return self._healthy.is_set()
+
+    def current_issues(self) -> list[dict]:
+        """The target's alarm issues as last published (copies)."""
+        with self._lock:
+            return [dict(i) for i in self._issues]
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"alarm-watch-{self.target}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        pc = self._pc
+        if pc is not None:
+            try:
+                pc.CancelWaitForUpdates()
+            except Exception:  # best-effort: maxWaitSeconds bounds the wait anyway
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ── watch loop ──────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.watch(self._connect())
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning(
+                    "Alarm watch on %s failed, polling covers it; retry in %ds: %s",
+                    self.target, self._retry, e,
+                )
+            finally:
+                self._healthy.clear()
+            self._stop.wait(self._retry)
+
+    def watch(self, si: ServiceInstance) -> None:
+        """Register the filter and stream updates until stopped or failed."""
+        content = si.RetrieveContent()
+        pc = content.propertyCollector.CreatePropertyCollector()
+        view = content.viewManager.CreateContainerView(
+            content.rootFolder, _WATCHED_TYPES, True
+        )
+        self._pc = pc
+        self._rows, self._names = {}, {}
+        try:
+            pc.CreateFilter(_filter_spec(content.rootFolder, view), partialUpdates=False)
+            options = vmodl.query.PropertyCollector.WaitOptions(
+                maxWaitSeconds=self._max_wait
+            )
+            version = ""
+            while not self._stop.is_set():
+                update = pc.WaitForUpdatesEx(version, options)
+                if update is None:  # maxWaitSeconds elapsed with no change
+                    continue
+                version = update.version
+                self._apply(si, update)
+                self._healthy.set()
+                self._publish()
+        except vmodl.fault.RequestCanceled:
+            if not self._stop.is_set():
+                raise
+        finally:
+            self._pc = None
+            for cleanup in (pc.Destroy, view.Destroy):
+                try:
+                    cleanup()
+                except Exception:
+                    pass
+
+    def _apply(self, si: ServiceInstance, update) -> None:
+        changed: dict = {}
+        for filter_update in update.filterSet or []:
+            for obj_update in filter_update.objectSet or []:
+                if obj_update.kind == "leave":
+                    self._rows.pop(obj_update.obj, None)
+                    changed.pop(obj_update.obj, None)
+                    continue
+                for change in obj_update.changeSet or []:
+                    if change.name == "triggeredAlarmState":
+                        value = change.val if change.op != "remove" else None
+                        changed[obj_update.obj] = list(value or [])
+        new = {
+            ref for states in changed.values() for s in states
+            for ref in (s.alarm, s.entity) if ref not in self._names
+        }
+        if new:
+            self._names.update(_read_names(si, new))
+
+        def name(ref) -> str:
+            # Not cached only if it was gone before its name could be read.
+            return self._names.get(ref) or ref._moId
+
+        for obj, states in changed.items():
+            self._rows[obj] = [alarm_state_row(s, name(s.alarm), name(s.entity)) for s in states]
+
+    def _publish(self) -> None:
+        rows = [r for rows in self._rows.values() for r in rows]
+        issues = alarms_to_issues(dedupe_alarm_rows(rows))
+        keys = {_issue_key(i) for i in issues}
+        if keys == self._last_keys:
+            return
+        self._last_keys = keys
+        with self._lock:
+            self._issues = issues
+        self._on_change(self.target, [dict(i) for i in issues])
+
+
+def _read_names(si: ServiceInstance, refs: set) -> dict:
+    """``info.name`` of the alarms and ``name`` of the entities in ``refs``, in
+    one PropertyCollector call; empty if one of them is already gone."""
+    pc = vmodl.query.PropertyCollector
+    spec = pc.FilterSpec(
+        objectSet=[pc.ObjectSpec(obj=ref, skip=False) for ref in refs],
+        propSet=[
+            pc.PropertySpec(type=vim.alarm.Alarm, pathSet=["info.name"], all=False),
+            pc.PropertySpec(type=vim.ManagedEntity, pathSet=["name"], all=False),
+        ],
+    )
+    try:
+        found = _retrieve_all(si.RetrieveContent().propertyCollector, spec, vim.ManagedEntity)
+    except vmodl.fault.ManagedObjectNotFound:
+        return {}
+    return {obj: props.get("info.name", props.get("name")) for obj, props in found}
+
+
+def _filter_spec(root_folder, view) -> vmodl.query.PropertyCollector.FilterSpec:
+    """Root folder (aggregated alarms) + every DC / cluster / host in ``view``."""
+    traversal = vmodl.query.PropertyCollector.TraversalSpec(
+        name="traverseView", type=vim.view.ContainerView, path="view", skip=False
+    )
+    return vmodl.query.PropertyCollector.FilterSpec(
+        objectSet=[
+            vmodl.query.PropertyCollector.ObjectSpec(obj=root_folder, skip=False),
+            vmodl.query.PropertyCollector.ObjectSpec(
+                obj=view, skip=True, selectSet=[traversal]
+            ),
+        ],
+        propSet=[
+            vmodl.query.PropertyCollector.PropertySpec(
+                type=vim.ManagedEntity, pathSet=["triggeredAlarmState"], all=False
+            ),
+        ],
+    )
@@ -0,0 +1,66 @@
+"""Adaptive per-target scan interval.
+
+Each target's scan job owns a :class:`ScanPacer`. After every cycle the job
+reports how long the cycle took, how slow vCenter was to answer, and how many
+critical/warning issues are active; the pacer returns the interval until the
+next cycle:
+
+* **overrun** — a cycle that used more than ``overrun_ratio`` of its interval
+  doubles the interval (at least 2x the cycle time), so a struggling target
+  is not hammered back-to-back;
+* **slow vCenter** — a round-trip above ``slow_latency_seconds`` stretches the
+  interval by 1.5x;
+* **active issues** — while anything critical/warning is active the interval
+  shrinks to half the base, so recoveries and escalations are seen sooner;
+* otherwise the interval steps back halfway toward the base each cycle.
+
+Results are clamped to ``[min_seconds, max_seconds]``. ``max_seconds`` (and
+the base) must stay below ``limit_seconds`` when one is given — the event
+lookback less the trigger jitter — so no events fall between two scans.
+"""
+
+from __future__ import annotations
+
+
+class ScanPacer:
+    """Computes the next scan interval for one target."""
+
+    def __init__(
+        self,
+        base_seconds: float,
+        min_seconds: float,
+        max_seconds: float,
+        overrun_ratio: float = 0.5,
+        slow_latency_seconds: float = 2.0,
+        limit_seconds: float | None = None,
+    ) -> None:
+        self.base = base_seconds
+        self.min = min(min_seconds, base_seconds)
+        self.max = max(max_seconds, base_seconds)
+        if limit_seconds is not None and self.max >= limit_seconds:
+            raise ValueError(
+                f"Scan interval of up to {self.max:.0f}s must stay below {limit_seconds:.0f}s "
+                f"(the event lookback less jitter), or events between scans are missed."
+            )
+        self._overrun_ratio = overrun_ratio
+        self._slow_latency = slow_latency_seconds
+        self.interval = base_seconds
+
+    def observe(self, duration: float, latency: float, active_issues: int) -> float:
+        """Fold one cycle's measurements in and return the new interval (s)."""
+        current = self.interval
+        if duration >= current * self._overrun_ratio:
+            target = max(current * 2, duration * 2)
+        elif latency >= self._slow_latency:
+            target = current * 1.5
+        elif active_issues:
+            target = self.base / 2
+        elif current > self.base:
+            target = self.base + (current - self.base) / 2
+        else:
+            target = self.base
+        # Snap small residues so the job is not rescheduled for a few seconds.
+        if abs(target - self.base) < 1:
+            target = self.base
+        self.interval = max(self.min, min(self.max, target))
+        return self.interval
@@ -4,82 +4,261 @@ from __future__ import annotations
 
 import logging
 import os
+import random
 import signal
 import sys
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+from vmware_aiops import metrics
 from vmware_aiops.config import AppConfig, load_config
 from vmware_aiops.connection import ConnectionManager
+from vmware_aiops.notify.history import ScanHistory
+from vmware_aiops.notify.issue_state import IssueStateStore
 from vmware_aiops.notify.logger import ScanLogger
 from vmware_aiops.notify.webhook import WebhookNotifier
+from vmware_aiops.notify.webhook_queue import WebhookSender, WebhookSpool
 from vmware_aiops.ops.ttl import get_expired_entries, remove_entry
 from vmware_aiops.ops.vm_lifecycle import VMNotFoundError, delete_vm
 from vmware_aiops.scanner.alarm_scanner import scan_alarms
+from vmware_aiops.scanner.alarm_watcher import AlarmWatcher
 from vmware_aiops.scanner.log_scanner import scan_host_logs, scan_logs
+from vmware_aiops.scanner.pacing import ScanPacer
 
 logger = logging.getLogger("vmware-aiops.scheduler")
 
 PID_FILE = Path.home() / ".vmware-aiops" / "daemon.pid"
 
+# Scan cycles and alarm watcher threads share the issue store and scan.log.
+_REPORT_LOCK = threading.Lock()
 
-def _run_scan(config: AppConfig, conn_mgr: ConnectionManager) -> None:
-    """Execute a single scan cycle across all targets."""
-    scan_logger = ScanLogger(config.notify.log_file)
-    webhook = WebhookNotifier(
-        url=config.notify.webhook_url,
-        timeout=config.notify.webhook_timeout,
-    )
 
-    all_issues: list[dict] = []
+def _scan_target(
+    config: AppConfig,
+    conn_mgr: ConnectionManager,
+    target_name: str,
+    watcher: AlarmWatcher | None = None,
+) -> tuple[list[dict], set[tuple[str, str]], float]:
+    """Scan one target.
+
+    Returns ``(issues, scanned_scopes, connect_seconds)``. ``connect_seconds``
+    is the time to obtain a live session — for a cached session that is one
+    liveness round-trip, which doubles as a vCenter latency sample.
+    """
+    with metrics.timer("scan_target_seconds", target=target_name):
+        issues, scanned, latency = _scan_target_body(
+            config, conn_mgr, target_name, watcher
+        )
+    for issue in issues:
+        metrics.inc(
+            "scan_issues_total", target=target_name,
+            severity=issue.get("severity", "info"),
+        )
+    return issues, scanned, latency
 
-    for target_name in conn_mgr.list_targets():
-        try:
-            si = conn_mgr.connect(target_name)
-        except Exception as e:
-            issue = {
-                "severity": "critical",
-                "source": "connection",
-                "message": f"Failed to connect to {target_name}: {e}",
-                "time": "",
-                "entity": target_name,
-            }
-            all_issues.append(issue)
-            continue
 
-        # Scan alarms
+def _scan_target_body(
+    config: AppConfig,
+    conn_mgr: ConnectionManager,
+    target_name: str,
+    watcher: AlarmWatcher | None,
+) -> tuple[list[dict], set[tuple[str, str]], float]:
+    scanned: set[tuple[str, str]] = {(target_name, "connection")}
+    start = time.monotonic()
+    try:
+        si = conn_mgr.connect(target_name)
+    except Exception as e:
+        issue = {
+            "severity": "critical",
+            "source": "connection",
+            "message": f"Failed to connect to {target_name}: {e}",
+            "time": "",
+            "entity": target_name,
+            "target": target_name,
+        }
+        return [issue], scanned, time.monotonic() - start
+    latency = time.monotonic() - start
+
+    target_issues: list[dict] = []
+
+    # Scan alarms, or take a live watcher's current set: re-submitting it each
+    # cycle keeps long-lived alarms renotifying and their state from expiring.
+    if watcher is not None and watcher.healthy:
+        target_issues.extend(watcher.current_issues())
+        scanned.add((target_name, "alarm"))
+    else:
         try:
-            all_issues.extend(scan_alarms(si))
+            target_issues.extend(scan_alarms(si))
+            scanned.add((target_name, "alarm"))
         except Exception as e:
             logger.error("Alarm scan failed for %s: %s", target_name, e)
 
-        # Scan events/logs
-        try:
-            all_issues.extend(scan_logs(si, config.scanner))
-        except Exception as e:
-            logger.error("Log scan failed for %s: %s", target_name, e)
+    # Scan events/logs
+    try:
+        target_issues.extend(scan_logs(si, config.scanner))
+    except Exception as e:
+        logger.error("Log scan failed for %s: %s", target_name, e)
 
-        # Scan host-level logs
-        try:
-            all_issues.extend(scan_host_logs(si))
-        except Exception as e:
-            logger.error("Host log scan failed for %s: %s", target_name, e)
+    # Scan host-level logs
+    try:
+        target_issues.extend(
+            scan_host_logs(
+                si, patterns=config.scanner.host_log_patterns,
+                severity_threshold=config.scanner.severity_threshold,
+            )
+        )
+    except Exception as e:
+        logger.error("Host log scan failed for %s: %s", target_name, e)
+
+    for issue in target_issues:
+        issue.setdefault("target", target_name)
+    return target_issues, scanned, latency
+
+
+def _run_target_scan(
+    config: AppConfig,
+    conn_mgr: ConnectionManager,
+    target_name: str,
+    pacer: ScanPacer,
+    issue_state: IssueStateStore | None = None,
+    webhook_sender: WebhookSender | None = None,
+    alarm_watchers: dict[str, AlarmWatcher] | None = None,
+    scheduler: BaseScheduler | None = None,
+) -> None:
+    """One target's scan job: scan, report, then re-pace the job."""
+    start = time.monotonic()
+    watcher = (alarm_watchers or {}).get(target_name)
+    issues, scanned, latency = _scan_target(config, conn_mgr, target_name, watcher)
+    reported = _report(config, issues, scanned, issue_state, webhook_sender)
+    duration = time.monotonic() - start
+    _write_metrics(config)
+
+    active = sum(1 for i in issues if i["severity"] in ("critical", "warning"))
+    previous = pacer.interval
+    interval = pacer.observe(duration, latency, active)
+    logger.info(
+        "Scan %s: %d issue(s), %d reported, %.1fs (connect %.2fs); next in %.0fs",
+        target_name, len(issues), len(reported), duration, latency, interval,
+    )
+    if scheduler is not None and interval != previous:
+        job_id = _scan_job_id(target_name)
+        scheduler.modify_job(job_id, misfire_grace_time=_misfire_grace(interval))
+        scheduler.reschedule_job(
+            job_id,
+            trigger=IntervalTrigger(
+                seconds=interval, jitter=config.scanner.jitter_seconds or None
+            ),
+        )
+
+
+def _scan_job_id(target_name: str) -> str:
+    return f"vmware_scan:{target_name}"
+
+
+def _misfire_grace(interval: float) -> int:
+    """A late start within half an interval still runs."""
+    return max(1, int(interval // 2))
+
+
+def _write_metrics(config: AppConfig) -> None:
+    if not metrics.REGISTRY.enabled:
+        return
+    try:
+        metrics.REGISTRY.write_textfile(config.metrics.textfile)
+    except OSError as e:
+        logger.warning("Could not write metrics textfile: %s", e)
+
+
+def _history(config: AppConfig) -> ScanHistory | None:
+    if not config.notify.history_enabled:
+        return None
+    return ScanHistory(
+        config.notify.history_file,
+        retention_days=config.notify.history_retention_days,
+    )
+
+
+def _report(
+    config: AppConfig,
+    issues: list[dict],
+    scanned: set[tuple[str, str]],
+    issue_state: IssueStateStore | None,
+    webhook_sender: WebhookSender | None,
+) -> list[dict]:
+    """Dedup, log and notify one batch of issues; returns what was reported."""
+    scan_logger = ScanLogger(
+        config.notify.log_file,
+        max_bytes=config.notify.log_max_bytes,
+        rotate_hours=config.notify.log_rotate_hours,
+        backups=config.notify.log_backups,
+        compress=config.notify.log_compress,
+        console_limit=config.notify.console_limit,
+        history=_history(config),
+    )
+    webhook = WebhookNotifier(
+        url=config.notify.webhook_url,
+        timeout=config.notify.webhook_timeout,
+    )
 
-    # Log all issues
-    for issue in all_issues:
-        scan_logger.log_issue(issue)
+    with _REPORT_LOCK:
+        if issue_state is not None:
+            reported = issue_state.process(issues, scanned)
+            try:
+                issue_state.save()
+            except OSError as e:
+                logger.warning("Could not persist issue state: %s", e)
+        else:
+            reported = issues
+        for issue in reported:
+            metrics.inc("scan_reported_total", transition=issue.get("transition", "all"))
 
-    # Send webhook if there are critical/warning issues
-    important = [i for i in all_issues if i["severity"] in ("critical", "warning")]
+        # Log reported issues (one write per batch)
+        try:
+            scan_logger.log_issues(reported)
+        except OSError as e:
+            logger.error("Could not write scan log: %s", e)
+
+    # Send webhook if there are critical/warning issues (or resolutions)
+    important = [
+        i for i in reported
+        if i["severity"] in ("critical", "warning") or i.get("transition") == "resolved"
+    ]
     if important and config.notify.webhook_url:
-        webhook.send(important)
+        if webhook_sender is not None:
+            try:
+                webhook_sender.enqueue(important)
+            except OSError as e:
+                logger.error("Could not spool webhook batch, sending inline: %s", e)
+                webhook.send(important)
+        else:
+            webhook.send(important)
 
-    if all_issues:
-        logger.info("Scan complete: %d issue(s) found", len(all_issues))
-    else:
-        logger.info("Scan complete: all clear")
+    return reported
+
+
+def _on_alarm_change(
+    config: AppConfig,
+    target_name: str,
+    issues: list[dict],
+    issue_state: IssueStateStore | None,
+    webhook_sender: WebhookSender | None,
+) -> None:
+    """AlarmWatcher callback: the target's full current alarm set changed."""
+    for issue in issues:
+        issue.setdefault("target", target_name)
+    reported = _report(
+        config, issues, {(target_name, "alarm")}, issue_state, webhook_sender
+    )
+    logger.info(
+        "Alarm watch %s: %d active alarm(s), %d change(s) reported",
+        target_name, len(issues), len(reported),
+    )
 
 
 def _run_ttl_check(conn_mgr: ConnectionManager) -> None:
@@ -109,6 +288,57 @@ def _run_ttl_check(conn_mgr: ConnectionManager) -> None:
         remove_entry(vm_name)
 
 
+def _add_scan_jobs(
+    scheduler: BaseScheduler,
+    config: AppConfig,
+    conn_mgr: ConnectionManager,
+    issue_state: IssueStateStore | None,
+    webhook_sender: WebhookSender | None,
+    alarm_watchers: dict[str, AlarmWatcher],
+) -> dict[str, ScanPacer]:
+    """Register one scan job per target, each with its own interval, start
+    offset, misfire grace and pacer. Returns the pacers by target name."""
+    scanner = config.scanner
+    pacers: dict[str, ScanPacer] = {}
+    now = datetime.now().astimezone()
+    limit = scanner.lookback_hours * 3600 - scanner.jitter_seconds
+    for target in config.targets:
+        base = (target.scan_interval_minutes or scanner.interval_minutes) * 60
+        if scanner.adaptive:
+            pacer = ScanPacer(
+                base,
+                min_seconds=scanner.min_interval_minutes * 60,
+                max_seconds=scanner.max_interval_minutes * 60,
+                limit_seconds=limit,
+            )
+        else:
+            pacer = ScanPacer(base, min_seconds=base, max_seconds=base, limit_seconds=limit)
+        pacers[target.name] = pacer
+        scheduler.add_job(
+            _run_target_scan,
+            trigger=IntervalTrigger(seconds=base, jitter=scanner.jitter_seconds or None),
+            args=[config, conn_mgr, target.name, pacer],
+            kwargs={
+                "issue_state": issue_state,
+                "webhook_sender": webhook_sender,
+                "alarm_watchers": alarm_watchers,
+                "scheduler": scheduler,
+            },
+            id=_scan_job_id(target.name),
+            name=f"VMware AIops Scanner ({target.name})",
+            # A cycle is never run twice at once for a target, a late start
+            # within half an interval still runs, and a backlog collapses to
+            # one run.
+            max_instances=1,
+            misfire_grace_time=_misfire_grace(base),
+            coalesce=True,
+            next_run_time=now + timedelta(
+                seconds=random.uniform(0, scanner.jitter_seconds)
+            ),
+        )
+    return pacers
+
+
 def start_scheduler(config_path: Path | None = None) -> None:
     """Start the blocking scheduler daemon."""
     logging.basicConfig(
@@ -123,19 +353,64 @@ def start_scheduler(config_path: Path | None = None) -> None:
         logger.warning("Scanner is disabled in config. Exiting.")
         return
 
+    if config.metrics.enabled:
+        metrics.REGISTRY.enabled = True
+        if config.metrics.port:
+            metrics.REGISTRY.serve(config.metrics.port)
+
     # Write PID file
     PID_FILE.parent.mkdir(parents=True, exist_ok=True)
     PID_FILE.write_text(str(os.getpid()), encoding="utf-8")
 
+    issue_state = None
+    if config.notify.dedup_enabled:
+        issue_state = IssueStateStore(
+            config.notify.state_file,
+            renotify_minutes=config.notify.renotify_minutes,
+            max_entries=config.notify.state_max_entries,
+            expire_hours=config.notify.state_expire_hours,
+        )
+
+    webhook_sender = None
+    if config.notify.webhook_url and config.notify.webhook_async:
+        webhook_sender = WebhookSender(
+            config.notify.webhook_url,
+            WebhookSpool(config.notify.webhook_spool_dir),
+            timeout=config.notify.webhook_timeout,
+            max_batch=config.notify.webhook_max_batch,
+            rate_per_minute=config.notify.webhook_rate_per_minute,
+            backoff_max=config.notify.webhook_backoff_max_seconds,
+        )
+        webhook_sender.start()
+
+    alarm_watchers: dict[str, AlarmWatcher] = {}
+    watch_conn_mgr = None
+    if config.scanner.alarm_watch:
+        # Separate sessions: WaitForUpdatesEx parks a request for up to
+        # alarm_watch_max_wait_seconds and must not share the scan's session.
+        watch_conn_mgr = ConnectionManager(config)
+        for name in conn_mgr.list_targets():
+            alarm_watchers[name] = AlarmWatcher(
+                name,
+                connect=lambda n=name: watch_conn_mgr.connect(n),
+                on_change=lambda t, issues: _on_alarm_change(
+                    config, t, issues, issue_state, webhook_sender
+                ),
+                max_wait_seconds=config.scanner.alarm_watch_max_wait_seconds,
+            )
+            alarm_watchers[name].start()
+
+    def _stop_background() -> None:
+        for watcher in alarm_watchers.values():
+            watcher.stop()
+        if watch_conn_mgr is not None:
+            watch_conn_mgr.disconnect_all()
+        if webhook_sender is not None:
+            webhook_sender.stop()
+
     scheduler = BlockingScheduler()
-    scheduler.add_job(
-        _run_scan,
-        trigger=IntervalTrigger(minutes=config.scanner.interval_minutes),
-        args=[config, conn_mgr],
-        id="vmware_scan",
-        name="VMware AIops Scanner",
-        max_instances=1,
-        next_run_time=None,  # Scheduler interval starts after manual first run below
+    _add_scan_jobs(
+        scheduler, config, conn_mgr, issue_state, webhook_sender, alarm_watchers
     )
     scheduler.add_job(
         _run_ttl_check,
@@ -146,17 +421,18 @@ def start_scheduler(config_path: Path | None = None) -> None:
         max_instances=1,
     )
 
-    # Run first scan immediately, then scheduler takes over
+    # First scans start within jitter_seconds, staggered per target.
     logger.info(
-        "Scanner starting. Interval: %dm. Targets: %s",
+        "Scanner starting. Interval: %dm (adaptive: %s). Targets: %s",
         config.scanner.interval_minutes,
+        config.scanner.adaptive,
         ", ".join(conn_mgr.list_targets()),
     )
-    _run_scan(config, conn_mgr)
 
     def _shutdown(signum, frame):
         logger.info("Shutting down scanner...")
         scheduler.shutdown(wait=False)
+        _stop_background()
         PID_FILE.unlink(missing_ok=True)
         conn_mgr.disconnect_all()
         sys.exit(0)
@@ -167,5 +443,6 @@ def start_scheduler(config_path: Path | None = None) -> None:
     try:
         scheduler.start()
     finally:
+        _stop_background()
         PID_FILE.unlink(missing_ok=True)
         conn_mgr.disconnect_all()